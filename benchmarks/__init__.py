@@ -0,0 +1 @@
+"""OpenGrowBox performance benchmarks (HA-free simulation harness)."""
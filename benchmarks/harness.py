@@ -0,0 +1,729 @@
+"""HA-free simulation harness for the benchmark suite.
+
+Provides a fake ``hass`` (bus, states, services, config), synthesizes rooms
+with sensor devices and actuators, wires the real OGB core components
+(DataStore, OGBEventManager, OGBVPDManager, OGBModeManager,
+OGBActionManager, OGBCO2Manager, OGBDSManager) and replays sensor traces.
+
+Traces are lists of ``TraceSample`` (time offset, room, entity, value). They
+can be synthesized or loaded from a JSON list or a Home Assistant history CSV
+export (``entity_id,state,last_changed``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import heapq
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+import types
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Actuator device types and the capability they provide
+ACTUATOR_TYPES = [
+    ("Exhaust", "canExhaust"),
+    ("Intake", "canIntake"),
+    ("Ventilation", "canVentilate"),
+    ("Humidifier", "canHumidify"),
+    ("Dehumidifier", "canDehumidify"),
+    ("Heater", "canHeat"),
+    ("Cooler", "canCool"),
+    ("Light", "canLight"),
+]
+
+
+def install_ha_stubs():
+    """Install the logic-test HA stubs plus homeassistant.core.
+
+    The benchmark imports OGB modules below managers/core whose package
+    __init__ pulls in OGBMainController and therefore homeassistant.core.
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    import tests.logic.conftest  # noqa: F401  (installs namespace + HA stubs)
+
+    ha_module = sys.modules["homeassistant"]
+    if not hasattr(ha_module, "__path__"):
+        ha_module.__path__ = []
+    if "homeassistant.core" not in sys.modules:
+        core = types.ModuleType("homeassistant.core")
+
+        class _Placeholder:
+            def __init__(self, *args, **kwargs):
+                pass
+
+        core.callback = lambda func: func
+        core.HomeAssistant = _Placeholder
+        core.Event = _Placeholder
+        core.ServiceCall = _Placeholder
+        core.State = _Placeholder
+        sys.modules["homeassistant.core"] = core
+        ha_module.core = core
+
+
+# ---------------------------------------------------------------------------
+# Fake Home Assistant
+# ---------------------------------------------------------------------------
+
+
+class FakeBus:
+    """Event bus that records fired events and dispatches to listeners."""
+
+    def __init__(self):
+        self.listeners: Dict[str, list] = {}
+        self.fired = 0
+
+    def async_listen(self, event_type, handler):
+        self.listeners.setdefault(event_type, []).append(handler)
+        return lambda: self.listeners.get(event_type, []).remove(handler)
+
+    def async_fire(self, event_type, data=None):
+        self.fired += 1
+        event = types.SimpleNamespace(event_type=event_type, data=data or {})
+        for handler in self.listeners.get(event_type, []):
+            result = handler(event)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+
+    fire = async_fire
+
+
+class FakeStates:
+    """Minimal state machine (entity_id -> State-like namespace)."""
+
+    def __init__(self):
+        self._states: Dict[str, Any] = {}
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id, state, attributes=None):
+        self._states[entity_id] = types.SimpleNamespace(
+            entity_id=entity_id,
+            state=str(state),
+            attributes=attributes or {},
+            last_changed=datetime.now(),
+        )
+
+    def async_all(self, domain=None):
+        values = list(self._states.values())
+        if domain:
+            values = [s for s in values if s.entity_id.startswith(f"{domain}.")]
+        return values
+
+
+class FakeServices:
+    """Service registry that records calls and their arrival time."""
+
+    def __init__(self, states: FakeStates):
+        self.states = states
+        self.calls: List[tuple] = []
+        self.call_count = 0
+        self.on_call = None
+
+    def has_service(self, domain, service):
+        return True
+
+    def async_register(self, *args, **kwargs):
+        return None
+
+    async def async_call(self, domain, service, service_data=None, blocking=False, **kwargs):
+        self.call_count += 1
+        service_data = service_data or kwargs.get("target") or {}
+        if self.on_call:
+            self.on_call(domain, service, service_data)
+        entity_id = service_data.get("entity_id") if isinstance(service_data, dict) else None
+        if entity_id and service in ("turn_on", "turn_off"):
+            for eid in entity_id if isinstance(entity_id, list) else [entity_id]:
+                self.states.async_set(eid, "on" if service == "turn_on" else "off")
+        return None
+
+
+class FakeConfig:
+    def __init__(self, config_dir: str):
+        self.config_dir = config_dir
+        self.latitude = 52.52
+        self.longitude = 13.41
+
+    def path(self, *parts):
+        return str(Path(self.config_dir, *parts))
+
+
+class FakeHass:
+    """Enough of ``hass`` for the OGB core components."""
+
+    def __init__(self, config_dir: Optional[str] = None):
+        self.bus = FakeBus()
+        self.states = FakeStates()
+        self.services = FakeServices(self.states)
+        self._tmp = None
+        if config_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="ogb_bench_")
+            config_dir = self._tmp.name
+        self.config = FakeConfig(config_dir)
+        self.data: Dict[str, Any] = {}
+
+    async def async_add_executor_job(self, func, *args):
+        return await asyncio.to_thread(func, *args)
+
+    def async_create_task(self, coro, *args, **kwargs):
+        return asyncio.ensure_future(coro)
+
+    def cleanup(self):
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+
+class VirtualClock:
+    """Simulated wall clock with ``call_later`` timers and an async ``sleep``.
+
+    ``run_until`` moves time forward timer by timer and lets the tasks those
+    timers start finish before going on, so event/deadline driven components
+    (e.g. the crop steering phase engine) replay hours in milliseconds.
+    ``sleep`` only advances time; it is meant for code running inside such a
+    task (an irrigation waiting for its shot duration).
+    """
+
+    class Handle:
+        __slots__ = ("cancelled",)
+
+        def __init__(self):
+            self.cancelled = False
+
+        def cancel(self):
+            self.cancelled = True
+
+    def __init__(self, start: datetime):
+        self._now = start
+        self._timers: List[tuple] = []
+        self._seq = 0
+        self.fired = 0
+
+    def now(self) -> datetime:
+        return self._now
+
+    def call_later(self, delay: float, callback) -> "VirtualClock.Handle":
+        handle = VirtualClock.Handle()
+        self._seq += 1
+        when = self._now + timedelta(seconds=max(0.0, delay))
+        heapq.heappush(self._timers, (when, self._seq, callback, handle))
+        return handle
+
+    async def sleep(self, seconds: float):
+        await self._advance(self._now + timedelta(seconds=seconds), settle=False)
+
+    async def run_until(self, when: datetime):
+        await self._advance(when, settle=True)
+
+    async def _advance(self, when: datetime, settle: bool):
+        while self._timers and self._timers[0][0] <= when:
+            at, _, callback, handle = heapq.heappop(self._timers)
+            if handle.cancelled:
+                continue
+            self._now = max(self._now, at)
+            self.fired += 1
+            before = asyncio.all_tasks() if settle else None
+            callback()
+            if settle:
+                await self._settle(before)
+        self._now = max(self._now, when)
+
+    @staticmethod
+    async def _settle(before):
+        """Wait for the tasks started since ``before`` (and the tasks they start)."""
+        while True:
+            pending = [task for task in asyncio.all_tasks() - before if not task.done()]
+            if not pending:
+                return
+            await asyncio.wait(pending)
+
+
+# ---------------------------------------------------------------------------
+# Simulated devices
+# ---------------------------------------------------------------------------
+
+
+class SimSensorDevice:
+    """Sensor device exposing the interface OGBVPDManager reads.
+
+    Mirrors Sensor.sensorReadings: {context: {type: [{entity_id, state, label}]}}.
+    """
+
+    def __init__(self, name: str, sensor_count: int):
+        self.deviceName = name
+        self.deviceType = "Sensor"
+        self.isInitialized = True
+        self.sensorReadings: Dict[str, Dict[str, list]] = {"air": {"temperature": [], "humidity": []}}
+        self.entities: Dict[str, dict] = {}
+        for index in range(sensor_count):
+            kind = "temperature" if index % 2 == 0 else "humidity"
+            entity_id = f"sensor.{name}_{kind}_{index}"
+            reading = {"entity_id": entity_id, "state": 24.0 if kind == "temperature" else 60.0, "label": "air"}
+            self.sensorReadings["air"][kind].append(reading)
+            self.entities[entity_id] = reading
+
+    def getSensorsByContext(self, context):
+        return self.sensorReadings.get(context, {})
+
+    def update(self, entity_id: str, value: float):
+        reading = self.entities.get(entity_id)
+        if reading is not None:
+            reading["state"] = value
+
+
+class SimActuator:
+    """Actuator reacting to ``Increase/Reduce <Type>`` like OGBDevices.Device."""
+
+    def __init__(self, room: "SimRoom", name: str, device_type: str):
+        self.room = room
+        self.deviceName = name
+        self.deviceType = device_type
+        self.entity_id = f"switch.{name}"
+        room.event_manager.on(f"Increase {device_type}", self._on_action)
+        room.event_manager.on(f"Reduce {device_type}", self._on_action)
+
+    async def _on_action(self, data):
+        service = "turn_on" if getattr(data, "action", None) != "Reduce" else "turn_off"
+        await self.room.hass.services.async_call(
+            domain="switch", service=service, service_data={"entity_id": self.entity_id}
+        )
+        self.room.record_actuation()
+
+
+# ---------------------------------------------------------------------------
+# Rooms and world
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TraceSample:
+    offset: float
+    room: str
+    entity_id: str
+    value: float
+
+
+@dataclass
+class SimRoom:
+    name: str
+    hass: FakeHass
+    data_store: Any = None
+    event_manager: Any = None
+    vpd_manager: Any = None
+    mode_manager: Any = None
+    action_manager: Any = None
+    co2_manager: Any = None
+    ds_manager: Any = None
+    sensor_devices: List[SimSensorDevice] = field(default_factory=list)
+    actuators: List[SimActuator] = field(default_factory=list)
+    pending_since: Optional[float] = None
+    latencies: List[float] = field(default_factory=list)
+    actuations: int = 0
+
+    # Compatibility attributes for action modules (ogb.dataStore etc.)
+    @property
+    def room(self):
+        return self.name
+
+    @property
+    def dataStore(self):
+        return self.data_store
+
+    @property
+    def eventManager(self):
+        return self.event_manager
+
+    @property
+    def actionManager(self):
+        return self.action_manager
+
+    def record_actuation(self):
+        self.actuations += 1
+        if self.pending_since is not None:
+            self.latencies.append(time.perf_counter() - self.pending_since)
+            self.pending_since = None
+
+    def sensor_entities(self) -> List[str]:
+        return [eid for dev in self.sensor_devices for eid in dev.entities]
+
+
+def _configure_room_state(data_store, actuator_types):
+    data_store.set("mainControl", "HomeAssistant")
+    data_store.set("tentMode", "VPD Perfection")
+    data_store.setDeep("vpd.perfection", 1.1)
+    data_store.setDeep("vpd.perfectMin", 1.0)
+    data_store.setDeep("vpd.perfectMax", 1.2)
+    data_store.setDeep("vpd.current", None)
+    data_store.setDeep("tentData.leafTempOffset", 2.0)
+    # Normally filled from the plant stage table by OGBConfigurationManager
+    for key, value in (("minTemp", 20.0), ("maxTemp", 28.0), ("minHumidity", 50.0), ("maxHumidity", 70.0)):
+        data_store.setDeep(f"tentData.{key}", value)
+    data_store.setDeep("isPlantDay.islightON", True)
+    data_store.setDeep("controlOptions.nightVPDHold", True)
+    capabilities = data_store.get("capabilities")
+    for device_type, cap in actuator_types:
+        entry = capabilities.setdefault(cap, {"state": False, "count": 0, "devEntities": [], "deviceData": {}})
+        entry["state"] = True
+        entry["count"] += 1
+        entry["devEntities"].append(f"{device_type.lower()}")
+    data_store.set("capabilities", capabilities)
+
+
+async def build_room(hass: FakeHass, name: str, devices: int, sensors: int) -> SimRoom:
+    """Create one room with ``devices`` actuators and ``sensors`` air sensors."""
+    from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import OGBConf
+    from custom_components.opengrowbox.OGBController.managers.OGBActionManager import OGBActionManager
+    from custom_components.opengrowbox.OGBController.managers.OGBCO2Manager import OGBCO2Manager
+    from custom_components.opengrowbox.OGBController.managers.OGBDSManager import OGBDSManager
+    from custom_components.opengrowbox.OGBController.managers.OGBEventManager import OGBEventManager
+    from custom_components.opengrowbox.OGBController.managers.OGBModeManager import OGBModeManager
+    from custom_components.opengrowbox.OGBController.managers.core.OGBVPDManager import OGBVPDManager
+
+    room = SimRoom(name=name, hass=hass)
+    room.data_store = DataStore(OGBConf(hass=hass, room=name))
+    room.event_manager = OGBEventManager(hass, room.data_store)
+    room.vpd_manager = OGBVPDManager(room.data_store, room.event_manager, name, hass)
+    room.action_manager = OGBActionManager(hass, room.data_store, room.event_manager, name)
+    room.mode_manager = OGBModeManager(hass, room.data_store, room.event_manager, name, action_manager=room.action_manager)
+    room.co2_manager = OGBCO2Manager(hass, room.data_store, room.event_manager, name)
+    room.ds_manager = OGBDSManager(hass, room.data_store, room.event_manager, name, None)
+    room.ds_manager._state_loaded = True
+    await room.action_manager.initialize_action_modules(room)
+
+    # One sensor device per 4 sensors keeps device iteration realistic
+    per_device = 4
+    for index in range(max(1, math.ceil(sensors / per_device))):
+        count = min(per_device, sensors - index * per_device) or per_device
+        room.sensor_devices.append(SimSensorDevice(f"{name.lower()}_sensor{index}", count))
+
+    actuator_types = [ACTUATOR_TYPES[i % len(ACTUATOR_TYPES)] for i in range(devices)]
+    for index, (device_type, _cap) in enumerate(actuator_types):
+        room.actuators.append(SimActuator(room, f"{name.lower()}_{device_type.lower()}{index}", device_type))
+
+    room.data_store.set("devices", list(room.sensor_devices))
+    _configure_room_state(room.data_store, actuator_types)
+    return room
+
+
+class SimWorld:
+    """N rooms x M devices x K sensors on one fake hass."""
+
+    def __init__(self, rooms: int, devices: int, sensors: int, seed: int = 42):
+        self.room_count = rooms
+        self.devices = devices
+        self.sensors = sensors
+        self.seed = seed
+        self.hass = FakeHass()
+        self.rooms: Dict[str, SimRoom] = {}
+
+    async def start(self):
+        for index in range(self.room_count):
+            name = f"BenchRoom{index}"
+            self.rooms[name] = await build_room(self.hass, name, self.devices, self.sensors)
+        return self
+
+    async def stop(self):
+        for room in self.rooms.values():
+            await room.event_manager.async_shutdown()
+            for manager in (room.mode_manager, room.action_manager, room.co2_manager):
+                shutdown = getattr(manager, "async_shutdown", None)
+                if shutdown:
+                    try:
+                        await shutdown()
+                    except Exception:
+                        pass
+        # Let cancelled tasks settle before the loop closes
+        await asyncio.sleep(0)
+        self.hass.cleanup()
+
+    def synthesize_trace(self, samples_per_sensor: int, period: float = 10.0) -> List[TraceSample]:
+        """Diurnal-ish temperature/humidity swings with noise, sorted by time."""
+        rng = random.Random(self.seed)
+        trace: List[TraceSample] = []
+        for room in self.rooms.values():
+            for entity_id in room.sensor_entities():
+                is_temp = "_temperature_" in entity_id
+                phase = rng.random() * math.tau
+                for step in range(samples_per_sensor):
+                    swing = math.sin(phase + step / 30.0)
+                    if is_temp:
+                        value = 24.0 + 3.0 * swing + rng.gauss(0, 0.2)
+                    else:
+                        value = 60.0 - 10.0 * swing + rng.gauss(0, 1.0)
+                    trace.append(TraceSample(step * period + rng.random(), room.name, entity_id, round(value, 2)))
+        trace.sort(key=lambda sample: sample.offset)
+        return trace
+
+    async def replay(self, trace: List[TraceSample], drain_every: int = 1) -> dict:
+        """Feed samples through the pipeline as fast as possible.
+
+        Each sample updates the sensor reading and emits VPDCreation for its
+        room, like Sensor.handleSensorUpdate does. Background listener tasks
+        are drained every ``drain_every`` samples so latency measurements
+        reflect one sensor update at a time.
+        """
+        from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBPublications import (
+            OGBVPDPublication,
+        )
+
+        device_index = {
+            entity_id: (room, device)
+            for room in self.rooms.values()
+            for device in room.sensor_devices
+            for entity_id in device.entities
+        }
+
+        start = time.perf_counter()
+        for index, sample in enumerate(trace, 1):
+            room, device = device_index[sample.entity_id]
+            device.update(sample.entity_id, sample.value)
+            if room.pending_since is None:
+                room.pending_since = time.perf_counter()
+            await room.event_manager.emit(
+                "VPDCreation", OGBVPDPublication(Name=room.name, VPD=None, AvgTemp=None, AvgHum=None, AvgDew=None)
+            )
+            if index % drain_every == 0:
+                await self.drain()
+                for pending_room in self.rooms.values():
+                    pending_room.pending_since = None
+        await self.drain()
+        elapsed = time.perf_counter() - start
+
+        latencies = [lat for room in self.rooms.values() for lat in room.latencies]
+        for room in self.rooms.values():
+            room.pending_since = None
+        return {
+            "samples": len(trace),
+            "elapsed_s": elapsed,
+            "latencies": latencies,
+            "actuations": sum(room.actuations for room in self.rooms.values()),
+            "service_calls": self.hass.services.call_count,
+        }
+
+    async def drain(self, max_rounds: int = 50):
+        """Wait until all event manager background tasks have finished."""
+        for _ in range(max_rounds):
+            pending = [
+                task
+                for room in self.rooms.values()
+                for task in room.event_manager._background_tasks
+                if not task.done()
+            ]
+            if not pending:
+                return
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# Trace loading
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Crop steering day
+# ---------------------------------------------------------------------------
+
+
+class SimSubstrate:
+    """One grow medium: VWC dries back with the light and rises while drippers run."""
+
+    def __init__(self, clock: VirtualClock, is_light_on, vwc: float = 52.0,
+                 day_dryback: float = 1.5, night_dryback: float = 0.3, shot_rate: float = 0.12):
+        self.clock = clock
+        self.is_light_on = is_light_on
+        self.vwc = vwc
+        self.day_dryback = day_dryback  # % VWC per hour
+        self.night_dryback = night_dryback
+        self.shot_rate = shot_rate  # % VWC per dripper second
+        self.current_ec = 2.0
+        self.current_temp = 22.0
+        self.drippers_on = 0
+        self.shots = 0
+        self._updated = clock.now()
+
+    def advance(self):
+        now = self.clock.now()
+        seconds = (now - self._updated).total_seconds()
+        self._updated = now
+        if self.drippers_on:
+            self.vwc = min(80.0, self.vwc + seconds * self.shot_rate)
+        else:
+            rate = self.day_dryback if self.is_light_on() else self.night_dryback
+            self.vwc = max(0.0, self.vwc - seconds / 3600 * rate)
+
+    @property
+    def current_moisture(self) -> float:
+        self.advance()
+        return round(self.vwc, 2)
+
+    def pump(self, action: str):
+        self.advance()
+        if action == "on":
+            self.drippers_on += 1
+            self.shots += 1
+        else:
+            self.drippers_on = max(0, self.drippers_on - 1)
+
+
+class SubstrateEventManager:
+    """Records emitted events and drives the substrate from ``PumpAction``."""
+
+    def __init__(self, substrate: SimSubstrate):
+        self.substrate = substrate
+        self.listeners: Dict[str, list] = {}
+        self.emitted: Dict[str, int] = {}
+
+    def on(self, event_name, callback):
+        self.listeners.setdefault(event_name, []).append(callback)
+
+    async def emit(self, event_name, data, haEvent=False, debug_type=None):
+        self.emitted[event_name] = self.emitted.get(event_name, 0) + 1
+        if event_name == "PumpAction":
+            self.substrate.pump(data.Action)
+
+    async def dispatch(self, event_name, data):
+        for callback in self.listeners.get(event_name, []):
+            await callback(data)
+
+
+async def simulate_crop_steering_day(
+    hours: float = 24.0,
+    sample_minutes: float = 5.0,
+    start: datetime = datetime(2026, 3, 1, 5, 0),
+    light_on_hour: int = 6,
+    light_off_hour: int = 18,
+    mode: str = "Automatic",
+) -> dict:
+    """Replay a crop steering day on a virtual clock.
+
+    A real ``OGBCSManager`` steers one ``SimSubstrate``; medium updates arrive
+    every ``sample_minutes`` and the light follows the on/off hours.
+    """
+    from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import OGBConf
+    from custom_components.opengrowbox.OGBController.managers.hydro.crop_steering.OGBCSManager import OGBCSManager
+
+    name = "SimRoom"
+    hass = FakeHass()
+    clock = VirtualClock(start)
+    store = DataStore(OGBConf(hass=hass, room=name))
+    store.setDeep("isPlantDay.lightOnTime", f"{light_on_hour:02d}:00:00")
+    store.setDeep("isPlantDay.lightOffTime", f"{light_off_hour:02d}:00:00")
+    store.setDeep("isPlantDay.islightON", light_on_hour <= start.hour < light_off_hour)
+    store.setDeep("Hydro.Mode", "Crop-Steering")
+    store.setDeep("CropSteering.ActiveMode", mode)
+    store.setDeep("capabilities.canPump", {"state": True, "count": 1, "devEntities": ["switch.dripper_1"]})
+
+    substrate = SimSubstrate(clock, lambda: bool(store.getDeep("isPlantDay.islightON")))
+    events = SubstrateEventManager(substrate)
+    manager = OGBCSManager(
+        hass, store, events, name,
+        medium_manager=types.SimpleNamespace(get_mediums=lambda: [substrate]),
+    )
+    manager.clock = clock.now
+    manager.sleep = clock.sleep
+    manager._phase_engine.call_later = clock.call_later
+
+    samples = 0
+    wall_start = time.perf_counter()
+    try:
+        await manager.handle_mode_change({})
+        end = start + timedelta(hours=hours)
+        step = timedelta(minutes=sample_minutes)
+        now = start
+        while now < end:
+            now = min(end, now + step)
+            await clock.run_until(now)
+            lights = light_on_hour <= now.hour < light_off_hour
+            if lights != store.getDeep("isPlantDay.islightON"):
+                store.setDeep("isPlantDay.islightON", lights)
+                await events.dispatch("toggleLight", lights)
+            await events.dispatch("MediumSensorUpdate", {"room": name})
+            samples += 1
+        await clock.run_until(end)
+        wall = time.perf_counter() - wall_start
+        engine = manager._phase_engine
+        return {
+            "manager": manager,
+            "substrate": substrate,
+            "events": events,
+            "samples": samples,
+            "wall_s": wall,
+            "timers_fired": clock.fired,
+            "stats": engine.get_stats(),
+            "transitions": [(at, old, new) for at, old, new in engine.transitions],
+        }
+    finally:
+        await manager._phase_engine.stop()
+        hass.cleanup()
+
+
+def load_trace(path: str, room_map: Optional[Dict[str, str]] = None) -> List[TraceSample]:
+    """Load a recorded trace.
+
+    Supported formats:
+      - JSON: list of {"offset"|"t", "room", "entity_id", "value"}
+      - CSV (HA history export): entity_id,state,last_changed
+        Offsets are relative to the first timestamp; ``room_map`` maps
+        entity ids to room names (default: single room "BenchRoom0").
+    """
+    file_path = Path(path)
+    samples: List[TraceSample] = []
+    if file_path.suffix == ".json":
+        for row in json.loads(file_path.read_text(encoding="utf-8")):
+            samples.append(
+                TraceSample(float(row.get("offset", row.get("t", 0.0))), row["room"], row["entity_id"], float(row["value"]))
+            )
+    else:
+        room_map = room_map or {}
+        first = None
+        with file_path.open(encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                try:
+                    value = float(row["state"])
+                except (TypeError, ValueError):
+                    continue
+                stamp = datetime.fromisoformat(row["last_changed"].replace("Z", "+00:00")).timestamp()
+                first = stamp if first is None else first
+                samples.append(
+                    TraceSample(stamp - first, room_map.get(row["entity_id"], "BenchRoom0"), row["entity_id"], value)
+                )
+    samples.sort(key=lambda sample: sample.offset)
+    return samples
+
+
+def percentiles(values: List[float]) -> dict:
+    """p50/p95/p99/max in milliseconds (nearest rank)."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def _rank(q):
+        return ordered[max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4),
+        "p50_ms": round(_rank(50) * 1000, 4),
+        "p95_ms": round(_rank(95) * 1000, 4),
+        "p99_ms": round(_rank(99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def quiet_logging():
+    """OGB logs at WARNING on hot paths; keep benchmark output readable."""
+    logging.getLogger("custom_components").setLevel(logging.CRITICAL)
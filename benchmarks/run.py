@@ -0,0 +1,131 @@
+"""Run the OGB benchmark suite and store JSON results.
+
+Examples:
+    python -m benchmarks.run
+    python -m benchmarks.run --rooms 4 --devices 20 --sensors 8 --only pipeline
+    python -m benchmarks.run --trace history.csv --only pipeline
+    python -m benchmarks.run --compare benchmarks/results/before.json benchmarks/results/after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .harness import REPO_ROOT, install_ha_stubs, quiet_logging
+
+DEFAULT_RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_suite(config, only=None) -> dict:
+    from .scenarios import SCENARIOS
+
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        if only and name not in only:
+            continue
+        start = time.perf_counter()
+        results[name] = await scenario(config)
+        print(f"  {name:<14} done in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": asdict(config),
+        },
+        "results": results,
+    }
+
+
+def _flatten(prefix, value, out):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else key, item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+    return out
+
+
+def compare(old_path: str, new_path: str) -> str:
+    """Side-by-side numeric diff of two result files."""
+    old = _flatten("", json.loads(Path(old_path).read_text())["results"], {})
+    new = _flatten("", json.loads(Path(new_path).read_text())["results"], {})
+    lines = [f"{'metric':<52} {'old':>12} {'new':>12} {'change':>9}"]
+    for key in sorted(set(old) | set(new)):
+        before, after = old.get(key), new.get(key)
+        if before is None or after is None:
+            lines.append(f"{key:<52} {str(before):>12} {str(after):>12} {'':>9}")
+            continue
+        change = f"{(after - before) / before * 100:+.1f}%" if before else ""
+        lines.append(f"{key:<52} {before:>12} {after:>12} {change:>9}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OpenGrowBox benchmark suite")
+    parser.add_argument("--rooms", type=int, default=2)
+    parser.add_argument("--devices", type=int, default=8, help="actuators per room")
+    parser.add_argument("--sensors", type=int, default=6, help="air sensors per room")
+    parser.add_argument("--samples", type=int, default=25, help="synthesized samples per sensor")
+    parser.add_argument("--iterations", type=int, default=20000, help="micro benchmark iterations")
+    parser.add_argument("--trace", help="recorded trace (JSON or HA history CSV) for the pipeline scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare(*args.compare))
+        return 0
+
+    install_ha_stubs()
+    quiet_logging()
+    from .scenarios import BenchConfig
+
+    config = BenchConfig(
+        rooms=args.rooms,
+        devices=args.devices,
+        sensors=args.sensors,
+        samples_per_sensor=args.samples,
+        iterations=args.iterations,
+        trace_path=args.trace,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_suite(config, args.only))
+
+    output = Path(args.output) if args.output else (
+        DEFAULT_RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['meta']['git']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["results"], indent=2))
+    print(f"\nResults written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,582 @@
+"""Benchmark scenarios.
+
+Each scenario is an ``async def`` taking a ``BenchConfig`` and returning a
+JSON-serializable dict of metrics. Scenarios use the real OGB components;
+only Home Assistant is simulated (see harness.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import tracemalloc
+import types
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict
+
+from .harness import ACTUATOR_TYPES, FakeHass, SimWorld, percentiles, simulate_crop_steering_day
+
+
+@dataclass
+class BenchConfig:
+    rooms: int = 2
+    devices: int = 8
+    sensors: int = 6
+    samples_per_sensor: int = 25
+    iterations: int = 20000
+    trace_path: str | None = None
+    seed: int = 42
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds > 0 else 0.0
+
+
+def _alloc_stats(snapshot_before, snapshot_after, operations: int) -> dict:
+    stats = snapshot_after.compare_to(snapshot_before, "filename")
+    size = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return {
+        "retained_kb": round(size / 1024, 2),
+        "retained_blocks": blocks,
+        "blocks_per_op": round(blocks / operations, 3) if operations else 0,
+    }
+
+
+async def bench_event_bus(config: BenchConfig) -> dict:
+    """OGBEventManager.emit throughput with mixed sync/async listeners."""
+    from custom_components.opengrowbox.OGBController.managers.OGBEventManager import OGBEventManager
+
+    hass = FakeHass()
+    manager = OGBEventManager(hass, None)
+    counter = {"sync": 0, "async": 0}
+
+    def sync_listener(_data):
+        counter["sync"] += 1
+
+    async def async_listener(_data):
+        counter["async"] += 1
+
+    for index in range(4):
+        manager.on(f"Bench{index}", sync_listener)
+        manager.on(f"Bench{index}", async_listener)
+
+    async def _drain():
+        while manager._background_tasks:
+            await asyncio.gather(*list(manager._background_tasks), return_exceptions=True)
+
+    async def _run(count):
+        for index in range(count):
+            await manager.emit(f"Bench{index & 3}", index)
+            if index % 500 == 0:
+                await _drain()
+        await _drain()
+
+    n = config.iterations
+    await _run(200)  # warm up
+
+    start = time.perf_counter()
+    await _run(n)
+    elapsed = time.perf_counter() - start
+
+    # Separate allocation pass: tracemalloc slows execution several times
+    alloc_n = max(100, n // 10)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    await _run(alloc_n)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    await manager.async_shutdown()
+    hass.cleanup()
+    return {
+        "events": n,
+        "elapsed_s": round(elapsed, 4),
+        "events_per_s": _rate(n, elapsed),
+        "listener_calls": counter["sync"] + counter["async"],
+        "tracemalloc_peak_kb": round(peak / 1024, 1),
+        "alloc": _alloc_stats(before, after, alloc_n),
+    }
+
+
+async def bench_event_burst(config: BenchConfig) -> dict:
+    """Memory of a 10k publication burst through OGBEventManager, slotted vs. plain dataclasses."""
+    from dataclasses import fields, make_dataclass
+
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBPublications import (
+        OGBHydroAction,
+        OGBVPDPublication,
+    )
+    from custom_components.opengrowbox.OGBController.managers.OGBEventManager import OGBEventManager
+
+    burst = min(10_000, max(200, config.iterations // 2))
+
+    def _unslotted(cls):
+        # Same fields, but instances carry a __dict__ (the previous layout)
+        return make_dataclass(cls.__name__, [(f.name, f.type) for f in fields(cls)], frozen=True)
+
+    async def _run(hydro_cls, vpd_cls):
+        hass = FakeHass()
+        manager = OGBEventManager(hass, None)
+        received = [0]
+
+        def listener(_data):
+            received[0] += 1
+
+        manager.on("PumpAction", listener)
+        manager.on("VPDCreation", listener)
+
+        def _payloads():
+            return [
+                hydro_cls(Name="BenchRoom", Device="pump.bench", Cycle="true", Action="on")
+                if index & 1
+                else vpd_cls(Name="BenchRoom", VPD=1.1, AvgTemp=24.0, AvgHum=60.0, AvgDew=15.0, Timestamp="01.01.2026 00:00:00")
+                for index in range(burst)
+            ]
+
+        async def _emit(payloads):
+            for index, payload in enumerate(payloads):
+                await manager.emit("PumpAction" if index & 1 else "VPDCreation", payload)
+
+        payloads = _payloads()
+        start = time.perf_counter()
+        await _emit(payloads)
+        elapsed = time.perf_counter() - start
+        del payloads
+
+        # The whole burst is held at once, as when a backlog of updates is replayed
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        payloads = _payloads()
+        held, _ = tracemalloc.get_traced_memory()
+        await _emit(payloads)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        await manager.async_shutdown()
+        hass.cleanup()
+        return {
+            "events_per_s": _rate(burst, elapsed),
+            "bytes_per_event": round((held - base) / burst, 1),
+            "tracemalloc_peak_kb": round((peak - base) / 1024, 1),
+            "listener_calls": received[0],
+        }
+
+    slotted = await _run(OGBHydroAction, OGBVPDPublication)
+    plain = await _run(_unslotted(OGBHydroAction), _unslotted(OGBVPDPublication))
+    return {
+        "events": burst,
+        "slotted": slotted,
+        "dataclass": plain,
+        "bytes_saved_per_event": round(plain["bytes_per_event"] - slotted["bytes_per_event"], 1),
+    }
+
+
+async def bench_datastore(config: BenchConfig) -> dict:
+    """DataStore get/getDeep/setDeep throughput on a real OGBConf state."""
+    from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import OGBConf
+
+    hass = FakeHass()
+    store = DataStore(OGBConf(hass=hass, room="BenchRoom"))
+    n = config.iterations
+    paths = ["vpd.current", "tentData.temperature", "capabilities.canExhaust.state", "controlOptions.co2Control"]
+
+    results = {}
+    start = time.perf_counter()
+    for index in range(n):
+        store.getDeep(paths[index & 3])
+    results["getDeep_ops_per_s"] = _rate(n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for index in range(n):
+        store.setDeep("tentData.temperature", 20.0 + (index & 7))
+    results["setDeep_ops_per_s"] = _rate(n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        store.get("tentMode")
+    results["get_ops_per_s"] = _rate(n, time.perf_counter() - start)
+
+    hass.cleanup()
+    return results
+
+
+async def bench_pipeline(config: BenchConfig) -> dict:
+    """Sensor trace replay through VPD -> mode -> action -> actuator."""
+    world = await SimWorld(config.rooms, config.devices, config.sensors, seed=config.seed).start()
+    try:
+        if config.trace_path:
+            from .harness import load_trace
+
+            trace = load_trace(config.trace_path)
+        else:
+            trace = world.synthesize_trace(config.samples_per_sensor)
+
+        for room in world.rooms.values():
+            room.event_manager.enable_profiling(True)
+
+        result = await world.replay(trace)
+
+        # Allocation pass over a slice of the trace (tracemalloc distorts timing)
+        alloc_trace = trace[: min(len(trace), 100)]
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        await world.replay(alloc_trace)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        emits = 0
+        stage_p95 = {}
+        for room in world.rooms.values():
+            profile = room.event_manager.get_profile()
+            emits += sum(stats.get("count", 0) for stats in profile["emits"].values())
+            for name, stats in profile["listeners"].items():
+                stage_p95[name] = max(stage_p95.get(name, 0.0), stats.get("p95_ms", 0.0))
+            room.event_manager.enable_profiling(False)
+    finally:
+        await world.stop()
+
+    elapsed = result["elapsed_s"]
+    return {
+        "topology": {"rooms": config.rooms, "devices": config.devices, "sensors": config.sensors},
+        "samples": result["samples"],
+        "elapsed_s": round(elapsed, 4),
+        "samples_per_s": _rate(result["samples"], elapsed),
+        "events_per_s": _rate(emits, elapsed),
+        "actuations": result["actuations"],
+        "service_calls": result["service_calls"],
+        "sensor_to_action": percentiles(result["latencies"]),
+        "listener_p95_ms": dict(sorted(stage_p95.items(), key=lambda kv: kv[1], reverse=True)[:10]),
+        "tracemalloc_peak_kb": round(peak / 1024, 1),
+        "alloc": _alloc_stats(before, after, len(alloc_trace)),
+    }
+
+
+async def bench_persistence(config: BenchConfig) -> dict:
+    """OGBDSManager.saveState cost: state snapshot, JSON encode and write."""
+    world = await SimWorld(1, config.devices, config.sensors, seed=config.seed).start()
+    try:
+        room = next(iter(world.rooms.values()))
+        store = room.data_store
+        saves = max(10, config.iterations // 1000)
+
+        start = time.perf_counter()
+        for _ in range(saves):
+            state = store.getFullState()
+        snapshot_ms = (time.perf_counter() - start) / saves * 1000
+
+        start = time.perf_counter()
+        for _ in range(saves):
+            encoded = json.dumps(state, indent=2, default=str)
+        encode_ms = (time.perf_counter() - start) / saves * 1000
+
+        start = time.perf_counter()
+        for _ in range(saves):
+            await room.ds_manager.saveState({"source": "benchmark"})
+        save_ms = (time.perf_counter() - start) / saves * 1000
+
+        tracemalloc.start()
+        await room.ds_manager.saveState({"source": "benchmark"})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        with open(room.ds_manager.storage_path, encoding="utf-8") as handle:
+            file_bytes = len(handle.read().encode("utf-8"))
+    finally:
+        await world.stop()
+
+    return {
+        "saves": saves,
+        "full_state_snapshot_ms": round(snapshot_ms, 3),
+        "full_state_json_ms": round(encode_ms, 3),
+        "full_state_json_kb": round(len(encoded) / 1024, 1),
+        "save_state_ms": round(save_ms, 3),
+        "saved_file_kb": round(file_bytes / 1024, 1),
+        "tracemalloc_peak_kb": round(peak / 1024, 1),
+    }
+
+
+def _fill_realistic_state(store, rng, target_kb: int = 500):
+    """Grow a DataStore to roughly ``target_kb`` of JSON with the shapes seen in real rooms."""
+    from datetime import datetime, timedelta
+
+    store.set("tentMode", "VPD Perfection")
+    store.set("growMediums", [
+        {
+            "name": f"medium_{index}",
+            "medium_type": "SOIL",
+            "plant_name": f"Plant {index}",
+            "breeder_bloom_days": 63,
+            "properties": {"ph_range": (5.8, 6.5), "ec_range": (1.2, 2.2), "water_retention": 0.6},
+            "sensor_history": [rng.random() for _ in range(200)],
+        }
+        for index in range(8)
+    ])
+    store.set("capCalibration", {
+        "active": None,
+        "results": {
+            cap: {"steps": [{"dutyCycle": step, "delta": round(rng.random(), 3)} for step in range(0, 101, 5)]}
+            for _, cap in ACTUATOR_TYPES
+        },
+    })
+    start = datetime(2026, 1, 1)
+    day = 0
+    while True:
+        stamp = (start + timedelta(days=day)).strftime("%Y-%m-%d")
+        store.setDeep(f"Energy.daily.{stamp}", {
+            "kwh": round(rng.random() * 20, 6),
+            "cost": round(rng.random() * 7, 4),
+            "runtime": {f"switch.device_{index}": round(rng.random() * 24, 4) for index in range(16)},
+        })
+        store.setDeep(f"complianceDaily.{stamp}", {"o": 86400.0, "r": {"vpd_max": [rng.random() * 3600, 2, 0.2]}})
+        day += 1
+        if day % 30 == 0 and len(json.dumps(store.getFullState(), indent=2, default=str)) > target_kb * 1024:
+            break
+    store.set("previousActions", [
+        {"capability": "canExhaust", "action": "Increase", "time": start + timedelta(minutes=minute)}
+        for minute in range(200)
+    ])
+    return day
+
+
+async def bench_state_codec(config: BenchConfig) -> dict:
+    """Full-state encode/decode of a ~500 KB OGBConf: schema-compiled codec vs. the former generic walk."""
+    import dataclasses
+    import random
+
+    from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import OGBConf
+    from custom_components.opengrowbox.OGBController.managers.OGBDSManager import _clean_corrupted_data
+    from custom_components.opengrowbox.OGBController.utils import stateCodec
+
+    hass = FakeHass()
+    store = DataStore(OGBConf(hass=hass, room="BenchRoom"))
+    days = _fill_realistic_state(store, random.Random(config.seed))
+    rounds = max(3, config.iterations // 2000)
+
+    def legacy_encode():
+        state = {
+            field.name: store._make_serializable(
+                store._filter_cropsteering_for_save(getattr(store.state, field.name))
+                if field.name == "CropSteering" else getattr(store.state, field.name)
+            )
+            for field in dataclasses.fields(store.state)
+            if not store._should_exclude_key(field.name)
+        }
+        return json.dumps(state, indent=2, default=str)
+
+    def legacy_decode(raw):
+        return _clean_corrupted_data(json.loads(raw), "BenchRoom")
+
+    def codec_encode():
+        return stateCodec.dumps(store.getFullState())
+
+    def codec_decode(raw):
+        return store.codec.decode(stateCodec.loads(raw), "BenchRoom")
+
+    def measure(func, *args):
+        func(*args)  # warm up (compiles the codec)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            result = func(*args)
+        elapsed = (time.perf_counter() - start) / rounds
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return result, {"ms": round(elapsed * 1000, 3), "tracemalloc_peak_kb": round(peak / 1024, 1)}
+
+    legacy_raw, legacy_enc = measure(legacy_encode)
+    codec_raw, codec_enc = measure(codec_encode)
+    _, legacy_dec = measure(legacy_decode, legacy_raw)
+    _, codec_dec = measure(codec_decode, codec_raw)
+    hass.cleanup()
+
+    def speedup(old, new):
+        return round(old["ms"] / new["ms"], 1) if new["ms"] else 0.0
+
+    return {
+        "days_of_history": days,
+        "orjson": stateCodec.orjson is not None,
+        "legacy_json_kb": round(len(legacy_raw) / 1024, 1),
+        "codec_json_kb": round(len(codec_raw) / 1024, 1),
+        "encode": {"legacy": legacy_enc, "codec": codec_enc, "speedup": speedup(legacy_enc, codec_enc)},
+        "decode": {"legacy": legacy_dec, "codec": codec_dec, "speedup": speedup(legacy_dec, codec_dec)},
+    }
+
+
+async def bench_crop_steering(config: BenchConfig) -> dict:
+    """OGBCSManager sensor averaging and failsafe evaluation per medium update."""
+    world = await SimWorld(1, config.devices, config.sensors, seed=config.seed).start()
+    try:
+        room = next(iter(world.rooms.values()))
+        cs_manager = room.mode_manager.CropSteeringManager
+        mediums = [
+            types.SimpleNamespace(current_moisture=40.0 + i, current_ec=1.8, current_temp=22.0)
+            for i in range(max(1, config.sensors))
+        ]
+        cs_manager.medium_manager = types.SimpleNamespace(get_mediums=lambda: mediums)
+        cs_manager.isInitialized = True
+
+        n = max(100, config.iterations // 10)
+        start = time.perf_counter()
+        for index in range(n):
+            mediums[index % len(mediums)].current_moisture = 35.0 + (index % 20)
+            averages = await cs_manager._get_sensor_averages()
+            cs_manager._evaluate_failsafe_condition(averages["vwc"])
+        elapsed = time.perf_counter() - start
+    finally:
+        await world.stop()
+
+    return {
+        "mediums": len(mediums),
+        "evaluations": n,
+        "evaluations_per_s": _rate(n, elapsed),
+        "mean_us": round(elapsed / n * 1e6, 2),
+    }
+
+
+async def bench_crop_steering_day(config: BenchConfig) -> dict:
+    """24 h automatic crop steering replay on a virtual clock (5 min medium samples)."""
+    result = await simulate_crop_steering_day(hours=24, sample_minutes=5)
+    stats = result["stats"]
+    return {
+        "replay_s": round(result["wall_s"], 4),
+        "sensor_samples": result["samples"],
+        "evaluations": stats["evaluations"],
+        "wakeups": stats["wakeups"],
+        "timers_fired": result["timers_fired"],
+        "phase_transitions": len(result["transitions"]),
+        "shots": result["substrate"].shots,
+    }
+
+
+class _NullEventManager:
+    async def emit(self, *args, **kwargs):
+        pass
+
+    def on(self, *args, **kwargs):
+        pass
+
+
+async def bench_action_pipeline(config: BenchConfig) -> dict:
+    """OGBActionManager per-cycle cost (dedup, conflicts, guards, publication) for 5-50 actions."""
+    import random
+
+    from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import OGBConf
+    from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBPublications import OGBActionPublication
+    from custom_components.opengrowbox.OGBController.managers.OGBActionManager import OGBActionManager
+
+    hass = FakeHass()
+    store = DataStore(OGBConf(hass=hass, room="BenchRoom"))
+    store.set("tentMode", "VPD Perfection")
+    for _, cap in ACTUATOR_TYPES:
+        store.setDeep(f"capabilities.{cap}.state", True)
+    manager = OGBActionManager(hass, store, _NullEventManager(), "BenchRoom")
+
+    rng = random.Random(config.seed)
+    caps = [cap for _, cap in ACTUATOR_TYPES] + ["canVentilate", "canClimate", "canCO2"]
+    cycles = max(200, config.iterations // 20)
+    results = {}
+    for size in (5, 10, 20, 50):
+        batches = [
+            [
+                OGBActionPublication(
+                    Name="BenchRoom",
+                    message="Bounds: bench" if rng.random() < 0.1 else "bench",
+                    capability=rng.choice(caps),
+                    action=rng.choice(("Increase", "Reduce")),
+                    priority=rng.choice(("low", "medium", "high")),
+                )
+                for _ in range(size)
+            ]
+            for _ in range(32)
+        ]
+        start = time.perf_counter()
+        for index in range(cycles):
+            actions = batches[index & 31]
+            # Conflicts are removed before the cooldown stage; dedup happens in publication
+            actions = manager._remove_conflicting_actions(actions)
+            await manager.publicationActionHandler(actions)
+        elapsed = time.perf_counter() - start
+        results[f"actions_{size}"] = {"per_cycle_us": round(elapsed / cycles * 1e6, 2)}
+
+    hass.cleanup()
+    return results
+
+
+_STARTUP_PROBE = """
+import asyncio, json, resource, sys, time, tracemalloc
+from benchmarks.harness import FakeHass, install_ha_stubs, quiet_logging
+install_ha_stubs()
+quiet_logging()
+before = set(sys.modules)
+start = time.perf_counter()
+from custom_components.opengrowbox.OGBController.managers.core.OGBMainController import OGBMainController
+import_ms = (time.perf_counter() - start) * 1000
+modules = len(set(sys.modules) - before)
+
+async def main(rooms):
+    hass = FakeHass()
+    hass.loop = asyncio.get_running_loop()
+    tracemalloc.start()
+    controllers = []
+    start = time.perf_counter()
+    for index in range(rooms):
+        controllers.append(OGBMainController(hass, f"BenchRoom{index}", f"bench_{index}"))
+    build_ms = (time.perf_counter() - start) * 1000
+    await asyncio.sleep(0.1)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    managers = getattr(controllers[0], "managers", None)
+    hass.cleanup()
+    return {
+        "import_ms": round(import_ms, 1),
+        "modules_imported": modules,
+        "build_ms_per_room": round(build_ms / rooms, 2),
+        "traced_kb_per_room": round(current / 1024 / rooms, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "managers": managers.get_stats() if managers is not None else {},
+    }
+
+print(json.dumps(asyncio.run(main(int(sys.argv[1])))))
+"""
+
+
+async def bench_startup(config: BenchConfig) -> dict:
+    """Cold import time, module count, per-room memory and active optional managers."""
+    import subprocess
+    import sys
+
+    from .harness import REPO_ROOT
+
+    # Fresh interpreter: the other scenarios have already imported most modules
+    rooms = max(config.rooms, 1)
+    result = await asyncio.to_thread(
+        subprocess.run,
+        [sys.executable, "-c", _STARTUP_PROBE, str(rooms)],
+        cwd=str(REPO_ROOT),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+SCENARIOS: Dict[str, Callable[[BenchConfig], Awaitable[dict]]] = {
+    "event_bus": bench_event_bus,
+    "event_burst": bench_event_burst,
+    "datastore": bench_datastore,
+    "pipeline": bench_pipeline,
+    "persistence": bench_persistence,
+    "state_codec": bench_state_codec,
+    "crop_steering": bench_crop_steering,
+    "crop_steering_day": bench_crop_steering_day,
+    "action_pipeline": bench_action_pipeline,
+    "startup": bench_startup,
+}
@@ -16,6 +16,7 @@ from .managers.OGBWizardManager import OGBWizardManager
 from .OGBOrchestrator import OGBOrchestrator
 from .RegistryListener import OGBRegistryEvenListener
 from .utils.ambient import is_ambient_room
+from .utils.weatherService import get_weather_service
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -99,7 +100,9 @@ class OpenGrowBox:
 
         # Register HA bus listeners
         self.hass.bus.async_listen("AmbientData", self._handle_ambient_data)
-        self.hass.bus.async_listen("OutsiteData", self._handle_outsite_data)
+        self._weather_unsub = get_weather_service(self.hass).subscribe(
+            self.hass.config.latitude, self.hass.config.longitude, self._handle_outsite_data
+        )
 
         # Initialize additional backwards compatibility
         self._setup_backwards_compatibility()
@@ -126,7 +129,6 @@ class OpenGrowBox:
         self.plantCastManager = self.main_controller.plant_cast_manager
         self.modeManager = self.main_controller.mode_manager
         self.actionManager = self.main_controller.action_manager
-        self.feedManager = self.main_controller.feed_manager
         self.consoleManager = self.main_controller.console_manager
         self.calibManager = self.main_controller.calib_manager
         self.premiumManager = self.premium_manager  # From our initialization
@@ -139,9 +141,6 @@ class OpenGrowBox:
         self.co2Manager = self.main_controller.co2_manager
         self.co2_manager = self.main_controller.co2_manager
 
-        # Device Recognition Manager - migrated to main_controller
-        self.device_recognition = self.main_controller.device_recognition
-
         # Inject config_manager into main_controller for entity routing
         self.main_controller.config_manager = self.config_manager
 
@@ -153,10 +152,25 @@ class OpenGrowBox:
             device_manager=self.main_controller.device_manager,
             mode_manager=self.main_controller.mode_manager,
             action_manager=self.main_controller.action_manager,
-            feed_manager=self.main_controller.feed_manager,
+            feed_manager=self.main_controller.managers.peek("feed_manager"),
             vpd_manager=self.vpd_manager,
             co2_manager=self.main_controller.co2_manager
         )
+        # Optional managers come and go with their feature - keep the orchestrator in sync
+        self.main_controller.managers.subscribe(self._on_optional_manager_change)
+
+    @property
+    def feedManager(self):
+        return self.main_controller.feed_manager
+
+    @property
+    def device_recognition(self):
+        """Device Recognition Manager - migrated to main_controller, built on first use."""
+        return self.main_controller.device_recognition
+
+    def _on_optional_manager_change(self, name, manager):
+        if name == "feed_manager":
+            self.orchestrator.inject_managers(feed_manager=manager)
 
     async def _manager_wrapper(self, entity):
         """Backwards compatible wrapper for manager method - routes to ConfigurationManager."""
@@ -206,6 +220,9 @@ class OpenGrowBox:
         # Initialize default data store values (lost in modular migration)
         self._initialize_default_data_store_values()
 
+        # Restored config and discovered devices decide which optional managers run
+        await self.main_controller.managers.refresh()
+
         # Initialize action modules (pump controller, etc.)
         if hasattr(self.actionManager, 'initialize_action_modules'):
             await self.actionManager.initialize_action_modules(self)
@@ -234,8 +251,9 @@ class OpenGrowBox:
 
         # Start device recognition discovery
         try:
-            if hasattr(self.main_controller, 'device_recognition') and self.main_controller.device_recognition:
-                await self.main_controller.device_recognition.start_discovery()
+            device_recognition = self.main_controller.managers.peek("device_recognition")
+            if device_recognition:
+                await device_recognition.start_discovery()
                 _LOGGER.debug(f"✅ {self.room} Device recognition started")
         except Exception as e:
             _LOGGER.warning(f"Error starting device recognition: {e}")
@@ -322,10 +340,6 @@ class OpenGrowBox:
         """Handle ambient data from other rooms."""
         return await self.main_controller._handle_ambient_data(event)
 
-    async def _handle_outsite_data(self, event):
-        """Handle outside data."""
-        return await self.main_controller._handle_outsite_data(event)
-
     async def _auto_update_plant_stages(self, data):
         """Auto update plant stages."""
         return await self.main_controller._auto_update_plant_stages(data)
@@ -464,10 +478,10 @@ class OpenGrowBox:
         """Fetch weather data for outdoor conditions.
 
         Deprecated: weather data is fetched by OGBVPDManager and consumed via
-        the OutsiteData bus event. This method is kept for backwards compatibility.
+        the shared weather cache (OGBWeatherService). This method is kept for backwards compatibility.
         """
         _LOGGER.debug(
-            "%s: get_weather_data is deprecated; weather is updated via OutsiteData events",
+            "%s: get_weather_data is deprecated; weather is updated via the shared weather cache",
             self.room,
         )
 
@@ -683,6 +697,11 @@ class OpenGrowBox:
                 except Exception as e:
                     _LOGGER.error(f"Error shutting down VPD manager: {e}")
 
+            # 7a. Stop receiving outside weather
+            for unsub in (self._weather_unsub, getattr(self.main_controller, "_weather_unsub", None)):
+                if unsub:
+                    unsub()
+
             # 8. Save state before shutdown
             if hasattr(self, 'data_storeManager') and self.data_storeManager:
                 try:
@@ -1,6 +1,8 @@
 import dataclasses
 import logging
 
+from .utils.stateCodec import StateCodec
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -102,6 +104,8 @@ class DataStore(SimpleEventEmitter):
         super().__init__()
         # Falls initial_state None ist, benutze das leere OGBConf Objekt
         self.state = initial_state
+        # Compiled on first getFullState (see utils/stateCodec.py)
+        self._codec = None
         # Repair keys that may have been corrupted by old buggy versions
         self._repair_corrupted_state_keys()
 
@@ -449,49 +453,27 @@ class DataStore(SimpleEventEmitter):
             # Als letzter Ausweg, konvertiere zu String
             return str(obj)
 
+    @property
+    def codec(self) -> StateCodec:
+        """Encoder/decoder compiled from the fields of the state dataclass."""
+        if self._codec is None:
+            self._codec = StateCodec(
+                type(self.state),
+                exclude_keys=self.SERIALIZATION_EXCLUDE_KEYS,
+                transforms={"CropSteering": self._filter_cropsteering_for_save},
+            )
+        return self._codec
+
     def getFullState(self):
-        """Gibt den vollständigen State als JSON-serialisierbares dict zurück."""
+        """Gibt den vollständigen State als JSON-serialisierbares dict zurück.
+
+        JSON-native Teilbäume werden nicht kopiert, sondern mit dem Live-State
+        geteilt - das Ergebnis daher nicht verändern.
+        """
         try:
             if dataclasses.is_dataclass(self.state):
-                # Erstelle eine Kopie des State-Objekts ohne excluded fields
-                state_dict = {}
-                for field in dataclasses.fields(self.state):
-                    # Use centralized exclusion check
-                    if self._should_exclude_key(field.name):
-                        continue
-                        
-                    try:
-                        value = getattr(self.state, field.name)
-                        
-                        # CRITICAL FIX: Skip dataclass Field objects that somehow ended up as values
-                        # This prevents corruption like: "deviceCooldowns": ["Field(name=None...)"]
-                        if isinstance(value, dataclasses.Field):
-                            _LOGGER.warning(
-                                f"⚠️ Field '{field.name}' contains a dataclass.Field object, using default instead"
-                            )
-                            # Get the default value from the field definition
-                            if field.default_factory is not dataclasses.MISSING:
-                                value = field.default_factory()
-                            elif field.default is not dataclasses.MISSING:
-                                value = field.default
-                            else:
-                                value = None
-                        
-                        # Special handling for CropSteering - filter runtime data
-                        if field.name == "CropSteering" and isinstance(value, dict):
-                            value = self._filter_cropsteering_for_save(value)
-                        
-                        state_dict[field.name] = self._make_serializable(value)
-                    except Exception as e:
-                        _LOGGER.warning(
-                            f"⚠️ Failed to serialize field '{field.name}': {e}"
-                        )
-                        state_dict[field.name] = str(
-                            getattr(self.state, field.name, "N/A")
-                        )
-                return state_dict
-            else:
-                return self._make_serializable(self.state)
+                return self.codec.encode(self.state)
+            return self._make_serializable(self.state)
         except Exception as e:
             _LOGGER.error(f"❌ Failed to get full state: {e}")
             return {"error": "Failed to serialize state", "message": str(e)}
@@ -10,6 +10,7 @@ import json
 from datetime import datetime, timedelta, timezone, time
 from .Device import Device
 from ..data.OGBParams.OGBParams import DEVICE_TYPE_MAPPING
+from ..utils.frameHash import frame_hash, is_near_duplicate
 
 # Home Assistant imports for scheduling
 from homeassistant.util import dt as dt_util
@@ -47,7 +48,7 @@ class Camera(Device):
         self.deviceData = deviceData
         self.camera_entity_id = "camera." + self.deviceName
         
-        # Initialize camera state
+        # Initialize camera state (last_image holds the raw JPEG bytes)
         self.last_image = None
         self.last_capture_time = None
         
@@ -56,6 +57,10 @@ class Camera(Device):
         self.tl_start_time = None
         self.tl_end_time = None  # End time for duration check
         self.tl_image_count = 0
+        self.tl_skipped_count = 0  # Near-duplicate frames that were not saved
+        self._last_frame_hash = None  # dHash of the last saved timelapse frame
+        self._counter_persist_task = None
+        self._counter_persist_delay = 300.0  # seconds; counters are saved at most this often
         self._timelapse_unsub = None  # Stores HA timer unsubscribe callback
         self._timelapse_start_unsub = None  # Stores start timer unsubscribe callback (async_track_point_in_time)
 
@@ -359,6 +364,7 @@ class Camera(Device):
             # Restore timelapse counter from persisted state
             if plants_view:
                 self.tl_image_count = int(plants_view.get("tl_image_count", 0) or 0)
+                self.tl_skipped_count = int(plants_view.get("tl_skipped_count", 0) or 0)
 
             # Schedule daily snapshot if enabled (use plants_view, not create defaults)
             if plants_view and plants_view.get("daily_snapshot_enabled", False):
@@ -593,7 +599,7 @@ class Camera(Device):
             # Emit HasPlantViewed event for Premium Integration to send encrypted
             await self.event_manager.emit("HasPlantViewed", {
                 "device_name": self.camera_entity_id,
-                "image_data": image_data,
+                "image_data": self._image_base64(image_data),
                 "cache_status": cache_status,
                 "capture_time": capture_time.isoformat() if capture_time else None,
                 "room": self.inRoom,
@@ -698,26 +704,7 @@ class Camera(Device):
 
                 # Save Image with current timestamp (only if capture succeeded)
                 if image_data:
-                    # Use timelapse subdirectory
-                    storage_base = getattr(self, 'camera_storage_path', f"/config/ogb_data/{self.inRoom}_img/{self.deviceName}")
-                    image_path = os.path.join(storage_base, "timelapse")
-
-                    # ISO FILENAME FORMAT: {device_name}_YYYYMMDD_HHMMSS.jpg
-                    # Uses ISO 8601 date format with underscore separator (filesystem-safe)
-                    # Timestamp in LOCAL time for human-readable filenames
-                    now_local = dt_util.as_local(dt_util.now())
-                    timestamp_str = now_local.strftime("%Y%m%d_%H%M%S")
-                    filename = f"{self.deviceName}_{timestamp_str}.jpg"
-                    full_path = os.path.join(image_path, filename)
-
-                    await self.saveImage(full_path)
-                    self.tl_image_count += 1
-
-                    # Persist updated count to plantsView
-                    plants_view = self._get_plants_view() or {}
-                    plants_view["tl_image_count"] = self.tl_image_count
-                    self._set_plants_view( plants_view)
-
+                    await self._save_timelapse_frame(image_data, dt_util.as_local(dt_util.now()))
                     _LOGGER.debug(f"{self.deviceName}: Captured first timelapse image immediately at start")
         except Exception as e:
             _LOGGER.error(f"{self.deviceName}: Failed to capture initial timelapse image: {e}")
@@ -830,7 +817,10 @@ class Camera(Device):
 
             if not resume:
                 self.tl_image_count = 0
+                self.tl_skipped_count = 0
                 plants_view["tl_image_count"] = 0
+                plants_view["tl_skipped_count"] = 0
+            self._last_frame_hash = None
 
             plants_view["isTimeLapseActive"] = True
             self._set_plants_view(plants_view)
@@ -891,26 +881,9 @@ class Camera(Device):
             # 3. Capture Image with retry
             image_data = await self._capture_timelapse_image_with_retry()
 
-            # 4. Save Image (only if capture succeeded)
+            # 4. Save Image (only if capture succeeded and it is not a near-duplicate)
             if image_data:
-                # Use timelapse subdirectory
-                storage_base = getattr(self, 'camera_storage_path', f"/config/ogb_data/{self.inRoom}_img/{self.deviceName}")
-                image_path = os.path.join(storage_base, "timelapse")
-
-                # ISO FILENAME FORMAT: {device_name}_YYYYMMDD_HHMMSS.jpg
-                # Uses ISO 8601 date format with underscore separator (filesystem-safe)
-                # Timestamp in LOCAL time for human-readable filenames
-                timestamp_str = now_local.strftime("%Y%m%d_%H%M%S")
-                filename = f"{self.deviceName}_{timestamp_str}.jpg"
-                full_path = os.path.join(image_path, filename)
-
-                await self.saveImage(full_path)
-                self.tl_image_count += 1
-
-                # Persist updated count to plantsView
-                plants_view = self._get_plants_view() or {}
-                plants_view["tl_image_count"] = self.tl_image_count
-                self._set_plants_view( plants_view)
+                saved = await self._save_timelapse_frame(image_data, now_local)
 
                 # Emit status
                 await self.event_manager.emit("CameraRecordingStatus", {
@@ -922,9 +895,9 @@ class Camera(Device):
                         "last_capture_time": self.last_capture_time.isoformat() if self.last_capture_time else None,
                         "is_night_mode": not is_plant_day if not capture_at_night else False,
                         "capture_at_night_enabled": capture_at_night,
+                        "duplicate_skipped": not saved,
+                        "skipped_count": self.tl_skipped_count,
                     }, haEvent=True)
-
-                asyncio.create_task(self.event_manager.emit("SaveState", {"source": "Camera", "device": self.deviceName}))
             else:
                 # Capture failed - emit status with last successful capture time
                 await self.event_manager.emit("CameraRecordingStatus", {
@@ -970,9 +943,12 @@ class Camera(Device):
         if self.tl_start_time:
              duration = (dt_util.now() - self.tl_start_time).total_seconds()
 
-        # Update Config
+        # Update Config (the SaveState below also persists the capture counters)
+        self._cancel_counter_persist()
         plants_view = self._get_plants_view() or {}
         plants_view["isTimeLapseActive"] = False
+        plants_view["tl_image_count"] = self.tl_image_count
+        plants_view["tl_skipped_count"] = self.tl_skipped_count
         self._set_plants_view( plants_view)
 
         # Get night mode config for status event
@@ -1032,10 +1008,9 @@ class Camera(Device):
             image = await async_get_image(self.hass, entity_id)
             
             if image and image.content:
-                # Convert bytes to base64
-                image_base64 = base64.b64encode(image.content).decode('utf-8')
+                # Raw JPEG bytes; base64 only where a consumer needs text (_image_base64)
                 _LOGGER.debug(f"{self.deviceName}: Successfully captured image from {entity_id} ({len(image.content)} bytes)")
-                return image_base64
+                return image.content
             else:
                 _LOGGER.warning(f"{self.deviceName}: No image content from {entity_id}")
                 return None
@@ -1044,6 +1019,13 @@ class Camera(Device):
             _LOGGER.error(f"{self.deviceName}: Error fetching HA camera image: {e}")
             return None
 
+    @staticmethod
+    def _image_base64(image_data):
+        """Base64 text of an image for JSON consumers (API, frontend events)."""
+        if image_data is None or isinstance(image_data, str):
+            return image_data
+        return base64.b64encode(image_data).decode('utf-8')
+
     def _sync_save_image(self, path, image_data):
         """Synchronous image save - called via executor."""
         # Create directory if it doesn't exist
@@ -1075,6 +1057,69 @@ class Camera(Device):
         except Exception as e:
             _LOGGER.error(f"{self.deviceName}: Failed to save image to {path}: {e}")
 
+    async def _save_timelapse_frame(self, image_data, now_local):
+        """Save a captured timelapse frame unless it looks like the last saved one.
+
+        The dHash of the frame is computed in the executor. Frames within
+        ``duplicate_frame_distance`` bits of the last saved frame are skipped
+        (plantsView ``skip_duplicate_frames``, default on). Counters are
+        persisted on a debounce instead of per frame.
+
+        Returns:
+            bool: True if the frame was written, False if it was skipped.
+        """
+        plants_view = self._get_plants_view() or {}
+        frame = await self.hass.async_add_executor_job(frame_hash, image_data)
+        if plants_view.get("skip_duplicate_frames", True):
+            try:
+                max_distance = int(plants_view.get("duplicate_frame_distance", 4))
+            except (TypeError, ValueError):
+                max_distance = 4
+            if is_near_duplicate(frame, self._last_frame_hash, max_distance):
+                self.tl_skipped_count += 1
+                self._schedule_counter_persist()
+                _LOGGER.debug(
+                    f"{self.deviceName}: Skipped near-duplicate timelapse frame "
+                    f"({self.tl_skipped_count} skipped)"
+                )
+                return False
+
+        # ISO FILENAME FORMAT: {device_name}_YYYYMMDD_HHMMSS.jpg
+        # Uses ISO 8601 date format with underscore separator (filesystem-safe)
+        # Timestamp in LOCAL time for human-readable filenames
+        storage_base = getattr(self, 'camera_storage_path', f"/config/ogb_data/{self.inRoom}_img/{self.deviceName}")
+        timestamp_str = now_local.strftime("%Y%m%d_%H%M%S")
+        full_path = os.path.join(storage_base, "timelapse", f"{self.deviceName}_{timestamp_str}.jpg")
+
+        await self.saveImage(full_path)
+        self._last_frame_hash = frame
+        self.tl_image_count += 1
+        self._schedule_counter_persist()
+        return True
+
+    def _schedule_counter_persist(self):
+        """Persist the capture counters at most once per ``_counter_persist_delay``."""
+        task = self._counter_persist_task
+        if task is not None and not task.done():
+            return
+        self._counter_persist_task = asyncio.create_task(self._delayed_counter_persist())
+
+    def _cancel_counter_persist(self):
+        task, self._counter_persist_task = self._counter_persist_task, None
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def _delayed_counter_persist(self):
+        try:
+            await asyncio.sleep(self._counter_persist_delay)
+        except asyncio.CancelledError:
+            return
+        plants_view = self._get_plants_view() or {}
+        plants_view["tl_image_count"] = self.tl_image_count
+        plants_view["tl_skipped_count"] = self.tl_skipped_count
+        self._set_plants_view(plants_view)
+        await self.event_manager.emit("SaveState", {"source": "Camera", "device": self.deviceName})
+
     # ============================================================================
     # Daily Snapshot Scheduling
     # ============================================================================
@@ -1085,7 +1130,7 @@ class Camera(Device):
         Reuses _get_ha_camera_image() for actual capture.
         Emits ogb_camera_capture_failed on final failure.
         Returns:
-            str: Base64-encoded image data on success, None on failure.
+            bytes: JPEG image data on success, None on failure.
         """
         retry_delays = [5, 15, 30]  # seconds between retries
         camera_entity_id = self.camera_entity_id
@@ -1148,7 +1193,7 @@ class Camera(Device):
         Reuses _get_ha_camera_image() for actual capture.
         Emits ogb_camera_capture_failed on final failure.
         Returns:
-            str: Base64-encoded image data on success, None on failure.
+            bytes: JPEG image data on success, None on failure.
         """
         retry_delays = [5, 15, 30]  # seconds between retries
         camera_entity_id = self.camera_entity_id
@@ -1276,7 +1321,7 @@ class Camera(Device):
     async def _save_daily_photo(self, image_data):
         """Save daily snapshot photo with YYYY-MM-DD_HHMMSS.jpg filename format.
         Args:
-            image_data: Base64-encoded image data to save.
+            image_data: JPEG bytes (or base64 text) to save.
         Returns:
             dict: Result with keys:
                 - success (bool): True if saved or already exists
@@ -1352,9 +1397,9 @@ class Camera(Device):
                     "reason": "already_exists",
                 }
 
-            # Decode base64 image data to bytes for file write
+            # Raw bytes are written as-is (base64 text from older callers is decoded)
             def _write_image():
-                binary_data = base64.b64decode(image_data)
+                binary_data = base64.b64decode(image_data) if isinstance(image_data, str) else image_data
                 with open(full_path, 'wb') as f:
                     f.write(binary_data)
                 return full_path
@@ -1610,6 +1655,12 @@ class Camera(Device):
             if "capture_at_night" in new_config:
                 plants_view["capture_at_night"] = new_config["capture_at_night"]
 
+            # Near-duplicate frame skipping
+            if "skip_duplicate_frames" in new_config:
+                plants_view["skip_duplicate_frames"] = bool(new_config["skip_duplicate_frames"])
+            if "duplicate_frame_distance" in new_config:
+                plants_view["duplicate_frame_distance"] = new_config["duplicate_frame_distance"]
+
             self._set_plants_view( plants_view)
 
             # Update daily snapshot scheduling if settings changed
@@ -3493,6 +3544,14 @@ class Camera(Device):
             # Stop timelapse scheduler if active
             self._stop_timelapse_internal_timer()
 
+            # Hand pending capture counters to the state that is saved on shutdown
+            if self._counter_persist_task is not None and not self._counter_persist_task.done():
+                self._cancel_counter_persist()
+                plants_view = self._get_plants_view() or {}
+                plants_view["tl_image_count"] = self.tl_image_count
+                plants_view["tl_skipped_count"] = self.tl_skipped_count
+                self._set_plants_view(plants_view)
+
             # Reset active flag
             if self.tl_active:
                 self.tl_active = False
@@ -3,6 +3,7 @@ import logging
 import asyncio
 from ..data.OGBParams.OGBParams import CAP_MAPPING
 from ..utils.sensor_identification import resolve_remappable_sensor_type
+from ..utils.commandPlan import compile_command_plan, plan_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -360,6 +361,7 @@ class Device:
         self.checkForControlValue()
         self.identifyCapabilities()
         self._update_deviceData_in_capabilities()
+        self._compile_command_plans()
         if(self.initialization == True):
             self.initialization = False
             self.isInitialized = True
@@ -1402,14 +1404,9 @@ class Device:
         
         self._commanded_state = "on"
         
-        # Store power before action for reliability validation
-        power_before = await self._get_current_power()
-        if self.reliability_manager:
-            rel = self.reliability_manager._device_reliability
-            if self.deviceName not in rel:
-                from ..managers.OGBFallBackManager import DeviceReliabilityState
-                rel[self.deviceName] = DeviceReliabilityState(device_name=self.deviceName)
-            rel[self.deviceName].last_power_before_action = power_before
+        # Power before action for reliability validation: plain state read,
+        # the bookkeeping runs after the commands went out
+        power_before = self._read_current_power() if self.reliability_manager else None
         
         # Flag to prevent sensor from overwriting our control value
         self._in_active_control = True
@@ -1481,550 +1478,27 @@ class Device:
                 else:
                     percentage = 100.0
 
-            # === Special case: AcInfinity devices ===
-            if self.isAcInfinDev:
-                entity_ids = []
-                if self.switches:
-                    entity_ids = [
-                        switch["entity_id"] for switch in self.switches 
-                        if "select." in switch["entity_id"]
-                    ]
-                if not entity_ids:
-                    _LOGGER.warning(f"{self.deviceName}: No matching select switches, falling back to options")
-                    if self.options:
-                        entity_ids = [
-                            option["entity_id"] for option in self.options
-                            if "select." in option["entity_id"]
-                        ]
-
-                if entity_ids:
-                    for entity_id in entity_ids:
-                        _LOGGER.debug(f"{self.deviceName} ON ACTION with ID {entity_id}")
-                        await self.hass.services.async_call(
-                            domain="select",
-                            service="select_option",
-                            service_data={
-                                "entity_id": entity_id,
-                                "option": "On"
-                            },
-                        )
-
-                    # Additional actions depending on device type
-                    if self.deviceType in ["Light", "Humidifier", "Dehumidifier", "Exhaust", "Intake", "Ventilation"]:
-                        # For AcInfinity, a percentage value is often set separately
-                        if self.deviceType == "Light":
-                            if brightness_pct is not None:
-                                _LOGGER.warning(f"{self.deviceName}: set value to {brightness_pct}")
-                                await self.set_value(int(brightness_pct/10))
-                        else:
-                            if percentage is not None:
-                                _LOGGER.warning(f"{self.deviceName}: set value to {percentage}")
-                                await self.set_value(percentage/10)
-
-                    self.isRunning = True
-                    return
-
-                _LOGGER.warning(f"{self.deviceName}: AcInfinity without select entity - using standard fallback path")
-
-            # === Standard devices ===
-            if not self.switches:
+            plan = self._get_command_plan("on")
+            if plan is None:
                 _LOGGER.warning(f"{self.deviceName} has not Switch to Activate or Turn On")
                 return
 
-            entity_ids = [switch["entity_id"] for switch in self.switches]
-
-            for entity_id in entity_ids:
-                # Validate and fix entity_id if it's a list
-                _LOGGER.debug(f"{self.deviceName}: Processing entity_id={entity_id}, type={type(entity_id)}")
-                if isinstance(entity_id, list):
-                    entity_id = entity_id[0] if entity_id else "unknown"
-                if not isinstance(entity_id, str):
-                    entity_id = str(entity_id)
-                _LOGGER.debug(f"{self.deviceName}: Using entity_id={entity_id}")
-
-                # Turn on light (all light device types)
-                if self.deviceType in ["Light", "LightFarRed", "LightUV", "LightBlue", "LightRed"]:
-                    if self.isDimmable:
-                        # Check voltageFromNumber path (as in original)
-                        if self.voltageFromNumber:
-                            # Original path for Tuya devices: switch + set_value
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            await self.set_value(float(brightness_pct/10))
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Light ON (via Number).")
-                            return
-                        else:
-                            # Standard path: light.turn_on with brightness_pct (0-100)
-                            if isinstance(brightness_pct, list):
-                                brightness_pct = brightness_pct[0] if brightness_pct else 100
-                            brightness_pct = max(0, min(100, float(brightness_pct)))
-                            brightness_pct = int(brightness_pct)
-                            _LOGGER.debug(f"{self.deviceName}: Calling HA light.turn_on with entity_id={entity_id}, brightness_pct={brightness_pct}")
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: {self.deviceType} ON ({brightness_pct}%).")
-                            return
-                    else:
-                        # Non-dimmable lights
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = True
-                        _LOGGER.debug(f"{self.deviceName}: {self.deviceType} ON (non-dimmable).")
-                        return
-
-                # Turn on exhaust
-                elif self.deviceType == "Exhaust":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Exhaust ON ({brightness_pct}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Exhaust ON (Switch).")
-                            return
-
-                    elif self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                            await self.set_value(percentage)
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Exhaust ON via power+number ({percentage}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="fan",
-                                service="set_percentage",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "percentage": percentage,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Exhaust ON ({percentage}%).")
-                            return
-                    elif entity_id.startswith("cover."):
-                        await self.hass.services.async_call(
-                            domain="cover",
-                            service="open_cover",
-                            service_data={"entity_id": entity_id},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = True
-                        _LOGGER.warning(f"{self.deviceName}: Exhaust ON (Switch).")
-                        return
-
-                # Turn on intake
-                elif self.deviceType == "Intake":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Intake ON ({brightness_pct}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Intake ON (Switch).")
-                            return
-                    elif self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                            await self.set_value(percentage)
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Intake ON via power+number ({percentage}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="fan",
-                                service="set_percentage",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "percentage": percentage,
-                                },
-                            )
-                            self.isRunning = True
-                            return
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = True
-                        _LOGGER.debug(f"{self.deviceName}: Intake ON (Switch).")
-                        return
-
-                # Turn on ventilation
-                elif self.deviceType == "Ventilation":
-                    if self.isSpecialDevice:
-                        await self.hass.services.async_call(
-                            domain="light",
-                            service="turn_on",
-                            service_data={
-                                "entity_id": entity_id,
-                                "brightness_pct": brightness_pct,
-                            },
-                        )
-                    elif self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                            await self.set_value(percentage)
-                        else:
-                            await self.hass.services.async_call(
-                                domain="fan",
-                                service="set_percentage",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "percentage": percentage,
-                                },
-                            )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-
-                    # Set state and log once after ALL ventilation entities are processed
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: Ventilation ON - {len(self.switches)} entities activated.")
-
-
-                # Turn on climate
-                elif self.deviceType == "Climate":
-                    hvac_mode = kwargs.get("hvac_mode", "heat")
-                    await self.hass.services.async_call(
-                        domain="climate",
-                        service="set_hvac_mode",
-                        service_data={
-                            "entity_id": entity_id,
-                            "hvac_mode": hvac_mode,
-                        },
-                    )
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: HVAC-Mode {hvac_mode} ON.")
-                    return
-
-                # Turn on humidifier
-                elif self.deviceType == "Humidifier":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Humidifier ON ({brightness_pct}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Humidifier ON (Switch).")
-                            return
-                    elif entity_id.startswith("fan.") and self.isDimmable and percentage is not None:
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="set_percentage",
-                            service_data={"entity_id": entity_id, "percentage": percentage},
-                        )
-                    elif entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif hasattr(self, 'realHumidifierClass') and self.realHumidifierClass:
-                        await self.hass.services.async_call(
-                            domain="humidifier",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-
-                    # Non-AC-Infinity dimmable humidifier path:
-                    # turn on first, then set numeric output value (duty/intensity/number).
-                    if self.isDimmable and percentage is not None:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                        await self.set_value(percentage)
-
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: Humidifier ON ({percentage}%).")
-                    return
-
-                # Turn on dehumidifier
-                elif self.deviceType == "Dehumidifier":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Dehumidifier ON ({brightness_pct}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Dehumidifier ON (Switch).")
-                            return
-                    elif entity_id.startswith("fan.") and self.isDimmable and percentage is not None:
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="set_percentage",
-                            service_data={"entity_id": entity_id, "percentage": percentage},
-                        )
-                    elif entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif hasattr(self, 'realHumidifierClass') and self.realHumidifierClass and hasattr(self, 'humidifierEntityId') and self.humidifierEntityId:
-                        await self.hass.services.async_call(
-                            domain="humidifier",
-                            service="turn_on",
-                            service_data={"entity_id": self.humidifierEntityId},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-
-                    # Non-AC-Infinity dimmable dehumidifier path:
-                    # turn on first, then set numeric output value (duty/intensity/number).
-                    if self.isDimmable and percentage is not None:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                        await self.set_value(percentage)
-
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: Dehumidifier ON ({percentage}%).")
-                    return
-
-                # Turn on heater
-                elif self.deviceType == "Heater":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Heater ON ({brightness_pct}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Heater ON (Switch).")
-                            return
-                    elif entity_id.startswith("fan.") and self.isDimmable and percentage is not None:
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="set_percentage",
-                            service_data={"entity_id": entity_id, "percentage": percentage},
-                        )
-                    elif entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif entity_id.startswith("climate."):
-                        await self.hass.services.async_call(
-                            domain="climate",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-
-                    if self.isDimmable and percentage is not None:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                        await self.set_value(percentage)
-
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: Heater ON ({percentage}%).")
-                    return
-
-                # Turn on cooler
-                elif self.deviceType == "Cooler":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_on",
-                                service_data={
-                                    "entity_id": entity_id,
-                                    "brightness_pct": brightness_pct,
-                                },
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Cooler ON ({brightness_pct}%).")
-                            return
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_on",
-                                service_data={"entity_id": entity_id},
-                            )
-                            self.isRunning = True
-                            _LOGGER.debug(f"{self.deviceName}: Cooler ON (Switch).")
-                            return
-                    elif entity_id.startswith("fan.") and self.isDimmable and percentage is not None:
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="set_percentage",
-                            service_data={"entity_id": entity_id, "percentage": percentage},
-                        )
-                    elif entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif entity_id.startswith("climate."):
-                        await self.hass.services.async_call(
-                            domain="climate",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-
-                    if self.isDimmable and percentage is not None:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(True)
-                        await self.set_value(percentage)
-
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: Cooler ON ({percentage}%).")
-                    return
-
-
-                # Turn on CO2
-                elif self.deviceType == "CO2":
-                    if self.isDimmable:
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="set_percentage",
-                            service_data={
-                                "entity_id": entity_id,
-                                "percentage": percentage,
-                            },
-                        )
-                        self.isRunning = True
-                        _LOGGER.debug(f"{self.deviceName}: CO2 ON ({percentage}%).")
-                        return
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_on",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = True
-                        _LOGGER.debug(f"{self.deviceName}: CO2 ON (Switch).")
-                        return
-
-                # Fallback
-                else:
-                    await self.hass.services.async_call(
-                        domain="switch",
-                        service="turn_on",
-                        service_data={"entity_id": entity_id},
-                    )
-                    self.isRunning = True
-                    _LOGGER.debug(f"{self.deviceName}: Default-Switch ON.")
-                    return
+            await plan.execute(
+                self,
+                {
+                    "brightness_pct": brightness_pct,
+                    "percentage": percentage,
+                    "hvac_mode": kwargs.get("hvac_mode", "heat"),
+                },
+            )
+            _LOGGER.debug(f"{self.deviceName}: {plan.label}")
 
         except Exception as e:
             _LOGGER.error(f"Error TurnON -> {self.deviceName}: {e}")
         finally:
             self._in_active_control = False
+            if self.reliability_manager:
+                self._record_power_before_action(power_before, keep_none=True)
 
     async def turn_off(self, **kwargs):
         """Turns the device off."""
@@ -2032,381 +1506,28 @@ class Device:
         
         self._commanded_state = "off"
         
-        # Store power before action for reliability validation
-        power_before = await self._get_current_power()
-        if self.reliability_manager:
-            rel = self.reliability_manager._device_reliability
-            if self.deviceName not in rel:
-                from ..managers.OGBFallBackManager import DeviceReliabilityState
-                rel[self.deviceName] = DeviceReliabilityState(device_name=self.deviceName)
-            if power_before is not None:
-                rel[self.deviceName].last_power_before_action = power_before
+        power_before = self._read_current_power() if self.reliability_manager else None
         
         # Set control lock to prevent HA state updates from overwriting
         # our recently sent control value (5 second lock)
         self._control_lock_until = time.time() + 5.0
         
         try:
-            # === Special case: AcInfinity devices ===
-            if self.isAcInfinDev:
-                entity_ids = []
-                if self.switches:
-                    entity_ids = [
-                        switch["entity_id"] for switch in self.switches 
-                        if "select." in switch["entity_id"]
-                    ]
-                if not entity_ids:
-                    _LOGGER.warning(f"{self.deviceName}: No matching select switches, falling back to options")
-                    if self.options:
-                        entity_ids = [
-                            option["entity_id"] for option in self.options
-                            if "select." in option["entity_id"]
-                        ]
-
-                if entity_ids:
-                    for entity_id in entity_ids:
-                        _LOGGER.debug(f"{self.deviceName} OFF ACTION with ID {entity_id}")
-                        await self.hass.services.async_call(
-                            domain="select",
-                            service="select_option",
-                            service_data={
-                                "entity_id": entity_id,
-                                "option": "Off"
-                            },
-                        )
-                    # Set numeric value to 0 (uses number.* entity via set_value, NOT select entity_id)
-                    if self.deviceType in ["Light", "Humidifier","Exhaust","Ventilation"]:
-                        await self.set_value(0)
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: AcInfinity via select OFF.")
-                    return
-
-                _LOGGER.warning(f"{self.deviceName}: AcInfinity without select entity - using standard fallback off path")
-
-            # === Standard devices ===
-            if not self.switches:
+            plan = self._get_command_plan("off")
+            if plan is None:
                 _LOGGER.debug(f"{self.deviceName} has NO Switches to Turn OFF")
                 return
 
-            entity_ids = [switch["entity_id"] for switch in self.switches]
-
-            for entity_id in entity_ids:
-                _LOGGER.debug(f"{self.deviceName}: Service-Call for Entity: {entity_id}")
-
-                # Turn off climate
-                if self.deviceType == "Climate":
-                    await self.hass.services.async_call(
-                        domain="climate",
-                        service="set_hvac_mode",
-                        service_data={
-                            "entity_id": entity_id,
-                            "hvac_mode": "off",
-                        },
-                    )
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: HVAC-Mode OFF.")
-                    return
-
-                # Turn off humidifier
-                elif self.deviceType == "Humidifier":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Humidifier OFF.")
-                        return
-                    if self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                        await self.set_value(0)
-                    if entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif hasattr(self, 'realHumidifierClass') and self.realHumidifierClass and hasattr(self, 'humidifierEntityId') and self.humidifierEntityId:
-                        await self.hass.services.async_call(
-                            domain="humidifier",
-                            service="turn_off",
-                            service_data={"entity_id": self.humidifierEntityId},
-                        )
-                    elif entity_id.startswith("cover."):
-                        await self.hass.services.async_call(
-                            domain="cover",
-                            service="close_cover",
-                            service_data={"entity_id": entity_id},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: Humidifier OFF.")
-                    return
-
-                # Turn off dehumidifier
-                elif self.deviceType == "Dehumidifier":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Dehumidifier OFF.")
-                        return
-                    if self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                        await self.set_value(0)
-                    if entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif hasattr(self, 'realHumidifierClass') and self.realHumidifierClass and hasattr(self, 'humidifierEntityId') and self.humidifierEntityId:
-                        await self.hass.services.async_call(
-                            domain="humidifier",
-                            service="turn_off",
-                            service_data={"entity_id": self.humidifierEntityId},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: Dehumidifier OFF.")
-                    return
-
-                # Turn off light
-                elif self.deviceType == "Light":
-                    if self.isDimmable:
-                        # For dimmable lights, use brightness_pct=0 to turn off
-                        await self.hass.services.async_call(
-                            domain="light",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = False
-                        # Reset voltage to 0 for dimmable lights
-                        self.voltage = 0
-                        _LOGGER.debug(f"{self.deviceName}: Light OFF (dimmable).")
-                        return
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Light OFF (Default-Switch).")
-                        return
-
-                # Turn off exhaust
-                elif self.deviceType == "Exhaust":
-                    if self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                            await self.set_value(0)
-                            self.isRunning = False
-                        return  # Disabled for fan-percentage exhaust
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Exhaust OFF.")
-                        return
-
-                # Turn off intake
-                elif self.deviceType == "Intake":
-                    if self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                            await self.set_value(0)
-                            self.isRunning = False
-                        return
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Intake OFF.")
-                        return
-
-                # Turn off ventilation
-                elif self.deviceType == "Ventilation":
-                    if self.isSpecialDevice:
-                        await self.hass.services.async_call(
-                            domain="light",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                            await self.set_value(0)
-                        else:
-                            await self.hass.services.async_call(
-                                domain="fan",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-
-                    # Set state and log once after ALL ventilation entities are processed
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: Ventilation OFF - {len(self.switches)} entities deactivated.")
-                        
-                # Turn off heater
-                elif self.deviceType == "Heater":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Heater OFF.")
-                        return
-                    if self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                        await self.set_value(0)
-                    if entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif entity_id.startswith("climate."):
-                        await self.hass.services.async_call(
-                            domain="climate",
-                            service="set_hvac_mode",
-                            service_data={"entity_id": entity_id, "hvac_mode": "off"},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: Heater OFF.")
-                    return
-
-                # Turn off cooler
-                elif self.deviceType == "Cooler":
-                    if self.isSpecialDevice:
-                        if self.isDimmable:
-                            await self.hass.services.async_call(
-                                domain="light",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        else:
-                            await self.hass.services.async_call(
-                                domain="switch",
-                                service="turn_off",
-                                service_data={"entity_id": entity_id},
-                            )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: Cooler OFF.")
-                        return
-                    if self.isDimmable:
-                        if self._has_power_and_number_control():
-                            await self._set_power_control(False)
-                        await self.set_value(0)
-                    if entity_id.startswith("fan."):
-                        await self.hass.services.async_call(
-                            domain="fan",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    elif entity_id.startswith("climate."):
-                        await self.hass.services.async_call(
-                            domain="climate",
-                            service="set_hvac_mode",
-                            service_data={"entity_id": entity_id, "hvac_mode": "off"},
-                        )
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: Cooler OFF.")
-                    return
-
-                # Turn off CO2
-                elif self.deviceType == "CO2":
-                    if self.isDimmable:
-                        return
-                    else:
-                        await self.hass.services.async_call(
-                            domain="switch",
-                            service="turn_off",
-                            service_data={"entity_id": entity_id},
-                        )
-                        self.isRunning = False
-                        _LOGGER.debug(f"{self.deviceName}: CO2 OFF.")
-                        return
-
-                # Fallback: standard switch
-                else:
-                    await self.hass.services.async_call(
-                        domain="switch",
-                        service="turn_off",
-                        service_data={"entity_id": entity_id},
-                    )
-                    self.isRunning = False
-                    _LOGGER.debug(f"{self.deviceName}: Default-Switch OFF.")
-                    return
+            await plan.execute(self, {"brightness_pct": 0, "percentage": 0})
+            _LOGGER.debug(f"{self.deviceName}: {plan.label}")
 
         except Exception as e:
             _LOGGER.error(f"Error turning off {self.deviceName}: {e}")
         finally:
-            pass
+            if self.reliability_manager:
+                self._record_power_before_action(power_before, keep_none=False)
+                # Verify later that the device actually stopped drawing power
+                self.reliability_manager.schedule_runaway_check(self.deviceName)
 
     async def hard_turn_off(self):
         """Forcefully turn off the device by directly calling services on all entities."""
@@ -3475,11 +2596,40 @@ class Device:
             await self.turn_on()
             _LOGGER.debug(f"{self.deviceName}: Turned on for correction")
 
+    def _get_command_plan(self, action: str):
+        """Return the compiled turn_on/turn_off plan, recompiling if identification changed."""
+        key = plan_key(self)
+        if getattr(self, "_command_plan_key", None) != key:
+            self._compile_command_plans(key)
+        return self._command_plans.get(action)
+
+    def _compile_command_plans(self, key=None) -> None:
+        self._command_plan_key = key or plan_key(self)
+        self._command_plans = {
+            "on": compile_command_plan(self, "on"),
+            "off": compile_command_plan(self, "off"),
+        }
+
+    def _record_power_before_action(self, power_before: Optional[float], keep_none: bool) -> None:
+        rel = self.reliability_manager._device_reliability
+        if self.deviceName not in rel:
+            from ..managers.OGBFallBackManager import DeviceReliabilityState
+            rel[self.deviceName] = DeviceReliabilityState(device_name=self.deviceName)
+        if keep_none or power_before is not None:
+            rel[self.deviceName].last_power_before_action = power_before
+
     async def _get_current_power(self) -> Optional[float]:
         """Read current power consumption of device."""
+        return self._read_current_power()
+
+    def _read_current_power(self) -> Optional[float]:
+        """Synchronous power read from the HA state machine."""
         try:
-            # Find power sensor
-            power_sensor = self._find_power_sensor()
+            # Find power sensor (cached once found)
+            power_sensor = getattr(self, "_power_sensor_id", None)
+            if power_sensor is None or not self.hass.states.get(power_sensor):
+                power_sensor = self._find_power_sensor()
+                self._power_sensor_id = power_sensor
             if power_sensor:
                 state = self.hass.states.get(power_sensor)
                 if state and state.state not in [None, "unknown", "unavailable", "", "None"]:
@@ -114,8 +114,9 @@ class Pump(Device):
             target_name = data.get("Device") or data.get("id")
             action = data.get("Action", "on").lower()
         else:
-            target_name = getattr(data, "Device", None)
-            action = getattr(data, "Action", "on").lower()
+            # OGBHydroAction / OGBRetrieveAction (see EVENT_PAYLOADS)
+            target_name = data.Device
+            action = data.Action.lower()
 
         if target_name != self.deviceName:
             # Auch Entity-ID Format prüfen (z.B. "switch.devwaterreservoir" -> "devwaterreservoir")
@@ -139,7 +140,7 @@ class Pump(Device):
         if isinstance(data, dict):
             target_name = data.get("Device") or data.get("id")
         else:
-            target_name = getattr(data, "Device", None)
+            target_name = data.Device
 
         if target_name != self.deviceName:
             # Auch Entity-ID Format prüfen (z.B. "switch.devwaterreservoir" -> "devwaterreservoir")
@@ -158,7 +159,7 @@ class Pump(Device):
         if isinstance(data, dict):
             target_name = data.get("Device") or data.get("id")
         else:
-            target_name = getattr(data, "Device", None)
+            target_name = data.Device
 
         if target_name != self.deviceName:
             # Auch Entity-ID Format prüfen (z.B. "switch.devwaterreservoir" -> "devwaterreservoir")
@@ -138,6 +138,9 @@ class OGBOrchestrator:
                 
                 # Update loop statistics
                 loop_duration = time.time() - loop_start
+                profiler = getattr(self.event_manager, "profiler", None)
+                if profiler is not None and profiler.enabled:
+                    profiler.record_span("orchestrator.loop", loop_duration)
                 self._loop_count += 1
                 self._last_loop_time = loop_duration
                 self._avg_loop_time = (
@@ -438,5 +441,6 @@ class OGBOrchestrator:
             'last_loop_time': self._last_loop_time,
             'avg_loop_time': self._avg_loop_time,
             'timing_config': self.timing_config,
-            'last_updates': self._last_updates
+            'last_updates': self._last_updates,
+            'profiler_enabled': bool(getattr(getattr(self.event_manager, "profiler", None), "enabled", False)),
         }
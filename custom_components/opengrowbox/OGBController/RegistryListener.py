@@ -144,6 +144,46 @@ class OGBRegistryEvenListener:
         # Return entity_ids as a set
         return set(combined_entities.keys())
 
+    async def async_wait_for_states(self, entity_ids, timeout=5.0):
+        """
+        Wait until the given entities report a valid state.
+
+        Driven by state_changed events instead of polling; entities that are
+        still invalid when the timeout hits are returned so the caller can
+        decide (device discovery keeps them with value None).
+        """
+        waiting = {
+            entity_id
+            for entity_id in entity_ids
+            if getattr(self.hass.states.get(entity_id), "state", None) in INVALID_VALUES
+        }
+        if not waiting:
+            return set()
+
+        all_valid = asyncio.Event()
+
+        @callback
+        def _state_changed(event):
+            entity_id = event.data.get("entity_id")
+            if entity_id not in waiting:
+                return
+            new_state = event.data.get("new_state")
+            if new_state is not None and new_state.state not in INVALID_VALUES:
+                waiting.discard(entity_id)
+                if not waiting:
+                    all_valid.set()
+
+        remove = self.hass.bus.async_listen("state_changed", _state_changed)
+        try:
+            await asyncio.wait_for(all_valid.wait(), timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.debug(
+                f"{self.room_name}: {len(waiting)} entities without valid state after {timeout}s: {sorted(waiting)[:10]}"
+            )
+        finally:
+            remove()
+        return set(waiting)
+
     async def get_filtered_entities_with_value(
         self, room_name, max_retries=5, retry_interval=1
     ):
@@ -152,56 +192,13 @@ class OGBRegistryEvenListener:
         Group entities based on their prefix (device_name).
         Includes platform information, labels (entity + device).
         """
-        entity_registry = async_get_entity_registry(self.hass)
-        device_registry = async_get_device_registry(self.hass)
         label_registry = async_get_label_registry(self.hass)
-
-        # Log all areas and devices for debugging
-        all_areas = set()
-        all_devices = []
-        for device in device_registry.devices.values():
-            if device.area_id:
-                all_areas.add(device.area_id)
-            all_devices.append(f"{device.name} (area: {device.area_id})")
-
-
-        # Filter devices in room - try exact match first
-        devices_in_room = {
-            device.id: device
-            for device in device_registry.devices.values()
-            if device.area_id == room_name
-        }
-
-        # If no exact match, try case-insensitive match
-        if not devices_in_room:
-            devices_in_room = {
-                device.id: device
-                for device in device_registry.devices.values()
-                if device.area_id and device.area_id.lower() == room_name.lower()
-            }
+        entities, devices_in_room = self._relevant_room_entities(room_name, label_registry)
 
         grouped_entities_array = []
-        room_lower = room_name.lower()
 
         async def process_entity(entity):
             """Process a single entity with retry logic."""
-            
-            # NEW: Skip disabled entities
-            if entity.disabled:
-                return None
-            
-            is_ogb_room_entity = "ogb_" in entity.entity_id and f"_{room_lower}" in entity.entity_id
-            
-            if not is_ogb_room_entity and entity.device_id not in devices_in_room:
-                return None
-
-            if not (
-                entity.entity_id.startswith(RELEVANT_PREFIXES)
-                or any(keyword in entity.entity_id for keyword in RELEVANT_KEYWORDS)
-                or self._matches_sensor_translations(entity, label_registry)
-            ):
-                return None
-
             parts = entity.entity_id.split(".")
             device_name = parts[1].split("_")[0] if len(parts) > 1 else "Unknown"
 
@@ -215,7 +212,8 @@ class OGBRegistryEvenListener:
                 #_LOGGER.debug(
                 #    f"Value for {entity.entity_id} invalid ({state_value}), retry {attempt + 1}/{max_retries}"
                 #)
-                await asyncio.sleep(retry_interval)
+                if attempt + 1 < max_retries:
+                    await asyncio.sleep(retry_interval)
 
             if state_value in INVALID_VALUES:
                 # Keep sensor + actuator entities even if value is currently unavailable/unknown.
@@ -299,7 +297,7 @@ class OGBRegistryEvenListener:
             }
 
         # Process in parallel
-        tasks = [process_entity(entity) for entity in entity_registry.entities.values()]
+        tasks = [process_entity(entity) for entity in entities]
         results = await asyncio.gather(*tasks)
 
         # Grouping
@@ -335,6 +333,59 @@ class OGBRegistryEvenListener:
 
         return grouped_entities_array
 
+    def _relevant_room_entities(self, room_name, label_registry=None):
+        """
+        Enabled registry entries that belong to the room and are relevant for OGB.
+
+        Returns the entries and the devices in the room (exact area match first,
+        case-insensitive as fallback).
+        """
+        entity_registry = async_get_entity_registry(self.hass)
+        device_registry = async_get_device_registry(self.hass)
+        if label_registry is None:
+            label_registry = async_get_label_registry(self.hass)
+
+        # Filter devices in room - try exact match first
+        devices_in_room = {
+            device.id: device
+            for device in device_registry.devices.values()
+            if device.area_id == room_name
+        }
+
+        # If no exact match, try case-insensitive match
+        if not devices_in_room:
+            devices_in_room = {
+                device.id: device
+                for device in device_registry.devices.values()
+                if device.area_id and device.area_id.lower() == room_name.lower()
+            }
+
+        room_lower = room_name.lower()
+        entities = []
+        for entity in entity_registry.entities.values():
+            # Skip disabled entities
+            if entity.disabled:
+                continue
+
+            is_ogb_room_entity = "ogb_" in entity.entity_id and f"_{room_lower}" in entity.entity_id
+            if not is_ogb_room_entity and entity.device_id not in devices_in_room:
+                continue
+
+            if not (
+                entity.entity_id.startswith(RELEVANT_PREFIXES)
+                or any(keyword in entity.entity_id for keyword in RELEVANT_KEYWORDS)
+                or self._matches_sensor_translations(entity, label_registry)
+            ):
+                continue
+            entities.append(entity)
+
+        return entities, devices_in_room
+
+    def get_relevant_entity_ids(self, room_name):
+        """Entity ids that device discovery will read for this room."""
+        entities, _ = self._relevant_room_entities(room_name)
+        return {entity.entity_id for entity in entities}
+
     async def get_filtered_entities_with_valueForDevice(
         self, room_name, max_retries=5, retry_interval=1
     ):
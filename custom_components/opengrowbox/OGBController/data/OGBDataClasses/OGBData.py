@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from ...utils.stateCodec import NATIVE_JSON
+
 
 @dataclass
 class LightStage:
@@ -343,6 +345,7 @@ class OGBConf:
         }
     )
     Energy: Dict[str, Any] = field(
+        metadata=NATIVE_JSON,
         default_factory=lambda: {
             "price_per_kwh": 0.35,
             "currency": "EUR",
@@ -350,8 +353,6 @@ class OGBConf:
             "current_day": None,
             "devices": {},
             "daily": {},
-            "weekly": {},
-            "monthly": {},
         }
     )
     isPlantDay: Dict[str, Any] = field(
@@ -799,7 +800,11 @@ class OGBConf:
             "results": {}
         }
     ),
-    deviceCooldowns: Dict[str, float] = field(default_factory=dict),
+    deviceCooldowns: Dict[str, float] = field(default_factory=dict)
+    cooldownState: Dict[str, Any] = field(default_factory=dict, metadata=NATIVE_JSON)
+    dosingJobs: List[Any] = field(default_factory=list, metadata=NATIVE_JSON)
+    complianceDaily: Dict[str, Any] = field(default_factory=dict, metadata=NATIVE_JSON)
+    rateLimiterState: Dict[str, Any] = field(default_factory=dict, metadata=NATIVE_JSON)
     logType: str = ""
     def __post_init__(self):
         """Wird nach der Initialisierung aufgerufen, um hass zu setzen"""
@@ -1,43 +1,43 @@
 import logging
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBInitData:
     Name: str
     newState: tuple[Union[float, str]] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBEventPublication:
     Name: str
     oldState: tuple[Union[float, str]] = field(default_factory=list)
     newState: tuple[Union[float, str]] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBDeviceEventPublication:
     Name: str
     oldState: tuple[Union[float, str]] = field(default_factory=list)
     newState: tuple[Union[float, str]] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBModePublication:
     currentMode: str
     previousMode: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBModeRunPublication:
     currentMode: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBVPDPublication:
     Name: str
     VPD: Optional[float] = None
@@ -52,7 +52,7 @@ class OGBVPDPublication:
         return asdict(self)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBWaterPublication:
     Name: str
     ecCurrent: Optional[float] = None
@@ -66,7 +66,7 @@ class OGBWaterPublication:
         return asdict(self)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBSoilPublication:
     Name: str
     ecCurrent: Optional[float] = None
@@ -77,26 +77,26 @@ class OGBSoilPublication:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class OGBMoisturePublication:
     Name: str
     MoistureValues: list
     AvgMoisture: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OGBDLIPublication:
     Name: str
     DLI: int
 
 
-@dataclass
+@dataclass(slots=True)
 class OGBPPFDPublication:
     Name: str
     PPFD: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBCO2Publication:
     Name: str
     co2Current: Optional[float] = None
@@ -108,7 +108,7 @@ class OGBCO2Publication:
         return asdict(self)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBActionPublication:
     Name: str
     message: str
@@ -118,7 +118,7 @@ class OGBActionPublication:
     value: Optional[int] = field(default=None)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBWeightPublication:
     Name: str
     message: str
@@ -130,7 +130,7 @@ class OGBWeightPublication:
     humWeight: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBHydroPublication:
     Name: str
     Mode: str
@@ -142,7 +142,7 @@ class OGBHydroPublication:
     Devices: List[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBRetrivePublication:
     Name: str
     Active: bool
@@ -154,7 +154,7 @@ class OGBRetrivePublication:
     Devices: List[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBCropSteeringPublication:
     Name: str
     Active: bool
@@ -167,21 +167,21 @@ class OGBCropSteeringPublication:
     Devices: List[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBECAction:
     Name: str
     TargetEC: str
     CurrentEC: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBDripperAction:
     Name: str
     Device: str
     Action: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBRetrieveAction:
     Name: str
     Device: str
@@ -189,7 +189,7 @@ class OGBRetrieveAction:
     Action: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBHydroAction:
     Name: str
     Device: str
@@ -197,7 +197,7 @@ class OGBHydroAction:
     Action: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBWaterAction:
     Name: str
     Device: str
@@ -206,7 +206,7 @@ class OGBWaterAction:
     Message: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBLightAction:
     Name: str
     Device: str
@@ -219,7 +219,7 @@ class OGBLightAction:
     SunSet: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OGBPremPublication:
     Name: str
     UserID: str
@@ -229,7 +229,7 @@ class OGBPremPublication:
     Message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class OGBMediumPlantPublication:
     """Publication for per-medium plant data - emitted as array for UI"""
     Name: str  # Room name
@@ -246,7 +246,7 @@ class OGBMediumPlantPublication:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class OGBPlantDatesPublication:
     """Publication for single medium plant dates update"""
     Name: str  # Room name
@@ -275,3 +275,42 @@ class OGBPlantDatesPublication:
 
     def to_dict(self):
         return asdict(self)
+
+
+# Payload types per event name. Publications are slotted dataclasses, so a
+# consumer that receives one of the listed publication types can read its
+# fields directly. Some events are also emitted with a plain dict (e.g.
+# ``{"action": "off"}`` to stop all pumps), a mode string or ``True`` as a
+# bare trigger; those are listed as well.
+EVENT_PAYLOADS: Dict[str, Tuple[type, ...]] = {
+    "SensorUpdate": (OGBEventPublication, dict),
+    "RoomUpdate": (OGBEventPublication, bool),
+    "VPDCreation": (OGBVPDPublication, bool, float, int),
+    "AmbientData": (OGBVPDPublication,),
+    "selectActionMode": (OGBModeRunPublication, OGBModePublication, str),
+    "DLIUpdate": (OGBDLIPublication,),
+    "PPFDUpdate": (OGBPPFDPublication,),
+    "CheckForFeed": (OGBWaterPublication, bool),
+    "PumpAction": (OGBHydroAction, dict),
+    "RetrieveAction": (OGBRetrieveAction, dict),
+    "Increase Pump": (OGBHydroAction, OGBRetrieveAction, dict),
+    "Reduce Pump": (OGBHydroAction, OGBRetrieveAction, dict),
+    "MediumPlantsUpdate": (OGBMediumPlantPublication,),
+    "MediumPlantUpdate": (OGBPlantDatesPublication,),
+}
+
+
+def validate_payload(event_name: str, data: Any) -> bool:
+    """Check ``data`` against ``EVENT_PAYLOADS``; logs a warning on a mismatch.
+
+    Meant for debug mode: the event manager only calls it when debug logging
+    is enabled, so production emits pay nothing for it.
+    """
+    expected = EVENT_PAYLOADS.get(event_name)
+    if expected is None or isinstance(data, expected):
+        return True
+    _LOGGER.warning(
+        f"Event '{event_name}' emitted with {type(data).__name__}, expected "
+        f"{' | '.join(t.__name__ for t in expected)}"
+    )
+    return False
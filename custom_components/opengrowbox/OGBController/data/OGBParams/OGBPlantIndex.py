@@ -0,0 +1,309 @@
+"""Immutable lookup index for the plant species catalog.
+
+Built once from ``PLANT_SPECIES_VPD_MAPS`` when ``OGBPlants`` is imported:
+
+- species and stages are interned to integer ids,
+- every species/stage has a flat target tuple (see ``TARGET_FIELDS``), with
+  the "missing stage -> first stage of the species" fallback already applied,
+- transitions into a stage are precomputed as one interpolated target tuple
+  per day (``transition_days``),
+- the catalog is validated and problems are logged and kept in ``issues``.
+
+Lookups by id or name return stored tuples, so they do not allocate.
+Unknown species fall back to the default species and unknown stages to the
+first stage of the species, like the former dict walks in ``OGBPlants``.
+"""
+
+import logging
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# Canonical stage order; species may use a prefix of it (no flowering stages)
+STAGE_ORDER: Tuple[str, ...] = (
+    "Germination",
+    "Clones",
+    "EarlyVeg",
+    "MidVeg",
+    "LateVeg",
+    "EarlyFlower",
+    "MidFlower",
+    "LateFlower",
+)
+
+# Target vector layout: (field name, catalog key, index into a [min, max] range or None)
+_FIELD_SOURCES: Tuple[Tuple[str, str, Optional[int]], ...] = (
+    ("vpdMin", "vpdRange", 0),
+    ("vpdMax", "vpdRange", 1),
+    ("minTemp", "minTemp", None),
+    ("maxTemp", "maxTemp", None),
+    ("minHumidity", "minHumidity", None),
+    ("maxHumidity", "maxHumidity", None),
+    ("minEC", "minEC", None),
+    ("maxEc", "maxEc", None),
+    ("minPh", "minPh", None),
+    ("maxPh", "maxPh", None),
+    ("minLight", "minLight", None),
+    ("maxLight", "maxLight", None),
+    ("minCo2", "minCo2", None),
+    ("maxCo2", "maxCo2", None),
+    ("nightMinTemp", "nightMinTemp", None),
+    ("nightMaxTemp", "nightMaxTemp", None),
+    ("nightMinHumidity", "nightMinHumidity", None),
+    ("nightMaxHumidity", "nightMaxHumidity", None),
+    ("nightVpdMin", "nightVpdRange", 0),
+    ("nightVpdMax", "nightVpdRange", 1),
+)
+
+TARGET_FIELDS: Tuple[str, ...] = tuple(name for name, _, _ in _FIELD_SOURCES)
+FIELD_INDEX: Mapping[str, int] = MappingProxyType({name: i for i, name in enumerate(TARGET_FIELDS)})
+
+(
+    VPD_MIN, VPD_MAX, MIN_TEMP, MAX_TEMP, MIN_HUMIDITY, MAX_HUMIDITY, MIN_EC, MAX_EC,
+    MIN_PH, MAX_PH, MIN_LIGHT, MAX_LIGHT, MIN_CO2, MAX_CO2, NIGHT_MIN_TEMP, NIGHT_MAX_TEMP,
+    NIGHT_MIN_HUMIDITY, NIGHT_MAX_HUMIDITY, NIGHT_VPD_MIN, NIGHT_VPD_MAX,
+) = range(len(TARGET_FIELDS))
+
+_MIN_MAX_PAIRS = tuple(
+    (TARGET_FIELDS[i], TARGET_FIELDS[i + 1]) for i in range(0, len(TARGET_FIELDS), 2)
+)
+
+DEFAULT_TRANSITION_DAYS = 7
+
+
+def validate_plant_maps(
+    maps: Mapping[str, Mapping[str, Mapping[str, Any]]],
+    options: Iterable[str] = (),
+    default_species: Optional[str] = None,
+) -> List[str]:
+    """Return a list of human readable problems in the species catalog."""
+    issues: List[str] = []
+    options = list(options)
+
+    if default_species is not None and default_species not in maps:
+        issues.append(f"Default species '{default_species}' has no VPD map")
+    for name in sorted(set(options) - set(maps)):
+        issues.append(f"Species option '{name}' has no VPD map")
+    for name in sorted(set(maps) - set(options)) if options else ():
+        issues.append(f"Species '{name}' is not in the species options")
+
+    for species, stages in maps.items():
+        if not stages:
+            issues.append(f"{species}: no stages")
+            continue
+        known = [stage for stage in stages if stage in STAGE_ORDER]
+        for stage in stages:
+            if stage not in STAGE_ORDER:
+                issues.append(f"{species}: unknown stage '{stage}'")
+        if known != sorted(known, key=STAGE_ORDER.index):
+            issues.append(f"{species}: stages are not in growth order")
+
+        for stage, config in stages.items():
+            for name, key, position in _FIELD_SOURCES:
+                value = config.get(key)
+                if value is None:
+                    issues.append(f"{species}/{stage}: missing '{key}'")
+                    break
+                if position is not None:
+                    if not isinstance(value, (list, tuple)) or len(value) != 2:
+                        issues.append(f"{species}/{stage}: '{key}' must be [min, max]")
+                        break
+                    value = value[position]
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    issues.append(f"{species}/{stage}: '{name}' is not a number ({value!r})")
+                    break
+            else:
+                vector = _target_vector(config)
+                for low, high in _MIN_MAX_PAIRS:
+                    if vector[FIELD_INDEX[low]] > vector[FIELD_INDEX[high]]:
+                        issues.append(f"{species}/{stage}: {low} > {high}")
+
+    return issues
+
+
+def _target_vector(config: Mapping[str, Any]) -> Tuple[float, ...]:
+    values = []
+    for _, key, position in _FIELD_SOURCES:
+        value = config.get(key)
+        if position is not None:
+            value = value[position] if isinstance(value, (list, tuple)) and len(value) == 2 else None
+        values.append(float(value) if isinstance(value, (int, float)) else float("nan"))
+    return tuple(values)
+
+
+def _interpolate(start: Tuple[float, ...], end: Tuple[float, ...], weight: float) -> Tuple[float, ...]:
+    return tuple(round(a + (b - a) * weight, 3) for a, b in zip(start, end))
+
+
+class _StageTable(dict):
+    """stage name -> entry; unknown stage names resolve to the species' first stage."""
+
+    __slots__ = ("fallback",)
+
+    def __missing__(self, stage):
+        return self.fallback
+
+
+class PlantIndex:
+    """Read-only species/stage target tables addressed by interned ids or names."""
+
+    __slots__ = (
+        "species",
+        "species_ids",
+        "stage_names",
+        "stage_ids",
+        "default_species",
+        "transition_days",
+        "issues",
+        "_species_index",
+        "_stage_index",
+        "_stage_count",
+        "_species_stages",
+        "_rows",
+        "_present",
+        "_targets",
+        "_transitions",
+        "_configs",
+    )
+
+    def __init__(
+        self,
+        maps: Mapping[str, Mapping[str, Mapping[str, Any]]],
+        default_species: str,
+        transition_days: int = DEFAULT_TRANSITION_DAYS,
+        issues: Iterable[str] = (),
+    ):
+        stage_names = list(STAGE_ORDER)
+        for stages in maps.values():
+            for stage in stages:
+                if stage not in stage_names:
+                    stage_names.append(stage)
+
+        # Species without stages are reported by the validation and left out
+        self.species = tuple(name for name, stages in maps.items() if stages)
+        self.stage_names = tuple(stage_names)
+        self._species_index = {name: i for i, name in enumerate(self.species)}
+        self._stage_index = {name: i for i, name in enumerate(self.stage_names)}
+        self.species_ids = MappingProxyType(self._species_index)
+        self.stage_ids = MappingProxyType(self._stage_index)
+        self.default_species = default_species if default_species in self._species_index else self.species[0]
+        self.transition_days = max(1, int(transition_days))
+        self.issues = tuple(issues)
+        self._stage_count = len(self.stage_names)
+
+        rows: List[Tuple[float, ...]] = []
+        present: List[bool] = []
+        species_stages = []
+        targets: Dict[str, _StageTable] = {}
+        transitions: Dict[str, _StageTable] = {}
+        configs: Dict[str, _StageTable] = {}
+
+        for species in self.species:
+            stages = maps[species]
+            order = tuple(stages)
+            species_stages.append(order)
+            vectors = {stage: _target_vector(stages[stage]) for stage in order}
+
+            # Day 0 of a transition is the previous stage, the last day the stage itself
+            blends = {order[0]: (vectors[order[0]],)}
+            for previous, stage in zip(order, order[1:]):
+                blends[stage] = (
+                    vectors[previous],
+                    *(
+                        _interpolate(vectors[previous], vectors[stage], day / self.transition_days)
+                        for day in range(1, self.transition_days)
+                    ),
+                    vectors[stage],
+                )
+
+            targets[species] = _table(vectors, order[0])
+            transitions[species] = _table(blends, order[0])
+            configs[species] = _table({stage: _freeze(stages[stage]) for stage in order}, order[0])
+
+            for stage in self.stage_names:
+                present.append(stage in vectors)
+                rows.append(targets[species][stage])
+
+        self._species_stages = tuple(species_stages)
+        self._rows = tuple(rows)
+        self._present = tuple(present)
+        self._targets = targets
+        self._transitions = transitions
+        self._configs = configs
+
+    # -----------------------------------------------------------------
+    # Ids
+    # -----------------------------------------------------------------
+
+    def species_id(self, species: str) -> int:
+        """Id of a species, the default species if unknown."""
+        return self._species_index.get(species, self._species_index[self.default_species])
+
+    def stage_id(self, stage: str) -> int:
+        """Id of a stage, -1 if the name is unknown."""
+        return self._stage_index.get(stage, -1)
+
+    def has_species(self, species: str) -> bool:
+        return species in self._species_index
+
+    def has_stage(self, species: str, stage: str) -> bool:
+        stage_id = self._stage_index.get(stage, -1)
+        return stage_id >= 0 and self._present[self.species_id(species) * self._stage_count + stage_id]
+
+    def stages(self, species: str) -> Tuple[str, ...]:
+        """Stages of a species in growth order."""
+        return self._species_stages[self.species_id(species)]
+
+    # -----------------------------------------------------------------
+    # Targets
+    # -----------------------------------------------------------------
+
+    def targets_by_id(self, species_id: int, stage_id: int) -> Tuple[float, ...]:
+        if stage_id < 0:
+            return self._targets[self.species[species_id]].fallback
+        return self._rows[species_id * self._stage_count + stage_id]
+
+    def targets(self, species: str, stage: str) -> Tuple[float, ...]:
+        """Target tuple laid out as ``TARGET_FIELDS``."""
+        table = self._targets.get(species)
+        return (table if table is not None else self._targets[self.default_species])[stage]
+
+    def transition(self, species: str, stage: str, day: int) -> Tuple[float, ...]:
+        """Targets ``day`` days after entering ``stage`` (linear blend from the previous stage)."""
+        table = self._transitions.get(species)
+        blends = (table if table is not None else self._transitions[self.default_species])[stage]
+        if day <= 0:
+            return blends[0]
+        return blends[day] if day < len(blends) else blends[-1]
+
+    def stage_config(self, species: str, stage: str) -> Dict[str, Any]:
+        """The catalog entry as a new, mutable dict (ranges as lists)."""
+        table = self._configs.get(species)
+        config = (table if table is not None else self._configs[self.default_species])[stage]
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in config.items()}
+
+
+def _table(entries: Dict[str, Any], first_stage: str) -> _StageTable:
+    table = _StageTable(entries)
+    table.fallback = entries[first_stage]
+    return table
+
+
+def _freeze(config: Mapping[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {key: tuple(value) if isinstance(value, list) else value for key, value in config.items()}
+    )
+
+
+def build_plant_index(
+    maps: Mapping[str, Mapping[str, Mapping[str, Any]]],
+    options: Iterable[str] = (),
+    default_species: Optional[str] = None,
+    transition_days: int = DEFAULT_TRANSITION_DAYS,
+) -> PlantIndex:
+    """Validate the catalog and build the index; problems are logged once."""
+    issues = validate_plant_maps(maps, options, default_species)
+    for issue in issues:
+        _LOGGER.warning(f"Plant catalog: {issue}")
+    return PlantIndex(maps, default_species or next(iter(maps), ""), transition_days, issues)
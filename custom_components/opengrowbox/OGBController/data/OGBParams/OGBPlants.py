@@ -16,6 +16,8 @@ Each species can have fewer stages if not applicable (e.g., Lettuce has no flowe
 
 from typing import Dict, Any, List
 
+from .OGBPlantIndex import VPD_MAX, VPD_MIN, build_plant_index
+
 # Default plant species
 DEFAULT_PLANT_SPECIES = "Cannabis"
 
@@ -2591,6 +2593,10 @@ PLANT_SPECIES_VPD_MAPS: Dict[str, Dict[str, Dict[str, Any]]] = {
 }
 
 
+# Validated, immutable lookup index over PLANT_SPECIES_VPD_MAPS (built once at import)
+PLANT_INDEX = build_plant_index(PLANT_SPECIES_VPD_MAPS, PLANT_SPECIES_OPTIONS, DEFAULT_PLANT_SPECIES)
+
+
 def get_plant_species_stages(species: str) -> List[str]:
     """Get list of available stages for a plant species.
     
@@ -2600,8 +2606,7 @@ def get_plant_species_stages(species: str) -> List[str]:
     Returns:
         List of stage names
     """
-    species_map = PLANT_SPECIES_VPD_MAPS.get(species, PLANT_SPECIES_VPD_MAPS[DEFAULT_PLANT_SPECIES])
-    return list(species_map.keys())
+    return list(PLANT_INDEX.stages(species))
 
 
 def get_stage_config(species: str, stage: str) -> Dict[str, Any]:
@@ -2615,17 +2620,7 @@ def get_stage_config(species: str, stage: str) -> Dict[str, Any]:
         Stage configuration dict with vpdRange, temp, humidity, etc.
         Falls back to Cannabis defaults if species/stage not found.
     """
-    species_map = PLANT_SPECIES_VPD_MAPS.get(species)
-    if not species_map:
-        species_map = PLANT_SPECIES_VPD_MAPS[DEFAULT_PLANT_SPECIES]
-    
-    stage_config = species_map.get(stage)
-    if not stage_config:
-        # Fallback to first available stage if specific stage not found
-        first_stage = list(species_map.keys())[0]
-        stage_config = species_map[first_stage]
-    
-    return stage_config
+    return PLANT_INDEX.stage_config(species, stage)
 
 
 def get_vpd_range(species: str, stage: str) -> list:
@@ -2638,8 +2633,8 @@ def get_vpd_range(species: str, stage: str) -> list:
     Returns:
         List [min_vpd, max_vpd]
     """
-    config = get_stage_config(species, stage)
-    return config.get("vpdRange", [0.8, 1.2])
+    targets = PLANT_INDEX.targets(species, stage)
+    return [targets[VPD_MIN], targets[VPD_MAX]]
 
 
 def is_valid_species(species: str) -> bool:
@@ -2651,16 +2646,19 @@ def is_valid_species(species: str) -> bool:
     Returns:
         True if species exists in PLANT_SPECIES_VPD_MAPS
     """
-    return species in PLANT_SPECIES_VPD_MAPS
+    return PLANT_INDEX.has_species(species)
 
 
 def get_full_plant_stages(species: str) -> Dict[str, Dict[str, Any]]:
     """Get full plant stages dict for a species (compatible with OGBData.plantStages).
     
+    Returns new dicts, so a room editing its stored stages does not change
+    the catalog shared by all rooms.
+
     Args:
         species: Plant species name
         
     Returns:
         Dict of stage_name -> stage_config
     """
-    return PLANT_SPECIES_VPD_MAPS.get(species, PLANT_SPECIES_VPD_MAPS[DEFAULT_PLANT_SPECIES])
+    return {stage: PLANT_INDEX.stage_config(species, stage) for stage in PLANT_INDEX.stages(species)}
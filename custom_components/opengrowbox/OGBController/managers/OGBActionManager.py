@@ -20,6 +20,7 @@ from ..data.OGBDataClasses.OGBPublications import (OGBActionPublication,
                                                OGBWeightPublication)
 from ..data.OGBParams.OGBParams import DEFAULT_DEVICE_COOLDOWNS
 from .OGBgcdManager import OGBgcdManager
+from ..utils.actionIndex import ActionIndex, ConflictGraph, build_action_records
 from ..utils.ambient import is_ambient_room
 
 if TYPE_CHECKING:
@@ -234,25 +235,16 @@ class OGBActionManager:
         # Resolve conflicting actions first
         actionMap = self._remove_conflicting_actions(actionMap)
 
-        filteredActions = []
-        blockedActions = []
-
-        for action in actionMap:
-            capability = action.get('capability') if isinstance(action, dict) else getattr(action, 'capability', None)
-            actionType = action.get('action') if isinstance(action, dict) else getattr(action, 'action', None)
-
-            # Determine relevant deviation for this capability
-            deviation = 0
-            if capability in ["canHumidify", "canDehumidify"]:
-                deviation = humDeviation
-            elif capability in ["canHeat", "canCool"]:
-                deviation = tempDeviation
-
-            if await self._isActionAllowed(capability, actionType, deviation):
-                filteredActions.append(action)
-                await self._registerAction(capability, actionType, deviation)
-            else:
-                blockedActions.append(action)
+        # Relevant deviation per capability; one batch check + registration
+        deviations = {
+            "canHumidify": humDeviation,
+            "canDehumidify": humDeviation,
+            "canHeat": tempDeviation,
+            "canCool": tempDeviation,
+        }
+        filteredActions, blockedActions = self.cooldown_manager.filter_allowed(
+            actionMap, deviations
+        )
 
         if blockedActions:
             _LOGGER.debug(
@@ -420,10 +412,8 @@ class OGBActionManager:
             action = data.get("Action") or data.get("action")
             cycle = data.get("Cycle") or data.get("cycle")
         else:
-            # Handle dataclass objects
-            dev = getattr(data, 'Device', '<unknown>')
-            action = getattr(data, 'Action', None)
-            cycle = getattr(data, 'Cycle', None)
+            # OGBHydroAction / OGBRetrieveAction (see EVENT_PAYLOADS)
+            dev, action, cycle = data.Device, data.Action, data.Cycle
 
         # Emit pump control events directly (like original code)
         message = "Unknown Pump Action"
@@ -445,10 +435,8 @@ class OGBActionManager:
             action = data.get("Action") or data.get("action")
             cycle = data.get("Cycle") or data.get("cycle")
         else:
-            # Handle dataclass objects
-            dev = getattr(data, 'Device', '<unknown>')
-            action = getattr(data, 'Action', None)
-            cycle = getattr(data, 'Cycle', None)
+            # OGBHydroAction / OGBRetrieveAction (see EVENT_PAYLOADS)
+            dev, action, cycle = data.Device, data.Action, data.Cycle
 
         # Retrieve pumps are also registered pump devices - emit events for Pump devices to handle
         if action in ["on", "off"]:
@@ -606,34 +594,12 @@ class OGBActionManager:
         Returns:
             Deduplicated action list
         """
-        prio_map = {"emergency": 4, "high": 3, "medium": 2, "low": 1}
-        best = {}  # capability -> (priority_score, index, action)
-        first_occurrence = {}
-
-        for i, action in enumerate(actionMap):
-            cap = getattr(action, 'capability', None)
-            if not cap:
-                continue
-            prio = prio_map.get(getattr(action, 'priority', 'medium') or 'medium', 0)
-            if cap not in first_occurrence:
-                first_occurrence[cap] = i
-            # Keep if higher priority, or same priority but later index
-            if cap not in best or prio > best[cap][0] or (
-                prio == best[cap][0] and i > best[cap][1]
-            ):
-                best[cap] = (prio, i, action)
-
-        if len(best) < len([a for a in actionMap if getattr(a, 'capability', None)]):
+        index = ActionIndex(actionMap)
+        if index.multi:
             _LOGGER.debug(
-                f"{self.room}: Deduplicated {len(actionMap)} actions → {len(best)} unique"
+                f"{self.room}: Deduplicated {len(actionMap)} actions → {len(index.order)} unique"
             )
-
-        # Sort by first occurrence index to preserve original order
-        unique_actions = [
-            best[cap][2]
-            for cap in sorted(best.keys(), key=lambda c: first_occurrence[c])
-        ]
-        return unique_actions
+        return index.deduplicated()
 
     CONFLICTING_ACTION_PAIRS = [
         # (cap_a, action_a) conflicts with (cap_b, action_b)
@@ -649,6 +615,14 @@ class OGBActionManager:
         ("canExhaust", "canHumidify"),
     ]
 
+    def _conflict_graph(self) -> ConflictGraph:
+        """CONFLICTING_ACTION_PAIRS compiled to capability bitmasks (cached per class)."""
+        graph = type(self).__dict__.get("_compiled_conflicts")
+        if graph is None or graph.source is not self.CONFLICTING_ACTION_PAIRS:
+            graph = ConflictGraph(self.CONFLICTING_ACTION_PAIRS)
+            setattr(type(self), "_compiled_conflicts", graph)
+        return graph
+
     def _remove_conflicting_actions(self, actionMap: List) -> List:
         """
         Remove actions that physically contradict each other on action-level.
@@ -658,114 +632,7 @@ class OGBActionManager:
         Also detects intra-capability conflicts (same capability with opposite actions)
         e.g. canHeat Reduce vs canHeat Increase – prevents device oscillation.
         """
-        # Build lookup: capability → action object
-        cap_to_action = {
-            getattr(a, 'capability', None): a
-            for a in actionMap
-            if getattr(a, 'capability', None)
-        }
-
-        prio_map = {"emergency": 4, "high": 3, "medium": 2, "low": 1}
-        blocked_caps = set()
-        # Track specific (capability, action) pairs to block for intra-capability conflicts
-        blocked_pairs = set()
-
-        for cap_a, act_a, cap_b, act_b in self.CONFLICTING_ACTION_PAIRS:
-            action_a = cap_to_action.get(cap_a)
-            action_b = cap_to_action.get(cap_b)
-
-            if not action_a or not action_b:
-                continue
-
-            # Only conflict if action types actually match the pair definition
-            if getattr(action_a, 'action', '') != act_a:
-                continue
-            if getattr(action_b, 'action', '') != act_b:
-                continue
-
-            prio_a = prio_map.get(getattr(action_a, 'priority', 'medium'), 2)
-            prio_b = prio_map.get(getattr(action_b, 'priority', 'medium'), 2)
-
-            if prio_b > prio_a:
-                blocked_caps.add(cap_a)
-                _LOGGER.debug(
-                    f"{self.room}: Conflict – {cap_b}:{act_b} (prio={prio_b}) "
-                    f"overrides {cap_a}:{act_a} (prio={prio_a})"
-                )
-            else:
-                blocked_caps.add(cap_b)
-                _LOGGER.debug(
-                    f"{self.room}: Conflict – {cap_a}:{act_a} (prio={prio_a}) "
-                    f"overrides {cap_b}:{act_b} (prio={prio_b})"
-                )
-
-        # Intra-capability conflict detection (same capability with opposite actions)
-        # Prevents fatal oscillations like canHeat Reduce + canHeat Increase
-        from collections import defaultdict
-        cap_actions = defaultdict(list)
-        for a in actionMap:
-            cap = getattr(a, 'capability', None)
-            if cap:
-                cap_actions[cap].append(a)
-
-        opposite_pairs = {"Increase": "Reduce", "Reduce": "Increase"}
-        for cap, actions in cap_actions.items():
-            if len(actions) < 2:
-                continue
-
-            # Check for opposite actions on same capability
-            for i, action_a in enumerate(actions):
-                act_a = getattr(action_a, 'action', '')
-                opposite = opposite_pairs.get(act_a)
-                if not opposite:
-                    continue
-
-                for action_b in actions[i + 1:]:
-                    act_b = getattr(action_b, 'action', '')
-                    if act_b != opposite:
-                        continue
-
-                    # Found conflict: same capability with opposite actions
-                    prio_a = prio_map.get(getattr(action_a, 'priority', 'medium'), 2)
-                    prio_b = prio_map.get(getattr(action_b, 'priority', 'medium'), 2)
-
-                    msg_a = getattr(action_a, 'message', '')
-                    msg_b = getattr(action_b, 'message', '')
-
-                    if prio_a > prio_b:
-                        winner, loser = action_a, action_b
-                    elif prio_b > prio_a:
-                        winner, loser = action_b, action_a
-                    else:
-                        # Equal priority: Bounds wins (safety first)
-                        # Check if one is a bounds correction
-                        is_a_bounds = "Bounds:" in msg_a
-                        is_b_bounds = "Bounds:" in msg_b
-                        if is_a_bounds and not is_b_bounds:
-                            winner, loser = action_a, action_b
-                        elif is_b_bounds and not is_a_bounds:
-                            winner, loser = action_b, action_a
-                        else:
-                            # Both or none are bounds - keep first one found
-                            winner, loser = action_a, action_b
-
-                    loser_cap = getattr(loser, 'capability', '')
-                    loser_act = getattr(loser, 'action', '')
-                    winner_act = getattr(winner, 'action', '')
-                    # Block only the specific (capability, action) pair, not all actions on this capability
-                    blocked_pairs.add((loser_cap, loser_act))
-                    _LOGGER.warning(
-                        f"{self.room}: CRITICAL Intra-capability conflict – "
-                        f"{loser_cap}:{loser_act} removed in favor of {winner_act} "
-                        f"(reason: {getattr(winner, 'message', '')})"
-                    )
-                    break
-
-        return [
-            a for a in actionMap
-            if getattr(a, 'capability', None) not in blocked_caps
-            and (getattr(a, 'capability', None), getattr(a, 'action', None)) not in blocked_pairs
-        ]
+        return ActionIndex(actionMap).without_conflicts(self._conflict_graph(), self.room)
 
 
     # =================================================================
@@ -1207,13 +1074,10 @@ class OGBActionManager:
             # No dampening - use enhanced actions directly
             final_actions = enhanced_actions
 
-        # Remove duplicate actions for the same capability, keeping highest priority
-        final_actions = self._remove_duplicate_actions(final_actions)
-
         # STEP 3: ENVIRONMENT GUARD (always active)
         final_actions = await self._apply_environment_guard(final_actions)
 
-        # STEP 4: Execute actions
+        # STEP 4: Execute actions (duplicates are removed during publication)
         await self.publicationActionHandler(final_actions)
 
         # Log results
@@ -1299,13 +1163,10 @@ class OGBActionManager:
         else:
             final_actions = enhanced_actions
 
-        # Remove duplicate actions for the same capability, keeping highest priority
-        final_actions = self._remove_duplicate_actions(final_actions)
-
         # STEP 3: ENVIRONMENT GUARD (always active)
         final_actions = await self._apply_environment_guard(final_actions)
 
-        # STEP 4: Execute actions
+        # STEP 4: Execute actions (duplicates are removed during publication)
         await self.publicationActionHandler(final_actions)
 
         # Log results
@@ -1443,7 +1304,6 @@ class OGBActionManager:
             )
             
             final_actions = await self._apply_environment_guard(actionMap)
-            final_actions = self._remove_duplicate_actions(final_actions)
             await self.publicationActionHandler(final_actions)
 
     async def publicationActionHandler(self, actionMap: List):
@@ -1451,9 +1311,10 @@ class OGBActionManager:
         Execute device actions and emit DataRelease event.
         
         This is the core action execution method that:
-        1. Stores actions in history for analytics
-        2. Emits device-specific events
-        3. Triggers DataRelease for Premium API sync
+        1. Removes conflicting and duplicate actions (one ActionIndex)
+        2. Stores actions in history for analytics
+        3. Emits device-specific events
+        4. Triggers DataRelease for Premium API sync
         
         Args:
             actionMap: List of actions to execute
@@ -1465,6 +1326,9 @@ class OGBActionManager:
 
         actionMap = await self._apply_environment_guard(actionMap)
         actionMap = self._apply_negative_pressure_guard(actionMap)
+
+        # One index for the cycle: conflict removal and dedup both read from it
+        actionMap = ActionIndex(actionMap).resolved(self._conflict_graph(), self.room)
         _LOGGER.debug(f"{self.room}: Executing {len(actionMap)} validated actions")
 
         # CRITICAL: Send LogForClient as bundle (original format expected by UI)
@@ -1472,122 +1336,50 @@ class OGBActionManager:
             await self.event_manager.emit("LogForClient", actionMap, haEvent=True, debug_type="INFO")
 
         
-        # Build action set with all actions from this execution cycle
+        # History entry, API payload and device events come from one pass over the actions
         # API expects: {device: "exhaust", action: "Increase", priority: "high", reason: "...", controllerType: "VPD-P"}
         current_time = time.time()
+        controller_type = self._map_tentmode_to_controller_type(tentMode)
+        history_actions, controlCommands, device_events = build_action_records(
+            actionMap, controller_type, current_time
+        )
         action_set = {
-            "actions": [],
+            "actions": history_actions,
             "timestamp": current_time,
             "room": self.room,
-            "controllerType": self._map_tentmode_to_controller_type(tentMode),
+            "controllerType": controller_type,
         }
-        
-        for action in actionMap:
-            # Map capability to device name (canExhaust -> exhaust, canHeat -> heat, etc.)
-            capability = getattr(action, 'capability', '')
-            device = capability.replace('can', '').lower() if capability.startswith('can') else capability.lower()
-            
-            action_entry = {
-                "device": device,
-                "action": getattr(action, 'action', 'Eval'),
-                "priority": getattr(action, 'priority', 'medium') or 'medium',
-                "reason": getattr(action, 'message', ''),
-                "timestamp": current_time,
-                "controllerType": action_set["controllerType"],
-                # Keep capability for backwards compatibility with HA format conversion
-                "capability": capability,
-            }
-            action_set["actions"].append(action_entry)
-
-        # Use lock for thread-safe action history updates to prevent race conditions
-        async with self.cooldown_manager._lock:
-            previousActions = self.data_store.get("previousActions") or []
-            
-            # Only add if we have actions
-            if action_set["actions"]:
-                previousActions.append(action_set)
 
-            # Keep only the last 5 action sets (API expects max 5)
-            previousActions = previousActions[-5:]
-            self.data_store.set("previousActions", previousActions)
+        # No await between read and write, so the update is atomic on the event loop
+        previousActions = self.data_store.get("previousActions") or []
+
+        # Only add if we have actions
+        if history_actions:
+            previousActions.append(action_set)
+
+        # Keep only the last 5 action sets (API expects max 5)
+        previousActions = previousActions[-5:]
+        self.data_store.set("previousActions", previousActions)
         
         # CRITICAL: Also store actionData for API compatibility
         # The API's HistoricalDataTrainer.extractActionsFromRecord() expects actionData.controlCommands
         # This ensures ALL modes (VPD Perfection, PID, MPC, AI, etc.) provide data for AI training
-        controlCommands = []
-        for action_entry in action_set.get("actions", []):
-            controlCommands.append({
-                "device": action_entry.get("device", ""),
-                "action": action_entry.get("action", "Eval"),
-                "priority": action_entry.get("priority", "medium"),
-                "reason": action_entry.get("reason", ""),
-                "timestamp": action_entry.get("timestamp", current_time),
-                "controllerType": action_set.get("controllerType", "VPD-P"),
-            })
-        
         actionData = {
-            "controllerType": action_set.get("controllerType", "VPD-P"),
+            "controllerType": controller_type,
             "commandCount": len(controlCommands),
             "controlCommands": controlCommands,
         }
         self.data_store.set("actionData", actionData)
         
-        # DEBUG: Log the format being saved
-        _LOGGER.debug(f"🔍 {self.room} actionData: {actionData}")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(f"🔍 {self.room} actionData: {actionData}")
 
         # Execute device-specific actions
-        for action in actionMap:
-            actionCap = getattr(action, 'capability', None)
-            actionType = getattr(action, 'action', None)
-            actionMessage = getattr(action, 'message', '')
-            
-            if not actionCap or not actionType:
-                continue
-                
-            _LOGGER.debug(f"{self.room}: {actionCap} - {actionType} - {actionMessage}")
-
-            # Emit device-specific events with error handling
-            # Build event data with optional target value for dimmable devices
-            action_value = getattr(action, 'value', None)
-            event_data = actionType if action_value is None else {"action": actionType, "value": action_value}
-            
+        for event_name, event_data in device_events:
             try:
-                if actionCap == "canExhaust":
-                    await self.event_manager.emit(f"{actionType} Exhaust", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Exhaust executed." + (f" Value: {action_value}" if action_value else ""))
-                elif actionCap == "canIntake":
-                    await self.event_manager.emit(f"{actionType} Intake", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Intake executed." + (f" Value: {action_value}" if action_value else ""))
-                elif actionCap == "canVentilate":
-                    await self.event_manager.emit(f"{actionType} Ventilation", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Ventilation executed.")
-                elif actionCap == "canWindow":
-                    await self.event_manager.emit(f"{actionType} Ventilation", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Window (via Ventilation) executed.")
-                elif actionCap == "canHumidify":
-                    await self.event_manager.emit(f"{actionType} Humidifier", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Humidifier executed." + (f" Value: {action_value}" if action_value else ""))
-                elif actionCap == "canDehumidify":
-                    await self.event_manager.emit(f"{actionType} Dehumidifier", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Dehumidifier executed." + (f" Value: {action_value}" if action_value else ""))
-                elif actionCap == "canHeat":
-                    await self.event_manager.emit(f"{actionType} Heater", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Heater executed." + (f" Value: {action_value}" if action_value else ""))
-                elif actionCap == "canCool":
-                    await self.event_manager.emit(f"{actionType} Cooler", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Cooler executed." + (f" Value: {action_value}" if action_value else ""))
-                elif actionCap == "canClimate":
-                    await self.event_manager.emit(f"{actionType} Climate", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Climate executed.")
-                elif actionCap == "canCO2":
-                    _LOGGER.debug(f"{self.room}: Emitting {actionType} CO2")
-                    await self.event_manager.emit(f"{actionType} CO2", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} CO2 executed.")
-                elif actionCap == "canLight":
-                    await self.event_manager.emit(f"{actionType} Light", event_data)
-                    _LOGGER.debug(f"{self.room}: {actionType} Light executed.")
+                await self.event_manager.emit(event_name, event_data)
             except Exception as e:
-                _LOGGER.error(f"{self.room}: Failed to execute {actionCap} {actionType} action: {e}")
+                _LOGGER.error(f"{self.room}: Failed to execute {event_name} action: {e}")
                 # Continue with next action instead of failing the entire batch
 
         # Emit DataRelease event for Premium API synchronization (ONLY IF mainControl is Premium)
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import os
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Callable, Dict, List, Optional
 
 from ..data.OGBParams.OGBParams import DEFAULT_DEVICE_COOLDOWNS
@@ -250,6 +250,14 @@ class OGBConsoleManager:
             ["reset_costs", "reset_costs today", "reset_costs all"],
         )
 
+        self.register_command(
+            "profiler",
+            self.cmd_profiler,
+            "Control loop profiler: per-stage latency percentiles and event-loop lag",
+            "profiler [on|off|reset|status] [top_n]",
+            ["profiler on", "profiler status", "profiler status 5", "profiler off"],
+        )
+
     def register_command(
         self,
         name: str,
@@ -1442,18 +1450,20 @@ class OGBConsoleManager:
 
     async def cmd_get_costs(self, params: List[str]):
         """Shows detailed energy consumption, costs, and device statistics."""
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
+        from .OGBEnergyManager import month_totals, week_totals
         
         energy_data = self.data_store.getDeep("Energy", {})
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        yesterday_str = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        week_str = datetime.now().strftime("%Y-W%W")
-        month_str = datetime.now().strftime("%Y-%m")
+        now = datetime.now(timezone.utc)
+        today_str = now.strftime("%Y-%m-%d")
+        yesterday_str = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+        week_str = now.strftime("%Y-W%W")
+        month_str = now.strftime("%Y-%m")
         
         daily = energy_data.get("daily", {}).get(today_str, {})
         yesterday = energy_data.get("daily", {}).get(yesterday_str, {})
-        weekly = energy_data.get("weekly", {}).get(week_str, {})
-        monthly = energy_data.get("monthly", {}).get(month_str, {})
+        weekly = week_totals(energy_data, now)
+        monthly = month_totals(energy_data, now)
         price = energy_data.get("price_per_kwh", 0.35)
         currency = energy_data.get("currency", "EUR")
         
@@ -1550,20 +1560,20 @@ class OGBConsoleManager:
                     # Sort by power consumption
                     sorted_active = sorted(
                         active_devices.items(),
-                        key=lambda x: x[1].get('power_watts', 0),
+                        key=lambda x: x[1].power_watts,
                         reverse=True
                     )
                     
-                    total_power = sum(t.get('power_watts', 0) for t in active_devices.values())
+                    total_power = sum(t.power_watts for t in active_devices.values())
                     lines.append(f"   Total Power Draw: {total_power:.1f}W")
                     lines.append("")
                     lines.append("   Device          Power   Type    Session kWh")
                     lines.append("   ───────────────────────────────────────────")
                     
                     for device_name, tracking in sorted_active:
-                        power = tracking.get("power_watts", 0.0)
-                        is_estimated = tracking.get("is_estimated", True)
-                        session_kwh = tracking.get("session_kwh", 0.0)
+                        power = tracking.power_watts
+                        is_estimated = tracking.is_estimated
+                        session_kwh = tracking.session_kwh
                         source = "EST" if is_estimated else "SNS"
                         lines.append(
                             f"   {device_name:<14} {power:>6.1f}W {source:>6} {session_kwh:>9.4f}"
@@ -1587,26 +1597,37 @@ class OGBConsoleManager:
             )
             return
         
+        from .OGBEnergyManager import month_bounds, week_bounds
+
         energy_data = self.data_store.getDeep("Energy", {})
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        week_str = datetime.now().strftime("%Y-W%W")
-        month_str = datetime.now().strftime("%Y-%m")
+        daily = energy_data.get("daily", {})
+        now = datetime.now(timezone.utc)
+        today_str = now.strftime("%Y-%m-%d")
         
         reset_items = []
+
+        # Week/month totals are derived from the daily ledger, so resetting
+        # them means clearing the daily buckets they cover.
+        def _clear_days(start, end):
+            start_key = start.strftime("%Y-%m-%d")
+            end_key = end.strftime("%Y-%m-%d")
+            cleared = False
+            for day_key in daily:
+                if start_key <= day_key <= end_key:
+                    daily[day_key] = {"kwh": 0.0, "cost": 0.0, "runtime": {}}
+                    cleared = True
+            return cleared
         
         if scope in ["today", "all"]:
-            if today_str in energy_data.get("daily", {}):
-                energy_data["daily"][today_str] = {"kwh": 0.0, "cost": 0.0, "runtime": {}}
+            if _clear_days(now, now):
                 reset_items.append("Today's data")
         
         if scope in ["week", "all"]:
-            if week_str in energy_data.get("weekly", {}):
-                energy_data["weekly"][week_str] = {"kwh": 0.0, "cost": 0.0}
+            if _clear_days(*week_bounds(now)):
                 reset_items.append("This week's data")
         
         if scope in ["month", "all"]:
-            if month_str in energy_data.get("monthly", {}):
-                energy_data["monthly"][month_str] = {"kwh": 0.0, "cost": 0.0}
+            if _clear_days(*month_bounds(now)):
                 reset_items.append("This month's data")
         
         # Reset active device session tracking
@@ -1620,9 +1641,7 @@ class OGBConsoleManager:
                             break
                 
                 if main_controller and hasattr(main_controller, 'energy_manager'):
-                    energy_mgr = main_controller.energy_manager
-                    for device_name in list(energy_mgr._device_tracking.keys()):
-                        energy_mgr._device_tracking[device_name]["session_kwh"] = 0.0
+                    main_controller.energy_manager.reset_sessions()
                     reset_items.append("Active device sessions")
             except Exception as e:
                 _LOGGER.debug(f"[{self.room}] Could not reset active sessions: {e}")
@@ -1853,6 +1872,72 @@ class OGBConsoleManager:
         summary.append("="*50)
         await self._send_response("\n".join(summary))
 
+    async def cmd_profiler(self, params: List[str]):
+        """
+        Switches the control loop profiler on/off or shows its histograms.
+        Usage: profiler [on|off|reset|status] [top_n]
+        """
+        action = params[0].lower() if params else "status"
+
+        if action == "on":
+            self.event_manager.enable_profiling(True)
+            await self._send_response(
+                "✅ Profiler enabled. Run 'profiler status' after a few control cycles."
+            )
+            return
+        if action == "off":
+            self.event_manager.enable_profiling(False)
+            await self._send_response("✅ Profiler disabled (collected data kept until 'profiler reset').")
+            return
+        if action == "reset":
+            self.event_manager.profiler.reset()
+            await self._send_response("✅ Profiler histograms cleared.")
+            return
+        if action != "status":
+            await self._send_response(
+                "⚠️ Invalid arguments.\nUsage: profiler [on|off|reset|status] [top_n]"
+            )
+            return
+
+        try:
+            top = int(params[1]) if len(params) > 1 else 10
+        except ValueError:
+            await self._send_response("⚠️ top_n must be an integer.")
+            return
+
+        profile = self.event_manager.get_profile(top=top)
+        lines = [
+            f"⏱️ Control Loop Profiler ({'ON' if profile['enabled'] else 'OFF'})",
+            "=" * 50,
+        ]
+
+        def _fmt(name, stats):
+            if not stats.get("count"):
+                return f"  {name:<32} -"
+            return (
+                f"  {name:<32} n={stats['count']:<6} p50={stats['p50_ms']:.1f} "
+                f"p95={stats['p95_ms']:.1f} p99={stats['p99_ms']:.1f} max={stats['max_ms']:.1f} ms"
+            )
+
+        lines.append(_fmt("event loop lag", profile["loop_lag"]))
+        tasks = profile["tasks"]
+        lines.append(
+            f"  tasks: active={tasks['active']} peak={tasks['peak_active']} "
+            f"background={tasks['background']} listeners={profile['registered_listeners']}"
+        )
+        for title, key in (
+            ("Spans", "spans"),
+            ("Listener run time by event", "listeners"),
+            ("Slowest handlers", "handlers"),
+            ("Emit dispatch", "emits"),
+        ):
+            if profile[key]:
+                lines.append(f"\n{title}:")
+                lines.extend(_fmt(name, stats) for name, stats in profile[key].items())
+
+        lines.append("=" * 50)
+        await self._send_response("\n".join(lines))
+
     # =========================
     # UTILITY METHODS
     # =========================
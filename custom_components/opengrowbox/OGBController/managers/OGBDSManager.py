@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 
 from ..data.OGBParams.OGBParams import CAP_MAPPING
 from ..utils.ambient import is_ambient_room
+from ..utils.stateCodec import SCHEMA_KEY, SCHEMA_VERSION, dumps, loads, migrate, register_migration
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +45,18 @@ PRESERVED_STATE_KEYS = {
     
     # Device Cooldowns (GCDs - müssen persistiert werden)
     "deviceCooldowns",
+
+    # Aktive Cooldowns (Wall-Clock Ablaufzeiten, siehe OGBgcdManager)
+    "cooldownState",
+
+    # Offene Dosier-Jobs (werden nach Neustart fortgesetzt, siehe OGBDosingScheduler)
+    "dosingJobs",
+
+    # Compliance Tages-Zusammenfassungen (7/30-Tage Reports, siehe OGBComplianceEngine)
+    "complianceDaily",
+
+    # Rate-Limit Budgets (GCRA Ankunftszeiten, siehe OGBRateLimiter)
+    "rateLimiterState",
     
     # Energy consumption data (daily/weekly/monthly tracking)
     "Energy",
@@ -271,6 +284,12 @@ def _clean_corrupted_data(data: Dict[str, Any], room: str) -> Dict[str, Any]:
     return data
 
 
+@register_migration(0)
+def _migrate_unversioned_state(data: Dict[str, Any], room: str) -> Dict[str, Any]:
+    """Files written before the state codec may still carry corrupted values."""
+    return _clean_corrupted_data(data, room)
+
+
 def _merge_capabilities(data: Dict[str, Any], room: str) -> Dict[str, Any]:
     """Ensure capability schema keys exist in loaded state.
 
@@ -376,9 +395,8 @@ class OGBDSManager:
             
             _LOGGER.debug(f"[{self.room}] 📥 LOADING state from {self.storage_path}")
             
-            # CRITICAL: Clean corrupted data before loading into datastore
-            # This fixes issues like corrupted tuple strings in growMediums
-            data = _clean_corrupted_data(data, self.room)
+            # Schema migrations (incl. cleanup of corrupted legacy files) and typed field checks
+            data = self._decode_state(data)
             
             # Schema check only (do not restore runtime capability assignments)
             data = _merge_capabilities(data, self.room)
@@ -447,12 +465,21 @@ class OGBDSManager:
     def _sync_load_state(self):
         """Synchronous file read - called via executor job."""
         try:
-            with open(self.storage_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(self.storage_path, "rb") as f:
+                return loads(f.read())
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error reading state file: {e}")
             return None
 
+    def _decode_state(self, data):
+        """Run schema migrations and the per-field decoders of the datastore codec."""
+        if not isinstance(data, dict):
+            return data
+        codec = getattr(self.data_store, "codec", None)
+        if codec is None:
+            return migrate(data, self.room)
+        return codec.decode(data, self.room)
+
     def _get_secure_path(self, filename: str) -> str:
         """Gibt einen sicheren Pfad unterhalb von /config/ogb_data zurück."""
         subdir = self.hass.config.path("ogb_data")
@@ -485,10 +512,11 @@ class OGBDSManager:
             
             # CRITICAL: Sanitize before saving
             preserved_state = self._sanitize_state_for_save(preserved_state)
+            preserved_state[SCHEMA_KEY] = SCHEMA_VERSION
             
             # Teste JSON-Serialisierung vor dem Speichern
             try:
-                json_string = json.dumps(preserved_state, indent=2, default=str)
+                json_string = dumps(preserved_state)
                 json_size_kb = len(json_string) / 1024
                 
                 # CRITICAL: Refuse to save if file is too large (indicates corruption)
@@ -506,7 +534,8 @@ class OGBDSManager:
 
                     # Fallback: persist a reduced state instead of losing all recent changes
                     reduced_state = self._create_reduced_state_for_emergency(preserved_state)
-                    json_string = json.dumps(reduced_state, indent=2, default=str)
+                    reduced_state[SCHEMA_KEY] = SCHEMA_VERSION
+                    json_string = dumps(reduced_state)
                     _LOGGER.debug(f"[{self.room}] ⚠️ Reduced state persisted ({len(json_string) / 1024:.1f}KB) to prevent config loss")
                 elif json_size_kb > 50:
                     _LOGGER.warning(f"[{self.room}] ⚠️ State file size: {json_size_kb:.1f}KB - consider cleanup")
@@ -516,7 +545,7 @@ class OGBDSManager:
             except Exception as json_error:
                 _LOGGER.error(f"❌ JSON serialization failed: {json_error}")
                 simplified_state = self._create_simplified_state(preserved_state)
-                json_string = json.dumps(simplified_state, indent=2, default=str)
+                json_string = dumps(simplified_state)
                 _LOGGER.debug(f"⚠️ Saving simplified state instead")
 
             await asyncio.to_thread(self._sync_save, json_string)
@@ -562,9 +591,12 @@ class OGBDSManager:
                 if not isinstance(medium, dict):
                     continue
                 
-                # Check properties for corrupted data
+                # Check properties for corrupted data (copies: getFullState shares
+                # plain subtrees with the live datastore)
+                medium = dict(medium)
                 props = medium.get("properties", {})
                 if isinstance(props, dict):
+                    props = dict(props)
                     for key in ["ph_range", "ec_range"]:
                         val = props.get(key)
                         # Convert tuples to lists
@@ -599,7 +631,7 @@ class OGBDSManager:
                 "capture_at_night": False,
             }
         elif isinstance(state.get("plantsView"), dict):
-            pv = state["plantsView"]
+            pv = dict(state["plantsView"])
             pv.setdefault("TimeLapseIntervall", "900")
             pv.setdefault("OutPutFormat", "mp4")
             pv.setdefault("daily_snapshot_enabled", False)
@@ -647,9 +679,9 @@ class OGBDSManager:
         
         return reduced
 
-    def _sync_save(self, json_string):
-        with open(self.storage_path, "w", encoding="utf-8") as f:
-            f.write(json_string)
+    def _sync_save(self, json_bytes):
+        with open(self.storage_path, "wb") as f:
+            f.write(json_bytes)
 
     def _create_simplified_state(self, state):
         """Erstelle eine vereinfachte Version des States für die Serialisierung."""
@@ -675,8 +707,8 @@ class OGBDSManager:
         try:
             loaded_data = await asyncio.to_thread(self._sync_load)
             
-            # CRITICAL: Clean corrupted data before loading
-            loaded_data = _clean_corrupted_data(loaded_data, self.room)
+            # CRITICAL: Migrate/clean corrupted data before loading
+            loaded_data = self._decode_state(loaded_data)
             
             _LOGGER.debug(f"✅ State loaded from {self.storage_path}")
 
@@ -692,8 +724,8 @@ class OGBDSManager:
             _LOGGER.error(f"❌ Failed to load DataStore: {e}")
 
     def _sync_load(self):
-        with open(self.storage_path, "r") as f:
-            return json.load(f)
+        with open(self.storage_path, "rb") as f:
+            return loads(f.read())
 
     async def deleteState(self, data):
         """Löscht die gespeicherte Datei."""
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, List
 
@@ -27,17 +28,111 @@ DEFAULT_POWER_ESTIMATES = {
 }
 
 
+# Periodic flush cadence. Integration itself is event driven; the flush only
+# closes open intervals for devices without fresh samples and appends to the
+# daily ledger.
+LEDGER_FLUSH_INTERVAL_SECONDS = 900
+
+# Minimum spacing between SaveState requests caused by energy bookkeeping.
+PERSIST_MIN_INTERVAL_SECONDS = 900
+
+# Daily buckets older than this are pruned from the ledger.
+LEDGER_RETENTION_DAYS = 180
+
+
+def _day_key(ts: float) -> str:
+    """Return the UTC ledger key (YYYY-MM-DD) for an epoch timestamp."""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _next_midnight_ts(ts: float) -> float:
+    """Return the epoch timestamp of the next UTC midnight after ts."""
+    day = datetime.fromtimestamp(ts, tz=timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (day + timedelta(days=1)).timestamp()
+
+
+def sum_daily_buckets(energy_data: Dict[str, Any], start: datetime, end: datetime) -> Dict[str, float]:
+    """Sum kWh and runtime of all daily ledger buckets in [start, end].
+
+    Weekly and monthly figures are derived from the daily ledger on demand
+    instead of being stored as separate trees.
+    """
+    daily = energy_data.get("daily", {}) or {}
+    start_key = start.strftime("%Y-%m-%d")
+    end_key = end.strftime("%Y-%m-%d")
+    kwh = 0.0
+    runtime = 0.0
+    for day_key, bucket in daily.items():
+        if start_key <= day_key <= end_key and isinstance(bucket, dict):
+            kwh += bucket.get("kwh", 0.0)
+            runtime += sum((bucket.get("runtime") or {}).values())
+    price_per_kwh = energy_data.get("price_per_kwh", 0.35)
+    return {
+        "kwh": round(kwh, 4),
+        "cost": round(kwh * price_per_kwh, 4),
+        "runtime_hours": round(runtime, 2),
+    }
+
+
+def week_bounds(now: datetime) -> tuple[datetime, datetime]:
+    """Return Monday..Sunday of the week containing now."""
+    week_start = now - timedelta(days=now.weekday())
+    return week_start, week_start + timedelta(days=6)
+
+
+def month_bounds(now: datetime) -> tuple[datetime, datetime]:
+    """Return first..last day of the month containing now."""
+    month_start = now.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    return month_start, next_month - timedelta(days=1)
+
+
+def week_totals(energy_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, float]:
+    """Lazily computed totals for the current week."""
+    now = now or datetime.now(timezone.utc)
+    return sum_daily_buckets(energy_data, *week_bounds(now))
+
+
+def month_totals(energy_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, float]:
+    """Lazily computed totals for the current month."""
+    now = now or datetime.now(timezone.utc)
+    return sum_daily_buckets(energy_data, *month_bounds(now))
+
+
+class EnergyCounter:
+    """Compact running state for one powered device."""
+
+    __slots__ = (
+        "power_watts",
+        "last_ts",
+        "start_ts",
+        "session_kwh",
+        "is_estimated",
+    )
+
+    def __init__(self, power_watts: float, now_ts: float, is_estimated: bool):
+        self.power_watts = power_watts
+        self.last_ts = now_ts
+        self.start_ts = now_ts
+        self.session_kwh = 0.0
+        self.is_estimated = is_estimated
+
+
 class OGBEnergyManager:
     """Enterprise-safe energy consumption tracking per room.
     
     Architecture:
-    - Event-based device state tracking (ON/OFF)
-    - Power sensor updates update wattage readings
-    - Periodic aggregation (every 5 min) calculates accumulated kWh
+    - Event-driven integration: every PowerSensorUpdate closes the interval
+      since the previous sample with the trapezoidal rule
+    - DeviceStateChange starts/stops per-device counters
+    - Energy is credited to an in-memory ledger keyed by UTC day and appended
+      to the daily buckets in Energy.daily; intervals crossing midnight are split
+    - Weekly/monthly totals are computed lazily from the daily buckets
+    - A slow flush (every 15 min) closes intervals for devices without fresh
+      samples (estimated power) and requests a debounced SaveState
     - Startup scan catches devices already running
-    - Estimated power fallback for devices without power sensors
-    - UTC timestamps for daylight-saving safety
-    - Atomic updates to prevent data corruption
     """
 
     def __init__(self, hass, data_store, event_manager, room):
@@ -54,27 +149,25 @@ class OGBEnergyManager:
         self.event_manager = event_manager
         self.room = room
 
+        # Active counters per running device
+        self._device_tracking: Dict[str, EnergyCounter] = {}
+
+        # Energy not yet appended to the ledger:
+        # {day_key: {device_name: [kwh, runtime_seconds]}}
+        self._pending: Dict[str, Dict[str, List[float]]] = {}
+
+        self._dirty = False
+        self._last_persist_ts = 0.0
+
+        # Background task for periodic ledger flush
+        self._update_task = None
+        self._shutdown = False
+
         # Skip initialization for ambient room - no devices to track
         if is_ambient_room(self.room):
             _LOGGER.debug(f"[{self.room}] OGBEnergyManager disabled - ambient room")
             return
 
-        # Active tracking state per device
-        # {
-        #   device_name: {
-        #     "power_watts": float,       # Current power reading
-        #     "last_update": datetime,     # Last energy calculation timestamp (UTC)
-        #     "start_time": datetime,      # When device turned ON (UTC)
-        #     "session_kwh": float,        # kWh accumulated this session
-        #     "is_estimated": bool,        # Whether using estimated power
-        #   }
-        # }
-        self._device_tracking: Dict[str, Dict[str, Any]] = {}
-
-        # Background task for periodic aggregation
-        self._update_task = None
-        self._shutdown = False
-
         # Register event handlers
         self.event_manager.on("DeviceStateChange", self._on_device_state_change)
         self.event_manager.on("PowerSensorUpdate", self._on_power_sensor_update)
@@ -85,39 +178,28 @@ class OGBEnergyManager:
         _LOGGER.debug(f"[{self.room}] OGBEnergyManager initialized")
 
     def _start_background_tasks(self):
-        """Start background update and persistence loops."""
+        """Start the background ledger flush loop."""
         if self._update_task is None or self._update_task.done():
             self._update_task = asyncio.create_task(self._background_loop())
 
     async def _background_loop(self):
-        """Background loop for periodic aggregation and persistence."""
+        """Background loop that periodically flushes the ledger."""
         # Wait a bit for devices to initialize before scanning
         await asyncio.sleep(5)
         
         # Initial scan for already-running devices
         await self._scan_initial_devices()
+        await self._update_sensor_entities()
         
         _LOGGER.debug(f"[{self.room}] Energy background loop started")
         
         while not self._shutdown:
             try:
-                _LOGGER.debug(f"[{self.room}] Energy loop iteration starting")
-                
-                # Check for day rollover
-                await self._check_day_rollover()
-                
-                # Calculate energy for all tracked devices
-                await self._calculate_all_tracked_devices()
-                
-                # Aggregate and persist
-                await self._aggregate_and_persist()
-                
-                # Update HA sensor entities
+                await asyncio.sleep(LEDGER_FLUSH_INTERVAL_SECONDS)
+
+                self._integrate_all(time.time())
+                await self._flush_ledger()
                 await self._update_sensor_entities()
-                
-                _LOGGER.debug(f"[{self.room}] Energy loop iteration complete, sleeping 5min")
-                
-                await asyncio.sleep(300)  # 5 minutes
             except asyncio.CancelledError:
                 _LOGGER.debug(f"[{self.room}] Energy background loop cancelled")
                 break
@@ -169,20 +251,14 @@ class OGBEnergyManager:
         Args:
             device: Device object with deviceName, isRunning, etc.
         """
+        device_name = getattr(device, "deviceName", None)
         try:
-            device_name = device.deviceName
-            
             # Read current power value
             power_watts, is_estimated = await self._read_device_power(device)
-            
-            now = datetime.now(timezone.utc)
-            self._device_tracking[device_name] = {
-                "power_watts": power_watts,
-                "last_update": now,
-                "start_time": now,
-                "session_kwh": 0.0,
-                "is_estimated": is_estimated,
-            }
+
+            self._device_tracking[device_name] = EnergyCounter(
+                power_watts, time.time(), is_estimated
+            )
             
             source = "estimated" if is_estimated else "sensor"
             _LOGGER.debug(
@@ -257,7 +333,6 @@ class OGBEnergyManager:
         try:
             device_name = event_data.get("device_name")
             is_running = event_data.get("is_running", False)
-            entity_id = event_data.get("entity_id", "")
 
             if not device_name:
                 return
@@ -273,32 +348,25 @@ class OGBEnergyManager:
                         # Fallback: start with estimated power
                         await self._start_tracking_with_estimate(device_name)
             else:
-                # Device turned off - finalize tracking
-                if device_name in self._device_tracking:
-                    # Calculate final energy for this session
-                    await self._calculate_device_energy(device_name)
-                    
-                    tracking = self._device_tracking[device_name]
-                    session_kwh = tracking.get("session_kwh", 0.0)
-                    duration = datetime.now(timezone.utc) - tracking["start_time"]
-                    hours = duration.total_seconds() / 3600.0
-                    
-                    _LOGGER.debug(
-                        f"[{self.room}] Energy tracking stopped for {device_name}: "
-                        f"{session_kwh:.4f} kWh in {hours:.1f}h"
-                    )
-                    
-                    # CRITICAL FIX: Save runtime to daily data BEFORE removing from tracking
-                    # This ensures short sessions (like mistpump) are recorded
-                    if session_kwh > 0 or hours > 0:
-                        await self._save_session_to_daily(device_name, session_kwh, hours)
-                    
-                    # Remove from active tracking
-                    del self._device_tracking[device_name]
-                    
-                    # Persist immediately on state change
-                    await self._aggregate_and_persist()
-                    await self._update_sensor_entities()
+                # Device turned off - close the last interval and drop the counter
+                counter = self._device_tracking.get(device_name)
+                if counter is None:
+                    return
+
+                now_ts = time.time()
+                self._integrate(device_name, counter, now_ts)
+                hours = (now_ts - counter.start_ts) / 3600.0
+
+                _LOGGER.debug(
+                    f"[{self.room}] Energy tracking stopped for {device_name}: "
+                    f"{counter.session_kwh:.4f} kWh in {hours:.1f}h"
+                )
+
+                del self._device_tracking[device_name]
+
+                # Append the finished session so short runs (mistpump) are never lost
+                await self._flush_ledger()
+                await self._update_sensor_entities()
 
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error handling device state change: {e}")
@@ -319,70 +387,20 @@ class OGBEnergyManager:
             if key in device_name.lower():
                 power = estimate
                 break
-        
-        now = datetime.now(timezone.utc)
-        self._device_tracking[device_name] = {
-            "power_watts": power,
-            "last_update": now,
-            "start_time": now,
-            "session_kwh": 0.0,
-            "is_estimated": True,
-        }
+
+        self._device_tracking[device_name] = EnergyCounter(power, time.time(), True)
         
         _LOGGER.debug(
             f"[{self.room}] Energy tracking started for {device_name} "
             f"at {power}W (estimated, device not found)"
         )
 
-    async def _save_session_to_daily(self, device_name: str, session_kwh: float, hours: float):
-        """Save a completed session directly to daily data.
-        
-        This ensures short sessions (like mistpump) are not lost.
-        """
-        try:
-            energy_data = self.data_store.getDeep("Energy", {})
-            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            price_per_kwh = energy_data.get("price_per_kwh", 0.35)
-            
-            if "daily" not in energy_data:
-                energy_data["daily"] = {}
-            if today_str not in energy_data["daily"]:
-                energy_data["daily"][today_str] = {
-                    "kwh": 0.0,
-                    "cost": 0.0,
-                    "runtime": {},
-                }
-            
-            daily_data = energy_data["daily"][today_str]
-            
-            # Add session energy to today's total
-            daily_data["kwh"] = round(daily_data.get("kwh", 0.0) + session_kwh, 4)
-            daily_data["cost"] = round(daily_data["kwh"] * price_per_kwh, 4)
-            
-            # Update runtime
-            runtime = daily_data.get("runtime", {})
-            if device_name in runtime:
-                runtime[device_name] = round(runtime[device_name] + hours, 2)
-            else:
-                runtime[device_name] = round(hours, 2)
-            daily_data["runtime"] = runtime
-            
-            energy_data["daily"][today_str] = daily_data
-            self.data_store.setDeep("Energy", energy_data)
-            
-            _LOGGER.debug(
-                f"[{self.room}] Saved session for {device_name}: "
-                f"{session_kwh:.6f} kWh, {hours:.2f}h"
-            )
-            
-        except Exception as e:
-            _LOGGER.error(f"[{self.room}] Error saving session to daily: {e}")
-
     async def _on_power_sensor_update(self, event_data):
         """Handle power sensor updates from devices.
         
-        CRITICAL FIX: If power > 0 but device not in tracking, start tracking!
-        This handles devices that are on but we missed the startup event.
+        Each sample closes the interval since the previous one (trapezoidal
+        rule). If power > 0 but the device is not tracked yet, tracking starts
+        - this handles devices that are on but we missed the startup event.
         """
         # Skip for ambient room - no devices to track
         if is_ambient_room(self.room):
@@ -395,330 +413,240 @@ class OGBEnergyManager:
             if not device_name:
                 return
 
-            if device_name not in self._device_tracking:
-                # CRITICAL FIX: If power > 0, device is obviously running!
-                try:
-                    power = float(power_watts)
-                    if power > 0:
-                        device = self._find_device_by_name(device_name)
-                        if device:
-                            await self._start_device_tracking(device)
-                            _LOGGER.debug(
-                                f"[{self.room}] Auto-started tracking for {device_name} "
-                                f"due to power reading: {power}W"
-                            )
-                        else:
-                            await self._start_tracking_with_estimate(device_name)
-                            # Update power to actual reading
-                            self._device_tracking[device_name]["power_watts"] = power
-                    else:
-                        # Power is 0, device is probably off - ignore
-                        pass
-                except (ValueError, TypeError):
-                    pass
-                return
-
-            tracking = self._device_tracking[device_name]
-            
-            # Validate power value
             try:
                 power = float(power_watts)
-                if power < 0:
-                    _LOGGER.warning(
-                        f"[{self.room}] Negative power reading from {device_name}: "
-                        f"{power}W, ignoring"
-                    )
-                    return
-                tracking["power_watts"] = power
-                tracking["is_estimated"] = False
-                
-                _LOGGER.debug(
-                    f"[{self.room}] {device_name} power updated: {power}W"
-                )
             except (ValueError, TypeError):
                 _LOGGER.warning(
                     f"[{self.room}] Invalid power reading from {device_name}: "
                     f"{power_watts}"
                 )
+                return
 
-        except Exception as e:
-            _LOGGER.error(f"[{self.room}] Error handling power sensor update: {e}")
+            if power < 0:
+                _LOGGER.warning(
+                    f"[{self.room}] Negative power reading from {device_name}: "
+                    f"{power}W, ignoring"
+                )
+                return
 
-    async def _calculate_device_energy(self, device_name: str) -> float:
-        """Calculate accumulated energy for a device since last update.
-        
-        Returns:
-            Energy added in this calculation (kWh)
-        """
-        if device_name not in self._device_tracking:
-            return 0.0
+            counter = self._device_tracking.get(device_name)
+            if counter is None:
+                # Power > 0 means the device is obviously running
+                if power > 0:
+                    device = self._find_device_by_name(device_name)
+                    if device:
+                        await self._start_device_tracking(device)
+                    else:
+                        await self._start_tracking_with_estimate(device_name)
+                    counter = self._device_tracking.get(device_name)
+                    if counter is not None:
+                        counter.power_watts = power
+                        counter.is_estimated = False
+                    _LOGGER.debug(
+                        f"[{self.room}] Auto-started tracking for {device_name} "
+                        f"due to power reading: {power}W"
+                    )
+                return
 
-        tracking = self._device_tracking[device_name]
-        last_update = tracking.get("last_update")
-        power_watts = tracking.get("power_watts", 0.0)
+            self._integrate(device_name, counter, time.time(), power)
+            counter.is_estimated = False
 
-        if not last_update or power_watts <= 0:
-            return 0.0
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Error handling power sensor update: {e}")
 
-        now = datetime.now(timezone.utc)
-        time_delta_hours = (now - last_update).total_seconds() / 3600.0
+    def _integrate(
+        self,
+        device_name: str,
+        counter: EnergyCounter,
+        now_ts: float,
+        new_power: Optional[float] = None,
+    ) -> float:
+        """Close the interval [counter.last_ts, now_ts] for one device.
 
-        if time_delta_hours <= 0:
-            return 0.0
+        Power is interpolated linearly between the previous and the new sample
+        (trapezoidal rule). Without a new sample the last power is held.
+        Intervals crossing UTC midnight are split so each day gets its share.
 
-        # Calculate energy: kWh = W * h / 1000
-        energy_kwh = (power_watts * time_delta_hours) / 1000.0
-        
-        # Validate: should not be negative or unreasonably high
-        if energy_kwh < 0:
-            _LOGGER.error(
-                f"[{self.room}] Negative energy calculated for {device_name}: "
-                f"{energy_kwh} kWh"
-            )
+        Returns:
+            Energy added in this interval (kWh)
+        """
+        start_ts = counter.last_ts
+        p_start = counter.power_watts
+        p_end = p_start if new_power is None else new_power
+
+        if now_ts <= start_ts:
+            counter.power_watts = p_end
             return 0.0
-        
-        max_expected = power_watts * 5.1 / 1000.0  # Max 5+ minutes worth
-        if energy_kwh > max_expected:
-            _LOGGER.warning(
-                f"[{self.room}] Unusually high energy for {device_name}: "
-                f"{energy_kwh:.4f} kWh (expected max {max_expected:.4f}). "
-                f"Time delta: {time_delta_hours:.2f}h"
-            )
 
-        tracking["session_kwh"] += energy_kwh
-        tracking["last_update"] = now
+        duration = now_ts - start_ts
+        slope = (p_end - p_start) / duration
+        added_kwh = 0.0
 
-        return energy_kwh
+        seg_start = start_ts
+        while seg_start < now_ts:
+            seg_end = min(_next_midnight_ts(seg_start), now_ts)
+            p_a = p_start + slope * (seg_start - start_ts)
+            p_b = p_start + slope * (seg_end - start_ts)
+            seconds = seg_end - seg_start
+            kwh = (p_a + p_b) / 2.0 * seconds / 3_600_000.0
 
-    async def _calculate_all_tracked_devices(self):
-        """Calculate energy for all currently tracked devices."""
-        total_added = 0.0
-        for device_name in list(self._device_tracking.keys()):
-            added = await self._calculate_device_energy(device_name)
-            total_added += added
-        
-        if total_added > 0:
-            _LOGGER.debug(
-                f"[{self.room}] Calculated {total_added:.4f} kWh for "
-                f"{len(self._device_tracking)} tracked devices"
+            entry = self._pending.setdefault(_day_key(seg_start), {}).setdefault(
+                device_name, [0.0, 0.0]
             )
-
-    async def _aggregate_and_persist(self):
-        """Aggregate tracking data and persist to data store.
-        
-        CRITICAL: Preserves existing energy data from disk - only adds new session energy.
+            entry[0] += kwh
+            entry[1] += seconds
+            added_kwh += kwh
+            seg_start = seg_end
+
+        counter.session_kwh += added_kwh
+        counter.last_ts = now_ts
+        counter.power_watts = p_end
+        return added_kwh
+
+    def _integrate_all(self, now_ts: float):
+        """Close open intervals for all tracked devices at now_ts."""
+        for device_name, counter in self._device_tracking.items():
+            self._integrate(device_name, counter, now_ts)
+
+    async def _flush_ledger(self, force_save: bool = False):
+        """Append pending energy to the daily ledger buckets.
+
+        Only the touched daily buckets are written. A SaveState is requested
+        at most every PERSIST_MIN_INTERVAL_SECONDS unless force_save is set.
         """
         try:
-            energy_data = self.data_store.getDeep("Energy", {})
-            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            
-            # Ensure today's data structure exists - preserve existing data!
-            if "daily" not in energy_data:
-                energy_data["daily"] = {}
-            
-            # CRITICAL FIX: Check if today's data already exists (loaded from disk)
-            if today_str not in energy_data["daily"]:
-                _LOGGER.debug(f"[{self.room}] Creating new daily energy entry for {today_str}")
-                energy_data["daily"][today_str] = {
-                    "kwh": 0.0,
-                    "cost": 0.0,
-                    "runtime": {},
-                }
-            
-            daily_data = energy_data["daily"][today_str]
-            price_per_kwh = energy_data.get("price_per_kwh", 0.35)
-
-            # CRITICAL FIX: Load EXISTING values from datastore (preserved from disk)
-            # Do NOT start from 0 - add to existing values
-            total_today_kwh = daily_data.get("kwh", 0.0)
-            total_runtime = daily_data.get("runtime", {}).copy()
-
-            # Only aggregate if we have active tracked devices
-            if self._device_tracking:
-                _LOGGER.debug(
-                    f"[{self.room}] Aggregating energy for {len(self._device_tracking)} "
-                    f"tracked devices (existing: {total_today_kwh:.4f} kWh)"
-                )
-
-                for device_name, tracking in self._device_tracking.items():
-                    session_kwh = tracking.get("session_kwh", 0.0)
-                    
-                    if session_kwh > 0:
-                        # Add session energy to today's total
-                        total_today_kwh += session_kwh
-                        
-                        _LOGGER.debug(
-                            f"[{self.room}] {device_name}: added {session_kwh:.6f} kWh "
-                            f"(total: {total_today_kwh:.4f})"
+            if self._pending:
+                energy_data = self.data_store.getDeep("Energy", {}) or {}
+                daily = energy_data.get("daily") or {}
+                price_per_kwh = energy_data.get("price_per_kwh", 0.35)
+                new_day = False
+
+                for day_key, devices in self._pending.items():
+                    bucket = daily.get(day_key)
+                    if bucket is None:
+                        bucket = {"kwh": 0.0, "cost": 0.0, "runtime": {}}
+                        new_day = True
+                    runtime = bucket.setdefault("runtime", {})
+                    day_kwh = bucket.get("kwh", 0.0)
+
+                    for device_name, (kwh, seconds) in devices.items():
+                        day_kwh += kwh
+                        runtime[device_name] = round(
+                            runtime.get(device_name, 0.0) + seconds / 3600.0, 4
                         )
-                    
-                    # Reset session counter (we've accounted for it)
-                    tracking["session_kwh"] = 0.0
-                    
-                    # Update runtime
-                    start_time = tracking.get("start_time")
-                    if start_time:
-                        runtime_hours = (datetime.now(timezone.utc) - start_time).total_seconds() / 3600.0
-                        total_runtime[device_name] = round(runtime_hours, 2)
-            else:
-                _LOGGER.debug(
-                    f"[{self.room}] No active devices to aggregate "
-                    f"(preserving {total_today_kwh:.4f} kWh)"
-                )
-
-            # Update today's totals
-            daily_data["kwh"] = round(total_today_kwh, 4)
-            daily_data["cost"] = round(total_today_kwh * price_per_kwh, 4)
-            daily_data["runtime"] = total_runtime
-            energy_data["daily"][today_str] = daily_data
-            energy_data["current_day"] = today_str
-            energy_data["last_update"] = datetime.now(timezone.utc).isoformat()
 
-            # Update weekly and monthly
-            await self._update_weekly_monthly(energy_data)
-            
-            # Cleanup old data
-            await self._cleanup_old_data(energy_data)
-            
-            # Atomically persist
-            self.data_store.setDeep("Energy", energy_data)
-            
-            # This prevents data loss on unexpected restarts
-            try:
-                await self.event_manager.emit("SaveState", {"source": "OGBEnergyManager", "room": self.room})
-            except Exception as e:
-                _LOGGER.debug(f"[{self.room}] SaveState emission failed: {e}")
-
-            _LOGGER.debug(
-                f"[{self.room}] Energy persisted: {total_today_kwh:.4f} kWh today, "
-                f"cost: {daily_data['cost']:.2f} {energy_data.get('currency', 'EUR')}"
-            )
+                    bucket["kwh"] = round(day_kwh, 6)
+                    bucket["cost"] = round(day_kwh * price_per_kwh, 4)
+                    self.data_store.setDeep(f"Energy.daily.{day_key}", bucket)
+
+                self._pending = {}
+                self._dirty = True
+                now = datetime.now(timezone.utc)
+                self.data_store.setDeep("Energy.current_day", now.strftime("%Y-%m-%d"))
+                self.data_store.setDeep("Energy.last_update", now.isoformat())
+
+                if new_day:
+                    self._cleanup_old_data()
+
+            now_ts = time.time()
+            if self._dirty and (
+                force_save or now_ts - self._last_persist_ts >= PERSIST_MIN_INTERVAL_SECONDS
+            ):
+                self._dirty = False
+                self._last_persist_ts = now_ts
+                try:
+                    await self.event_manager.emit(
+                        "SaveState", {"source": "OGBEnergyManager", "room": self.room}
+                    )
+                except Exception as e:
+                    _LOGGER.debug(f"[{self.room}] SaveState emission failed: {e}")
 
         except Exception as e:
-            _LOGGER.error(f"[{self.room}] Error aggregating energy data: {e}")
-
-    async def _check_day_rollover(self):
-        """Check if day has changed and finalize previous day's data."""
-        energy_data = self.data_store.getDeep("Energy", {})
-        current_day = energy_data.get("current_day")
-        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-
-        if current_day and current_day != today_str:
-            # Day changed - log the transition
-            _LOGGER.debug(f"[{self.room}] Day rollover: {current_day} -> {today_str}")
-            
-            # Reset all session tracking (new day)
-            for device_name in self._device_tracking:
-                tracking = self._device_tracking[device_name]
-                tracking["session_kwh"] = 0.0
-                tracking["start_time"] = datetime.now(timezone.utc)
-
-    async def _update_weekly_monthly(self, energy_data: Dict[str, Any]):
-        """Update weekly and monthly aggregate data from daily data."""
+            _LOGGER.error(f"[{self.room}] Error flushing energy ledger: {e}")
+
+    def _cleanup_old_data(self):
+        """Drop daily buckets past retention and legacy derived aggregates."""
+        energy_data = self.data_store.getDeep("Energy", {}) or {}
+        cutoff_str = (
+            datetime.now(timezone.utc) - timedelta(days=LEDGER_RETENTION_DAYS)
+        ).strftime("%Y-%m-%d")
+
+        daily = energy_data.get("daily") or {}
+        for day_key in [k for k in daily if k < cutoff_str]:
+            self.data_store.delete(f"Energy.daily.{day_key}")
+
+        # Weekly/monthly are derived lazily from the daily ledger now
+        for legacy_key in ("weekly", "monthly"):
+            if legacy_key in energy_data:
+                self.data_store.delete(f"Energy.{legacy_key}")
+
+    def _build_summary(self, energy_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Current day/week/month figures including not yet flushed energy."""
         now = datetime.now(timezone.utc)
-        week_str = now.strftime("%Y-W%W")
-        month_str = now.strftime("%Y-%m")
-
-        # Calculate weekly total
-        week_start = now - timedelta(days=now.weekday())
-        week_dates = []
-        for i in range(7):
-            day = week_start + timedelta(days=i)
-            if day.month == now.month:  # Only current month days
-                week_dates.append(day.strftime("%Y-%m-%d"))
-
-        weekly_kwh = sum(
-            energy_data.get("daily", {}).get(date, {}).get("kwh", 0.0)
-            for date in week_dates
-        )
-
+        today_str = now.strftime("%Y-%m-%d")
         price_per_kwh = energy_data.get("price_per_kwh", 0.35)
-        currency = energy_data.get("currency", "EUR")
-        
-        if "weekly" not in energy_data:
-            energy_data["weekly"] = {}
-        energy_data["weekly"][week_str] = {
-            "kwh": round(weekly_kwh, 4),
-            "cost": round(weekly_kwh * price_per_kwh, 4),
-            "currency": currency,
-        }
-
-        # Calculate monthly total
-        month_days = []
-        day = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
-        while day.month == now.month:
-            month_days.append(day.strftime("%Y-%m-%d"))
-            day += timedelta(days=1)
 
-        monthly_kwh = sum(
-            energy_data.get("daily", {}).get(date, {}).get("kwh", 0.0)
-            for date in month_days
-        )
+        daily = energy_data.get("daily", {}).get(today_str, {})
+        runtime = dict(daily.get("runtime", {}))
+        pending_kwh = 0.0
+        pending_week = 0.0
+        pending_month = 0.0
+        week_start, week_end = week_bounds(now)
+        week_range = (week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d"))
+        month_prefix = now.strftime("%Y-%m")
+
+        for day_key, devices in self._pending.items():
+            day_kwh = sum(kwh for kwh, _ in devices.values())
+            if day_key == today_str:
+                pending_kwh += day_kwh
+                for device_name, (_, seconds) in devices.items():
+                    runtime[device_name] = runtime.get(device_name, 0.0) + seconds / 3600.0
+            if week_range[0] <= day_key <= week_range[1]:
+                pending_week += day_kwh
+            if day_key.startswith(month_prefix):
+                pending_month += day_kwh
+
+        today_kwh = daily.get("kwh", 0.0) + pending_kwh
+        week = week_totals(energy_data, now)
+        month = month_totals(energy_data, now)
+        week_kwh = week["kwh"] + pending_week
+        month_kwh = month["kwh"] + pending_month
 
-        if "monthly" not in energy_data:
-            energy_data["monthly"] = {}
-        energy_data["monthly"][month_str] = {
-            "kwh": round(monthly_kwh, 4),
-            "cost": round(monthly_kwh * price_per_kwh, 4),
-            "currency": currency,
+        return {
+            "today": {
+                "kwh": round(today_kwh, 4),
+                "cost": round(today_kwh * price_per_kwh, 4),
+                "runtime": {k: round(v, 2) for k, v in runtime.items()},
+            },
+            "week": {
+                "kwh": round(week_kwh, 4),
+                "cost": round(week_kwh * price_per_kwh, 4),
+            },
+            "month": {
+                "kwh": round(month_kwh, 4),
+                "cost": round(month_kwh * price_per_kwh, 4),
+            },
+            "price_per_kwh": price_per_kwh,
+            "currency": energy_data.get("currency", "EUR"),
         }
 
-    async def _cleanup_old_data(self, energy_data: Dict[str, Any]):
-        """Remove data older than 6 months."""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=180)
-        cutoff_str = cutoff_date.strftime("%Y-%m-%d")
-        cutoff_week = cutoff_date.strftime("%Y-W%W")
-        cutoff_month = cutoff_date.strftime("%Y-%m")
-
-        # Clean daily data
-        if "daily" in energy_data:
-            energy_data["daily"] = {
-                k: v for k, v in energy_data["daily"].items()
-                if k >= cutoff_str
-            }
-
-        # Clean weekly data
-        if "weekly" in energy_data:
-            energy_data["weekly"] = {
-                k: v for k, v in energy_data["weekly"].items()
-                if k >= cutoff_week
-            }
-
-        # Clean monthly data
-        if "monthly" in energy_data:
-            energy_data["monthly"] = {
-                k: v for k, v in energy_data["monthly"].items()
-                if k >= cutoff_month
-            }
-
     async def _update_sensor_entities(self):
         """Update HA sensor entities with current energy data."""
         try:
-            energy_data = self.data_store.getDeep("Energy", {})
-            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            week_str = datetime.now(timezone.utc).strftime("%Y-W%W")
-            month_str = datetime.now(timezone.utc).strftime("%Y-%m")
-
-            daily = energy_data.get("daily", {}).get(today_str, {})
-            weekly = energy_data.get("weekly", {}).get(week_str, {})
-            monthly = energy_data.get("monthly", {}).get(month_str, {})
-
-            # Calculate total runtime today
-            runtime = daily.get("runtime", {})
-            total_runtime = sum(runtime.values())
+            summary = self._build_summary(self.data_store.getDeep("Energy", {}) or {})
 
             # Emit event to update sensors
             await self.event_manager.emit("EnergyUpdate", {
                 "room": self.room,
-                "today_kwh": daily.get("kwh", 0.0),
-                "today_cost": daily.get("cost", 0.0),
-                "today_runtime_hours": round(total_runtime, 2),
-                "week_kwh": weekly.get("kwh", 0.0),
-                "week_cost": weekly.get("cost", 0.0),
-                "month_kwh": monthly.get("kwh", 0.0),
-                "month_cost": monthly.get("cost", 0.0),
-                "price_per_kwh": energy_data.get("price_per_kwh", 0.35),
-                "currency": energy_data.get("currency", "EUR"),
+                "today_kwh": summary["today"]["kwh"],
+                "today_cost": summary["today"]["cost"],
+                "today_runtime_hours": round(sum(summary["today"]["runtime"].values()), 2),
+                "week_kwh": summary["week"]["kwh"],
+                "week_cost": summary["week"]["cost"],
+                "month_kwh": summary["month"]["kwh"],
+                "month_cost": summary["month"]["cost"],
+                "price_per_kwh": summary["price_per_kwh"],
+                "currency": summary["currency"],
             })
 
         except Exception as e:
@@ -726,42 +654,27 @@ class OGBEnergyManager:
 
     def get_energy_summary(self) -> Dict[str, Any]:
         """Get current energy summary for the room."""
-        energy_data = self.data_store.getDeep("Energy", {})
-        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        week_str = datetime.now(timezone.utc).strftime("%Y-W%W")
-        month_str = datetime.now(timezone.utc).strftime("%Y-%m")
-
-        daily = energy_data.get("daily", {}).get(today_str, {})
-        weekly = energy_data.get("weekly", {}).get(week_str, {})
-        monthly = energy_data.get("monthly", {}).get(month_str, {})
+        summary = self._build_summary(self.data_store.getDeep("Energy", {}) or {})
 
         # Get active tracking info
-        active_devices = {}
-        for device_name, tracking in self._device_tracking.items():
-            active_devices[device_name] = {
-                "power_watts": tracking.get("power_watts", 0.0),
-                "is_estimated": tracking.get("is_estimated", True),
-                "session_kwh": round(tracking.get("session_kwh", 0.0), 4),
+        summary["active_devices"] = {
+            device_name: {
+                "power_watts": counter.power_watts,
+                "is_estimated": counter.is_estimated,
+                "session_kwh": round(counter.session_kwh, 4),
             }
-
-        return {
-            "today": {
-                "kwh": daily.get("kwh", 0.0),
-                "cost": daily.get("cost", 0.0),
-                "runtime": daily.get("runtime", {}),
-            },
-            "week": {
-                "kwh": weekly.get("kwh", 0.0),
-                "cost": weekly.get("cost", 0.0),
-            },
-            "month": {
-                "kwh": monthly.get("kwh", 0.0),
-                "cost": monthly.get("cost", 0.0),
-            },
-            "price_per_kwh": energy_data.get("price_per_kwh", 0.35),
-            "currency": energy_data.get("currency", "EUR"),
-            "active_devices": active_devices,
+            for device_name, counter in self._device_tracking.items()
         }
+        return summary
+
+    def reset_sessions(self):
+        """Reset session counters and drop energy not yet appended to the ledger."""
+        now_ts = time.time()
+        for counter in self._device_tracking.values():
+            counter.session_kwh = 0.0
+            counter.start_ts = now_ts
+            counter.last_ts = now_ts
+        self._pending = {}
 
     async def set_price_per_kwh(self, price: float):
         """Update the electricity price per kWh."""
@@ -770,12 +683,17 @@ class OGBEnergyManager:
                 _LOGGER.error(f"[{self.room}] Invalid negative price: {price}")
                 return
 
-            energy_data = self.data_store.getDeep("Energy", {})
-            energy_data["price_per_kwh"] = round(price, 4)
-            self.data_store.setDeep("Energy", energy_data)
+            self.data_store.setDeep("Energy.price_per_kwh", round(price, 4))
+
+            # Recalculate today's cost with the new price
+            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            bucket = self.data_store.getDeep(f"Energy.daily.{today_str}")
+            if isinstance(bucket, dict):
+                bucket["cost"] = round(bucket.get("kwh", 0.0) * round(price, 4), 4)
+                self.data_store.setDeep(f"Energy.daily.{today_str}", bucket)
 
-            # Recalculate costs with new price
-            await self._aggregate_and_persist()
+            self._dirty = True
+            await self._flush_ledger(force_save=True)
             await self._update_sensor_entities()
 
             _LOGGER.debug(f"[{self.room}] Energy price updated to {price:.4f} EUR/kWh")
@@ -793,8 +711,8 @@ class OGBEnergyManager:
             except asyncio.CancelledError:
                 pass
 
-        # Final calculation and persistence before shutdown
-        await self._calculate_all_tracked_devices()
-        await self._aggregate_and_persist()
+        # Close open intervals and persist before shutdown
+        self._integrate_all(time.time())
+        await self._flush_ledger(force_save=True)
 
         _LOGGER.debug(f"[{self.room}] OGBEnergyManager shutdown complete")
@@ -3,10 +3,14 @@ import inspect
 import json
 import logging
 import os
+import time
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
 from typing import Optional, Literal
 
+from ..data.OGBDataClasses.OGBPublications import validate_payload
+from ..utils.profiler import OGBProfiler
+
 _LOGGER = logging.getLogger(__name__)
 
 DebugType = Literal["DEBUG", "INFO", "WARNING", "ERROR"]
@@ -27,6 +31,9 @@ class OGBEventManager:
         self._shutdown = False
         # Lock for file log writes to prevent race conditions
         self._log_file_lock = asyncio.Lock()
+        # Opt-in pipeline profiler (disabled by default, see enable_profiling)
+        self.profiler = OGBProfiler()
+        self.profiler.set_reporter(self._publish_profile)
 
     def __repr__(self):
         return f"Current Listeners: {self.listeners}"
@@ -84,6 +91,14 @@ class OGBEventManager:
         # Don't emit events during shutdown
         if self._shutdown:
             return
+
+        # Payload type check against EVENT_PAYLOADS, debug mode only
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            validate_payload(event_name, data)
+
+        profiler = self.profiler if self.profiler.enabled else None
+        if profiler:
+            emit_start = time.perf_counter()
         
         # Debug log for medium-related events
         if "Medium" in event_name or "Plant" in event_name:
@@ -136,15 +151,28 @@ class OGBEventManager:
             for callback in self.listeners[event_name]:
                 if inspect.iscoroutinefunction(callback):
                     # MEMORY FIX: Track the task
-                    self._create_tracked_task(callback(data))
+                    if profiler:
+                        self._create_tracked_task(
+                            profiler.timed_listener(event_name, callback, callback(data))
+                        )
+                    else:
+                        self._create_tracked_task(callback(data))
                 else:
                     try:
-                        callback(data)
+                        if profiler:
+                            start = time.perf_counter()
+                            callback(data)
+                            profiler.record_listener(event_name, callback, time.perf_counter() - start)
+                        else:
+                            callback(data)
                     except Exception as e:
                         _LOGGER.error(f"Error in synchronous listener: {e}")
         elif "Medium" in event_name or "Plant" in event_name:
             _LOGGER.debug(f"ℹ️ No listeners registered for {event_name}")
 
+        if profiler:
+            profiler.record_emit(event_name, time.perf_counter() - emit_start)
+
     def emit_sync(self, event_name, data, haEvent=False, debug_type: Optional[DebugType] = None):
         """Emit an event synchronously (for synchronous contexts).
         If haEvent=True, the event is also sent to Home Assistant.
@@ -313,6 +341,24 @@ class OGBEventManager:
             _LOGGER.debug(f"Konnte logType nicht lesen: {e}")
             return ["WARNING", "ERROR"]
 
+    def enable_profiling(self, enabled: bool = True):
+        """Switch the control loop profiler on or off."""
+        if enabled:
+            self.profiler.enable()
+        else:
+            self.profiler.disable()
+
+    def get_profile(self, top: Optional[int] = None) -> dict:
+        """Profiler snapshot plus current task and listener counts."""
+        profile = self.profiler.snapshot(top)
+        profile["tasks"]["background"] = len(self._background_tasks)
+        profile["registered_listeners"] = sum(len(v) for v in self.listeners.values())
+        return profile
+
+    async def _publish_profile(self):
+        """Periodic profiler report for the diagnostic sensor."""
+        await self.emit("ProfilerUpdate", self.get_profile(top=10))
+
     def change_notify_set(self, state):
         self.notifications_enabled = state
         _LOGGER.debug(f"Notify State jetzt: {self.notifications_enabled}")
@@ -321,6 +367,7 @@ class OGBEventManager:
         """Shutdown event manager and cleanup all resources."""
         _LOGGER.debug("🛑 Shutting down EventManager")
         self._shutdown = True
+        self.profiler.disable()
         
         # Cancel all background tasks
         for task in list(self._background_tasks):
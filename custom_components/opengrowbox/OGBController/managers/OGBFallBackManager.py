@@ -10,16 +10,21 @@ notifies users when issues are detected.
 Features:
 - Monitors sensor last_update timestamps
 - Detects sensors/devices that haven't reported for 30+ minutes
+- Stale detection via a deadline min-heap: the loop sleeps until the earliest
+  deadline and only touches entities whose deadline actually passed
+- Event-driven runaway detection from power updates and turn_off commands
 - Sends critical alerts via notification manager
 - Sends recovery notifications when sensors come back online
 - Prevents notification spam with rate limiting
 """
 
 import asyncio
+import heapq
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..utils.ambient import is_ambient_room
 
@@ -42,6 +47,8 @@ class MonitoredEntityState:
     is_stale: bool = False
     stale_since: Optional[datetime] = None
     notification_sent: bool = False
+    deadline: float = 0.0  # monotonic time at which the entity goes stale
+    heap_deadline: Optional[float] = None  # deadline of the outstanding heap entry
 
 
 @dataclass
@@ -66,7 +73,7 @@ class OGBFallBackManager:
 
     # Configuration constants
     STALE_THRESHOLD_MINUTES = 30  # Global threshold
-    CHECK_INTERVAL_SECONDS = 60  # Check every minute
+    CHECK_INTERVAL_SECONDS = 60  # Runaway re-check / retry spacing
     NOTIFICATION_COOLDOWN_MINUTES = 60  # Don't spam same sensor
 
     # Device Reliability constants
@@ -102,6 +109,7 @@ class OGBFallBackManager:
 
         # State tracking
         self._monitored_entities: Dict[str, MonitoredEntityState] = {}
+        self._device_index: Dict[str, str] = {}  # device_name -> entity_id
         self._stale_entities: Set[str] = set()
         self._last_notification: Dict[str, datetime] = {}
 
@@ -109,6 +117,14 @@ class OGBFallBackManager:
         self._device_reliability: Dict[str, DeviceReliabilityState] = {}
 
         # Runaway device tracking (retry state via _device_reliability)
+        # device_name -> monotonic time of the next scheduled power check
+        self._runaway_due: Dict[str, float] = {}
+
+        # Deadline heap: (deadline, kind, key) with kind "stale" or "runaway".
+        # Entries are invalidated lazily; an entry is only acted on if it
+        # still matches the owner's current deadline.
+        self._deadline_heap: List[Tuple[float, str, str]] = []
+        self._wakeup = asyncio.Event()
 
         # Task management
         self._check_task: Optional[asyncio.Task] = None
@@ -130,6 +146,7 @@ class OGBFallBackManager:
         self.event_manager.on("DeviceInitialized", self._on_device_initialized)
         self.event_manager.on("DeviceStateChange", self._on_device_state_change)
         self.event_manager.on("DeviceRemoved", self._on_entity_removed)
+        self.event_manager.on("PowerSensorUpdate", self._on_power_sensor_update)
 
     async def start_monitoring(self):
         """Start the periodic health check monitoring."""
@@ -172,7 +189,7 @@ class OGBFallBackManager:
                 if entity_id in self._monitored_entities:
                     continue
 
-                self._monitored_entities[entity_id] = MonitoredEntityState(
+                self._register_entity(MonitoredEntityState(
                     entity_id=entity_id,
                     entity_type="device",
                     device_name=device_name,
@@ -181,7 +198,7 @@ class OGBFallBackManager:
                     device_ref=device_ref,
                     last_update=datetime.now(),
                     last_value="off",
-                )
+                ))
 
                 # Wire reliability_manager
                 if (
@@ -219,15 +236,77 @@ class OGBFallBackManager:
 
         _LOGGER.debug(f"🛑 {self.room} FallBack Manager monitoring stopped")
 
+    # =================================================================
+    # Deadline Scheduling
+    # =================================================================
+
+    def _stale_threshold_seconds(self) -> float:
+        return self.STALE_THRESHOLD_MINUTES * 60
+
+    def _push_deadline(self, deadline: float, kind: str, key: str):
+        """Push a deadline and wake the loop if it became the earliest one."""
+        if not self._deadline_heap or deadline < self._deadline_heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._deadline_heap, (deadline, kind, key))
+
+    def _register_entity(self, state: MonitoredEntityState):
+        """Add an entity to monitoring and schedule its first stale deadline."""
+        state.deadline = time.monotonic() + self._stale_threshold_seconds()
+        state.heap_deadline = state.deadline
+        self._monitored_entities[state.entity_id] = state
+        if state.entity_type == "device" and state.device_name:
+            self._device_index[state.device_name] = state.entity_id
+        self._push_deadline(state.deadline, "stale", state.entity_id)
+
+    async def _touch_entity(self, state: MonitoredEntityState):
+        """Refresh an entity's deadline after an update (O(1) amortized).
+
+        Only the deadline field moves; an existing heap entry is re-armed
+        lazily when it pops. A stale entity recovers immediately.
+        """
+        state.last_update = datetime.now()
+        state.deadline = time.monotonic() + self._stale_threshold_seconds()
+        if state.heap_deadline is None:
+            state.heap_deadline = state.deadline
+            self._push_deadline(state.deadline, "stale", state.entity_id)
+
+        if state.is_stale:
+            state.is_stale = False
+            state.stale_since = None
+            state.notification_sent = False
+            self._stale_entities.discard(state.entity_id)
+            await self._notify_entity_recovered(state)
+
+    def schedule_runaway_check(self, device_name: str, delay: Optional[float] = None):
+        """Schedule a power check for a device that was commanded OFF."""
+        if delay is None:
+            delay = self.CHECK_INTERVAL_SECONDS
+        due = time.monotonic() + delay
+        current = self._runaway_due.get(device_name)
+        if current is not None and current <= due:
+            return
+        self._runaway_due[device_name] = due
+        self._push_deadline(due, "runaway", device_name)
+
+    def _next_wakeup_delay(self, now: float) -> Optional[float]:
+        """Seconds until the earliest deadline, None if nothing is scheduled."""
+        if not self._deadline_heap:
+            return None
+        return max(0.0, self._deadline_heap[0][0] - now)
+
     async def _monitoring_loop(self):
-        """Main monitoring loop - checks all entities periodically."""
+        """Main monitoring loop - sleeps until the earliest deadline fires."""
         _LOGGER.debug(f"{self.room} FallBack Manager monitoring loop started")
 
         while self._is_running:
             try:
-                await self._check_all_entities()
-                await self._check_runaway_devices()
-                await asyncio.sleep(self.CHECK_INTERVAL_SECONDS)
+                self._wakeup.clear()
+                await self._process_due_deadlines(time.monotonic())
+                delay = self._next_wakeup_delay(time.monotonic())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
             except asyncio.CancelledError:
                 _LOGGER.debug(f"{self.room} Monitoring loop cancelled")
                 break
@@ -237,97 +316,101 @@ class OGBFallBackManager:
                 )
                 await asyncio.sleep(10)  # Brief pause on error
 
-    async def _check_all_entities(self):
-        """Check all monitored entities for staleness."""
-        if not self._monitored_entities:
-            return
+    async def _process_due_deadlines(self, now: float):
+        """Pop and handle every deadline <= now."""
+        stale_count = 0
 
-        now = datetime.now()
-        threshold = timedelta(minutes=self.STALE_THRESHOLD_MINUTES)
+        while self._deadline_heap and self._deadline_heap[0][0] <= now:
+            deadline, kind, key = heapq.heappop(self._deadline_heap)
 
-        stale_count = 0
-        recovered_count = 0
-
-        for entity_id, state in list(self._monitored_entities.items()):
-            age = now - state.last_update
-            was_stale = state.is_stale
-
-            # Check if entity became stale
-            if age > threshold:
-                if not was_stale:
-                    # Entity just became stale
-                    state.is_stale = True
-                    state.stale_since = now
-                    self._stale_entities.add(entity_id)
-                    await self._notify_entity_stale(state, age)
-                    stale_count += 1
-            else:
-                # Check if entity recovered
-                if was_stale:
-                    state.is_stale = False
-                    state.stale_since = None
-                    state.notification_sent = False
-                    self._stale_entities.discard(entity_id)
-                    await self._notify_entity_recovered(state)
-                    recovered_count += 1
-
-        if stale_count > 0 or recovered_count > 0:
+            if kind == "runaway":
+                if self._runaway_due.get(key) != deadline:
+                    continue
+                del self._runaway_due[key]
+                await self._check_runaway_device(key)
+                continue
+
+            state = self._monitored_entities.get(key)
+            if state is None or state.heap_deadline != deadline:
+                continue  # Superseded entry
+            state.heap_deadline = None
+
+            if state.deadline > now:
+                # Updated since this entry was pushed: re-arm with the real deadline
+                state.heap_deadline = state.deadline
+                heapq.heappush(self._deadline_heap, (state.deadline, "stale", key))
+                continue
+
+            if not state.is_stale:
+                state.is_stale = True
+                state.stale_since = datetime.now()
+                self._stale_entities.add(key)
+                await self._notify_entity_stale(state, datetime.now() - state.last_update)
+                stale_count += 1
+
+        if stale_count > 0:
             _LOGGER.debug(
                 f"{self.room} Health check: {stale_count} new stale, "
-                f"{recovered_count} recovered, {len(self._stale_entities)} total stale"
+                f"{len(self._stale_entities)} total stale"
             )
 
-    async def _check_runaway_devices(self):
+    def _find_monitored_device(self, device_name: str) -> Optional[MonitoredEntityState]:
+        """Find the monitored device entry for a device name."""
+        entity_id = self._device_index.get(device_name)
+        if entity_id is None:
+            return None
+        return self._monitored_entities.get(entity_id)
+
+    async def _check_runaway_device(self, device_name: str, current_power: Optional[float] = None):
         """
-        Check for devices commanded OFF but still consuming power (runaway).
+        Check one device commanded OFF but still consuming power (runaway).
         Uses per-device dynamic power threshold and 3 retry attempts with escalation.
+        While the device keeps running, a follow-up check is scheduled every
+        CHECK_INTERVAL_SECONDS.
         """
-        _LOGGER.debug(f"{self.room}: FB _check_runaway_devices scanning {len(self._monitored_entities)} entities")
-
-        for entity_id, state in list(self._monitored_entities.items()):
-            if state.entity_type != "device":
-                continue
-            if not state.device_ref:
-                continue
-
-            device_name = state.device_name or state.context
-            if not device_name:
-                continue
+        state = self._find_monitored_device(device_name)
+        if state is None or not state.device_ref:
+            return
 
-            # Nur Geräte mit echten HA-Entitäten prüfen
-            if not hasattr(state.device_ref, 'switches') or not state.device_ref.switches:
-                continue
+        # Nur Geräte mit echten HA-Entitäten prüfen
+        if not hasattr(state.device_ref, 'switches') or not state.device_ref.switches:
+            return
 
-            # NUR commanded_state = "off" prüfen, nicht HA-last_value
-            commanded = getattr(state.device_ref, '_commanded_state', None)
-            if commanded != "off":
-                continue
+        # NUR commanded_state = "off" prüfen, nicht HA-last_value
+        commanded = getattr(state.device_ref, '_commanded_state', None)
+        if commanded != "off":
+            return
 
-            # Leistungsaufnahme ermitteln (Power-Sensor + switch.current_power_w)
+        # Leistungsaufnahme ermitteln (Power-Sensor + switch.current_power_w)
+        if current_power is None:
             current_power = await self._get_device_power(state.device_ref)
-            if current_power is None:
-                continue
+        if current_power is None:
+            return
 
-            # Dynamische Schwelle pro Gerät
-            threshold = self._get_dynamic_threshold(state.device_ref)
+        # Dynamische Schwelle pro Gerät
+        threshold = self._get_dynamic_threshold(state.device_ref)
 
-            _LOGGER.debug(f"{self.room}: FB '{device_name}' commanded=OFF power={current_power}W threshold={threshold}W")
+        _LOGGER.debug(f"{self.room}: FB '{device_name}' commanded=OFF power={current_power}W threshold={threshold}W")
 
-            if current_power <= threshold:
-                # Gerät verbraucht normal — kein Runaway
-                # Retry-Zähler zurücksetzen wenn OK
-                if device_name in self._device_reliability:
-                    rel = self._device_reliability[device_name]
-                    if rel.retry_count > 0:
-                        rel.retry_count = 0
-                        _LOGGER.debug(f"{self.room}: FB '{device_name}' retry counter reset (power OK)")
-                continue
+        if current_power <= threshold:
+            # Gerät verbraucht normal — kein Runaway
+            # Retry-Zähler zurücksetzen wenn OK
+            self._runaway_due.pop(device_name, None)
+            if device_name in self._device_reliability:
+                rel = self._device_reliability[device_name]
+                if rel.retry_count > 0:
+                    rel.retry_count = 0
+                    _LOGGER.debug(f"{self.room}: FB '{device_name}' retry counter reset (power OK)")
+            return
 
-            # >>> RUNAWAY ERKANNT <<<
-            _LOGGER.warning(
-                f"{self.room}: ⚠️ Runaway '{device_name}' — commanded OFF but consuming {current_power}W (threshold: {threshold}W)"
-            )
-            await self._handle_runaway_device(state.device_ref, device_name, current_power, threshold)
+        # >>> RUNAWAY ERKANNT <<<
+        _LOGGER.warning(
+            f"{self.room}: ⚠️ Runaway '{device_name}' — commanded OFF but consuming {current_power}W (threshold: {threshold}W)"
+        )
+        # Follow-up check even if the power sensor stops reporting changes
+        self._runaway_due.pop(device_name, None)
+        self.schedule_runaway_check(device_name)
+        await self._handle_runaway_device(state.device_ref, device_name, current_power, threshold)
 
     async def _get_device_power(self, device_ref) -> Optional[float]:
         """Liest die aktuelle Leistungsaufnahme eines Geräts (Power-Sensor + Switch-Attribut)."""
@@ -465,29 +548,26 @@ class OGBFallBackManager:
     async def _on_sensor_update(self, event_data):
         """Handle sensor update event."""
         try:
-            # Extract entity_id from OGBEventPublication
-            entity_id = (
-                event_data.Name
-                if hasattr(event_data, "Name")
-                else event_data.get("entity_id")
-            )
+            is_dict = isinstance(event_data, dict)
+            # OGBEventPublication or a plain dict (see EVENT_PAYLOADS)
+            entity_id = event_data.get("entity_id") if is_dict else event_data.Name
 
             if not entity_id:
                 return
 
             # Update tracking
-            if entity_id in self._monitored_entities:
-                state = self._monitored_entities[entity_id]
-                state.last_update = datetime.now()
-
+            state = self._monitored_entities.get(entity_id)
+            if state is not None:
                 # Update last value
-                if hasattr(event_data, "newState"):
+                if not is_dict:
                     state.last_value = (
                         event_data.newState[0] if event_data.newState else None
                     )
                 elif "value" in event_data:
                     state.last_value = event_data.get("value")
 
+                await self._touch_entity(state)
+
                 _LOGGER.debug(f"{self.room} Updated tracking for sensor {entity_id}")
 
         except Exception as e:
@@ -510,14 +590,14 @@ class OGBFallBackManager:
                 return
 
             # Register sensor for monitoring
-            self._monitored_entities[entity_id] = MonitoredEntityState(
+            self._register_entity(MonitoredEntityState(
                 entity_id=entity_id,
                 entity_type="sensor",
                 sensor_type=sensor_type,
                 device_name=device_name,
                 context=context,
                 last_update=datetime.now(),
-            )
+            ))
 
 
         except Exception as e:
@@ -541,7 +621,7 @@ class OGBFallBackManager:
 
             # Register device for monitoring
             device_ref = event_data.get("device_ref")
-            self._monitored_entities[entity_id] = MonitoredEntityState(
+            self._register_entity(MonitoredEntityState(
                 entity_id=entity_id,
                 entity_type="device",
                 device_name=device_name,
@@ -550,7 +630,7 @@ class OGBFallBackManager:
                 device_ref=device_ref,
                 last_update=datetime.now(),
                 last_value="off",
-            )
+            ))
 
             # Wire reliability_manager so Device.turn_on/turn_off call validate_device_state
             if device_ref and hasattr(device_ref, 'reliability_manager') and device_ref.reliability_manager is None:
@@ -574,10 +654,10 @@ class OGBFallBackManager:
                 return
 
             # Update tracking
-            if entity_id in self._monitored_entities:
-                state = self._monitored_entities[entity_id]
-                state.last_update = datetime.now()
+            state = self._monitored_entities.get(entity_id)
+            if state is not None:
                 state.last_value = event_data.get("new_state")
+                await self._touch_entity(state)
 
                 _LOGGER.debug(f"{self.room} Updated tracking for device {entity_id} → last_value={state.last_value}")
             else:
@@ -586,13 +666,44 @@ class OGBFallBackManager:
         except Exception as e:
             _LOGGER.error(f"Error handling device state change: {e}", exc_info=True)
 
+    async def _on_power_sensor_update(self, event_data):
+        """Evaluate runaway state as soon as a power reading arrives."""
+        try:
+            device_name = event_data.get("device_name")
+            if not device_name:
+                return
+
+            state = self._find_monitored_device(device_name)
+            if state is None or getattr(state.device_ref, "_commanded_state", None) != "off":
+                return
+
+            try:
+                power = float(event_data.get("power_watts"))
+            except (ValueError, TypeError):
+                return
+
+            # Respect retry spacing while a follow-up check is already pending
+            if (
+                device_name in self._runaway_due
+                and power > self._get_dynamic_threshold(state.device_ref)
+            ):
+                return
+
+            await self._check_runaway_device(device_name, current_power=power)
+
+        except Exception as e:
+            _LOGGER.error(f"Error handling power sensor update: {e}", exc_info=True)
+
     async def _on_entity_removed(self, event_data):
         """Handle entity removal event."""
         try:
             entity_id = event_data.get("entity_id")
 
             if entity_id and entity_id in self._monitored_entities:
-                del self._monitored_entities[entity_id]
+                # Heap entry is dropped lazily when it pops
+                state = self._monitored_entities.pop(entity_id)
+                if self._device_index.get(state.device_name) == entity_id:
+                    del self._device_index[state.device_name]
                 self._stale_entities.discard(entity_id)
 
                 _LOGGER.debug(f"{self.room} Removed entity from monitoring: {entity_id}")
@@ -942,6 +1053,8 @@ class OGBFallBackManager:
             "stale_entities": list(self._stale_entities),
             "threshold_minutes": self.STALE_THRESHOLD_MINUTES,
             "check_interval_seconds": self.CHECK_INTERVAL_SECONDS,
+            "scheduled_deadlines": len(self._deadline_heap),
+            "pending_runaway_checks": len(self._runaway_due),
         }
 
     def get_monitored_entities(self) -> list:
@@ -998,8 +1111,11 @@ class OGBFallBackManager:
         """Cleanup and shutdown."""
         await self.stop_monitoring()
         self._monitored_entities.clear()
+        self._device_index.clear()
         self._stale_entities.clear()
         self._last_notification.clear()
+        self._deadline_heap.clear()
+        self._runaway_due.clear()
         _LOGGER.debug(f"🧹 {self.room} FallBack Manager shutdown complete")
 
     def __repr__(self):
@@ -14,7 +14,6 @@ from ..data.OGBDataClasses.OGBPublications import (OGBActionPublication,
                                              OGBRetrieveAction,
                                              OGBRetrivePublication)
 from ..premium.analytics.OGBAIDataBridge import OGBAIDataBridge
-from .hydro.crop_steering.OGBCSManager import OGBCSManager
 from .ClosedEnvironmentManager import ClosedEnvironmentManager
 from .OGBScriptMode import OGBScriptMode
 from ..utils.ambient import is_ambient_room, is_not_ambient_room
@@ -33,7 +32,9 @@ class OGBModeManager:
         self.medium_manager = medium_manager
         self.isInitialized = False
 
-        self.CropSteeringManager = OGBCSManager(hass, dataStore, self.event_manager, room, medium_manager=medium_manager)
+        # Built on first access; the active crop steering stack lives in OGBCastManager
+        self._crop_steering_manager = None
+        self.notificator = None
 
         # Closed Environment Manager for ambient-enhanced control
         self.closedEnvironmentManager = ClosedEnvironmentManager(dataStore, self.event_manager, room, hass)
@@ -94,6 +95,17 @@ class OGBModeManager:
         # Prem
         self.event_manager.on("PremiumCheck", self.handle_premium_modes)
 
+    @property
+    def CropSteeringManager(self):
+        """Crop steering manager, imported and created on first access."""
+        if self._crop_steering_manager is None:
+            from .hydro.crop_steering.OGBCSManager import OGBCSManager
+            self._crop_steering_manager = OGBCSManager(
+                self.hass, self.data_store, self.event_manager, self.room, medium_manager=self.medium_manager
+            )
+            self._crop_steering_manager.notificator = self.notificator
+        return self._crop_steering_manager
+
     def _calculate_dynamic_deadband(self, mode_name: str) -> float:
         """
         Calculate dynamic deadband based on plant stage and mode.
@@ -1,14 +1,56 @@
+import asyncio
 import logging
+import re
+from collections import OrderedDict
 from datetime import datetime, time, timedelta
-from typing import Dict, Optional
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
 
 from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.util import dt as dt_util
 
 from ..utils.ambient import is_ambient_room
+from ..utils.slidingWindow import SlidingWindowCounter
 
 _LOGGER = logging.getLogger(__name__)
 
+# Alert storm protection
+AGGREGATION_WINDOW_SECONDS = 30  # bursts with the same title within this window are merged
+MAX_TRACKED_FINGERPRINTS = 256  # LRU bound for per-issue cooldown state
+MAX_PENDING_BURSTS = 64  # bound for open aggregation groups
+MAX_AGGREGATED_LINES = 10  # messages listed in one aggregated notification
+
+# Standalone numbers (readings, durations); digits inside names like sensor_1 are kept
+_NUMBER_RE = re.compile(r"(?<!\w)-?\d+(?:[.,]\d+)?(?!\w)")
+
+
+def _fingerprint(title: str, message: str) -> str:
+    """Identify an issue by title and message with volatile numbers masked."""
+    return f"{title}\x1f{_NUMBER_RE.sub('#', message or '')}"
+
+
+class _AlertState:
+    """Cooldown state of one (level, fingerprint)."""
+
+    __slots__ = ("last_sent", "suppressed")
+
+    def __init__(self, last_sent: float):
+        self.last_sent = last_sent
+        self.suppressed = 0
+
+
+class _Burst:
+    """Aggregation group of one (level, title) after its first notification went out."""
+
+    __slots__ = ("opened", "count", "lines", "service", "task")
+
+    def __init__(self, opened: float):
+        self.opened = opened
+        self.count = 0
+        self.lines: List[str] = []
+        self.service: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
 
 class OGBNotificator:
     def __init__(
@@ -42,12 +84,18 @@ class OGBNotificator:
             "info": {"max_per_hour": 30, "cooldown_minutes": 1},
         }
 
-        # Track notifications for rate limiting
-        self._notification_history: Dict[str, list] = {
-            "critical": [],
-            "warning": [],
-            "info": [],
+        # Sliding-window counters per level (1h for limits, 24h for stats)
+        self._clock = monotonic
+        self._hour_windows: Dict[str, SlidingWindowCounter] = {
+            level: SlidingWindowCounter(3600, 60) for level in self.rate_limits
+        }
+        self._day_windows: Dict[str, SlidingWindowCounter] = {
+            level: SlidingWindowCounter(86400, 24) for level in self.rate_limits
         }
+        # (level, fingerprint) -> cooldown state, (level, title) -> open burst
+        self._alerts: "OrderedDict[Tuple[str, str], _AlertState]" = OrderedDict()
+        self._bursts: "OrderedDict[Tuple[str, str], _Burst]" = OrderedDict()
+        self._suppressed: Dict[str, int] = {level: 0 for level in self.rate_limits}
         self._dst_unsub = None
 
         self._ensure_dst_monitor_started()
@@ -98,6 +146,9 @@ class OGBNotificator:
 
     async def async_shutdown(self):
         """Cleanup scheduled callbacks to avoid restart-time leaks."""
+        for burst in getattr(self, "_bursts", {}).values():
+            if burst.task and not burst.task.done():
+                burst.task.cancel()
         if self._dst_unsub:
             try:
                 self._dst_unsub()
@@ -174,7 +225,7 @@ class OGBNotificator:
         service: Optional[str] = None,
     ):
         """
-        Internal notification sender with rate limiting
+        Internal notification sender with rate limiting and burst aggregation
 
         :param title: Notification title
         :param message: Notification message
@@ -191,63 +242,71 @@ class OGBNotificator:
                 return
 
             # Check rate limits before sending
-            if not await self._check_rate_limit(level, title):
-                _LOGGER.warning(
-                    f"[{self.room}] Rate limit exceeded for {level} notification: {title}"
-                )
+            message = self._admit(level, title, message, service)
+            if message is None:
                 return
 
-            # Determine which service to use
-            svc = service or self.service
-            additional_services = []
-            
-            # For critical notifications, use critical_service if configured
-            if level == "critical":
-                if self.critical_service:
-                    svc = self.critical_service
-                elif svc == "persistent_notification.create":
-                    # Try to find a mobile app service for critical notifications
-                    mobile_service = await self._find_mobile_notification_service()
-                    if mobile_service:
-                        svc = mobile_service
-                        _LOGGER.debug(
-                            f"[{self.room}] Using mobile notification service for critical alert: {svc}"
-                        )
-            elif level == "warning" and svc == "persistent_notification.create":
+            await self._dispatch(title, message, level, service)
+
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Failed to send {level} notification: {e}")
+
+    async def _dispatch(
+        self,
+        title: str,
+        message: str,
+        level: str,
+        service: Optional[str] = None,
+    ):
+        """Resolve target services, send and record the notification."""
+        # Determine which service to use
+        svc = service or self.service
+        additional_services = []
+
+        # For critical notifications, use critical_service if configured
+        if level == "critical":
+            if self.critical_service:
+                svc = self.critical_service
+            elif svc == "persistent_notification.create":
+                # Try to find a mobile app service for critical notifications
                 mobile_service = await self._find_mobile_notification_service()
                 if mobile_service:
-                    additional_services.append(mobile_service)
-
-            for target_service in [svc, *additional_services]:
-                domain, srv = target_service.split(".")
-                service_data = {}
-
-                if target_service == "persistent_notification.create":
-                    service_data = {"title": title, "message": message}
-                elif target_service.startswith("notify."):
-                    service_data = {"title": title, "message": message}
-                    # Set appropriate priority based on level
-                    if level == "critical":
-                        service_data["data"] = {"ttl": 0, "priority": "high", "push": {"sound": "default"}}
-                    elif level == "warning":
-                        service_data["data"] = {"ttl": 0, "priority": "high", "push": {"sound": "default"}}
-                else:
-                    _LOGGER.error(f"[{self.room}] Unsupported notification service '{target_service}'")
-                    continue
-
-                await self.hass.services.async_call(
-                    domain, srv, service_data, blocking=True
-                )
+                    svc = mobile_service
+                    _LOGGER.debug(
+                        f"[{self.room}] Using mobile notification service for critical alert: {svc}"
+                    )
+        elif level == "warning" and svc == "persistent_notification.create":
+            mobile_service = await self._find_mobile_notification_service()
+            if mobile_service:
+                additional_services.append(mobile_service)
+
+        for target_service in [svc, *additional_services]:
+            domain, srv = target_service.split(".")
+            service_data = {}
+
+            if target_service == "persistent_notification.create":
+                service_data = {"title": title, "message": message}
+            elif target_service.startswith("notify."):
+                service_data = {"title": title, "message": message}
+                # Set appropriate priority based on level
+                if level == "critical":
+                    service_data["data"] = {"ttl": 0, "priority": "high", "push": {"sound": "default"}}
+                elif level == "warning":
+                    service_data["data"] = {"ttl": 0, "priority": "high", "push": {"sound": "default"}}
+            else:
+                _LOGGER.error(f"[{self.room}] Unsupported notification service '{target_service}'")
+                continue
+
+            await self.hass.services.async_call(
+                domain, srv, service_data, blocking=True
+            )
 
-            # Record the notification for rate limiting
-            self._record_notification(level)
+        # Record the notification for rate limiting
+        self._record_notification(level)
 
-            service_list = ", ".join([svc, *additional_services])
-            _LOGGER.debug(f"[{self.room}] {level.title()} notification sent via {service_list}: {title}")
+        service_list = ", ".join([svc, *additional_services])
+        _LOGGER.debug(f"[{self.room}] {level.title()} notification sent via {service_list}: {title}")
 
-        except Exception as e:
-            _LOGGER.error(f"[{self.room}] Failed to send {level} notification: {e}")
-    
     async def _find_mobile_notification_service(self) -> Optional[str]:
         """
         Find the first available mobile app notification service.
@@ -270,58 +329,135 @@ class OGBNotificator:
             _LOGGER.error(f"[{self.room}] Error finding mobile notification service: {e}")
             return None
 
-    async def _check_rate_limit(self, level: str, title: str) -> bool:
+    def _admit(
+        self, level: str, title: str, message: str, service: Optional[str] = None
+    ) -> Optional[str]:
         """
-        Check if notification is within rate limits
+        Decide whether a notification goes out now.
+
+        - Identical issues (same title and message, numbers masked) are held
+          back for the level's cooldown; the next one that goes out carries
+          the number of suppressed repeats.
+        - Further alerts with the same title within AGGREGATION_WINDOW_SECONDS
+          of a sent one are merged into a single follow-up notification.
+        - The hourly limit per level is checked last.
 
-        :param level: Notification level
-        :param title: Notification title (used as identifier)
-        :return: True if notification can be sent
+        :return: Message to send (possibly annotated) or None if held back
         """
-        now = datetime.now()
+        now = self._clock()
         config = self.rate_limits.get(level, self.rate_limits["info"])
-        history = self._notification_history[level]
 
-        # Clean old entries (older than 1 hour)
-        cutoff = now - timedelta(hours=1)
-        history[:] = [t for t in history if t > cutoff]
+        key = (level, _fingerprint(title, message))
+        state = self._alerts.get(key)
+        if state is not None:
+            self._alerts.move_to_end(key)
+            if now - state.last_sent < config["cooldown_minutes"] * 60:
+                state.suppressed += 1
+                self._suppressed[level] = self._suppressed.get(level, 0) + 1
+                _LOGGER.debug(f"[{self.room}] Cooldown active for {level} notification: {title}")
+                return None
+
+        group = (level, title)
+        burst = self._bursts.get(group)
+        if burst is not None and now - burst.opened < AGGREGATION_WINDOW_SECONDS:
+            burst.count += 1
+            if len(burst.lines) < MAX_AGGREGATED_LINES:
+                burst.lines.append(message)
+            burst.service = service
+            self._remember_alert(key, now)
+            if burst.task is None:
+                delay = AGGREGATION_WINDOW_SECONDS - (now - burst.opened)
+                burst.task = asyncio.create_task(self._flush_burst_later(group, burst, delay))
+            return None
 
         # Check hourly limit
-        if len(history) >= config["max_per_hour"]:
-            return False
+        if self._hour_windows[level].count(now) >= config["max_per_hour"]:
+            _LOGGER.warning(
+                f"[{self.room}] Rate limit exceeded for {level} notification: {title}"
+            )
+            return None
 
-        # Check cooldown period for same title
-        cooldown_cutoff = now - timedelta(minutes=config["cooldown_minutes"])
-        recent_same_title = [t for t in history if t > cooldown_cutoff]
+        if state is not None and state.suppressed:
+            message = f"{message} (repeated {state.suppressed}x since last notification)"
+        self._remember_alert(key, now)
+        self._open_burst(group, now)
+        return message
+
+    def _remember_alert(self, key: Tuple[str, str], now: float):
+        state = self._alerts.get(key)
+        if state is None:
+            self._alerts[key] = _AlertState(now)
+            if len(self._alerts) > MAX_TRACKED_FINGERPRINTS:
+                self._alerts.popitem(last=False)
+        else:
+            state.last_sent = now
+            state.suppressed = 0
+            self._alerts.move_to_end(key)
+
+    def _open_burst(self, group: Tuple[str, str], now: float):
+        # A still pending previous burst keeps flushing through its own task
+        self._bursts.pop(group, None)
+        self._bursts[group] = _Burst(now)
+        while len(self._bursts) > MAX_PENDING_BURSTS:
+            _, dropped = self._bursts.popitem(last=False)
+            if dropped.task is not None and not dropped.task.done():
+                dropped.task.cancel()
+
+    async def _flush_burst_later(self, group: Tuple[str, str], burst: _Burst, delay: float):
+        await asyncio.sleep(max(0.0, delay))
+        await self._flush(group, burst)
+
+    async def flush_burst(self, group: Tuple[str, str]):
+        """Send the merged notification for an aggregation group now."""
+        burst = self._bursts.get(group)
+        if burst is not None and burst.task is not None and not burst.task.done():
+            burst.task.cancel()
+        await self._flush(group, burst)
+
+    async def _flush(self, group: Tuple[str, str], burst: Optional[_Burst]):
+        if burst is None or burst.count == 0:
+            return
+        level, title = group
+        count, lines = burst.count, burst.lines
+        burst.count, burst.lines, burst.task = 0, [], None
 
-        # Simple heuristic: if we've sent something recently, check if it's the same issue
-        # This prevents spam but allows different issues
-        if recent_same_title and len(recent_same_title) > 2:
-            _LOGGER.debug(f"[{self.room}] Cooldown active for {level} notifications")
-            return False
+        body = "\n".join(f"- {line}" for line in lines)
+        if count > len(lines):
+            body += f"\n(+{count - len(lines)} more)"
+        message = f"{count} more alert(s) within {AGGREGATION_WINDOW_SECONDS}s:\n{body}"
 
-        return True
+        config = self.rate_limits.get(level, self.rate_limits["info"])
+        if self._hour_windows[level].count(self._clock()) >= config["max_per_hour"]:
+            _LOGGER.warning(
+                f"[{self.room}] Rate limit exceeded for aggregated {level} notification: {title}"
+            )
+            return
+        try:
+            await self._dispatch(f"{title} ({count}x)", message, level, burst.service)
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Failed to send aggregated {level} notification: {e}")
 
     def _record_notification(self, level: str):
-        """Record notification timestamp for rate limiting"""
-        self._notification_history[level].append(datetime.now())
+        """Record notification for rate limiting"""
+        now = self._clock()
+        self._hour_windows[level].add(now=now)
+        self._day_windows[level].add(now=now)
 
     def get_notification_stats(self) -> dict:
         """Get notification statistics for debugging"""
-        now = datetime.now()
+        now = self._clock()
         stats = {}
 
         for level in ["critical", "warning", "info"]:
-            history = self._notification_history[level]
-            cutoff_1h = now - timedelta(hours=1)
-            cutoff_24h = now - timedelta(hours=24)
-
             stats[level] = {
-                "last_hour": len([t for t in history if t > cutoff_1h]),
-                "last_24h": len([t for t in history if t > cutoff_24h]),
+                "last_hour": self._hour_windows[level].count(now),
+                "last_24h": self._day_windows[level].count(now),
                 "rate_limit": self.rate_limits[level]["max_per_hour"],
+                "suppressed": self._suppressed.get(level, 0),
             }
 
+        stats["tracked_alerts"] = len(self._alerts)
+        stats["pending_bursts"] = sum(1 for b in self._bursts.values() if b.count)
         return stats
 
     # =================================================================
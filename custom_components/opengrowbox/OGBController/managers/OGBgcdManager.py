@@ -3,20 +3,117 @@ OpenGrowBox Global Cooldown Manager (GCD)
 
 Centralized management of device cooldowns and action history.
 Handles all cooldown logic, persistence, and status queries.
+
+Cooldown state is a table of time.monotonic() expiry timestamps indexed by
+capability slot (see utils/actionIndex.slot_of). Checks are plain reads on
+the event loop; registration mutates the table without awaiting, so no lock
+is needed. Active cooldowns are mirrored to the datastore as wall-clock
+timestamps only when they change and restored on first use after a restart.
 """
 
 import asyncio
 import logging
+import time
+from array import array
+from collections.abc import Mapping, MutableMapping
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 from ..data.OGBParams.OGBParams import DEFAULT_DEVICE_COOLDOWNS
+from ..utils.actionIndex import slot_of
 
 if TYPE_CHECKING:
     from ...OGBDataStore.OGBDataStore import OGBDataStore
 
 _LOGGER = logging.getLogger(__name__)
 
+_NEVER = float("-inf")
+_HISTORY_FIELDS = ("last_action", "action_type", "cooldown_until", "repeat_cooldown", "deviation")
+
+
+def _mono_to_datetime(value: float) -> datetime:
+    return datetime.now() + timedelta(seconds=value - time.monotonic())
+
+
+def _datetime_to_mono(value: datetime) -> float:
+    return time.monotonic() + (value - datetime.now()).total_seconds()
+
+
+class _HistoryEntryView(MutableMapping):
+    """dict-like view of one capability row, converting monotonic <-> datetime."""
+
+    __slots__ = ("_table", "_slot")
+
+    def __init__(self, table: "OGBgcdManager", slot: int):
+        self._table = table
+        self._slot = slot
+
+    def __getitem__(self, key):
+        table, slot = self._table, self._slot
+        if key == "last_action":
+            return _mono_to_datetime(table._last[slot])
+        if key == "cooldown_until":
+            return _mono_to_datetime(table._until[slot])
+        if key == "repeat_cooldown":
+            return _mono_to_datetime(table._repeat_until[slot])
+        if key == "action_type":
+            return table._action_type[slot]
+        if key == "deviation":
+            return table._deviation[slot]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        table, slot = self._table, self._slot
+        if key == "last_action":
+            table._last[slot] = _datetime_to_mono(value)
+        elif key == "cooldown_until":
+            table._until[slot] = _datetime_to_mono(value)
+        elif key == "repeat_cooldown":
+            table._repeat_until[slot] = _datetime_to_mono(value)
+        elif key == "action_type":
+            table._action_type[slot] = value
+        elif key == "deviation":
+            table._deviation[slot] = value
+        else:
+            raise KeyError(key)
+        table._mark_changed()
+
+    def __delitem__(self, key):
+        raise TypeError("cooldown history fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(_HISTORY_FIELDS)
+
+    def __len__(self):
+        return len(_HISTORY_FIELDS)
+
+
+class _HistoryView(Mapping):
+    """Backwards compatible ``action_history`` mapping over the cooldown table."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: "OGBgcdManager"):
+        self._table = table
+
+    def __getitem__(self, capability):
+        slot = self._table._slots.get(capability)
+        if slot is None:
+            raise KeyError(capability)
+        return _HistoryEntryView(self._table, slot)
+
+    def __iter__(self):
+        return iter(list(self._table._slots))
+
+    def __len__(self):
+        return len(self._table._slots)
+
+    def __contains__(self, capability):
+        return capability in self._table._slots
+
+    def clear(self):
+        self._table._reset_table()
+
 
 class OGBgcdManager:
     """
@@ -48,8 +145,16 @@ class OGBgcdManager:
         self.room = room
 
         self.cooldowns: Dict[str, float] = self.load_from_datastore()
-        self.action_history: Dict[str, Dict[str, Any]] = {}
         self._emergency_conditions: List[str] = []
+
+        # Cooldown table: capability slot -> monotonic timestamps / last action
+        self._slots: Dict[str, int] = {}  # registered capabilities
+        self._until = array("d")
+        self._repeat_until = array("d")
+        self._last = array("d")
+        self._action_type: List[Optional[str]] = []
+        self._deviation: List[float] = []
+        self._state_restored = False
         
         # Emergency priority mapping: which capabilities solve which emergencies
         # ALL capabilities must be listed here to ensure proper emergency response
@@ -118,6 +223,190 @@ class OGBgcdManager:
             self._async_lock = asyncio.Lock()
         return self._async_lock
 
+    @property
+    def action_history(self) -> _HistoryView:
+        """Registered actions per capability (datetime view of the cooldown table)."""
+        self._restore_state()
+        return _HistoryView(self)
+
+    # -----------------------------------------------------------------
+    # Cooldown table
+    # -----------------------------------------------------------------
+
+    def _ensure_slot(self, slot: int) -> None:
+        missing = slot + 1 - len(self._until)
+        if missing > 0:
+            filler = array("d", [_NEVER]) * missing
+            self._until.extend(filler)
+            self._repeat_until.extend(filler)
+            self._last.extend(filler)
+            self._action_type.extend([None] * missing)
+            self._deviation.extend([0.0] * missing)
+
+    def _reset_table(self) -> None:
+        self._slots.clear()
+        self._until = array("d")
+        self._repeat_until = array("d")
+        self._last = array("d")
+        self._action_type = []
+        self._deviation = []
+        self._mark_changed()
+
+    def _check(self, capability: str, action: str, now: float, reduce_factor: float) -> bool:
+        """Synchronous cooldown check against monotonic ``now``."""
+        slot = self._slots.get(capability)
+        if slot is None:
+            return True
+
+        # Check if this capability helps solve any active emergency
+        if self._emergency_conditions and self._can_solve_emergency(capability):
+            _LOGGER.debug(
+                f"{self.room}: Emergency override - bypassing cooldown for {capability} (solves {self._emergency_conditions})"
+            )
+            return True
+
+        until = self._until[slot]
+        # Reduce actions have shorter cooldowns to allow stopping devices quickly
+        if action == "Reduce":
+            last = self._last[slot]
+            reduce_until = last + (until - last) * reduce_factor
+            if now < reduce_until:
+                _LOGGER.debug(
+                    f"{self.room}: {capability} Reduce action still in cooldown for {reduce_until - now:.1f}s (factor: {reduce_factor})"
+                )
+                return False
+            return True
+
+        if now < until:
+            _LOGGER.debug(f"{self.room}: {capability} still in cooldown for {until - now:.1f}s")
+            return False
+
+        if self._action_type[slot] == action and now < self._repeat_until[slot]:
+            _LOGGER.debug(f"{self.room}: {capability} repeat of '{action}' still blocked")
+            return False
+
+        return True
+
+    def _reduce_factor(self) -> float:
+        # Default: 0.1 = 10% of normal cooldown
+        return self.data_store.getDeep("controlOptions.reduceCooldownFactor", 0.1)
+
+    def _record(self, capability: str, action: str, deviation: float, cooldown_minutes: float, now: float) -> float:
+        slot = self._slots.get(capability)
+        if slot is None:
+            slot = self._slots[capability] = slot_of(capability)
+            self._ensure_slot(slot)
+        seconds = cooldown_minutes * 60.0
+        self._last[slot] = now
+        self._until[slot] = now + seconds
+        self._repeat_until[slot] = now + seconds * 0.5
+        self._action_type[slot] = action
+        self._deviation[slot] = deviation
+        return now + seconds
+
+    def filter_allowed(
+        self,
+        actions: Sequence[Any],
+        deviations: Optional[Dict[str, float]] = None,
+        register: bool = True,
+    ) -> Tuple[List[Any], List[Any]]:
+        """Batch cooldown check for one cycle's actions.
+
+        Args:
+            actions: Action objects or dicts with capability/action
+            deviations: Optional capability -> deviation (for adaptive cooldowns)
+            register: Register allowed actions right away (a later action on
+                the same capability in this batch is then blocked)
+
+        Returns:
+            Tuple of (allowed, blocked)
+        """
+        self._restore_state()
+        now = time.monotonic()
+        reduce_factor = self._reduce_factor()
+        deviations = deviations or {}
+        allowed, blocked = [], []
+        changed = False
+
+        for action in actions:
+            if isinstance(action, dict):
+                capability, action_type = action.get("capability"), action.get("action")
+            else:
+                capability, action_type = getattr(action, "capability", None), getattr(action, "action", None)
+
+            if self._check(capability, action_type, now, reduce_factor):
+                allowed.append(action)
+                if register and capability:
+                    deviation = deviations.get(capability, 0)
+                    self._record(capability, action_type, deviation, self.calculate(capability, deviation), now)
+                    changed = True
+            else:
+                blocked.append(action)
+
+        if changed:
+            self._mark_changed()
+        return allowed, blocked
+
+    # -----------------------------------------------------------------
+    # Persistence of active cooldowns (wall clock in the datastore)
+    # -----------------------------------------------------------------
+
+    def _mark_changed(self) -> None:
+        """Mirror active cooldowns to the datastore; the next regular save writes them."""
+        now = time.monotonic()
+        wall = time.time()
+        state = {}
+        for capability, slot in self._slots.items():
+            until = self._until[slot]
+            repeat_until = self._repeat_until[slot]
+            if max(until, repeat_until) <= now:
+                continue
+            state[capability] = {
+                "action": self._action_type[slot],
+                "last": wall + (self._last[slot] - now),
+                "until": wall + (until - now),
+                "repeat": wall + (repeat_until - now),
+                "deviation": self._deviation[slot],
+            }
+        try:
+            self.data_store.set("cooldownState", state)
+        except Exception as e:
+            _LOGGER.debug(f"{self.room}: Could not mirror cooldown state: {e}")
+
+    def _restore_state(self) -> None:
+        """Load persisted cooldowns once, converting wall clock to monotonic."""
+        if self._state_restored:
+            return
+        self._state_restored = True
+        try:
+            state = self.data_store.get("cooldownState")
+        except Exception:
+            state = None
+        if not isinstance(state, dict) or not state:
+            return
+
+        now = time.monotonic()
+        wall = time.time()
+        restored = 0
+        for capability, entry in state.items():
+            try:
+                until = now + (float(entry["until"]) - wall)
+                repeat_until = now + (float(entry["repeat"]) - wall)
+                if max(until, repeat_until) <= now or capability in self._slots:
+                    continue
+                slot = self._slots[capability] = slot_of(capability)
+                self._ensure_slot(slot)
+                self._until[slot] = until
+                self._repeat_until[slot] = repeat_until
+                self._last[slot] = now + (float(entry.get("last", wall)) - wall)
+                self._action_type[slot] = entry.get("action")
+                self._deviation[slot] = float(entry.get("deviation", 0) or 0)
+                restored += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+        if restored:
+            _LOGGER.debug(f"{self.room}: Restored {restored} active cooldown(s) from datastore")
+
     def _can_solve_emergency(self, capability: str) -> bool:
         """
         Check if a capability can help solve any active emergency condition.
@@ -218,53 +507,10 @@ class OGBgcdManager:
         Returns:
             True if action is allowed
         """
-        now = datetime.now()
-
-        if capability not in self.action_history:
-            return True
-
-        history = self.action_history[capability]
-
-        # Check if this capability helps solve any active emergency
-        if self._can_solve_emergency(capability):
-            _LOGGER.debug(
-                f"{self.room}: Emergency override - bypassing cooldown for {capability} (solves {self._emergency_conditions})"
-            )
-            return True
-
-        # Reduce actions have shorter cooldowns to allow stopping devices quickly
-        if action == "Reduce":
-            # Get reduce cooldown factor from datastore (default: 0.1 = 10% of normal cooldown)
-            reduce_factor = self.data_store.getDeep("controlOptions.reduceCooldownFactor", 0.1)
-            
-            # Calculate reduced cooldown time
-            base_cooldown = history.get("cooldown_until", now)
-            last_action = history.get("last_action", now)
-            cooldown_duration = base_cooldown - last_action
-            reduce_cooldown = last_action + (cooldown_duration * reduce_factor)
-            
-            if now < reduce_cooldown:
-                _LOGGER.debug(
-                    f"{self.room}: {capability} Reduce action still in cooldown until {reduce_cooldown} (factor: {reduce_factor})"
-                )
-                return False
+        self._restore_state()
+        if capability not in self._slots:
             return True
-
-        if now < history.get("cooldown_until", now):
-            _LOGGER.debug(
-                f"{self.room}: {capability} still in cooldown until {history['cooldown_until']}"
-            )
-            return False
-
-        if history.get("action_type") == action and now < history.get(
-            "repeat_cooldown", now
-        ):
-            _LOGGER.debug(
-                f"{self.room}: {capability} repeat of '{action}' still blocked"
-            )
-            return False
-
-        return True
+        return self._check(capability, action, time.monotonic(), self._reduce_factor())
 
     def calculate(self, capability: str, deviation: float = 0, adaptive: bool = False) -> float:
         """
@@ -345,25 +591,14 @@ class OGBgcdManager:
             deviation: Current deviation from target
             adaptive: If True, use adaptive cooldown logic
         """
-        async with self._lock:
-            now = datetime.now()
+        self._restore_state()
+        cooldown_minutes = self.calculate(capability, deviation, adaptive)
+        self._record(capability, action, deviation, cooldown_minutes, time.monotonic())
+        self._mark_changed()
 
-            cooldown_minutes = self.calculate(capability, deviation, adaptive)
-            cooldown_until = now + timedelta(minutes=cooldown_minutes)
-
-            repeat_cooldown = now + timedelta(minutes=cooldown_minutes * 0.5)
-
-            self.action_history[capability] = {
-                "last_action": now,
-                "action_type": action,
-                "cooldown_until": cooldown_until,
-                "repeat_cooldown": repeat_cooldown,
-                "deviation": deviation,
-            }
-
-            _LOGGER.debug(
-                f"{self.room}: {capability} '{action}' registered, cooldown until {cooldown_until}"
-            )
+        _LOGGER.debug(
+            f"{self.room}: {capability} '{action}' registered, cooldown {cooldown_minutes:.1f} min"
+        )
 
     async def adjust(self, capability: str, minutes: float):
         """
@@ -389,32 +624,28 @@ class OGBgcdManager:
         Returns:
             Dictionary with cooldown status information
         """
-        now = datetime.now()
-
-        active_cooldowns = [
-            cap for cap, data in self.action_history.items()
-            if now < data.get("cooldown_until", now)
-        ]
+        self._restore_state()
+        now = time.monotonic()
+        remaining = {
+            cap: self._until[slot] - now
+            for cap, slot in self._slots.items()
+            if self._until[slot] > now
+        }
 
         status = {
             "cooldowns": self.cooldowns.copy(),
-            "active_count": len(active_cooldowns),
-            "active_cooldowns": active_cooldowns,
+            "active_count": len(remaining),
+            "active_cooldowns": list(remaining),
             "emergency_conditions": self._emergency_conditions.copy(),
             "emergency_mode": bool(self._emergency_conditions),  # Backwards compatibility
         }
 
-        # Calculate cooldown status for ALL devices in action history
-        for cap, data in self.action_history.items():
-            cooldown_until = data.get("cooldown_until", now)
-            cooldown_remaining = cooldown_until - now
-            
-            # Only add status if cooldown is still active (remaining > 0)
-            if cooldown_remaining.total_seconds() > 0:
-                status[cap] = {
-                    "cooldown_remaining_seconds": max(0, cooldown_remaining.total_seconds()),
-                    "is_blocked": True,
-                }
+        # Only devices whose cooldown is still active
+        for cap, seconds in remaining.items():
+            status[cap] = {
+                "cooldown_remaining_seconds": seconds,
+                "is_blocked": True,
+            }
 
         return status
 
@@ -452,9 +683,9 @@ class OGBgcdManager:
         """
         Clear all cooldowns during emergencies.
         """
-        now = datetime.now()
-
-        for capability in self.action_history:
-            self.action_history[capability]["cooldown_until"] = now
+        now = time.monotonic()
+        for slot in self._slots.values():
+            self._until[slot] = now
+        self._mark_changed()
 
         _LOGGER.debug(f"{self.room}: All cooldowns cleared")
@@ -340,7 +340,7 @@ class OGBConfigurationManager:
         action = actions.get(entity_key)
         
         if action:
-            asyncio.create_task(action(data))
+            asyncio.create_task(self._apply_configuration(action, data, entity_key))
             return True
         
         # Dynamic handler for CropSteering parameters (number entities)
@@ -358,6 +358,13 @@ class OGBConfigurationManager:
             _LOGGER.warning(f"{self.room}: Unhandled entity update: {original_key}")
         return False
 
+    async def _apply_configuration(self, action, data, entity_key):
+        """Run a configuration handler, then announce that settings changed."""
+        try:
+            await action(data)
+        finally:
+            await self.event_manager.emit("ConfigurationApplied", entity_key)
+
     # Core control methods
     async def _ogb_vpd_determination(self, data):
         """Update VPD determination mode."""
@@ -2210,14 +2217,15 @@ class OGBConfigurationManager:
         if self.room == "Ambient":
             return  # Ambient room does not have soil moisture thresholds
             
+        # OGBEventPublication / OGBInitData
         value = self._coerce_float(
-            data.newState[0] if getattr(data, "newState", None) else None,
+            data.newState[0] if data.newState else None,
             context="soil moisture threshold",
         )
         if value is None:
             return
 
-        entity_name = (getattr(data, "Name", "") or "").lower()
+        entity_name = (data.Name or "").lower()
         room_suffix = f"_{self.room.lower()}"
         is_min = f"ogb_soilmoisturemin{room_suffix}" in entity_name
         is_max = f"ogb_soilmoisturemax{room_suffix}" in entity_name
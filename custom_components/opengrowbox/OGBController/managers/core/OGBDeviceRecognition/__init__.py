@@ -89,6 +89,10 @@ class OGBDeviceRecognitionManager:
         
         # Direct API controller
         self._direct_api = None
+
+        # One connection-limited HTTP session for scanner, recognizers and direct APIs
+        from .http_pool import SharedHttpSession
+        self._http = SharedHttpSession()
         
         # Background tasks
         self._discovery_task = None
@@ -151,7 +155,8 @@ class OGBDeviceRecognitionManager:
             self._network_scanner = NetworkScanner(
                 self._on_device_discovered,
                 ip_ranges,
-                self.room
+                self.room,
+                http=self._http,
             )
             await self._network_scanner.start()
             _LOGGER.warning(f"[{self.room}] Network scanner started")
@@ -360,11 +365,13 @@ class OGBDeviceRecognitionManager:
         
         try:
             import aiohttp
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(f"http://{ip}/cm?cmnd=Status%200") as resp:
-                    if resp.status != 200:
-                        return None
-                    status = await resp.json()
+            session = await self._http.get()
+            async with session.get(
+                f"http://{ip}/cm?cmnd=Status%200", timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status != 200:
+                    return None
+                status = await resp.json()
             
             status_net = status.get("StatusNET", {})
             status_stk = status.get("StatusSTS", {})
@@ -442,24 +449,27 @@ class OGBDeviceRecognitionManager:
         try:
             import aiohttp
             
+            session = await self._http.get()
+            timeout = aiohttp.ClientTimeout(total=5)
+
             # Try Gen2 API first
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                try:
-                    async with session.post(
-                        f"http://{ip}/rpc",
-                        json={"id": 1, "method": "Shelly.GetDeviceInfo"}
-                    ) as resp:
-                        if resp.status == 200:
-                            info = await resp.json()
-                            return await self._parse_shelly_gen2(ip, info, data)
-                except:
-                    pass
-                
-                # Fallback to Gen1
-                async with session.get(f"http://{ip}/shelly") as resp:
+            try:
+                async with session.post(
+                    f"http://{ip}/rpc",
+                    json={"id": 1, "method": "Shelly.GetDeviceInfo"},
+                    timeout=timeout,
+                ) as resp:
                     if resp.status == 200:
                         info = await resp.json()
-                        return await self._parse_shelly_gen1(ip, info, data)
+                        return await self._parse_shelly_gen2(ip, info, data)
+            except:
+                pass
+            
+            # Fallback to Gen1
+            async with session.get(f"http://{ip}/shelly", timeout=timeout) as resp:
+                if resp.status == 200:
+                    info = await resp.json()
+                    return await self._parse_shelly_gen1(ip, info, data)
             
             return None
             
@@ -555,15 +565,17 @@ class OGBDeviceRecognitionManager:
         
         try:
             import aiohttp
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(f"http://{ip}") as resp:
-                    if resp.status != 200:
-                        return None
-                    text = await resp.text()
-                    
-                    # Check for ESPHome signature
-                    if "esphome" not in text.lower() and "esp" not in text.lower():
-                        return None
+            session = await self._http.get()
+            async with session.get(
+                f"http://{ip}", timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status != 200:
+                    return None
+                text = await resp.text()
+                
+                # Check for ESPHome signature
+                if "esphome" not in text.lower() and "esp" not in text.lower():
+                    return None
             
             # Try to get device info via API
             # ESPHome native API requires special client, use basic info
@@ -1166,7 +1178,7 @@ class OGBDeviceRecognitionManager:
             
             if not self._direct_api:
                 from .direct_api import DirectAPIController
-                self._direct_api = DirectAPIController(self.room)
+                self._direct_api = DirectAPIController(self.room, http=self._http)
             
             return await self._direct_api.get_device_api(device)
             
@@ -1191,6 +1203,9 @@ class OGBDeviceRecognitionManager:
             await self._network_scanner.stop()
         if self._bluetooth_discovery:
             await self._bluetooth_discovery.stop()
+        if self._direct_api:
+            await self._direct_api.close_all()
+        await self._http.close()
         
         _LOGGER.info(f"[{self.room}] OGBDeviceRecognitionManager shutdown")
     
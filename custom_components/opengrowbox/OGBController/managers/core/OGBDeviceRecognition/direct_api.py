@@ -13,19 +13,23 @@ _LOGGER = logging.getLogger(__name__)
 class BaseDeviceAPI(ABC):
     """Base class for device-specific APIs."""
     
-    def __init__(self, ip_address: str, room: str):
+    def __init__(self, ip_address: str, room: str, http=None):
         """Initialize device API.
         
         Args:
             ip_address: Device IP address
             room: Room identifier
+            http: Optional SharedHttpSession to reuse instead of a private session
         """
         self.ip_address = ip_address
         self.room = room
+        self._http = http
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
+        """Get the shared session, or create a private one as fallback."""
+        if self._http is not None:
+            return await self._http.get()
         if not self._session or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=10)
             self._session = aiohttp.ClientSession(timeout=timeout)
@@ -52,7 +56,7 @@ class BaseDeviceAPI(ABC):
         pass
     
     async def close(self):
-        """Close HTTP session."""
+        """Close the private HTTP session (the shared one is closed by its owner)."""
         if self._session and not self._session.closed:
             await self._session.close()
 
@@ -294,13 +298,15 @@ class ShellyAPI(BaseDeviceAPI):
 class DirectAPIController:
     """Controller for direct device API communication."""
     
-    def __init__(self, room: str):
+    def __init__(self, room: str, http=None):
         """Initialize direct API controller.
         
         Args:
             room: Room identifier
+            http: Optional SharedHttpSession shared by all device APIs
         """
         self.room = room
+        self._http = http
         self._apis: Dict[str, BaseDeviceAPI] = {}
     
     async def get_device_api(self, device: Dict[str, Any]) -> Optional[BaseDeviceAPI]:
@@ -329,9 +335,9 @@ class DirectAPIController:
         
         api = None
         if manufacturer == "tasmota":
-            api = TasmotaAPI(ip, self.room)
+            api = TasmotaAPI(ip, self.room, http=self._http)
         elif manufacturer == "shelly":
-            api = ShellyAPI(ip, self.room)
+            api = ShellyAPI(ip, self.room, http=self._http)
         
         if api:
             self._apis[device_id] = api
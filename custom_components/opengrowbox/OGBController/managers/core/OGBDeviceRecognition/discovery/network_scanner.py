@@ -3,12 +3,24 @@
 import asyncio
 import ipaddress
 import logging
+import time
 from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fast pre-filter: hosts that do not accept a TCP connection within this time
+# are skipped before any HTTP fingerprinting.
+TCP_PROBE_TIMEOUT_SECONDS = 0.5
+
+# Timeout for each fingerprint request (all endpoints run concurrently).
+FINGERPRINT_TIMEOUT_SECONDS = 2
+
+# Hosts that had no open port or no recognizable device are not re-probed
+# until this TTL expires.
+NEGATIVE_CACHE_TTL_SECONDS = 1800
+
 # Known device endpoints to check
 DEVICE_ENDPOINTS = {
     "tasmota": {
@@ -38,28 +50,64 @@ DEVICE_ENDPOINTS = {
 
 
 class NetworkScanner:
-    """Scans network ranges for smart devices."""
+    """Scans network ranges for smart devices.
+
+    Each host first gets a cheap TCP connect probe; only hosts with an open
+    HTTP port are fingerprinted, with all DEVICE_ENDPOINTS requested
+    concurrently over the shared session. Hosts without a match are cached
+    as negative for NEGATIVE_CACHE_TTL_SECONDS.
+    """
     
     def __init__(self, callback: Callable[[Dict[str, Any]], None], 
-                 ip_ranges: List[str], room: str):
+                 ip_ranges: List[str], room: str, http=None, port: int = 80,
+                 max_concurrency: int = 50):
         """Initialize network scanner.
         
         Args:
             callback: Function to call when device is discovered
             ip_ranges: List of IP ranges to scan (e.g., ["192.168.1.0/24"])
             room: Room identifier
+            http: SharedHttpSession to use (created on demand if None)
+            port: HTTP port to probe
+            max_concurrency: Hosts probed in parallel
         """
         self._callback = callback
         self.ip_ranges = ip_ranges
         self.room = room
+        self.port = port
+        self._max_concurrency = max_concurrency
+        self._owns_http = http is None
+        if http is None:
+            from ..http_pool import SharedHttpSession
+            http = SharedHttpSession()
+        self._http = http
+        self._negative_cache: Dict[str, float] = {}  # ip -> expiry (monotonic)
         self._shutdown = False
         self._scanning = False
+        self.last_scan_stats: Dict[str, Any] = {}
         
     async def start(self):
         """Start network scanner."""
         _LOGGER.info(f"[{self.room}] Network scanner started, ranges: {self.ip_ranges}")
         # Initial scan
         await self.scan()
+
+    def _build_ip_list(self) -> List[str]:
+        """Expand configured ranges into host addresses."""
+        ips = []
+        for ip_range in self.ip_ranges:
+            try:
+                network = ipaddress.ip_network(ip_range, strict=False)
+                # Scan only host addresses (exclude network and broadcast)
+                hosts = list(network.hosts())
+                # Limit scan to reasonable number
+                if len(hosts) > 254:
+                    _LOGGER.warning(f"[{self.room}] IP range {ip_range} too large, limiting to first 254 hosts")
+                    hosts = hosts[:254]
+                ips.extend([str(ip) for ip in hosts])
+            except ValueError as e:
+                _LOGGER.error(f"[{self.room}] Invalid IP range {ip_range}: {e}")
+        return ips
     
     async def scan(self):
         """Perform network scan."""
@@ -68,111 +116,128 @@ class NetworkScanner:
         
         self._scanning = True
         _LOGGER.debug(f"[{self.room}] Starting network scan")
+        started = time.monotonic()
         
         try:
-            # Generate IP list from ranges
-            ips = []
-            for ip_range in self.ip_ranges:
-                try:
-                    network = ipaddress.ip_network(ip_range, strict=False)
-                    # Scan only host addresses (exclude network and broadcast)
-                    hosts = list(network.hosts())
-                    # Limit scan to reasonable number
-                    if len(hosts) > 254:
-                        _LOGGER.warning(f"[{self.room}] IP range {ip_range} too large, limiting to first 254 hosts")
-                        hosts = hosts[:254]
-                    ips.extend([str(ip) for ip in hosts])
-                except ValueError as e:
-                    _LOGGER.error(f"[{self.room}] Invalid IP range {ip_range}: {e}")
-            
+            ips = self._build_ip_list()
             if not ips:
                 return
+
+            now = time.monotonic()
+            self._negative_cache = {
+                ip: expiry for ip, expiry in self._negative_cache.items() if expiry > now
+            }
+            to_scan = [ip for ip in ips if ip not in self._negative_cache]
             
             # Scan IPs concurrently with semaphore to limit connections
-            semaphore = asyncio.Semaphore(50)  # Max 50 concurrent connections
-            tasks = [self._scan_ip(ip, semaphore) for ip in ips]
-            
-            await asyncio.gather(*tasks, return_exceptions=True)
+            semaphore = asyncio.Semaphore(self._max_concurrency)
+            tasks = [self._scan_ip(ip, semaphore) for ip in to_scan]
             
-            _LOGGER.debug(f"[{self.room}] Network scan complete, checked {len(ips)} IPs")
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            found = sum(1 for r in results if r is True)
+
+            self.last_scan_stats = {
+                "hosts": len(ips),
+                "skipped_cached": len(ips) - len(to_scan),
+                "probed": len(to_scan),
+                "found": found,
+                "duration_seconds": round(time.monotonic() - started, 3),
+            }
+            _LOGGER.debug(f"[{self.room}] Network scan complete: {self.last_scan_stats}")
             
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error during network scan: {e}")
         finally:
             self._scanning = False
+
+    async def _tcp_probe(self, ip: str) -> bool:
+        """Return True if the host accepts a TCP connection on the HTTP port."""
+        try:
+            _reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, self.port),
+                timeout=TCP_PROBE_TIMEOUT_SECONDS,
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def _fetch_endpoint(self, session, ip: str, endpoint: Dict[str, Any]):
+        """Request one fingerprint endpoint; returns parsed data or None."""
+        host = ip if self.port == 80 else f"{ip}:{self.port}"
+        url = endpoint["url"].format(ip=host)
+        timeout = aiohttp.ClientTimeout(total=FINGERPRINT_TIMEOUT_SECONDS)
+        try:
+            if endpoint.get("method", "GET") == "POST":
+                request = session.post(url, json=endpoint.get("json"), timeout=timeout)
+            else:
+                request = session.get(url, timeout=timeout)
+            async with request as resp:
+                if resp.status != 200:
+                    return None
+                if endpoint.get("text"):
+                    data = await resp.text()
+                else:
+                    data = await resp.json(content_type=None)
+            return data if endpoint["check"](data) else None
+        except (asyncio.TimeoutError, aiohttp.ClientError, ValueError, TypeError):
+            return None
     
-    async def _scan_ip(self, ip: str, semaphore: asyncio.Semaphore):
+    async def _scan_ip(self, ip: str, semaphore: asyncio.Semaphore) -> bool:
         """Scan a single IP address.
         
         Args:
             ip: IP address to scan
             semaphore: Semaphore to limit concurrent connections
+
+        Returns:
+            True if a device was recognized
         """
         async with semaphore:
             if self._shutdown:
-                return
-            
-            # Check if IP responds to HTTP
+                return False
+
             try:
-                timeout = aiohttp.ClientTimeout(total=2)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    # Quick check if device responds
-                    try:
-                        async with session.get(f"http://{ip}", allow_redirects=True) as resp:
-                            if resp.status not in [200, 401]:
-                                return
-                    except:
-                        return
-                    
-                    # Try to identify device by checking endpoints
-                    for device_type, endpoint in DEVICE_ENDPOINTS.items():
-                        try:
-                            url = endpoint["url"].format(ip=ip)
-                            method = endpoint.get("method", "GET")
-                            
-                            if method == "POST":
-                                async with session.post(url, json=endpoint.get("json")) as resp:
-                                    if resp.status == 200:
-                                        if endpoint.get("text"):
-                                            data = await resp.text()
-                                        else:
-                                            data = await resp.json()
-                                        
-                                        if endpoint["check"](data):
-                                            await self._callback({
-                                                "type": device_type.replace("_gen1", "").replace("_gen2", ""),
-                                                "ip": ip,
-                                                "method": "network_scan",
-                                                "endpoint": device_type,
-                                                "raw_data": data if not endpoint.get("text") else {"html": data[:500]},
-                                            })
-                                            return
-                            else:
-                                async with session.get(url) as resp:
-                                    if resp.status == 200:
-                                        if endpoint.get("text"):
-                                            data = await resp.text()
-                                        else:
-                                            data = await resp.json()
-                                        
-                                        if endpoint["check"](data):
-                                            await self._callback({
-                                                "type": device_type.replace("_gen1", "").replace("_gen2", ""),
-                                                "ip": ip,
-                                                "method": "network_scan",
-                                                "endpoint": device_type,
-                                                "raw_data": data if not endpoint.get("text") else {"html": data[:500]},
-                                            })
-                                            return
-                        except asyncio.TimeoutError:
-                            continue
-                        except Exception:
-                            continue
+                if not await self._tcp_probe(ip):
+                    self._negative_cache[ip] = time.monotonic() + NEGATIVE_CACHE_TTL_SECONDS
+                    return False
+
+                session = await self._http.get()
+                endpoints = list(DEVICE_ENDPOINTS.items())
+                results = await asyncio.gather(
+                    *(self._fetch_endpoint(session, ip, endpoint) for _, endpoint in endpoints)
+                )
+
+                # First match in DEVICE_ENDPOINTS order wins (specific before generic)
+                for (device_type, endpoint), data in zip(endpoints, results):
+                    if data is None:
+                        continue
+                    await self._callback({
+                        "type": device_type.replace("_gen1", "").replace("_gen2", ""),
+                        "ip": ip,
+                        "method": "network_scan",
+                        "endpoint": device_type,
+                        "raw_data": data if not endpoint.get("text") else {"html": data[:500]},
+                    })
+                    return True
+
+                self._negative_cache[ip] = time.monotonic() + NEGATIVE_CACHE_TTL_SECONDS
                             
             except Exception as e:
                 _LOGGER.debug(f"[{self.room}] Error scanning {ip}: {e}")
+            return False
+
+    def forget_host(self, ip: str):
+        """Drop a host from the negative cache so the next scan probes it."""
+        self._negative_cache.pop(ip, None)
     
     async def stop(self):
         """Stop network scanner."""
         self._shutdown = True
+        if self._owns_http:
+            await self._http.close()
         _LOGGER.info(f"[{self.room}] Network scanner stopped")
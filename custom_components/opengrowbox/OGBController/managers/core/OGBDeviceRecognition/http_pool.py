@@ -0,0 +1,70 @@
+"""Shared HTTP session for discovery engines and direct device APIs."""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Connection limits for the shared connector. Discovery fans out over a whole
+# subnet while direct APIs talk to a handful of known devices, so the total
+# limit caps sockets and the per-host limit keeps a single device from being
+# flooded by concurrent fingerprint probes.
+DEFAULT_CONNECTION_LIMIT = 64
+DEFAULT_CONNECTIONS_PER_HOST = 4
+DEFAULT_TIMEOUT_SECONDS = 10
+
+
+class SharedHttpSession:
+    """Lazily created, connection-limited aiohttp session.
+
+    One instance is owned by OGBDeviceRecognitionManager and handed to the
+    NetworkScanner, the recognizers and DirectAPIController so that all
+    device HTTP traffic of a room reuses one connection pool.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_CONNECTION_LIMIT,
+        limit_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self._limit,
+                    limit_per_host=self._limit_per_host,
+                    ttl_dns_cache=300,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self._timeout),
+                )
+                _LOGGER.debug(
+                    f"Created shared discovery session (limit={self._limit}, "
+                    f"per_host={self._limit_per_host})"
+                )
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def close(self):
+        """Close the shared session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
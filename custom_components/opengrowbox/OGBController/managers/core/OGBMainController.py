@@ -21,11 +21,10 @@ from ..OGBCO2Manager import OGBCO2Manager
 from ...premium.OGBPremiumIntegration import OGBPremiumIntegration
 from ..hydro.OGBCastManager import OGBCastManager
 from ..medium.OGBMediumManager import OGBMediumManager
-from ..hydro.tank.OGBTankFeedManager import OGBTankFeedManager
-from ..OGBEnergyManager import OGBEnergyManager
 from ...RegistryListener import OGBRegistryEvenListener
-from .OGBDeviceRecognition import OGBDeviceRecognitionManager
 from ...utils.ambient import is_ambient_room, is_not_ambient_room
+from ...utils.lazyRegistry import OGBManagerRegistry
+from ...utils.weatherService import get_weather_service
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -139,10 +138,6 @@ class OGBMainController:
         if hasattr(self.mode_manager, 'dryingActions'):
             self.mode_manager.dryingActions.action_manager = self.action_manager
 
-        self.feed_manager = OGBTankFeedManager(
-            self.hass, self.data_store, self.event_manager, self.room
-        )
-
         self.co2_manager = OGBCO2Manager(
             self.hass, self.data_store, self.event_manager, self.room
         )
@@ -192,8 +187,9 @@ class OGBMainController:
         if hasattr(self, 'plant_cast_manager') and hasattr(self.plant_cast_manager, 'CropSteeringManager'):
             self.plant_cast_manager.CropSteeringManager.notificator = self.notificator
 
-        if hasattr(self, 'mode_manager') and hasattr(self.mode_manager, 'CropSteeringManager'):
-            self.mode_manager.CropSteeringManager.notificator = self.notificator
+        if hasattr(self, 'mode_manager'):
+            # Handed on to its crop steering manager when that is first used
+            self.mode_manager.notificator = self.notificator
 
         # Monitoring and maintenance
         self.fallback_manager = OGBFallBackManager(
@@ -212,21 +208,106 @@ class OGBMainController:
             retention_days=7,  # Keep 7 days of raw sensor data
         )
 
-        # Energy management
-        self.energy_manager = OGBEnergyManager(
-            self.hass,
-            self.data_store,
+        # Premium features - using new modular integration
+        self.premium_manager = OGBPremiumIntegration(
+            self.hass, self.data_store, self.event_manager, self.room
+        )
+        # AI Data Bridge sends its batches over the premium WebSocket
+        self.mode_manager.aiDataBridge.prem_manager = self.premium_manager
+
+        # Optional managers - built when their feature is in use, torn down when disabled
+        self.managers = OGBManagerRegistry(
             self.event_manager,
             self.room,
+            shared=(
+                self.hass,
+                self.data_store,
+                self.event_manager,
+                self.registry_listener,
+                self.medium_manager,
+                self.action_manager,
+                self.notificator,
+            ),
         )
+        self.managers.register(
+            "feed_manager",
+            self._create_feed_manager,
+            gate=self._tank_feed_enabled,
+            gate_events=("FeedModeChange", "ReservoirLevelUpdate"),
+            wake_events=(
+                "CalibrateNutrientPump",
+                "DoseNutrients",
+                "DoseFullRecipe",
+                "DosePHDown",
+                "DosePHUp",
+            ),
+        )
+        self.managers.register(
+            "energy_manager",
+            self._create_energy_manager,
+            gate=lambda: is_not_ambient_room(self.room),
+        )
+        # Device recognition and auto-discovery (feature flag is off - built on first use)
+        self.managers.register(
+            "device_recognition", self._create_device_recognition, autostart=False
+        )
+        self.managers.start_enabled()
 
-        # Premium features - using new modular integration
-        self.premium_manager = OGBPremiumIntegration(
+    # =================================================================
+    # Optional managers
+    # =================================================================
+
+    @property
+    def feed_manager(self):
+        return self.managers.get("feed_manager")
+
+    @property
+    def energy_manager(self):
+        return self.managers.get("energy_manager")
+
+    @property
+    def device_recognition(self):
+        return self.managers.get("device_recognition")
+
+    # Pump capabilities served by the tank stack (see Pump.PUMP_TYPE_CAPABILITIES)
+    TANK_PUMP_CAPABILITIES = ("canPump", "canFeed", "canReservoirFill")
+
+    def _tank_feed_enabled(self) -> bool:
+        """
+        Tank stack is needed with an active feed mode, a tank pump (dosing,
+        feed, reservoir fill) or a reservoir level sensor: reservoir auto-fill
+        and level monitoring run independently of the feed mode.
+        """
+        if is_ambient_room(self.room):
+            return False
+        if self.data_store.getDeep("Hydro.FeedModeActive"):
+            return True
+        if any(self.data_store.getDeep(f"capabilities.{cap}.state") for cap in self.TANK_PUMP_CAPABILITIES):
+            return True
+        if self.data_store.getDeep("Hydro.ReservoirLevelRaw") is not None:
+            return True
+        # Never tear down in the middle of a reservoir fill
+        reservoir = getattr(self.managers.peek("feed_manager"), "reservoir_manager", None)
+        return bool(getattr(reservoir, "_is_filling", False))
+
+    def _create_feed_manager(self):
+        from ..hydro.tank.OGBTankFeedManager import OGBTankFeedManager
+        return OGBTankFeedManager(
             self.hass, self.data_store, self.event_manager, self.room
         )
 
-        # Device recognition and auto-discovery
-        self.device_recognition = OGBDeviceRecognitionManager(
+    def _create_energy_manager(self):
+        from ..OGBEnergyManager import OGBEnergyManager
+        return OGBEnergyManager(
+            self.hass,
+            self.data_store,
+            self.event_manager,
+            self.room,
+        )
+
+    def _create_device_recognition(self):
+        from .OGBDeviceRecognition import OGBDeviceRecognitionManager
+        return OGBDeviceRecognitionManager(
             self.hass, self.data_store, self.event_manager, self.room, self.config_entry_id
         )
 
@@ -240,7 +321,13 @@ class OGBMainController:
 
         # Ambient data handling
         self.hass.bus.async_listen("AmbientData", self._handle_ambient_data)
-        self.hass.bus.async_listen("OutsiteData", self._handle_outsite_data)
+
+        # Outside weather comes from the shared weather cache (warm on subscribe)
+        self._weather_unsub = None
+        if is_not_ambient_room(self.room):
+            self._weather_unsub = get_weather_service(self.hass).subscribe(
+                self.hass.config.latitude, self.hass.config.longitude, self._handle_outsite_data
+            )
 
         # Client logs handling
         self.hass.bus.async_listen("getOGBClientLogs", self.event_manager.handle_get_logs)
@@ -480,13 +567,13 @@ class OGBMainController:
             _LOGGER.debug(f"🔧 Set mainControl to 'HomeAssistant' for room {self.room}")
 
     async def _handle_outsite_data(self, event):
-        """Handle outside weather data."""
+        """Handle outside weather data (weather cache payload or OutsiteData event)."""
         if is_ambient_room(self.room):
             return
 
-        _LOGGER.debug(f"🌍 {self.room} Received OutsiteData: Temp={event.data.get('temperature')}°C, Hum={event.data.get('humidity')}%")
+        payload = event.data if hasattr(event, "data") else event
+        _LOGGER.debug(f"🌍 {self.room} Received OutsiteData: Temp={payload.get('temperature')}°C, Hum={payload.get('humidity')}%")
 
-        payload = event.data
         temp = payload.get("temperature")
         hum = payload.get("humidity")
 
@@ -9,9 +9,18 @@ from ...utils.sensorUpdater import (_update_specific_number,
                                   update_sensor_via_service)
 from ...data.OGBDataClasses.OGBPublications import OGBInitData, OGBVPDPublication, OGBModeRunPublication
 from ...utils.ambient import is_ambient_room, is_not_ambient_room
+from ...utils.evalMemo import EvaluationMemo, quantize
+from ...utils.weatherService import get_weather_service
 
 _LOGGER = logging.getLogger(__name__)
 
+# Reading resolution used to decide whether a VPD evaluation can be skipped
+TEMP_RESOLUTION = 0.1  # °C
+HUM_RESOLUTION = 0.1  # %RH
+# Re-run an unchanged evaluation at least this often (seconds)
+VPD_EVAL_MAX_AGE = 300
+VPD_TARGET_KEYS = ("perfection", "perfectMin", "perfectMax", "targeted", "targetedMin", "targetedMax", "tolerance")
+
 
 class OGBVPDManager:
     """Manages Vapor Pressure Deficit (VPD) calculations and sensor data processing."""
@@ -35,26 +44,16 @@ class OGBVPDManager:
         # VPD determination mode
         self.vpd_determination = "LIVE"  # LIVE or INTERVAL
 
-        # Weather data rate limiting (10 minute cooldown)
-        self._weather_last_fetch = None
-        self._weather_cache = None
-        self._weather_min_interval = 600  # 10 minutes in seconds
-        
-        # 429 Rate limiting backoff
-        self._weather_429_backoff_until = 0
-        self._weather_429_backoff_seconds = 60  # Start with 60s backoff
-        
-        # 502 retry tracking
-        self._weather_502_retry_count = 0
-        self._weather_max_502_retries = 3
-        self._weather_502_backoff_seconds = 120  # min interval after max retries exceeded
-
         # Sensor failure notification tracking (30 minute cooldown)
         self._sensor_failure_notifications = {}
         self._sensor_failure_cooldown = 1800  # 30 minutes in seconds
 
+        # Skips evaluations whose quantized inputs did not change
+        self.eval_memo = EvaluationMemo(max_age=VPD_EVAL_MAX_AGE)
+
         # Register event handlers
         self.event_manager.on("VPDCreation", self.handle_new_vpd)
+        self.event_manager.on("ConfigurationApplied", self._invalidate_evaluation)
 
     async def handle_new_vpd(self, data):
         """Handle new VPD data - ORIGINAL IMPLEMENTATION"""
@@ -125,20 +124,6 @@ class OGBVPDManager:
                         except (ValueError, TypeError):
                             _LOGGER.error(f"Invalid humidity value for {h.get('entity_id')}: {h.get('state')}")
 
-        _LOGGER.debug(
-            f"{self.room} VPD-CALC VALUES: "
-            f"temp_count={len(temperatures)}, hum_count={len(humidities)}"
-        )
-
-        self.data_store.setDeep("workData.temperature",temperatures)
-        self.data_store.setDeep("workData.humidity",humidities)
-        
-        # Calculate average values asynchronously (BEFORE leaf sensor logic!)
-        avgTemp = calculate_avg_value(temperatures)
-        self.data_store.setDeep("tentData.temperature", avgTemp)
-        avgHum = calculate_avg_value(humidities)
-        self.data_store.setDeep("tentData.humidity", avgHum)
-        
         # NEW: Read leaf temperature sensors
         leafTemperatures = []
         for dev in devices:
@@ -166,6 +151,25 @@ class OGBVPDManager:
                         except (ValueError, TypeError):
                             pass
         
+        fingerprint = self._evaluation_fingerprint(temperatures, humidities, leafTemperatures)
+        if not isinstance(data, OGBInitData) and self.eval_memo.is_unchanged(fingerprint):
+            _LOGGER.debug(f"{self.room} VPD inputs unchanged - skipping evaluation")
+            return
+
+        _LOGGER.debug(
+            f"{self.room} VPD-CALC VALUES: "
+            f"temp_count={len(temperatures)}, hum_count={len(humidities)}"
+        )
+
+        self.data_store.setDeep("workData.temperature",temperatures)
+        self.data_store.setDeep("workData.humidity",humidities)
+        
+        # Calculate average values asynchronously (BEFORE leaf sensor logic!)
+        avgTemp = calculate_avg_value(temperatures)
+        self.data_store.setDeep("tentData.temperature", avgTemp)
+        avgHum = calculate_avg_value(humidities)
+        self.data_store.setDeep("tentData.humidity", avgHum)
+        
         # Calculate leaf temperature average if sensors available
         # Skip for ambient room - leaf sensors only make sense for grow rooms
         if is_not_ambient_room(self.room):
@@ -248,6 +252,7 @@ class OGBVPDManager:
             #_LOGGER.debug(f"OGBInitData recognized: {data}")
             return
         else:
+            self.eval_memo.record(fingerprint)
             # Specific action for OGBEventPublication
             if currentVPD != lastVpd:
                 self.data_store.setDeep("vpd.current", currentVPD)
@@ -296,6 +301,30 @@ class OGBVPDManager:
                 _LOGGER.debug(f"Same-VPD: {vpdPub} currentVPD:{currentVPD}, lastStoreVPD:{lastVpd}")
                 await update_sensor_via_service(self.room,vpdPub,self.hass)
 
+    def _evaluation_fingerprint(self, temperatures, humidities, leafTemperatures):
+        """Quantized inputs of one VPD evaluation (readings, targets, mode, last action)."""
+        vpd = self.data_store.get("vpd") or {}
+        capabilities = self.data_store.get("capabilities") or {}
+        previous_actions = self.data_store.get("previousActions") or []
+        return (
+            tuple((t["entity_id"], quantize(t["value"], TEMP_RESOLUTION)) for t in temperatures),
+            tuple((h["entity_id"], quantize(h["value"], HUM_RESOLUTION)) for h in humidities),
+            tuple((t["entity_id"], quantize(t["value"], TEMP_RESOLUTION)) for t in leafTemperatures),
+            quantize(self.data_store.getDeep("tentData.leafTempOffset"), TEMP_RESOLUTION),
+            tuple(vpd.get(key) for key in VPD_TARGET_KEYS),
+            self.data_store.get("tentMode"),
+            self.data_store.get("plantStage"),
+            self.data_store.getDeep("controlOptionData.deadband.vpdDeadband"),
+            tuple(
+                (cap, bool(info.get("state")) if isinstance(info, dict) else None)
+                for cap, info in capabilities.items()
+            ),
+            previous_actions[-1].get("timestamp") if previous_actions else None,
+        )
+
+    async def _invalidate_evaluation(self, data):
+        self.eval_memo.invalidate(str(data))
+
     async def _notify_sensor_failure(self, entity_id: str, sensor_type: str, value: float):
         """Send critical notification for sensor with impossible values.
         
@@ -580,169 +609,20 @@ class OGBVPDManager:
         return vpdPub
 
     async def get_weather_data(self):
-        """Fetch weather data from Open-Meteo API with rate limiting and retry logic."""
-        import time
-
-        now = time.time()
-
-        # Check if we're in 429 backoff period
-        if now < self._weather_429_backoff_until:
-            wait_time = int(self._weather_429_backoff_until - now)
-            _LOGGER.warning(f"🌤️ {self.room} In 429 backoff period, skipping weather fetch (wait {wait_time}s)")
-            await self._emit_cached_weather()
-            return
-
-        # Check if we can use cached data (within cooldown period)
-        if self._weather_last_fetch and self._weather_cache:
-            elapsed = now - self._weather_last_fetch
-            if elapsed < self._weather_min_interval:
-                _LOGGER.debug(f"🌤️ {self.room} Using cached weather data (age: {int(elapsed)}s)")
-                await self._emit_cached_weather()
-                return
-
-        # Check if we need to fetch (allow one fetch even without cache)
-        can_fetch = True
-        if self._weather_last_fetch and not self._weather_cache:
-            elapsed = now - self._weather_last_fetch
-            if elapsed < self._weather_502_backoff_seconds:
-                can_fetch = False
-                _LOGGER.warning(
-                    f"🌤️ {self.room} Skipping weather fetch - too soon after failed attempt "
-                    f"(wait {int(self._weather_502_backoff_seconds - elapsed)}s)"
-                )
-
-        if not can_fetch:
-            await self._emit_cached_weather()
-            return
+        """Publish outdoor weather from the shared, hass-wide weather cache.
 
+        Fetching, TTL, backoff and fan-out to the other rooms are handled by
+        OGBWeatherService; this room only republishes the result on the bus.
+        """
         try:
-            lat = self.hass.config.latitude
-            lon = self.hass.config.longitude
-
-            url = (
-                f"https://api.open-meteo.com/v1/forecast?"
-                f"latitude={lat}&longitude={lon}&current=temperature_2m,relative_humidity_2m&timezone=auto"
-            )
-
-            import aiohttp
-
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                data = await self._fetch_with_retries(session, url)
-
-            if data is None:
-                # Retries exhausted or non-retryable error; fallback handled inside
-                return
-
-            current = data.get("current", {})
-            temperature = round(current.get("temperature_2m", 20.0), 1)
-            humidity = current.get("relative_humidity_2m", 60)
-
-            weather_data = {"temperature": temperature, "humidity": humidity}
-
-            # Cache the successful result
-            self._weather_cache = weather_data
-            self._weather_last_fetch = now
-            # Reset backoff on success
-            self._weather_429_backoff_seconds = 60
-            self._weather_429_backoff_until = 0
-            self._weather_502_retry_count = 0
-            self._weather_502_backoff_seconds = 120
-
-            _LOGGER.debug(f"🌤️ {self.room} Open-Meteo: {temperature}°C, {humidity}% (cached)")
-            await self.event_manager.emit("OutsiteData", weather_data, haEvent=True)
-
-        except asyncio.TimeoutError:
-            _LOGGER.warning(f"🌤️ {self.room} Timeout fetching Open-Meteo data")
-            self._weather_last_fetch = now
-            await self._emit_cached_weather()
-        except aiohttp.ClientError as e:
-            _LOGGER.warning(f"🌤️ {self.room} Open-Meteo connection error: {e}")
-            self._weather_last_fetch = now
-            await self._emit_cached_weather()
+            service = get_weather_service(self.hass)
+            weather_data = await service.get(self.hass.config.latitude, self.hass.config.longitude)
         except Exception as e:
-            _LOGGER.error(f"🌤️ {self.room} Fetch Error Open-Meteo: {e}")
-            self._weather_last_fetch = now
-            await self._emit_cached_weather()
-
-    async def _emit_cached_weather(self):
-        """Emit cached weather data if available."""
-        if self._weather_cache:
-            await self.event_manager.emit("OutsiteData", self._weather_cache, haEvent=True)
-
-    async def _fetch_with_retries(self, session, url):
-        """Fetch and parse Open-Meteo data with retry loop and rate-limit handling.
-
-        Returns the parsed JSON dict on success, or None if all retries are exhausted
-        or a non-retryable response is received.
-        """
-        import time
-
-        now = time.time()
-        import aiohttp
-
-        for attempt in range(1, self._weather_max_502_retries + 1):
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-
-                    if response.status == 429:
-                        self._weather_last_fetch = now
-                        self._weather_429_backoff_until = now + self._weather_429_backoff_seconds
-                        _LOGGER.error(
-                            f"🌤️ {self.room} Open-Meteo Rate Limited (429). "
-                            f"Backing off for {self._weather_429_backoff_seconds}s"
-                        )
-                        self._weather_429_backoff_seconds = min(self._weather_429_backoff_seconds * 2, 480)
-                        await self._emit_cached_weather()
-                        return None
-
-                    if response.status == 502:
-                        if attempt < self._weather_max_502_retries:
-                            wait_time = 2 ** attempt  # 2s, 4s, 8s
-                            _LOGGER.warning(
-                                f"🌤️ {self.room} Open-Meteo Server Error (502). "
-                                f"Retry {attempt}/{self._weather_max_502_retries} in {wait_time}s"
-                            )
-                            await asyncio.sleep(wait_time)
-                            continue
-
-                        _LOGGER.error(
-                            f"🌤️ {self.room} Open-Meteo Server Error (502). "
-                            f"Max retries ({self._weather_max_502_retries}) exceeded. "
-                            f"Next attempt in {self._weather_502_backoff_seconds}s"
-                        )
-                        self._weather_last_fetch = now
-                        self._weather_502_retry_count = 0
-                        self._weather_502_backoff_seconds = min(self._weather_502_backoff_seconds * 2, 900)
-                        await self._emit_cached_weather()
-                        return None
-
-                    # Any other non-200 status
-                    _LOGGER.error(f"🌤️ {self.room} Open-Meteo API Error: {response.status}")
-                    self._weather_last_fetch = now
-                    await self._emit_cached_weather()
-                    return None
-
-            except aiohttp.ClientError as e:
-                _LOGGER.warning(
-                    f"🌤️ {self.room} Open-Meteo connection error (attempt {attempt}): {e}"
-                )
-                if attempt < self._weather_max_502_retries:
-                    wait_time = 2 ** attempt
-                    await asyncio.sleep(wait_time)
-                    continue
-                _LOGGER.error(
-                    f"🌤️ {self.room} Open-Meteo connection failed after "
-                    f"{self._weather_max_502_retries} attempts"
-                )
-                self._weather_last_fetch = now
-                await self._emit_cached_weather()
-                return None
+            _LOGGER.error(f"🌤️ {self.room} Weather cache error: {e}")
+            return
 
-        return None
+        if weather_data:
+            await self.event_manager.emit("OutsiteData", weather_data, haEvent=True)
 
     def update_vpd_determination(self, value):
         """Update VPD determination mode."""
@@ -782,4 +662,5 @@ class OGBVPDManager:
             "perfection": self.data_store.getDeep("vpd.perfection"),
             "tolerance": self.data_store.getDeep("vpd.tolerance"),
             "determination_mode": self.vpd_determination,
+            "evaluation_cache": self.eval_memo.get_stats(),
         }
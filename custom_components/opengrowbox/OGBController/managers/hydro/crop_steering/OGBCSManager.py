@@ -8,6 +8,8 @@ from ....data.OGBDataClasses.OGBPublications import OGBHydroAction, OGBWaterActi
 from .OGBAdvancedSensor import OGBAdvancedSensor
 from .OGBCSCalibrationManager import OGBCSCalibrationManager
 from .OGBCSConfigurationManager import CSMode, OGBCSConfigurationManager
+from .OGBCSPhaseEngine import CSPhaseEngine
+from .OGBCSShotController import CSShotController, CSShotModel
 from ....utils.ambient import is_ambient_room, is_not_ambient_room
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,6 +21,10 @@ class OGBCSManager:
     RESPONSE_EVENT = "CropSteeringState"
     MAX_RECENT_LOG_EVENTS = 100
 
+    # Time sources for phase timers and irrigation; a simulation swaps in a virtual clock
+    clock = staticmethod(datetime.now)
+    sleep = staticmethod(asyncio.sleep)
+
     def __init__(self, hass, dataStore, eventManager, room, medium_manager=None):
         self.name = "OGB Crop Steering Manager"
         self.hass = hass
@@ -56,13 +62,22 @@ class OGBCSManager:
             room=room
         )
 
-        self.blockCheckIntervall = 60  # Check sensors every 60s in automatic mode
         self.max_irrigation_attempts = 5
         self.stability_tolerance = 1.5
 
-        # Single task for any CS operation
-        self._main_task = None
+        # Phase state machine: evaluations run on sensor/light/phase events and
+        # on phase timers instead of a polling loop
+        self._phase_engine = CSPhaseEngine(room, clock=lambda: self.clock())
+        self._last_evaluated_inputs = None
+        self._last_light_state = None
+        self._manual_phase = None
+        self._manual_settings = None
         self._calibration_task = None
+
+        # Irrigation shots end on bound VWC readings; the rise rate model is learned
+        self._shot_model = None
+        self._active_shot = None
+        self._settling_shot = None
         
         # Irrigation protection - prevents mode change from cancelling active irrigation
         self._irrigation_lock = asyncio.Lock()
@@ -79,9 +94,6 @@ class OGBCSManager:
         # Track phase in automatic cycle to reset per-phase counters on entry
         self._last_automatic_phase = None
 
-        # Manual phase change signalling - allows immediate restart of manual cycle
-        self._manual_phase_changed_event = asyncio.Event()
-
         # Failsafe / learning state initialization
         self._init_failsafe_state()
 
@@ -94,6 +106,10 @@ class OGBCSManager:
         )
         self.event_manager.on("MediumChange", self._on_medium_change)
         self.event_manager.on("CSManualPhaseChanged", self._on_manual_phase_changed)
+        # Inputs of the phase state machine
+        self.event_manager.on("MediumSensorUpdate", self._on_medium_sensor_update)
+        self.event_manager.on("toggleLight", self._on_light_toggle)
+        self.event_manager.on("ConfigurationApplied", self._on_configuration_applied)
 
     def register_event_handlers(self):
         """Register internal and HA event handlers for dashboard state snapshots."""
@@ -192,9 +208,9 @@ class OGBCSManager:
             )
 
     async def _on_manual_phase_changed(self, data=None):
-        """Handle manual phase selector changes by interrupting the current manual cycle."""
-        # Only relevant while manual mode runner is active
-        if self._main_task and not self._main_task.done():
+        """Handle manual phase selector changes by restarting the manual phase."""
+        # Only relevant while the state machine is running
+        if self._phase_engine.running:
             new_phase = None
             if isinstance(data, dict):
                 new_phase = data.get("phase")
@@ -204,9 +220,100 @@ class OGBCSManager:
                 new_phase = self._extract_phase_from_value(new_phase)
             _LOGGER.debug(
                 f"{self.room} - Manual phase change requested: {new_phase}. "
-                f"Signalling manual cycle to restart."
+                f"Restarting manual phase."
             )
-            self._manual_phase_changed_event.set()
+            # Forces a fresh phase entry (settings, counters) on the next evaluation
+            self._manual_phase = None
+            self._phase_engine.notify("phase", settle=0)
+
+    # ==================== STATE MACHINE INPUTS ====================
+
+    async def _on_medium_sensor_update(self, data=None):
+        """A substrate sensor reported a new value."""
+        if isinstance(data, dict) and data.get("room") not in (None, self.room):
+            return
+        # A running shot (or the one that just ended) consumes the VWC readings first
+        shot = getattr(self, "_active_shot", None) or getattr(self, "_settling_shot", None)
+        if shot is not None and shot.on_reading(data) and shot.lag_learned:
+            self._settling_shot = None
+            self._save_learned_value("shot_model", shot.model.to_dict())
+        self._phase_engine.notify("sensor")
+
+    async def _on_light_toggle(self, data=None):
+        """Light schedule check; only an actual on/off change is an input."""
+        is_light_on = self._is_lights_on()
+        if is_light_on != self._last_light_state:
+            self._last_light_state = is_light_on
+            self._phase_engine.notify("light")
+
+    async def _on_configuration_applied(self, data=None):
+        self._phase_engine.notify("config")
+
+    def _schedule_phase_timer(self, seconds: float, reason: str):
+        """Ask the state machine to evaluate again after a phase interval."""
+        engine = getattr(self, "_phase_engine", None)
+        if engine is not None:
+            engine.wake_in(seconds, reason)
+
+    def _schedule_light_deadlines(self):
+        """Wake up at the next light schedule boundaries the phases depend on.
+
+        Light on/off, the irrigation window (LightBufferHours) and the
+        near-light-off checks (2 h for P1/P3, 1 h for P2).
+        """
+        light_on_str = self.data_store.getDeep("isPlantDay.lightOnTime")
+        light_off_str = self.data_store.getDeep("isPlantDay.lightOffTime")
+        if not light_on_str or not light_off_str:
+            return
+
+        def parse(value):
+            for fmt in ("%H:%M:%S", "%H:%M"):
+                try:
+                    return datetime.strptime(str(value), fmt).time()
+                except ValueError:
+                    continue
+            return None
+
+        light_on = parse(light_on_str)
+        light_off = parse(light_off_str)
+        if light_on is None or light_off is None:
+            return
+
+        raw = self.data_store.getDeep("CropSteering.LightBufferHours")
+        try:
+            buffer = timedelta(hours=int(raw) if raw is not None else 2)
+        except (TypeError, ValueError):
+            buffer = timedelta(hours=2)
+
+        now = self.clock()
+
+        def next_at(clock_time, offset=timedelta(0)):
+            when = datetime.combine(now.date(), clock_time) + offset
+            while when <= now:
+                when += timedelta(days=1)
+            return when
+
+        deadlines = {
+            "light_on": next_at(light_on),
+            "light_off": next_at(light_off),
+            "irrigation_window_start": next_at(light_on, buffer),
+            "irrigation_window_stop": next_at(light_off, -buffer),
+            "light_off_2h": next_at(light_off, -timedelta(minutes=120)),
+            "light_off_1h": next_at(light_off, -timedelta(minutes=60)),
+        }
+        for reason, when in deadlines.items():
+            self._phase_engine.wake_at(when, reason)
+
+    def get_phase_engine_status(self) -> Dict[str, Any]:
+        return self._phase_engine.get_stats()
+
+    def _get_shot_model(self) -> CSShotModel:
+        """Rise rate model of the drippers, loaded once from the learned values."""
+        model = getattr(self, "_shot_model", None)
+        if model is None:
+            model = CSShotModel.from_dict(self.data_store.getDeep("CropSteering.Learned.shot_model"))
+            self._shot_model = model
+        return model
 
     # ==================== FAILSAFE & LEARNING ====================
 
@@ -517,7 +624,7 @@ class OGBCSManager:
     def _record_sensor_reading(self, vwc: float):
         """Record VWC reading for jump/stuck detection."""
         from datetime import datetime
-        self._vwc_history.append((datetime.now(), vwc))
+        self._vwc_history.append((self.clock(), vwc))
         # Keep last 20 readings
         if len(self._vwc_history) > 20:
             self._vwc_history.pop(0)
@@ -579,7 +686,7 @@ class OGBCSManager:
     async def _send_critical_notification(self, title: str, message: str):
         """Send critical notification via notificator with cooldown."""
         from datetime import datetime
-        now = datetime.now()
+        now = self.clock()
         cooldown = self._notification_cooldowns.get(title)
         if cooldown and (now - cooldown).total_seconds() < 3600:
             _LOGGER.debug(f"{self.room} - Critical notification cooldown active: {title}")
@@ -691,7 +798,7 @@ class OGBCSManager:
         Rate-limited: one notification per reason per cooldown window, so the
         user is informed but not spammed while manual irrigation keeps running.
         """
-        now = datetime.now()
+        now = self.clock()
         cooldown_seconds = 30 * 60  # 30 minutes
         if not hasattr(self, "_manual_failsafe_warnings"):
             self._manual_failsafe_warnings = {}
@@ -779,7 +886,7 @@ class OGBCSManager:
             shot_duration = int(preset.get("emergency_shot_duration", 15))
 
         emergency_interval = int(preset.get("emergency_interval", 300))
-        now = datetime.now()
+        now = self.clock()
 
         emergency_count = self.data_store.getDeep(counter_key) or 0
         last_emergency_time = self.data_store.getDeep(last_time_key)
@@ -796,6 +903,10 @@ class OGBCSManager:
                 f"{self.room} - Dryout override: VWC {vwc:.1f}% < {emergency_level:.1f}% "
                 f"but limit reached ({emergency_count}/{max_shots}) or interval not elapsed"
             )
+            if emergency_count < max_shots:
+                self._schedule_phase_timer(
+                    emergency_interval - time_since_last_emergency, "dryout_override"
+                )
             return False
 
         target_vwc = preset.get("VWCTarget", emergency_level + 5)
@@ -808,6 +919,7 @@ class OGBCSManager:
 
         self.data_store.setDeep(counter_key, emergency_count + 1)
         self.data_store.setDeep(last_time_key, now)
+        self._schedule_phase_timer(emergency_interval, "dryout_override")
 
         _LOGGER.warning(
             f"{self.room} - {phase.upper()} Dryout override: Emergency irrigation Shot {emergency_count + 1}/{max_shots}: "
@@ -1015,16 +1127,16 @@ class OGBCSManager:
             await self._force_stop_all()
             return
 
-        # ===== STEP 4: Check if task already running =====
-        # If a task is running, DON'T restart unless mode actually changed
-        if self._main_task and not self._main_task.done():
-            # Task is running - check if we should restart
+        # ===== STEP 4: Check if the state machine is already running =====
+        # If it is running, DON'T restart unless mode actually changed
+        if self._phase_engine.running:
+            # Running - check if we should restart
             if self._last_mode_change_mode == requested_mode:
-                _LOGGER.debug(f"{self.room} - CS task already running for '{requested_mode}', ignoring duplicate call")
+                _LOGGER.debug(f"{self.room} - CS already running for '{requested_mode}', ignoring duplicate call")
                 return
             else:
                 _LOGGER.debug(f"{self.room} - Mode changed from '{self._last_mode_change_mode}' to '{requested_mode}', restarting...")
-                await self._cancel_main_task()
+                await self._stop_phase_engine()
                 # Reset phase state when switching between Automatic/Manual so stale
                 # counters from the previous mode don't corrupt the new mode.
                 _LOGGER.debug(f"{self.room} - Resetting P1/P2/P3 state tracking due to mode change")
@@ -1035,7 +1147,7 @@ class OGBCSManager:
                 self.data_store.setDeep("CropSteering.lastIrrigationTime", None)
         
         # ===== STEP 5: Debounce - prevent rapid restarts =====
-        now = datetime.now()
+        now = self.clock()
         if self._last_mode_change_time and self._last_mode_change_mode == requested_mode:
             elapsed = (now - self._last_mode_change_time).total_seconds()
             if elapsed < self._mode_change_debounce_seconds:
@@ -1094,10 +1206,12 @@ class OGBCSManager:
         # Log start
         await self._log_mode_start(mode, config, sensor_data)
 
-        # ===== STEP 7: Start the appropriate task =====
+        # ===== STEP 7: Start the state machine =====
+        self._last_evaluated_inputs = None
+        self._last_light_state = self._is_lights_on()
         if mode == CSMode.AUTOMATIC:
             _LOGGER.debug(f"{self.room} - STARTING AUTOMATIC cycle")
-            self._main_task = asyncio.create_task(self._automatic_cycle())
+            self._phase_engine.start(self._automatic_cycle)
         elif mode.value.startswith("Manual"):
             # For Manual mode, get phase from CropPhase selector (set by Phases entity)
             stored_phase = self.data_store.getDeep("CropSteering.CropPhase")
@@ -1118,7 +1232,8 @@ class OGBCSManager:
                 _LOGGER.debug(f"{self.room} - Extracted phase from mode enum: {phase}")
             
             _LOGGER.debug(f"{self.room} - STARTING MANUAL cycle for phase {phase}")
-            self._main_task = asyncio.create_task(self._run_manual_mode())
+            self._manual_phase = None
+            self._phase_engine.start(self._run_manual_mode)
         else:
             _LOGGER.error(f"{self.room} - Unknown mode: {mode}")
 
@@ -1174,35 +1289,17 @@ class OGBCSManager:
         _LOGGER.warning(f"{self.room} - Could not extract phase from value {value}, defaulting to p0")
         return "p0"
 
-    async def _cancel_main_task(self):
-        """Cancel main task without turning off drippers."""
-        if self._main_task and not self._main_task.done():
-            self._main_task.cancel()
-            try:
-                await self._main_task
-            except asyncio.CancelledError:
-                pass
-            self._main_task = None
+    async def _stop_phase_engine(self):
+        """Stop the phase state machine without turning off drippers."""
+        await self._phase_engine.stop()
 
     async def _force_stop_all(self):
         """Force stop all operations - used for Disabled/Config modes."""
         _LOGGER.debug(f"{self.room} - FORCE STOP: Cancelling all CS operations...")
         
-        # Cancel main task
-        if self._main_task:
-            task_done = self._main_task.done()
-            _LOGGER.debug(f"{self.room} - Main task exists, done={task_done}")
-            if not task_done:
-                _LOGGER.debug(f"{self.room} - Cancelling main task...")
-                self._main_task.cancel()
-                try:
-                    await self._main_task
-                except asyncio.CancelledError:
-                    _LOGGER.debug(f"{self.room} - Main task cancelled successfully")
-                except Exception as e:
-                    _LOGGER.error(f"{self.room} - Error cancelling main task: {e}")
-        else:
-            _LOGGER.debug(f"{self.room} - No main task to cancel")
+        # Stop the phase state machine (cancels an evaluation in progress)
+        _LOGGER.debug(f"{self.room} - Stopping phase engine, running={self._phase_engine.running}")
+        await self._phase_engine.stop()
         
         # Cancel calibration task
         if self._calibration_task:
@@ -1218,7 +1315,6 @@ class OGBCSManager:
                 except Exception as e:
                     _LOGGER.error(f"{self.room} - Error cancelling calibration task: {e}")
         
-        self._main_task = None
         self._calibration_task = None
         self._irrigation_in_progress = False
         
@@ -1338,17 +1434,12 @@ class OGBCSManager:
             self.isInitialized = True
 
         # Read from live GrowMedium objects if available
-        mediums = []
-        if self.medium_manager is not None:
-            try:
-                mediums = self.medium_manager.get_mediums() or []
-            except Exception as e:
-                _LOGGER.warning(f"{self.room} - Could not read mediums from medium_manager: {e}")
+        mediums = self._get_mediums()
 
         if mediums:
             for medium in mediums:
                 raw_moisture = getattr(medium, "current_moisture", None)
-                _LOGGER.warning(f"{self.room} - VWC values from medium: {raw_moisture}")
+                _LOGGER.debug(f"{self.room} - VWC values from medium: {raw_moisture}")
                 if raw_moisture:
                     try:
                         raw_val = float(raw_moisture)
@@ -1358,7 +1449,7 @@ class OGBCSManager:
                         _LOGGER.debug(f"{self.room} - VWC conversion error from medium: {e}")
 
                 raw_ec = getattr(medium, "current_ec", None)
-                _LOGGER.warning(f"{self.room} - EC conversion Values: {raw_ec}")
+                _LOGGER.debug(f"{self.room} - EC conversion Values: {raw_ec}")
                 if raw_ec:
                     try:
                         ec_val = float(raw_ec)
@@ -1381,7 +1472,7 @@ class OGBCSManager:
 
         # Fallback to legacy workData only if no live medium data is available
         if not vwc_values and not bulk_ec_values:
-            _LOGGER.error(f"{self.room} - WORKDATA MOISTURE : {self.data_store.getDeep('workData.moisture')}")
+            _LOGGER.debug(f"{self.room} - WORKDATA MOISTURE : {self.data_store.getDeep('workData.moisture')}")
             for item in self.data_store.getDeep("workData.moisture") or []:
                 raw = item.get("value")
                 if raw is None:
@@ -1437,6 +1528,16 @@ class OGBCSManager:
 
         return result
 
+    def _get_mediums(self) -> list:
+        """Live GrowMedium objects of the room (empty without a medium manager)."""
+        if self.medium_manager is None:
+            return []
+        try:
+            return self.medium_manager.get_mediums() or []
+        except Exception as e:
+            _LOGGER.warning(f"{self.room} - Could not read mediums from medium_manager: {e}")
+            return []
+
     # ==================== CONFIGURATION ====================
 
     async def _get_configuration(self, mode: CSMode):
@@ -1852,7 +1953,7 @@ class OGBCSManager:
         (used on mode start and phase changes). This is non-critical and must never
         crash the cycle.
         """
-        now = datetime.now()
+        now = self.clock()
         last = self._last_state_heartbeat_time
         interval_seconds = 60
         if not force and last and (now - last).total_seconds() < interval_seconds:
@@ -1907,7 +2008,7 @@ class OGBCSManager:
         if payload.get("Type") == "CSSTATE" and "state:" in (payload.get("Message") or ""):
             return
         entry = {
-            "time_fired": datetime.now().isoformat(),
+            "time_fired": self.clock().isoformat(),
             "payload": payload,
         }
         self._recent_log_events.append(entry)
@@ -1953,6 +2054,8 @@ class OGBCSManager:
                 "PreviousVWC": round(previous_vwc, 1) if previous_vwc is not None else None,
                 "Dryback": self._get_current_dryback_info(vwc_current, phase),
                 "Calibration": self._get_calibration_snapshot(),
+                "Engine": self.get_phase_engine_status(),
+                "ShotModel": self._get_shot_model().to_dict(),
             }
 
             self.hass.bus.async_fire(
@@ -1975,7 +2078,7 @@ class OGBCSManager:
         calibrated_value = round(calibrated_value, 1)
         self.data_store.setDeep("CropSteering.Calibration.p1.VWCMax", calibrated_value)
         self.data_store.setDeep(
-            "CropSteering.Calibration.p1.timestamp", datetime.now().isoformat()
+            "CropSteering.Calibration.p1.timestamp", self.clock().isoformat()
         )
         await self._update_number_entity("VWCMax", "p1", calibrated_value)
         await self.event_manager.emit("SaveState", {"source": "CropSteeringCalibration"})
@@ -2009,7 +2112,7 @@ class OGBCSManager:
                 "CropSteering.Calibration.p3.VWCMin", round(avg_vwc, 1)
             )
             self.data_store.setDeep(
-                "CropSteering.Calibration.p3.timestamp", datetime.now().isoformat()
+                "CropSteering.Calibration.p3.timestamp", self.clock().isoformat()
             )
             await self._update_number_entity("VWCMin", "p3", avg_vwc)
             await self.event_manager.emit(
@@ -2159,11 +2262,11 @@ class OGBCSManager:
             raw = self.data_store.getDeep("CropSteering.LightBufferHours")
             buffer_hours = int(raw) if raw is not None else 2
             
-            now = datetime.now().time()
+            now = self.clock().time()
             
             # Calculate irrigation window
             # Convert to datetime for arithmetic, then back to time
-            today = datetime.now().date()
+            today = self.clock().date()
             light_on_dt = datetime.combine(today, light_on)
             light_off_dt = datetime.combine(today, light_off)
             
@@ -2266,7 +2369,7 @@ class OGBCSManager:
                                 from datetime import datetime
                                 if isinstance(bloom_switch, str):
                                     bloom_switch = datetime.fromisoformat(bloom_switch.replace('Z', '+00:00'))
-                                days = (datetime.now() - bloom_switch).days
+                                days = (self.clock() - bloom_switch).days
                                 week = (days // 7) + 1 if days > 0 else 1
                             return ("flower", week or 1)
                         else:
@@ -2274,7 +2377,7 @@ class OGBCSManager:
                                 from datetime import datetime
                                 if isinstance(grow_start, str):
                                     grow_start = datetime.fromisoformat(grow_start.replace('Z', '+00:00'))
-                                days = (datetime.now() - grow_start).days
+                                days = (self.clock() - grow_start).days
                                 week = (days // 7) + 1 if days > 0 else 1
                             return ("veg", week or 1)
                 except Exception as e:
@@ -2287,8 +2390,28 @@ class OGBCSManager:
         generative_week = self.data_store.getDeep("isPlantDay.generativeWeek") or 0
         return (plant_phase, generative_week)
 
-    async def _automatic_cycle(self):
-        """Automatic sensor-based cycle mit festen Presets"""
+    async def _automatic_cycle(self, reasons=frozenset({"start"})):
+        """One evaluation of the automatic state machine (fixed presets).
+
+        Called by the phase engine when an input changed (sensor, light,
+        phase/config) or a deadline fired (phase timer, light schedule,
+        watchdog). Phase handlers register their own timers.
+        """
+        try:
+            if "start" in reasons and not await self._start_automatic_cycle():
+                return
+            await self._automatic_step(reasons)
+        except asyncio.CancelledError:
+            _LOGGER.warning(f"{self.room} - Automatic cycle CANCELLED")
+            await self._turn_off_all_drippers()
+            raise
+        finally:
+            if self._phase_engine.running:
+                self._phase_engine.record_phase(self.data_store.getDeep("CropSteering.CropPhase") or "p0")
+                self._schedule_light_deadlines()
+
+    async def _start_automatic_cycle(self) -> bool:
+        """Determine the starting phase when Automatic mode is (re)started."""
         try:
             # IMPORTANT: Sync medium type FIRST before any preset calculations
             if not self.isInitialized:
@@ -2332,142 +2455,145 @@ class OGBCSManager:
                 ),
                 haEvent=True,
             )
+            return True
+        except Exception as e:
+            _LOGGER.error(f"{self.room} - Automatic cycle FATAL error: {e}", exc_info=True)
+            await self._phase_engine.stop()
+            await self._emergency_stop()
+            return False
 
-            while True:
-                try:
-                    # === CRITICAL: Read sensor data NEWLY! ===
-                    sensor_data = await self._get_sensor_averages()
-                    if sensor_data:
-                        self.data_store.setDeep(
-                            "CropSteering.vwc_current", sensor_data["vwc"]
-                        )
-                        self.data_store.setDeep("CropSteering.ec_current", sensor_data["ec"])
+    async def _automatic_step(self, reasons):
+        """Evaluate guards and actions of the current automatic phase."""
+        try:
+            # === CRITICAL: Read sensor data NEWLY! ===
+            sensor_data = await self._get_sensor_averages()
+            if sensor_data:
+                self.data_store.setDeep(
+                    "CropSteering.vwc_current", sensor_data["vwc"]
+                )
+                self.data_store.setDeep("CropSteering.ec_current", sensor_data["ec"])
 
-                    current_phase = self.data_store.getDeep("CropSteering.CropPhase") or "p0"
+            current_phase = self.data_store.getDeep("CropSteering.CropPhase") or "p0"
 
-                    # Re-read plant info every cycle so stage changes take effect immediately
-                    plant_phase, generative_week = self._get_plant_info_from_medium()
+            vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
+            ec = float(self.data_store.getDeep("CropSteering.ec_current") or 0)
 
-                    # Get bulletproof presets for automatic mode (NO user overrides)
-                    preset = self._get_automatic_preset(current_phase)
+            # A sensor report without a changed reading is not an input change
+            inputs = (current_phase, vwc, ec)
+            if reasons == {"sensor"} and inputs == self._last_evaluated_inputs:
+                return
+            self._last_evaluated_inputs = inputs
 
-                    vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
-                    ec = float(self.data_store.getDeep("CropSteering.ec_current") or 0)
+            # Re-read plant info every cycle so stage changes take effect immediately
+            plant_phase, generative_week = self._get_plant_info_from_medium()
 
-                    is_light_on = self._is_lights_on()
+            # Get bulletproof presets for automatic mode (NO user overrides)
+            preset = self._get_automatic_preset(current_phase)
 
-                    # Light-based phase transitions are independent of VWC sensor
-                    # readings and must run even if a failsafe is latched, otherwise
-                    # the cycle could stay stuck in the wrong phase (e.g. P3 at day).
-                    light_transition = await self._check_forced_light_phase_transition(
-                        current_phase, is_light_on, vwc
-                    )
-                    if light_transition:
-                        await asyncio.sleep(self.blockCheckIntervall)
-                        continue
-
-                    # Reset per-phase emergency counters when entering a phase.
-                    # This prevents stale counters (e.g. from a previous night or a
-                    # restart) from blocking rescue irrigation in the new phase.
-                    if current_phase != self._last_automatic_phase:
-                        if current_phase == "p2":
-                            self._reset_p2_state_tracking()
-                        elif current_phase == "p3":
-                            self._reset_p3_state_tracking()
-                        self._last_automatic_phase = current_phase
-
-                    # Record sensor reading for jump/stuck detection
-                    self._record_sensor_reading(vwc)
-
-                    # Run bulletproof failsafe checks
-                    failsafe_latched = self._failsafe_stop is not None
-                    safe, reason = await self._run_failsafe_checks(vwc, source="automatic")
-                    if not safe:
-                        if failsafe_latched:
-                            _LOGGER.debug(
-                                f"{self.room} - Automatic failsafe still active: {reason}. "
-                                f"Skipping phase logic this cycle."
-                            )
-                        else:
-                            _LOGGER.warning(
-                                f"{self.room} - Automatic failsafe triggered: {reason}. "
-                                f"Skipping phase logic this cycle."
-                            )
+            is_light_on = self._is_lights_on()
 
-                        # Dryout override: never let a stuck-sensor/ineffective failsafe
-                        # keep the medium below the emergency level without trying a rescue shot.
-                        override = await self._run_dryout_override(
-                            vwc, preset, current_phase, reason
-                        )
-                        if override:
-                            await asyncio.sleep(self.blockCheckIntervall)
-                            continue
+            # Light-based phase transitions are independent of VWC sensor
+            # readings and must run even if a failsafe is latched, otherwise
+            # the cycle could stay stuck in the wrong phase (e.g. P3 at day).
+            light_transition = await self._check_forced_light_phase_transition(
+                current_phase, is_light_on, vwc
+            )
+            if light_transition:
+                self._phase_engine.notify("phase")
+                return
 
-                        await asyncio.sleep(self.blockCheckIntervall)
-                        continue
+            # Reset per-phase emergency counters when entering a phase.
+            # This prevents stale counters (e.g. from a previous night or a
+            # restart) from blocking rescue irrigation in the new phase.
+            if current_phase != self._last_automatic_phase:
+                if current_phase == "p2":
+                    self._reset_p2_state_tracking()
+                elif current_phase == "p3":
+                    self._reset_p3_state_tracking()
+                self._last_automatic_phase = current_phase
+
+            # Record sensor reading for jump/stuck detection
+            self._record_sensor_reading(vwc)
+
+            # Run bulletproof failsafe checks
+            failsafe_latched = self._failsafe_stop is not None
+            safe, reason = await self._run_failsafe_checks(vwc, source="automatic")
+            if not safe:
+                if failsafe_latched:
+                    _LOGGER.debug(
+                        f"{self.room} - Automatic failsafe still active: {reason}. "
+                        f"Skipping phase logic this cycle."
+                    )
+                else:
+                    _LOGGER.warning(
+                        f"{self.room} - Automatic failsafe triggered: {reason}. "
+                        f"Skipping phase logic this cycle."
+                    )
 
-                    if vwc == 0:
-                        _LOGGER.debug(f"{self.room} - Automatic: No VWC data yet, waiting...")
-                        await asyncio.sleep(self.blockCheckIntervall)
-                        continue
+                # Dryout override: never let a stuck-sensor/ineffective failsafe
+                # keep the medium below the emergency level without trying a rescue shot.
+                await self._run_dryout_override(
+                    vwc, preset, current_phase, reason
+                )
+                return
 
-                    # Emit sensor update for AI learning (non-critical, wrap in try)
-                    try:
-                        if sensor_data:
-                            env_data = self.data_store.getDeep("workData") or {}
-                            await self.event_manager.emit(
-                                "CSSensorUpdate",
-                                {
-                                    "room": self.room,
-                                    "vwc": sensor_data.get("vwc"),
-                                    "vwc_raw": sensor_data.get("vwc"),
-                                    "ec": sensor_data.get("ec"),
-                                    "ec_raw": sensor_data.get("bulk_ec"),
-                                    "pore_ec": sensor_data.get("pore_ec"),
-                                    "temperature": sensor_data.get("temperature"),
-                                    "soil_temp": sensor_data.get("temperature"),
-                                    "vwc_min": preset.get("VWCMin"),
-                                    "vwc_max": preset.get("VWCMax"),
-                                    "ec_target": preset.get("ECTarget"),
-                                    "air_temp": self._get_env_avg(env_data, "temperature"),
-                                    "humidity": self._get_env_avg(env_data, "humidity"),
-                                    "vpd": self._get_env_avg(env_data, "vpd"),
-                                    "light_intensity": self._get_env_avg(env_data, "lightPPFD"),
-                                    "light_status": "on" if is_light_on else "off",
-                                },
-                            )
-                    except Exception as emit_err:
-                        _LOGGER.debug(f"{self.room} - CSSensorUpdate emit error (non-critical): {emit_err}")
+            if vwc == 0:
+                _LOGGER.debug(f"{self.room} - Automatic: No VWC data yet, waiting...")
+                return
 
-                    # Periodic state heartbeat so the frontend always knows mode/phase/target/calibration
-                    await self._emit_state_heartbeat()
+            # Emit sensor update for AI learning (non-critical, wrap in try)
+            try:
+                if sensor_data:
+                    env_data = self.data_store.getDeep("workData") or {}
+                    await self.event_manager.emit(
+                        "CSSensorUpdate",
+                        {
+                            "room": self.room,
+                            "vwc": sensor_data.get("vwc"),
+                            "vwc_raw": sensor_data.get("vwc"),
+                            "ec": sensor_data.get("ec"),
+                            "ec_raw": sensor_data.get("bulk_ec"),
+                            "pore_ec": sensor_data.get("pore_ec"),
+                            "temperature": sensor_data.get("temperature"),
+                            "soil_temp": sensor_data.get("temperature"),
+                            "vwc_min": preset.get("VWCMin"),
+                            "vwc_max": preset.get("VWCMax"),
+                            "ec_target": preset.get("ECTarget"),
+                            "air_temp": self._get_env_avg(env_data, "temperature"),
+                            "humidity": self._get_env_avg(env_data, "humidity"),
+                            "vpd": self._get_env_avg(env_data, "vpd"),
+                            "light_intensity": self._get_env_avg(env_data, "lightPPFD"),
+                            "light_status": "on" if is_light_on else "off",
+                        },
+                    )
+            except Exception as emit_err:
+                _LOGGER.debug(f"{self.room} - CSSensorUpdate emit error (non-critical): {emit_err}")
 
-                    # Check calibration status periodically (once per day)
-                    await self._check_calibration_status()
+            # Periodic state heartbeat so the frontend always knows mode/phase/target/calibration
+            await self._emit_state_heartbeat()
 
-                    # Phase logic with presets
-                    if current_phase == "p0":
-                        await self._handle_phase_p0_auto(vwc, ec, preset)
-                    elif current_phase == "p1":
-                        await self._handle_phase_p1_auto(vwc, ec, preset)
-                    elif current_phase == "p2":
-                        await self._handle_phase_p2_auto(vwc, ec, is_light_on, preset)
-                    elif current_phase == "p3":
-                        await self._handle_phase_p3_auto(vwc, ec, is_light_on, preset)
+            # Check calibration status periodically (once per day)
+            await self._check_calibration_status()
 
-                except Exception as loop_error:
-                    # Don't kill the whole cycle for one iteration's error
-                    _LOGGER.error(f"{self.room} - Automatic cycle iteration error: {loop_error}", exc_info=True)
+            # Phase logic with presets
+            if current_phase == "p0":
+                await self._handle_phase_p0_auto(vwc, ec, preset)
+            elif current_phase == "p1":
+                await self._handle_phase_p1_auto(vwc, ec, preset)
+            elif current_phase == "p2":
+                await self._handle_phase_p2_auto(vwc, ec, is_light_on, preset)
+            elif current_phase == "p3":
+                await self._handle_phase_p3_auto(vwc, ec, is_light_on, preset)
 
-                await asyncio.sleep(self.blockCheckIntervall)
+            # A transition is an input for the new phase: evaluate it right away
+            if (self.data_store.getDeep("CropSteering.CropPhase") or "p0") != current_phase:
+                self._phase_engine.notify("phase")
 
         except asyncio.CancelledError:
-            _LOGGER.warning(f"{self.room} - Automatic cycle CANCELLED")
-            await self._turn_off_all_drippers()
             raise
-        except Exception as e:
-            _LOGGER.error(f"{self.room} - Automatic cycle FATAL error: {e}", exc_info=True)
-            await self._emergency_stop()
+        except Exception as loop_error:
+            # Don't stop the state machine for one evaluation's error
+            _LOGGER.error(f"{self.room} - Automatic cycle iteration error: {loop_error}", exc_info=True)
 
     async def _check_calibration_status(self):
         """
@@ -2477,7 +2603,7 @@ class OGBCSManager:
         Runs at most once per day to avoid spamming.
         """
         last_check = self.data_store.getDeep("CropSteering._last_calibration_check_time")
-        now_ts = datetime.now().timestamp()
+        now_ts = self.clock().timestamp()
         one_day_sec = 86400
 
         if last_check and (now_ts - last_check) < one_day_sec:
@@ -2550,7 +2676,7 @@ class OGBCSManager:
             self.data_store.setDeep("CropSteering.startNightMoisture", vwc)
             # Transition to P3
             await self._set_crop_phase_and_update_selector("p3")
-            self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+            self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
             await self._log_phase_change("p0", "p3", f"Lights OFF - switching to night dryback (VWC: {vwc:.1f}%)")
             return
 
@@ -2559,7 +2685,7 @@ class OGBCSManager:
         if self._is_initial_soak_armed():
             _LOGGER.debug(f"{self.room} - P0: Initial Soak armed - starting P1 immediately")
             await self._set_crop_phase_and_update_selector("p1")
-            self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+            self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
             await self._log_phase_change(
                 "p0", "p1", "Initial Soak armed - saturating to capacity immediately"
             )
@@ -2598,7 +2724,7 @@ class OGBCSManager:
                 f"{self.room} - P0: VWC {vwc:.1f}% < Min {preset['VWCMin']:.1f}% → Switching to P1"
             )
             await self._set_crop_phase_and_update_selector("p1")
-            self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+            self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
             await self._log_phase_change(
                 "p0",
                 "p1",
@@ -2613,7 +2739,7 @@ class OGBCSManager:
     async def _handle_phase_p1_auto(self, vwc, ec, preset):
         """
         P1: Saturation phase - Saturate block quickly
-        WITH OWN INTERVAL TRACKING (not blockCheckIntervall!)
+        WITH OWN INTERVAL TRACKING (next shot is a phase timer)
         
         IMPORTANT: P1 should only run during lights ON.
         If lights go OFF during P1, transition to P3.
@@ -2633,7 +2759,7 @@ class OGBCSManager:
             self.data_store.setDeep("CropSteering.startNightMoisture", vwc)
             # Transition to P3
             await self._set_crop_phase_and_update_selector("p3")
-            self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+            self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
             await self._log_phase_change("p1", "p3", f"Lights OFF - switching to night dryback (VWC: {vwc:.1f}%)")
             return
         
@@ -2649,7 +2775,7 @@ class OGBCSManager:
             self.data_store.setDeep("CropSteering.p1_last_irrigation_time", None)
             self.data_store.setDeep("CropSteering.startNightMoisture", vwc)
             await self._set_crop_phase_and_update_selector("p3")
-            self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+            self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
             await self._log_phase_change("p1", "p3", f"Lights turning off soon - early transition to night dryback (VWC: {vwc:.1f}%)")
             return
         
@@ -2708,7 +2834,7 @@ class OGBCSManager:
             "CropSteering.p1_last_irrigation_time"
         )
         
-        now = datetime.now()
+        now = self.clock()
         
         # Initialize on first entry into P1
         if p1_start_vwc is None:
@@ -2857,6 +2983,9 @@ class OGBCSManager:
 
             # Calculate next shot time
             next_shot_min = wait_between / 60
+            self._schedule_phase_timer(
+                wait_between - (self.clock() - now).total_seconds(), "p1_shot"
+            )
             
             await self.event_manager.emit(
                 "LogForClient",
@@ -2874,6 +3003,7 @@ class OGBCSManager:
             _LOGGER.debug(
                 f"{self.room} - P1: Waiting for next shot, {time_until_next:.0f}s remaining (interval: {wait_between}s)"
             )
+            self._schedule_phase_timer(time_until_next, "p1_shot")
 
     async def _complete_p1_saturation(
         self, vwc, target_max, success=True, updated_max=False
@@ -2921,7 +3051,7 @@ class OGBCSManager:
 
         # Transition to the target phase
         await self._set_crop_phase_and_update_selector(target_phase)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
         # Log the transition
         if soak_was_armed and success:
@@ -2970,7 +3100,7 @@ class OGBCSManager:
 
         p2_last_check_time = self.data_store.getDeep("CropSteering.p2_last_check_time")
         p2_shot_count = self.data_store.getDeep("CropSteering.p2_shot_count") or 0
-        now = datetime.now()
+        now = self.clock()
 
         if p2_last_check_time is None:
             self.data_store.setDeep(
@@ -3037,6 +3167,9 @@ class OGBCSManager:
                     f"{self.room} - P2 Emergency: VWC {vwc:.1f}% < {emergency_level:.1f}% "
                     f"but emergency interval not elapsed yet"
                 )
+                self._schedule_phase_timer(
+                    emergency_interval - time_since_last_emergency, "p2_emergency"
+                )
             elif p2_emergency_count >= max_emergency_shots:
                 _LOGGER.warning(
                     f"{self.room} - P2 Emergency: VWC {vwc:.1f}% < {emergency_level:.1f}% "
@@ -3053,6 +3186,7 @@ class OGBCSManager:
             else:
                 if await self._irrigate_p2_to_capacity(vwc, vwc_max_cap, shot_duration):
                     p2_emergency_count = self._record_p2_emergency_irrigation(now)
+                    self._schedule_phase_timer(emergency_interval, "p2_emergency")
                     await self.event_manager.emit(
                         "LogForClient",
                         self._build_cs_log(
@@ -3072,6 +3206,9 @@ class OGBCSManager:
 
         if time_since_last_check < check_interval_seconds:
             # Too soon for a regular dryback check
+            self._schedule_phase_timer(
+                check_interval_seconds - time_since_last_check, "p2_check"
+            )
             return
 
         # === P2 DRYBACK SHOT: VWC has dropped enough from capacity -> irrigate to capacity
@@ -3095,6 +3232,7 @@ class OGBCSManager:
                 )
                 if irrigated:
                     p2_shot_count = self._record_p2_irrigation(now)
+                    self._schedule_phase_timer(check_interval_seconds, "p2_check")
                     post_vwc = float(
                         self.data_store.getDeep("CropSteering.vwc_current") or vwc
                     )
@@ -3162,7 +3300,7 @@ class OGBCSManager:
                 )
                 self.data_store.setDeep(
                     "CropSteering.Calibration.p2.timestamp",
-                    datetime.now().isoformat()
+                    self.clock().isoformat()
                 )
                 await self._update_number_entity("VWCMax", "p2", avg_vwc)
                 await self.event_manager.emit("SaveState", {"source": "CropSteeringCalibration"})
@@ -3277,7 +3415,7 @@ class OGBCSManager:
                     self.data_store.getDeep("CropSteering.p3_emergency_count") or 0
                 )
                 p3_last_emergency_time = self.data_store.getDeep("CropSteering.p3_last_emergency_time")
-                now = datetime.now()
+                now = self.clock()
 
                 # Initialize emergency state on first emergency
                 if p3_last_emergency_time is None:
@@ -3295,6 +3433,7 @@ class OGBCSManager:
                         duration=emergency_shot_duration,
                         is_emergency=True,
                     )
+                    self._schedule_phase_timer(emergency_interval_seconds, "p3_emergency")
                     self.data_store.setDeep(
                         "CropSteering.p3_emergency_count", p3_emergency_count + 1
                     )
@@ -3315,6 +3454,10 @@ class OGBCSManager:
                     _LOGGER.warning(
                         f"{self.room} - P3: Max emergency irrigations reached ({max_emergency}) or too soon, skipping"
                     )
+                    if p3_emergency_count < max_emergency:
+                        self._schedule_phase_timer(
+                            emergency_interval_seconds - time_since_last_emergency, "p3_emergency"
+                        )
         else:
             # STAGE-CHECKER: Light is on -> Back to P0.
             # Exception: the lights can still report "on" during the end-of-day
@@ -3350,7 +3493,7 @@ class OGBCSManager:
             # Emit dryback complete event for AI learning
             night_duration = None
             if night_start_time:
-                night_duration = (datetime.now() - night_start_time).total_seconds()
+                night_duration = (self.clock() - night_start_time).total_seconds()
 
             await self.event_manager.emit(
                 "CSDrybackComplete",
@@ -3361,7 +3504,7 @@ class OGBCSManager:
                         if night_start_time
                         else None
                     ),
-                    "end_time": datetime.now().timestamp() * 1000,
+                    "end_time": self.clock().timestamp() * 1000,
                     "duration": night_duration,
                     "vwc_start": start_night,
                     "vwc_end": vwc,
@@ -3399,7 +3542,7 @@ class OGBCSManager:
         intended phase. The forced P3 → P0 must therefore not fire there,
         otherwise it would undo the early night transition on every cycle.
         """
-        now = datetime.now()
+        now = self.clock()
 
         if current_phase == "p3" and is_light_on and not self._is_near_light_off():
             _LOGGER.warning(
@@ -3441,41 +3584,35 @@ class OGBCSManager:
 
     # ==================== MANUAL MODE ====================
 
-    async def _run_manual_mode(self):
-        """
-        Wrapper around per-phase manual cycles that restarts the cycle
-        when CropPhase changes (e.g. user selects a new phase in HA).
+    async def _run_manual_mode(self, reasons=frozenset({"start"})):
+        """One evaluation of the manual state machine.
+
+        A phase change (user selector or automatic transition) re-enters the
+        phase with fresh settings and counters before it is evaluated.
         """
-        _LOGGER.debug(f"{self.room} - Manual mode runner started")
-        self._manual_phase_changed_event.clear()
         try:
-            while True:
-                phase = self.data_store.getDeep("CropSteering.CropPhase") or "p0"
-                phase = self._extract_phase_from_value(phase)
+            phase = self.data_store.getDeep("CropSteering.CropPhase") or "p0"
+            phase = self._extract_phase_from_value(phase)
+            if phase != self._manual_phase:
                 _LOGGER.debug(f"{self.room} - Manual runner starting cycle for phase {phase}")
-                cycle_task = asyncio.create_task(self._manual_cycle(phase))
-                wait_task = asyncio.create_task(self._manual_phase_changed_event.wait())
-                done, pending = await asyncio.wait(
-                    [cycle_task, wait_task],
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-                if wait_task in done:
-                    self._manual_phase_changed_event.clear()
-                    _LOGGER.debug(f"{self.room} - Manual runner restarting due to phase change")
-                    await asyncio.sleep(0.1)
-                else:
-                    # cycle_task finished normally (e.g. phase changed internally)
-                    await asyncio.sleep(2)
+                self._manual_settings = self._start_manual_phase(phase)
+                self._manual_phase = phase
+
+            await self._manual_cycle(phase, self._manual_settings)
+
+            current_phase = self._extract_phase_from_value(
+                self.data_store.getDeep("CropSteering.CropPhase") or phase
+            )
+            if current_phase != phase:
+                self._phase_engine.notify("phase")
         except asyncio.CancelledError:
             _LOGGER.warning(f"{self.room} - Manual mode runner CANCELLED")
             await self._turn_off_all_drippers()
             raise
+        finally:
+            if self._phase_engine.running:
+                self._phase_engine.record_phase(self._manual_phase)
+                self._schedule_light_deadlines()
 
     async def _manual_phase_light_transition(self, phase, vwc, settings):
         """
@@ -3539,386 +3676,407 @@ class OGBCSManager:
 
         return False
 
-    async def _manual_cycle(self, phase):
-            """Manual time-based cycle (uses USER settings)"""
-            _LOGGER.debug(f"{self.room} - CS - Manual {phase}: Started")
-            try:
-                settings = self._get_manual_phase_settings(phase)
+    def _start_manual_phase(self, phase):
+        """Enter a manual phase: load USER settings and reset the phase counters."""
+        _LOGGER.debug(f"{self.room} - CS - Manual {phase}: Started")
+        settings = self._get_manual_phase_settings(phase)
 
-                shot_duration = settings["ShotDuration"]["value"]
-                shot_interval = settings["ShotIntervall"]["value"]
-                shot_count = settings["ShotSum"]["value"]
+        shot_duration = settings["ShotDuration"]["value"]
+        shot_interval = settings["ShotIntervall"]["value"]
+        shot_count = settings["ShotSum"]["value"]
 
-                _LOGGER.warning(f"{self.room} - Manual {phase} settings: duration={shot_duration}s, interval={shot_interval}min, count={shot_count}")
+        _LOGGER.debug(f"{self.room} - Manual {phase} settings: duration={shot_duration}s, interval={shot_interval}min, count={shot_count}")
 
-                if shot_duration <= 0:
-                    shot_duration = 30
-                    _LOGGER.warning(f"{self.room} - Manual {phase}: Invalid duration, using default 30s")
-                if shot_interval <= 0:
-                    shot_interval = 30
-                    _LOGGER.warning(f"{self.room} - Manual {phase}: Invalid interval, using default 30min")
-                if shot_count <= 0:
-                    shot_count = 5
-                    _LOGGER.warning(f"{self.room} - Manual {phase}: Invalid count, using default 5")
+        if shot_duration <= 0:
+            settings["ShotDuration"]["value"] = 30
+            _LOGGER.warning(f"{self.room} - Manual {phase}: Invalid duration, using default 30s")
+        if shot_interval <= 0:
+            settings["ShotIntervall"]["value"] = 30
+            _LOGGER.warning(f"{self.room} - Manual {phase}: Invalid interval, using default 30min")
+        if shot_count <= 0:
+            settings["ShotSum"]["value"] = 5
+            _LOGGER.warning(f"{self.room} - Manual {phase}: Invalid count, using default 5")
 
-                self.data_store.setDeep("CropSteering.shotCounter", 0)
-                self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.shotCounter", 0)
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
-                # Reset per-run emergency counters so a fresh manual run has its full budget
-                if phase == "p2":
-                    self.data_store.setDeep("CropSteering.p2_emergency_shot_count", 0)
-                    self.data_store.setDeep("CropSteering.p2_last_emergency_time", None)
-                elif phase == "p3":
-                    self.data_store.setDeep("CropSteering.p3_emergency_count", 0)
-                    self.data_store.setDeep("CropSteering.p3_last_emergency_time", None)
+        # Reset per-run emergency counters so a fresh manual run has its full budget
+        if phase == "p2":
+            self.data_store.setDeep("CropSteering.p2_emergency_shot_count", 0)
+            self.data_store.setDeep("CropSteering.p2_last_emergency_time", None)
+        elif phase == "p3":
+            self.data_store.setDeep("CropSteering.p3_emergency_count", 0)
+            self.data_store.setDeep("CropSteering.p3_last_emergency_time", None)
 
-                _LOGGER.warning(f"{self.room} - Manual {phase}: {shot_count} shots every {shot_interval}min")
+        _LOGGER.debug(
+            f"{self.room} - Manual {phase}: {settings['ShotSum']['value']} shots every "
+            f"{settings['ShotIntervall']['value']}min"
+        )
+        return settings
 
-                while True:
-                    try:
-                        # === CRITICAL: Read sensor data NEWLY! ===
-                        sensor_data = await self._get_sensor_averages()
-                        if sensor_data:
-                            self.data_store.setDeep("CropSteering.vwc_current", sensor_data["vwc"])
-                            self.data_store.setDeep("CropSteering.ec_current", sensor_data["ec"])
-
-                        vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
-                        ec = float(self.data_store.getDeep("CropSteering.ec_current") or 0)
-
-                        # Periodic state heartbeat so the frontend always knows mode/phase/target/calibration
-                        await self._emit_state_heartbeat()
-
-                        self._record_sensor_reading(vwc)
-                        failsafe_reason = self._evaluate_failsafe_condition(vwc)
-                        if failsafe_reason is not None:
-                            if failsafe_reason in ("flood_guard", "max_runtime"):
-                                # Hardware-critical guards stay hard stops even in manual.
-                                safe, _ = await self._run_failsafe_checks(vwc, source="manual")
-                                if not safe:
-                                    _LOGGER.warning(
-                                        f"{self.room} - Manual {phase} critical failsafe: {failsafe_reason}. "
-                                        f"Stopping irrigation."
-                                    )
-                                    await asyncio.sleep(10)
-                                    continue
-                            else:
-                                # Non-critical guards warn but do NOT block manual irrigation:
-                                # the user decides, not the failsafe.
-                                await self._warn_manual_failsafe(failsafe_reason, vwc, phase)
-
-                        current_phase = self.data_store.getDeep("CropSteering.CropPhase") or phase
-                        if current_phase != phase:
-                            _LOGGER.warning(
-                                f"{self.room} - Manual {phase}: phase changed to {current_phase}, exiting cycle"
-                            )
-                            return
+    async def _manual_cycle(self, phase, settings=None):
+        """One evaluation of a manual phase (uses USER settings).
 
-                        raw_counter = self.data_store.getDeep("CropSteering.shotCounter")
-                        shot_counter = int(float(raw_counter)) if raw_counter is not None else 0
-
-                        # EC management - LOG ONLY
-                        ec_target = settings["ECTarget"]["value"]
-                        min_ec = settings["MinEC"]["value"]
-                        max_ec = settings["MaxEC"]["value"]
-
-                        if ec_target > 0 and ec:
-                            if ec < min_ec:
-                                _LOGGER.warning(f"{self.room} - Manual: EC {ec:.2f} < Min {min_ec:.2f} (would increase)")
-                            elif ec > max_ec:
-                                _LOGGER.warning(f"{self.room} - Manual: EC {ec:.2f} > Max {max_ec:.2f} (would decrease)")
-
-                        vwc_min = settings["VWCMin"]["value"]
-                        vwc_max = settings["VWCMax"]["value"]
-                        vwc_target = settings["VWCTarget"]["value"]
-
-                        # ==================================================
-                        # === Phase-spezifische Auto-Transition-Logik ===
-                        # (nur in Manual-Transition aktiv - reines Manual
-                        # behält die vom User gewählte Phase.)
-                        # ==================================================
-                        if self._use_auto_transitions():
-                            if phase == "p1":
-                                # Wie Automatic P1: bei Lights-Off oder kurz vor
-                                # Lights-Off zur Nacht-Dryback P3 wechseln (keine
-                                # nächtliche Bewässerung mehr).
-                                if not self._is_lights_on():
-                                    _LOGGER.warning(
-                                        f"{self.room} - Manual P1: Lights off, switching to P3 night dryback"
-                                    )
-                                    await self._complete_manual_p1_to_p3(vwc)
-                                    return
+        Without ``settings`` the phase is entered first (see ``_start_manual_phase``).
+        """
+        if settings is None:
+            settings = self._start_manual_phase(phase)
 
-                                if self._is_near_light_off(buffer_minutes=120):
-                                    _LOGGER.warning(
-                                        f"{self.room} - Manual P1: Lights off soon, switching to P3 early dryback"
-                                    )
-                                    await self._complete_manual_p1_to_p3(vwc)
-                                    return
+        shot_duration = settings["ShotDuration"]["value"]
+        shot_interval = settings["ShotIntervall"]["value"]
+        shot_count = settings["ShotSum"]["value"]
 
-                                if vwc_target > 0 and vwc >= vwc_target:
-                                    _LOGGER.warning(
-                                        f"{self.room} - Manual P1: Target VWC reached "
-                                        f"{vwc:.1f}% >= {vwc_target:.1f}%, switching to P2"
-                                    )
-                                    await self._complete_manual_p1(vwc, vwc_target)
-                                    return
+        try:
+            # === CRITICAL: Read sensor data NEWLY! ===
+            sensor_data = await self._get_sensor_averages()
+            if sensor_data:
+                self.data_store.setDeep("CropSteering.vwc_current", sensor_data["vwc"])
+                self.data_store.setDeep("CropSteering.ec_current", sensor_data["ec"])
+
+            vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
+            ec = float(self.data_store.getDeep("CropSteering.ec_current") or 0)
+
+            # Periodic state heartbeat so the frontend always knows mode/phase/target/calibration
+            await self._emit_state_heartbeat()
+
+            self._record_sensor_reading(vwc)
+            failsafe_reason = self._evaluate_failsafe_condition(vwc)
+            if failsafe_reason is not None:
+                if failsafe_reason in ("flood_guard", "max_runtime"):
+                    # Hardware-critical guards stay hard stops even in manual.
+                    safe, _ = await self._run_failsafe_checks(vwc, source="manual")
+                    if not safe:
+                        _LOGGER.warning(
+                            f"{self.room} - Manual {phase} critical failsafe: {failsafe_reason}. "
+                            f"Stopping irrigation."
+                        )
+                        return
+                else:
+                    # Non-critical guards warn but do NOT block manual irrigation:
+                    # the user decides, not the failsafe.
+                    await self._warn_manual_failsafe(failsafe_reason, vwc, phase)
 
-                                if vwc_max > 0 and vwc >= vwc_max:
-                                    _LOGGER.warning(
-                                        f"{self.room} - Manual P1: VWC at/above max cap "
-                                        f"{vwc:.1f}% >= {vwc_max:.1f}%, switching to P2"
-                                    )
-                                    await self._complete_manual_p1(vwc, vwc_target)
-                                    return
+            current_phase = self.data_store.getDeep("CropSteering.CropPhase") or phase
+            if current_phase != phase:
+                _LOGGER.warning(
+                    f"{self.room} - Manual {phase}: phase changed to {current_phase}, exiting cycle"
+                )
+                return
 
-                                if shot_counter >= shot_count:
-                                    _LOGGER.warning(
-                                        f"{self.room} - Manual P1: Max shots reached "
-                                        f"({shot_counter}/{shot_count}), switching to P2"
-                                    )
-                                    await self._complete_manual_p1(vwc, vwc_target)
-                                    return
-
-                            elif phase in ("p0", "p2", "p3"):
-                                # Licht-/Dryback-Übergänge: P0→P3, P0→P1, P2→P3, P3→P0
-                                if await self._manual_phase_light_transition(
-                                    phase, vwc, settings
-                                ):
-                                    return
-
-                        # P0: reine Dryback-Phase, keine Bewässerung.
-                        if phase == "p0":
-                            await asyncio.sleep(10)
-                            continue
-
-                        # P3: Nacht-Dryback mit konservativer Not-Bewässerung
-                        # (wie Automatic, ohne Kalibrierung/EC-Anpassung).
-                        if phase == "p3":
-                            if vwc > 0:
-                                await self._manual_p3_emergency(vwc, settings)
-                            await asyncio.sleep(10)
-                            continue
-
-                        # === P2: Dryback von VWCMax, dann wieder auf VWCMax giessen ===
-                        if phase == "p2":
-                            dryback_percent = float(
-                                settings.get("MoistureDryBack", {}).get("value", 10.0)
-                            )
-                            dryback_threshold = self._get_p2_dryback_threshold(
-                                vwc_max, vwc_min, dryback_percent
-                            )
+            raw_counter = self.data_store.getDeep("CropSteering.shotCounter")
+            shot_counter = int(float(raw_counter)) if raw_counter is not None else 0
+
+            # EC management - LOG ONLY
+            ec_target = settings["ECTarget"]["value"]
+            min_ec = settings["MinEC"]["value"]
+            max_ec = settings["MaxEC"]["value"]
+
+            if ec_target > 0 and ec:
+                if ec < min_ec:
+                    _LOGGER.warning(f"{self.room} - Manual: EC {ec:.2f} < Min {min_ec:.2f} (would increase)")
+                elif ec > max_ec:
+                    _LOGGER.warning(f"{self.room} - Manual: EC {ec:.2f} > Max {max_ec:.2f} (would decrease)")
+
+            vwc_min = settings["VWCMin"]["value"]
+            vwc_max = settings["VWCMax"]["value"]
+            vwc_target = settings["VWCTarget"]["value"]
+
+            # ==================================================
+            # === Phase-spezifische Auto-Transition-Logik ===
+            # (nur in Manual-Transition aktiv - reines Manual
+            # behält die vom User gewählte Phase.)
+            # ==================================================
+            if self._use_auto_transitions():
+                if phase == "p1":
+                    # Wie Automatic P1: bei Lights-Off oder kurz vor
+                    # Lights-Off zur Nacht-Dryback P3 wechseln (keine
+                    # nächtliche Bewässerung mehr).
+                    if not self._is_lights_on():
+                        _LOGGER.warning(
+                            f"{self.room} - Manual P1: Lights off, switching to P3 night dryback"
+                        )
+                        await self._complete_manual_p1_to_p3(vwc)
+                        return
 
-                            # ShotIntervall is configured in MINUTES (see _manual_cycle)
-                            p2_check_interval = int(shot_interval) * 60  # seconds
-                            p2_last_check = self.data_store.getDeep(
-                                "CropSteering.p2_last_check_time"
+                    if self._is_near_light_off(buffer_minutes=120):
+                        _LOGGER.warning(
+                            f"{self.room} - Manual P1: Lights off soon, switching to P3 early dryback"
+                        )
+                        await self._complete_manual_p1_to_p3(vwc)
+                        return
+
+                    if vwc_target > 0 and vwc >= vwc_target:
+                        _LOGGER.warning(
+                            f"{self.room} - Manual P1: Target VWC reached "
+                            f"{vwc:.1f}% >= {vwc_target:.1f}%, switching to P2"
+                        )
+                        await self._complete_manual_p1(vwc, vwc_target)
+                        return
+
+                    if vwc_max > 0 and vwc >= vwc_max:
+                        _LOGGER.warning(
+                            f"{self.room} - Manual P1: VWC at/above max cap "
+                            f"{vwc:.1f}% >= {vwc_max:.1f}%, switching to P2"
+                        )
+                        await self._complete_manual_p1(vwc, vwc_target)
+                        return
+
+                    if shot_counter >= shot_count:
+                        _LOGGER.warning(
+                            f"{self.room} - Manual P1: Max shots reached "
+                            f"({shot_counter}/{shot_count}), switching to P2"
+                        )
+                        await self._complete_manual_p1(vwc, vwc_target)
+                        return
+
+                elif phase in ("p0", "p2", "p3"):
+                    # Licht-/Dryback-Übergänge: P0→P3, P0→P1, P2→P3, P3→P0
+                    if await self._manual_phase_light_transition(
+                        phase, vwc, settings
+                    ):
+                        return
+
+            # P0: reine Dryback-Phase, keine Bewässerung.
+            if phase == "p0":
+                return
+
+            # P3: Nacht-Dryback mit konservativer Not-Bewässerung
+            # (wie Automatic, ohne Kalibrierung/EC-Anpassung).
+            if phase == "p3":
+                if vwc > 0:
+                    await self._manual_p3_emergency(vwc, settings)
+                return
+
+            # === P2: Dryback von VWCMax, dann wieder auf VWCMax giessen ===
+            if phase == "p2":
+                dryback_percent = float(
+                    settings.get("MoistureDryBack", {}).get("value", 10.0)
+                )
+                dryback_threshold = self._get_p2_dryback_threshold(
+                    vwc_max, vwc_min, dryback_percent
+                )
+
+                # ShotIntervall is configured in MINUTES (see _manual_cycle)
+                p2_check_interval = int(shot_interval) * 60  # seconds
+                p2_last_check = self.data_store.getDeep(
+                    "CropSteering.p2_last_check_time"
+                )
+                now = self.clock()
+                if p2_last_check is None:
+                    p2_last_check = now - timedelta(seconds=p2_check_interval)
+                    self.data_store.setDeep(
+                        "CropSteering.p2_last_check_time", p2_last_check
+                    )
+
+                time_since_check = (now - p2_last_check).total_seconds()
+                # Next dryback check
+                self._schedule_phase_timer(
+                    p2_check_interval - time_since_check
+                    if time_since_check < p2_check_interval
+                    else p2_check_interval,
+                    "p2_check",
+                )
+                if time_since_check >= p2_check_interval:
+                    self.data_store.setDeep(
+                        "CropSteering.p2_last_check_time", now
+                    )
+
+                    if vwc <= dryback_threshold:
+                        if shot_counter < shot_count:
+                            irrigated = await self._irrigate_p2_to_capacity(
+                                vwc, vwc_max, shot_duration
                             )
-                            now = datetime.now()
-                            if p2_last_check is None:
-                                p2_last_check = now - timedelta(seconds=p2_check_interval)
+                            if irrigated:
+                                shot_counter += 1
                                 self.data_store.setDeep(
-                                    "CropSteering.p2_last_check_time", p2_last_check
+                                    "CropSteering.shotCounter", shot_counter
                                 )
-
-                            time_since_check = (now - p2_last_check).total_seconds()
-                            if time_since_check >= p2_check_interval:
                                 self.data_store.setDeep(
-                                    "CropSteering.p2_last_check_time", now
+                                    "CropSteering.lastIrrigationTime", now
                                 )
-
-                                if vwc <= dryback_threshold:
-                                    if shot_counter < shot_count:
-                                        irrigated = await self._irrigate_p2_to_capacity(
-                                            vwc, vwc_max, shot_duration
-                                        )
-                                        if irrigated:
-                                            shot_counter += 1
-                                            self.data_store.setDeep(
-                                                "CropSteering.shotCounter", shot_counter
-                                            )
-                                            self.data_store.setDeep(
-                                                "CropSteering.lastIrrigationTime", now
-                                            )
-                                            self._record_p2_irrigation(now)
-                                            post_vwc = float(
-                                                self.data_store.getDeep(
-                                                    "CropSteering.vwc_current"
-                                                )
-                                                or vwc
-                                            )
-                                            if post_vwc > vwc_min:
-                                                self._update_learned_field_capacity(post_vwc)
-                                            await self._track_p2_vwc_peak(post_vwc)
-                                            await self.event_manager.emit(
-                                                "LogForClient",
-                                                self._build_cs_log(
-                                                    f"Manual P2 Dryback: VWC {vwc:.1f}% ≤ {dryback_threshold:.1f}% "
-                                                    f"(dryback {dryback_percent:.0f}%) → Shot {shot_counter}/{shot_count}",
-                                                    phase="p2",
-                                                ),
-                                                haEvent=True,
-                                            )
-                                            _LOGGER.debug(
-                                                f"{self.room} - Manual P2: Irrigated to capacity "
-                                                f"(VWC {vwc:.1f}% → {post_vwc:.1f}%)"
-                                            )
-                                    else:
-                                        _LOGGER.debug(
-                                            f"{self.room} - Manual P2: Dryback reached but max shots "
-                                            f"({shot_count}) reached"
-                                        )
-                                        await self.event_manager.emit(
-                                            "LogForClient",
-                                            self._build_cs_log(
-                                                f"Manual P2: Max shots reached ({shot_count}), VWC {vwc:.1f}%",
-                                                phase="p2",
-                                            ),
-                                            haEvent=True,
-                                        )
-                                else:
-                                    _LOGGER.debug(
-                                        f"{self.room} - Manual P2: VWC {vwc:.1f}% above dryback threshold "
-                                        f"{dryback_threshold:.1f}% (capacity {vwc_max:.1f}%, dryback {dryback_percent:.0f}%)"
-                                    )
-                                    last_irrigation = self.data_store.getDeep(
-                                        "CropSteering.lastIrrigationTime"
+                                self._record_p2_irrigation(now)
+                                post_vwc = float(
+                                    self.data_store.getDeep(
+                                        "CropSteering.vwc_current"
                                     )
-                                    if last_irrigation:
-                                        time_since_irr = (
-                                            now - last_irrigation
-                                        ).total_seconds()
-                                        if time_since_irr <= p2_check_interval * 2:
-                                            await self._track_p2_vwc_peak(vwc)
-
-                            await asyncio.sleep(10)
-                            continue
-
-                        # === Emergency irrigation (nur p1/p2) ===
-                        if vwc and vwc_min > 0 and vwc < vwc_min * 0.9:
-                            if shot_counter >= shot_count:
-                                _LOGGER.debug(
-                                    f"{self.room} - Manual {phase}: Emergency irrigation needed "
-                                    f"but max shots reached ({shot_counter}/{shot_count})"
+                                    or vwc
                                 )
+                                if post_vwc > vwc_min:
+                                    self._update_learned_field_capacity(post_vwc)
+                                await self._track_p2_vwc_peak(post_vwc)
                                 await self.event_manager.emit(
                                     "LogForClient",
                                     self._build_cs_log(
-                                        f"Manual {phase}: Emergency irrigation blocked - max shots reached",
-                                        phase=phase,
+                                        f"Manual P2 Dryback: VWC {vwc:.1f}% ≤ {dryback_threshold:.1f}% "
+                                        f"(dryback {dryback_percent:.0f}%) → Shot {shot_counter}/{shot_count}",
+                                        phase="p2",
                                     ),
                                     haEvent=True,
                                 )
-                            elif vwc_max > 0 and vwc >= vwc_max:
                                 _LOGGER.debug(
-                                    f"{self.room} - Manual {phase}: VWC {vwc:.1f}% already at/above max "
-                                    f"{vwc_max:.1f}%, skipping emergency irrigation"
+                                    f"{self.room} - Manual P2: Irrigated to capacity "
+                                    f"(VWC {vwc:.1f}% → {post_vwc:.1f}%)"
                                 )
-                            else:
-                                await self._irrigate(duration=shot_duration, target_vwc=vwc_target, max_vwc=vwc_max)
-                                shot_counter += 1
-                                self.data_store.setDeep("CropSteering.shotCounter", shot_counter)
-                                self.data_store.setDeep("CropSteering.lastIrrigationTime", datetime.now())
+                        else:
+                            _LOGGER.debug(
+                                f"{self.room} - Manual P2: Dryback reached but max shots "
+                                f"({shot_count}) reached"
+                            )
+                            await self.event_manager.emit(
+                                "LogForClient",
+                                self._build_cs_log(
+                                    f"Manual P2: Max shots reached ({shot_count}), VWC {vwc:.1f}%",
+                                    phase="p2",
+                                ),
+                                haEvent=True,
+                            )
+                    else:
+                        _LOGGER.debug(
+                            f"{self.room} - Manual P2: VWC {vwc:.1f}% above dryback threshold "
+                            f"{dryback_threshold:.1f}% (capacity {vwc_max:.1f}%, dryback {dryback_percent:.0f}%)"
+                        )
+                        last_irrigation = self.data_store.getDeep(
+                            "CropSteering.lastIrrigationTime"
+                        )
+                        if last_irrigation:
+                            time_since_irr = (
+                                now - last_irrigation
+                            ).total_seconds()
+                            if time_since_irr <= p2_check_interval * 2:
+                                await self._track_p2_vwc_peak(vwc)
 
-                                post_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
+                return
 
-                                await self.event_manager.emit(
-                                    "LogForClient",
-                                    self._build_cs_log(
-                                        f"CropSteering {phase}: Emergency irrigation ({shot_counter}/{shot_count}) | VWC: {vwc:.1f}% → {post_vwc:.1f}%",
-                                        phase=phase,
-                                        Type="Emergency irrigation",
-                                    ),
-                                    haEvent=True,
-                                )
+            # === Emergency irrigation (nur p1/p2) ===
+            if vwc and vwc_min > 0 and vwc < vwc_min * 0.9:
+                if shot_counter >= shot_count:
+                    _LOGGER.debug(
+                        f"{self.room} - Manual {phase}: Emergency irrigation needed "
+                        f"but max shots reached ({shot_counter}/{shot_count})"
+                    )
+                    await self.event_manager.emit(
+                        "LogForClient",
+                        self._build_cs_log(
+                            f"Manual {phase}: Emergency irrigation blocked - max shots reached",
+                            phase=phase,
+                        ),
+                        haEvent=True,
+                    )
+                elif vwc_max > 0 and vwc >= vwc_max:
+                    _LOGGER.debug(
+                        f"{self.room} - Manual {phase}: VWC {vwc:.1f}% already at/above max "
+                        f"{vwc_max:.1f}%, skipping emergency irrigation"
+                    )
+                else:
+                    await self._irrigate(duration=shot_duration, target_vwc=vwc_target, max_vwc=vwc_max)
+                    shot_counter += 1
+                    self.data_store.setDeep("CropSteering.shotCounter", shot_counter)
+                    self.data_store.setDeep("CropSteering.lastIrrigationTime", self.clock())
 
-                                if phase == "p1" and vwc_target > 0:
-                                    current_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
-                                    if current_vwc >= vwc_target:
-                                        await self._complete_manual_p1(current_vwc, vwc_target)
-                                        return
-                                    if vwc_max > 0 and current_vwc >= vwc_max:
-                                        await self._complete_manual_p1(current_vwc, vwc_target)
-                                        return
-
-                        # === Scheduled irrigation (nur p1/p2) ===
-                        last_irrigation = self.data_store.getDeep("CropSteering.lastIrrigationTime")
-                        now = datetime.now()
-
-                        should_irrigate = (
-                            last_irrigation is None
-                            or (now - last_irrigation).total_seconds() / 60 >= shot_interval
-                        )
+                    post_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
 
-                        if should_irrigate and shot_counter < shot_count:
-                            if vwc_max > 0 and vwc >= vwc_max:
-                                _LOGGER.debug(
-                                    f"{self.room} - Manual {phase}: VWC {vwc:.1f}% already at/above max "
-                                    f"{vwc_max:.1f}%, skipping scheduled irrigation"
-                                )
-                            else:
-                                await self._irrigate(duration=shot_duration, target_vwc=vwc_target, max_vwc=vwc_max)
-                                shot_counter += 1
-                                self.data_store.setDeep("CropSteering.shotCounter", shot_counter)
-                                self.data_store.setDeep("CropSteering.lastIrrigationTime", now)
+                    await self.event_manager.emit(
+                        "LogForClient",
+                        self._build_cs_log(
+                            f"CropSteering {phase}: Emergency irrigation ({shot_counter}/{shot_count}) | VWC: {vwc:.1f}% → {post_vwc:.1f}%",
+                            phase=phase,
+                            Type="Emergency irrigation",
+                        ),
+                        haEvent=True,
+                    )
 
-                                post_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
+                    if phase == "p1" and vwc_target > 0:
+                        current_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
+                        if current_vwc >= vwc_target:
+                            await self._complete_manual_p1(current_vwc, vwc_target)
+                            return
+                        if vwc_max > 0 and current_vwc >= vwc_max:
+                            await self._complete_manual_p1(current_vwc, vwc_target)
+                            return
 
-                                await self.event_manager.emit(
-                                    "LogForClient",
-                                    self._build_cs_log(
-                                        f"CropSteering {phase}: Shot {shot_counter}/{shot_count} | VWC: {vwc:.1f}% → {post_vwc:.1f}%",
-                                        phase=phase,
-                                    ),
-                                    haEvent=True,
-                                )
+            # === Scheduled irrigation (nur p1/p2) ===
+            last_irrigation = self.data_store.getDeep("CropSteering.lastIrrigationTime")
+            now = self.clock()
 
-                                if phase == "p1" and vwc_target > 0 and self._use_auto_transitions():
-                                    current_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
-                                    if current_vwc >= vwc_target:
-                                        await self._complete_manual_p1(current_vwc, vwc_target)
-                                        return
-                                    if vwc_max > 0 and current_vwc >= vwc_max:
-                                        await self._complete_manual_p1(current_vwc, vwc_target)
-                                        return
-
-                        # Reset counter after full cycle.
-                        # In Manual-Transition hat P1 eigene Transition-Logik,
-                        # in reinem Manual muss P1 (wie P2) den Zähler zurücksetzen.
-                        if phase in ("p1", "p2") and shot_counter >= shot_count:
-                            phase_start = self.data_store.getDeep("CropSteering.phaseStartTime")
-                            if phase_start:
-                                elapsed = (now - phase_start).total_seconds() / 60
-                                if elapsed >= shot_interval:
-                                    self.data_store.setDeep("CropSteering.shotCounter", 0)
-                                    self.data_store.setDeep("CropSteering.phaseStartTime", now)
-                                    await self.event_manager.emit(
-                                        "LogForClient",
-                                        self._build_cs_log(
-                                            f"CropSteering {phase}: New cycle started",
-                                            phase=phase,
-                                        ),
-                                        haEvent=True,
-                                    )
-                            else:
-                                self.data_store.setDeep("CropSteering.phaseStartTime", now)
+            should_irrigate = (
+                last_irrigation is None
+                or (now - last_irrigation).total_seconds() / 60 >= shot_interval
+            )
 
-                    except Exception as loop_error:
-                        _LOGGER.error(f"{self.room} - Manual cycle iteration error: {loop_error}", exc_info=True)
+            if should_irrigate and shot_counter < shot_count:
+                if vwc_max > 0 and vwc >= vwc_max:
+                    _LOGGER.debug(
+                        f"{self.room} - Manual {phase}: VWC {vwc:.1f}% already at/above max "
+                        f"{vwc_max:.1f}%, skipping scheduled irrigation"
+                    )
+                else:
+                    await self._irrigate(duration=shot_duration, target_vwc=vwc_target, max_vwc=vwc_max)
+                    shot_counter += 1
+                    self.data_store.setDeep("CropSteering.shotCounter", shot_counter)
+                    self.data_store.setDeep("CropSteering.lastIrrigationTime", now)
 
-                    await asyncio.sleep(10)
+                    post_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
 
-            except asyncio.CancelledError:
-                _LOGGER.warning(f"{self.room} - Manual cycle CANCELLED")
-                await self._turn_off_all_drippers()
-                raise
-            except Exception as e:
-                _LOGGER.error(f"{self.room} - Manual cycle FATAL error: {e}", exc_info=True)
-                await self._emergency_stop()
+                    await self.event_manager.emit(
+                        "LogForClient",
+                        self._build_cs_log(
+                            f"CropSteering {phase}: Shot {shot_counter}/{shot_count} | VWC: {vwc:.1f}% → {post_vwc:.1f}%",
+                            phase=phase,
+                        ),
+                        haEvent=True,
+                    )
+
+                    if phase == "p1" and vwc_target > 0 and self._use_auto_transitions():
+                        current_vwc = float(self.data_store.getDeep("CropSteering.vwc_current") or 0)
+                        if current_vwc >= vwc_target:
+                            await self._complete_manual_p1(current_vwc, vwc_target)
+                            return
+                        if vwc_max > 0 and current_vwc >= vwc_max:
+                            await self._complete_manual_p1(current_vwc, vwc_target)
+                            return
+
+            # Next scheduled shot
+            last_irrigation = self.data_store.getDeep("CropSteering.lastIrrigationTime")
+            if last_irrigation and shot_counter < shot_count:
+                self._schedule_phase_timer(
+                    shot_interval * 60 - (self.clock() - last_irrigation).total_seconds(),
+                    "manual_shot",
+                )
+
+            # Reset counter after full cycle.
+            # In Manual-Transition hat P1 eigene Transition-Logik,
+            # in reinem Manual muss P1 (wie P2) den Zähler zurücksetzen.
+            if phase in ("p1", "p2") and shot_counter >= shot_count:
+                phase_start = self.data_store.getDeep("CropSteering.phaseStartTime")
+                if phase_start:
+                    elapsed = (now - phase_start).total_seconds() / 60
+                    if elapsed >= shot_interval:
+                        self.data_store.setDeep("CropSteering.shotCounter", 0)
+                        self.data_store.setDeep("CropSteering.phaseStartTime", now)
+                        await self.event_manager.emit(
+                            "LogForClient",
+                            self._build_cs_log(
+                                f"CropSteering {phase}: New cycle started",
+                                phase=phase,
+                            ),
+                            haEvent=True,
+                        )
+                        self._schedule_phase_timer(0, "manual_cycle")
+                    else:
+                        self._schedule_phase_timer((shot_interval - elapsed) * 60, "manual_cycle")
+                else:
+                    self.data_store.setDeep("CropSteering.phaseStartTime", now)
+                    self._schedule_phase_timer(shot_interval * 60, "manual_cycle")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as loop_error:
+            _LOGGER.error(f"{self.room} - Manual cycle iteration error: {loop_error}", exc_info=True)
 
     async def _complete_manual_p0(self, vwc):
         """Complete P0 dryback phase and transition to P1 (lights on + VWC below P1 threshold)."""
         self.data_store.setDeep("CropSteering.shotCounter", 0)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
         await self._set_crop_phase_and_update_selector("p1")
 
@@ -3935,7 +4093,7 @@ class OGBCSManager:
         """Complete P0 monitoring phase and transition to P3 when lights go off (night dryback)."""
         self.data_store.setDeep("CropSteering.startNightMoisture", vwc)
         self.data_store.setDeep("CropSteering.shotCounter", 0)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
         await self._set_crop_phase_and_update_selector("p3")
 
@@ -3961,7 +4119,7 @@ class OGBCSManager:
         self._reset_p1_state_tracking()
         self._reset_p2_state_tracking()
         self.data_store.setDeep("CropSteering.shotCounter", 0)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
         # Calibrate VWCMax from observed saturation VWC
         await self._calibrate_p1_vwc_max(vwc, cap=user_vwc_max)
@@ -3995,7 +4153,7 @@ class OGBCSManager:
         self._reset_p1_state_tracking()
         self.data_store.setDeep("CropSteering.shotCounter", 0)
         self.data_store.setDeep("CropSteering.startNightMoisture", vwc)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
         # Calibrate VWCMax from observed saturation VWC
         await self._calibrate_p1_vwc_max(vwc, cap=user_vwc_max)
@@ -4015,7 +4173,7 @@ class OGBCSManager:
         """Complete P2 maintenance phase and transition to P3 (pre-lights-off dryback)."""
         self._reset_p2_state_tracking()
         self.data_store.setDeep("CropSteering.shotCounter", 0)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
         self.data_store.setDeep("CropSteering.startNightMoisture", vwc)
 
         await self._set_crop_phase_and_update_selector("p3")
@@ -4040,7 +4198,7 @@ class OGBCSManager:
         # Reset P3 state so the next night starts with fresh emergency counters.
         self._reset_p3_state_tracking()
         self.data_store.setDeep("CropSteering.shotCounter", 0)
-        self.data_store.setDeep("CropSteering.phaseStartTime", datetime.now())
+        self.data_store.setDeep("CropSteering.phaseStartTime", self.clock())
 
         await self._set_crop_phase_and_update_selector("p0")
 
@@ -4089,7 +4247,7 @@ class OGBCSManager:
         p3_last_emergency_time = self.data_store.getDeep(
             "CropSteering.p3_last_emergency_time"
         )
-        now = datetime.now()
+        now = self.clock()
 
         if p3_last_emergency_time is None:
             p3_last_emergency_time = now - timedelta(
@@ -4110,6 +4268,7 @@ class OGBCSManager:
                 "CropSteering.p3_emergency_count", p3_emergency_count + 1
             )
             self.data_store.setDeep("CropSteering.p3_last_emergency_time", now)
+            self._schedule_phase_timer(emergency_interval_seconds, "p3_emergency")
             await self.event_manager.emit(
                 "LogForClient",
                 self._build_cs_log(
@@ -4126,6 +4285,10 @@ class OGBCSManager:
             _LOGGER.warning(
                 f"{self.room} - Manual P3: Max emergency irrigations reached ({max_emergency}) or too soon, skipping"
             )
+            if p3_emergency_count < max_emergency:
+                self._schedule_phase_timer(
+                    emergency_interval_seconds - time_since_last, "p3_emergency"
+                )
 
     # ==================== IRRIGATION ====================
 
@@ -4171,36 +4334,38 @@ class OGBCSManager:
                 await self.event_manager.emit("PumpAction", pumpAction)
                 _LOGGER.debug(f"{self.room} - Sent ON to {dev_id}")
             
-            # Wait for irrigation duration, polling VWC periodically for early stop
-            elapsed = 0
-            poll_interval = 1  # seconds
+            # Wait for the shot: without a bound one timer, otherwise the shot
+            # controller stops on the first bound VWC reading or its predicted cutoff
             stopped_early = False
             stop_reason = None
-            while elapsed < duration:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-
-                # Only poll for early-stop if a bound was supplied
-                if max_vwc is not None or target_vwc is not None:
-                    sensor_data = await self._get_sensor_averages()
-                    current_vwc = sensor_data.get("vwc") if sensor_data else None
-                    if current_vwc is not None:
-                        if max_vwc is not None and current_vwc >= max_vwc:
-                            stopped_early = True
-                            stop_reason = f"safety cap {max_vwc:.1f}% reached"
-                            _LOGGER.debug(
-                                f"{self.room} - Irrigation stopping early after {elapsed}s: "
-                                f"VWC {current_vwc:.1f}% >= max {max_vwc:.1f}%"
-                            )
-                            break
-                        if target_vwc is not None and current_vwc >= target_vwc:
-                            stopped_early = True
-                            stop_reason = f"target {target_vwc:.1f}% reached"
-                            _LOGGER.debug(
-                                f"{self.room} - Irrigation stopping early after {elapsed}s: "
-                                f"VWC {current_vwc:.1f}% >= target {target_vwc:.1f}%"
-                            )
-                            break
+            if max_vwc is None and target_vwc is None:
+                await self.sleep(duration)
+                elapsed = duration
+            else:
+                shot = CSShotController(
+                    self._get_shot_model(),
+                    len(drippers),
+                    clock=self.clock,
+                    sleep=self.sleep,
+                    target_vwc=target_vwc,
+                    max_vwc=max_vwc,
+                )
+                shot.bind(self._get_mediums(), pre_vwc)
+                self._settling_shot = None
+                self._active_shot = shot
+                try:
+                    elapsed, stop_reason = await shot.run(duration)
+                finally:
+                    self._active_shot = None
+                elapsed = round(elapsed, 1)
+                stopped_early = shot.stopped_early
+                if shot.settling:
+                    self._settling_shot = shot
+                if stopped_early:
+                    _LOGGER.debug(
+                        f"{self.room} - Irrigation stopping early after {elapsed}s: {stop_reason} "
+                        f"(readings={shot.readings}, wakeups={shot.wakeups})"
+                    )
 
             # Record actual irrigation runtime for failsafe tracking
             self._record_irrigation(elapsed, pre_vwc)
@@ -4229,6 +4394,10 @@ class OGBCSManager:
             self.data_store.setDeep("CropSteering.pore_ec_current", post_pore_ec)
             post_temp = post_sensor_data.get("temperature", 25) if post_sensor_data else 25
             self.data_store.setDeep("CropSteering.temperature_current", post_temp)
+            if pre_vwc and post_vwc and self._get_shot_model().learn_shot(
+                len(drippers), elapsed, float(post_vwc) - float(pre_vwc)
+            ):
+                self._save_learned_value("shot_model", self._shot_model.to_dict())
             _LOGGER.warning(
                 f"{self.room} - Irrigation completed: {elapsed}s (requested {duration}s), "
                 f"VWC: {pre_vwc:.1f}% → {post_vwc:.1f}%, EC: {pre_ec:.2f} → {post_ec:.2f}, Pore EC: {pre_pore_ec:.2f} → {post_pore_ec:.2f}, Temperature: {pre_temp:.1f}°C → {post_temp:.1f}°C"
@@ -4399,7 +4568,7 @@ class OGBCSManager:
             except ValueError:
                 light_off = datetime.strptime(light_off_time_str, "%H:%M").time()
             
-            now = datetime.now()
+            now = self.clock()
             today = now.date()
             
             # Create datetime for light off today
@@ -4459,7 +4628,7 @@ class OGBCSManager:
             except (ValueError, TypeError):
                 return None
 
-        current_time = datetime.now().time()
+        current_time = self.clock().time()
         if light_on_time < light_off_time:
             # Normal cycle (e.g., 08:00 to 20:00)
             return light_on_time <= current_time < light_off_time
@@ -0,0 +1,213 @@
+"""
+OpenGrowBox Crop Steering Phase Engine
+
+Runs the crop steering state machine (P0 → P1 → P2 → P3) on events instead
+of a polling loop. An evaluation of the current phase runs only when
+
+- an input changed (medium VWC/EC update, light on/off, mode or phase change),
+  coalesced over ``settle_seconds`` so one probe update (VWC + EC + temp)
+  causes a single evaluation, or
+- a deadline fired: phase timers registered by the phase handlers (next P1
+  shot, next P2 dryback check, emergency intervals, ...), light schedule
+  boundaries, or the ``max_idle_seconds`` watchdog.
+
+Between evaluations nothing runs: there is one armed timer per room.
+
+Time comes from ``clock`` (returns a datetime) and timers are armed with
+``call_later(delay, callback)``; both default to the wall clock and the
+running asyncio loop and can be replaced by a virtual clock, so a steering
+day can be replayed in simulated time.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+PHASES = ("p0", "p1", "p2", "p3")
+
+
+class CSPhaseEngine:
+    """Event and deadline driven runner for crop steering evaluations."""
+
+    def __init__(
+        self,
+        room: str,
+        clock: Callable[[], datetime] = datetime.now,
+        call_later: Optional[Callable[[float, Callable[[], None]], Any]] = None,
+        settle_seconds: float = 2.0,
+        max_idle_seconds: float = 900.0,
+    ):
+        self.room = room
+        self.clock = clock
+        self.call_later = call_later
+        self.settle_seconds = settle_seconds
+        self.max_idle_seconds = max_idle_seconds
+
+        self._evaluate: Optional[Callable[[FrozenSet[str]], Awaitable[Any]]] = None
+        self._deadlines: Dict[str, datetime] = {}
+        self._due = set()
+        self._timer = None
+        self._timer_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.running = False
+
+        self.phase: Optional[str] = None
+        self.evaluations = 0
+        self.wakeups: Dict[str, int] = {}
+        self.transitions = []
+        self.last_evaluation: Optional[datetime] = None
+
+    # -----------------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------------
+
+    def start(self, evaluate: Callable[[FrozenSet[str]], Awaitable[Any]], reason: str = "start"):
+        """Start the state machine; the first evaluation runs right away."""
+        self._evaluate = evaluate
+        self._deadlines.clear()
+        self._due.clear()
+        self.running = True
+        self._deadlines[reason] = self.clock()
+        self._arm()
+
+    async def stop(self):
+        """Cancel the timer and an evaluation in progress."""
+        self.running = False
+        self._cancel_timer()
+        self._deadlines.clear()
+        self._due.clear()
+        task, self._task = self._task, None
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                _LOGGER.error(f"{self.room} - Crop steering evaluation failed while stopping: {e}")
+
+    async def drain(self):
+        """Wait until the evaluation in progress (if any) has finished."""
+        while self._task and not self._task.done():
+            await asyncio.wait({self._task})
+
+    # -----------------------------------------------------------------
+    # Inputs and deadlines
+    # -----------------------------------------------------------------
+
+    def notify(self, reason: str = "sensor", settle: Optional[float] = None):
+        """An input changed; evaluate after the settle delay."""
+        if not self.running:
+            return
+        delay = self.settle_seconds if settle is None else settle
+        self.wake_at(self.clock() + timedelta(seconds=max(0.0, delay)), reason)
+
+    def wake_in(self, seconds: float, reason: str):
+        """Evaluate again in ``seconds`` (earliest request per reason wins)."""
+        self.wake_at(self.clock() + timedelta(seconds=max(0.0, float(seconds))), reason)
+
+    def wake_at(self, when: datetime, reason: str):
+        if not self.running or when is None:
+            return
+        current = self._deadlines.get(reason)
+        if current is None or when < current:
+            self._deadlines[reason] = when
+            if self._task is None:
+                self._arm()
+
+    def record_phase(self, phase: str):
+        """Track phase changes of the state machine."""
+        if phase != self.phase:
+            if self.phase is not None:
+                self.transitions.append((self.clock(), self.phase, phase))
+                del self.transitions[:-50]
+            self.phase = phase
+
+    @property
+    def next_deadline(self) -> Optional[datetime]:
+        return min(self._deadlines.values()) if self._deadlines else None
+
+    # -----------------------------------------------------------------
+    # Scheduling
+    # -----------------------------------------------------------------
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_at = None
+
+    def _arm(self):
+        """Arm the single timer for the earliest deadline."""
+        if not self.running:
+            return
+        when = self.next_deadline
+        if when is None:
+            return
+        if self._timer is not None and self._timer_at == when:
+            return
+        self._cancel_timer()
+        delay = max(0.0, (when - self.clock()).total_seconds())
+        call_later = self.call_later or asyncio.get_running_loop().call_later
+        self._timer_at = when
+        self._timer = call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._timer_at = None
+        if not self.running:
+            return
+        self._collect_due()
+        if not self._due:
+            # Timer fired early (clock adjustments); re-arm for the real deadline
+            self._arm()
+            return
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        try:
+            while self._due and self.running:
+                reasons = frozenset(self._due)
+                self._due.clear()
+                self.evaluations += 1
+                self.last_evaluation = self.clock()
+                try:
+                    await self._evaluate(reasons)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    _LOGGER.error(f"{self.room} - Crop steering evaluation error: {e}", exc_info=True)
+                # Deadlines that passed while evaluating (e.g. during a shot)
+                self._collect_due()
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+            if self.running:
+                # Watchdog: never idle longer than max_idle_seconds
+                self._deadlines["idle"] = self.clock() + timedelta(seconds=self.max_idle_seconds)
+                self._arm()
+
+    def _collect_due(self):
+        now = self.clock()
+        for reason, when in list(self._deadlines.items()):
+            if when <= now:
+                del self._deadlines[reason]
+                self._due.add(reason)
+                self.wakeups[reason] = self.wakeups.get(reason, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        next_deadline = self.next_deadline
+        return {
+            "running": self.running,
+            "phase": self.phase,
+            "evaluations": self.evaluations,
+            "wakeups": dict(self.wakeups),
+            "last_evaluation": self.last_evaluation.isoformat() if self.last_evaluation else None,
+            "next_deadline": next_deadline.isoformat() if next_deadline else None,
+            "pending": sorted(self._deadlines),
+            "transitions": len(self.transitions),
+        }
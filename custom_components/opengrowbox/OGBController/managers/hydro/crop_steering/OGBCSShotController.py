@@ -0,0 +1,301 @@
+"""
+OpenGrowBox Crop Steering Shot Controller
+
+Ends an irrigation shot on substrate readings instead of polling the
+sensor averages every second:
+
+- the controller is bound to the moisture sensors of the room's mediums
+  and is fed their ``MediumSensorUpdate`` readings; the first reading at or
+  above the target/cap stops the shot,
+- a small online model (``CSShotModel``) learns the VWC rise rate per
+  dripper from previous shots and the sensor lag from the readings that
+  arrive after a shot. Between readings the VWC is extrapolated and the shot
+  is cut when the estimate plus the water still on its way to the sensor
+  reaches the bound,
+- one timer covers the predicted cutoff and the requested duration.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+MOISTURE = "moisture"
+
+
+class CSShotModel:
+    """Learned VWC rise rate per dripper and sensor lag (moving averages)."""
+
+    MIN_SAMPLES = 2
+    MIN_SHOT_SECONDS = 5.0
+    MAX_LAG_SECONDS = 60.0
+
+    def __init__(self, alpha: float = 0.3, lag_seconds: float = 5.0):
+        self.alpha = alpha
+        self.rate_per_dripper: Optional[float] = None  # % VWC per second
+        self.lag_seconds = lag_seconds
+        self.samples = 0
+        self.lag_samples = 0
+
+    @property
+    def trusted(self) -> bool:
+        return self.rate_per_dripper is not None and self.samples >= self.MIN_SAMPLES
+
+    def rate(self, drippers: int) -> float:
+        return (self.rate_per_dripper or 0.0) * max(1, drippers)
+
+    def learn_shot(self, drippers: int, seconds: float, vwc_rise: float) -> bool:
+        """Fold a finished shot into the rise rate; returns True if it was used."""
+        if seconds < self.MIN_SHOT_SECONDS or vwc_rise <= 0:
+            return False
+        observed = vwc_rise / seconds / max(1, drippers)
+        if self.rate_per_dripper is None:
+            self.rate_per_dripper = observed
+        else:
+            self.rate_per_dripper += self.alpha * (observed - self.rate_per_dripper)
+        self.samples += 1
+        return True
+
+    def learn_lag(self, seconds: float):
+        seconds = min(self.MAX_LAG_SECONDS, max(0.0, seconds))
+        self.lag_seconds += self.alpha * (seconds - self.lag_seconds)
+        self.lag_samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rate_per_dripper": round(self.rate_per_dripper, 5) if self.rate_per_dripper is not None else None,
+            "lag_seconds": round(self.lag_seconds, 2),
+            "samples": self.samples,
+            "lag_samples": self.lag_samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "CSShotModel":
+        model = cls()
+        if isinstance(data, dict):
+            try:
+                if data.get("rate_per_dripper") is not None:
+                    model.rate_per_dripper = float(data["rate_per_dripper"])
+                model.lag_seconds = float(data.get("lag_seconds", model.lag_seconds))
+                model.samples = int(data.get("samples") or 0)
+                model.lag_samples = int(data.get("lag_samples") or 0)
+            except (TypeError, ValueError):
+                return cls()
+        return model
+
+
+class CSShotController:
+    """One irrigation shot bounded by ``target_vwc`` and/or ``max_vwc``."""
+
+    # Readings later than this after the stop are not used to learn the lag
+    LAG_WINDOW_SECONDS = 120.0
+
+    def __init__(
+        self,
+        model: CSShotModel,
+        drippers: int,
+        clock: Callable[[], datetime],
+        sleep: Callable[[float], Any],
+        target_vwc: Optional[float] = None,
+        max_vwc: Optional[float] = None,
+    ):
+        self.model = model
+        self.drippers = drippers
+        self.clock = clock
+        self.sleep = sleep
+        self.target_vwc = target_vwc
+        self.max_vwc = max_vwc
+        bounds = [bound for bound in (target_vwc, max_vwc) if bound is not None]
+        self.bound = min(bounds) if bounds else None
+
+        self._entities: Dict[str, int] = {}
+        self._values: List[Optional[float]] = []
+        self._mediums: List[Any] = []
+        self._fresh = asyncio.Event()
+        self._reported_after_stop = set()
+
+        self.vwc: Optional[float] = None
+        self.reading_at: Optional[datetime] = None
+        self.started_at: Optional[datetime] = None
+        self.stopped_at: Optional[datetime] = None
+        self.stop_vwc: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        self.readings = 0
+        self.wakeups = 0
+        self.lag_learned = False
+
+    # -----------------------------------------------------------------
+    # Sensor binding
+    # -----------------------------------------------------------------
+
+    def bind(self, mediums: List[Any], vwc: Optional[float] = None):
+        """Bind to the moisture sensors of ``mediums``; ``vwc`` is the pre-shot average."""
+        self._mediums = list(mediums or [])
+        self._values = [_as_vwc(getattr(medium, "current_moisture", None)) for medium in self._mediums]
+        for index, medium in enumerate(self._mediums):
+            sensors = getattr(medium, "registered_sensors", None) or {}
+            for entity_id in sensors.get(MOISTURE, []):
+                self._entities[entity_id] = index
+        self.vwc = vwc if vwc else self._average()
+        self.reading_at = self.clock()
+
+    def on_reading(self, data: Dict[str, Any]) -> bool:
+        """Feed a MediumSensorUpdate payload; returns True if it is a bound VWC reading."""
+        if not isinstance(data, dict) or data.get("sensor_type") != MOISTURE:
+            return False
+        if self._entities:
+            index = self._entities.get(data.get("entity_id"))
+            if index is None:
+                return False
+            # last_reading has the sensor's calibration_offset applied, state is raw
+            calibrated = data.get("last_reading")
+            value = _as_vwc(calibrated if calibrated is not None else data.get("state"))
+            if value is None:
+                return False
+            self._values[index] = value
+            if self.stopped_at is not None:
+                self._reported_after_stop.add(index)
+        else:
+            # Mediums without registered sensors: re-read their current values
+            self._values = [_as_vwc(getattr(medium, "current_moisture", None)) for medium in self._mediums]
+        vwc = self._average()
+        if vwc is None:
+            return False
+
+        self.readings += 1
+        self.vwc = vwc
+        self.reading_at = self.clock()
+        if self.stopped_at is None:
+            self._fresh.set()
+        else:
+            self._learn_lag()
+        return True
+
+    def _average(self) -> Optional[float]:
+        values = [value for value in self._values if value]
+        return round(sum(values) / len(values), 1) if values else None
+
+    # -----------------------------------------------------------------
+    # Shot
+    # -----------------------------------------------------------------
+
+    @property
+    def stopped_early(self) -> bool:
+        return self.stop_reason is not None
+
+    def _threshold(self) -> Optional[float]:
+        """VWC reading at which to stop: the bound minus the water still arriving."""
+        if self.bound is None:
+            return None
+        if not self.model.trusted:
+            return self.bound
+        return self.bound - self.model.rate(self.drippers) * self.model.lag_seconds
+
+    def _estimate(self, at: datetime) -> Optional[float]:
+        if self.vwc is None or self.reading_at is None:
+            return None
+        if not self.model.trusted:
+            return self.vwc
+        return self.vwc + self.model.rate(self.drippers) * max(0.0, (at - self.reading_at).total_seconds())
+
+    def _seconds_to_cutoff(self, now: datetime) -> Optional[float]:
+        threshold = self._threshold()
+        estimate = self._estimate(now)
+        if threshold is None or estimate is None or not self.model.trusted:
+            return None
+        rate = self.model.rate(self.drippers)
+        if rate <= 0:
+            return None
+        return max(0.0, (threshold - estimate) / rate)
+
+    async def run(self, duration: float) -> Tuple[float, Optional[str]]:
+        """Wait until a bound is reached or ``duration`` passed; returns (seconds, stop reason)."""
+        self.started_at = start = self.clock()
+        while True:
+            now = self.clock()
+            elapsed = (now - start).total_seconds()
+            threshold = self._threshold()
+            if threshold is not None and self.vwc is not None and self.vwc >= threshold:
+                return self._stop(now, self._reason())
+
+            remaining = duration - elapsed
+            if remaining <= 0:
+                return self._stop(now, None)
+
+            cutoff = self._seconds_to_cutoff(now)
+            predicted = cutoff is not None and cutoff < remaining
+            got_reading = await self._wait(cutoff if predicted else remaining)
+            if got_reading:
+                continue
+            now = self.clock()
+            if predicted:
+                return self._stop(now, f"predicted {self._reason()}")
+            return self._stop(now, None)
+
+    async def _wait(self, seconds: float) -> bool:
+        """Sleep until ``seconds`` passed or a bound reading arrived."""
+        self._fresh.clear()
+        sleeper = asyncio.ensure_future(self.sleep(seconds))
+        waiter = asyncio.ensure_future(self._fresh.wait())
+        try:
+            await asyncio.wait({sleeper, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (sleeper, waiter):
+                if not task.done():
+                    task.cancel()
+        self.wakeups += 1
+        return self._fresh.is_set()
+
+    def _reason(self) -> str:
+        if self.max_vwc is not None and self.bound == self.max_vwc:
+            return f"safety cap {self.max_vwc:.1f}% reached"
+        return f"target {self.target_vwc:.1f}% reached"
+
+    def _stop(self, now: datetime, reason: Optional[str]) -> Tuple[float, Optional[str]]:
+        self.stopped_at = now
+        self.stop_vwc = self._estimate(now)
+        self.stop_reason = reason
+        return (now - self.started_at).total_seconds(), reason
+
+    def _learn_lag(self):
+        """Readings after the stop: the rise above the estimate is water that was still on its way."""
+        if self.lag_learned or self.stop_reason is None or self.stop_vwc is None:
+            return
+        if self._entities and len(self._reported_after_stop) < len(set(self._entities.values())):
+            return  # wait until every bound medium reported
+        if (self.reading_at - self.stopped_at).total_seconds() > self.LAG_WINDOW_SECONDS:
+            return
+        rate = self.model.rate(self.drippers)
+        if rate <= 0:
+            return
+        self.lag_learned = True
+        self.model.learn_lag(max(0.0, self.vwc - self.stop_vwc) / rate)
+
+    @property
+    def settling(self) -> bool:
+        """Still waiting for the reading that shows the lag after the stop."""
+        return (
+            self.stopped_at is not None
+            and not self.lag_learned
+            and self.stop_reason is not None
+            and (self.clock() - self.stopped_at).total_seconds() <= self.LAG_WINDOW_SECONDS
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "bound": self.bound,
+            "stop_reason": self.stop_reason,
+            "stop_vwc": round(self.stop_vwc, 1) if self.stop_vwc is not None else None,
+            "readings": self.readings,
+            "wakeups": self.wakeups,
+        }
+
+
+def _as_vwc(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
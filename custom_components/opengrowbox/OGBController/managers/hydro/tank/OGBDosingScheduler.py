@@ -0,0 +1,363 @@
+"""
+OpenGrowBox Dosing Scheduler
+
+Runs dosing jobs (A/B/C/X/Y nutrient sequences, pH corrections) as a list of
+persisted steps instead of one coroutine sleeping through the whole cycle.
+
+Each step has a pump, a volume, a stop deadline and a settle window. The
+runner only waits for the next deadline; settle windows end early once EC
+readings are stable, and steps do not start while a reservoir fill holds the
+scheduler. Jobs can be cancelled (the running pump is switched off) and are
+resumed after a restart from the datastore, with wall-clock deadlines and the
+undelivered part of an interrupted pump step re-queued.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DOSING_JOBS_KEY = "dosingJobs"
+
+# Settle windows end early when two consecutive EC readings differ less than this
+EC_STABLE_DELTA = 0.02  # mS/cm
+MIN_SETTLE_FRACTION = 0.33  # ...but never before a third of the window has passed
+MIN_RESUME_ML = 0.1  # smaller leftovers of an interrupted step are dropped
+
+# Step / job states
+PENDING = "pending"
+RUNNING = "running"
+SETTLING = "settling"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class DosingClock:
+    """Wall clock used for deadlines (replaced by a virtual clock in tests)."""
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+@dataclass
+class DosingStep:
+    """One pump run followed by a settle window."""
+
+    pump: str
+    volume_ml: float
+    run_time: float
+    settle_s: float = 0.0
+    state: str = PENDING
+    started_at: Optional[float] = None
+    stop_at: Optional[float] = None
+    settle_until: Optional[float] = None
+    stop_first: bool = False  # switch the pump off before continuing (after restart)
+
+
+@dataclass
+class DosingJob:
+    """Ordered dosing steps with their progress."""
+
+    kind: str
+    steps: List[DosingStep]
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    state: str = PENDING
+    created_at: float = 0.0
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DosingJob":
+        steps = [DosingStep(**step) for step in data.get("steps", [])]
+        return cls(
+            kind=data.get("kind", "unknown"),
+            steps=steps,
+            job_id=data.get("job_id") or uuid.uuid4().hex[:12],
+            state=data.get("state", PENDING),
+            created_at=data.get("created_at", 0.0),
+            meta=data.get("meta") or {},
+        )
+
+
+class OGBDosingScheduler:
+    """Deadline-driven dosing job runner for one room."""
+
+    def __init__(
+        self,
+        room: str,
+        data_store,
+        event_manager,
+        start_pump: Callable[[str, float, float], Awaitable[bool]],
+        stop_pump: Callable[[str], Awaitable[Any]],
+        clock: Optional[DosingClock] = None,
+    ):
+        self.room = room
+        self.data_store = data_store
+        self.event_manager = event_manager
+        self._start_pump = start_pump
+        self._stop_pump = stop_pump
+        self.clock = clock or DosingClock()
+
+        self._jobs: List[DosingJob] = []
+        self._done: Dict[str, asyncio.Future] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._current: Optional[DosingJob] = None
+        self._holds: set = set()
+        self._released = asyncio.Event()
+        self._released.set()
+        self._wake = asyncio.Event()
+        self._ec_readings: List[float] = []
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+
+    def submit(self, kind: str, steps: List[DosingStep], meta: Optional[Dict[str, Any]] = None) -> DosingJob:
+        """Queue a job and make sure the runner is active."""
+        job = DosingJob(kind=kind, steps=list(steps), created_at=self.clock.time(), meta=meta or {})
+        self._jobs.append(job)
+        self._done[job.job_id] = asyncio.get_running_loop().create_future()
+        self._persist(save=True)
+        self._ensure_runner()
+        _LOGGER.debug(f"[{self.room}] Dosing job {job.job_id} ({kind}) queued with {len(steps)} step(s)")
+        return job
+
+    async def wait(self, job: DosingJob) -> bool:
+        """Wait until a job is finished; True if all steps completed."""
+        future = self._done.get(job.job_id)
+        if future is None:
+            return job.state == DONE
+        return await asyncio.shield(future)
+
+    async def run(self, kind: str, steps: List[DosingStep], meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Submit a job and wait for it."""
+        return await self.wait(self.submit(kind, steps, meta))
+
+    async def cancel(self, job_id: Optional[str] = None) -> int:
+        """Cancel one job (or all); a running pump is switched off."""
+        cancelled = 0
+        for job in list(self._jobs):
+            if job_id is not None and job.job_id != job_id:
+                continue
+            if job is self._current and self._runner and not self._runner.done():
+                self._runner.cancel()
+                try:
+                    await self._runner
+                except asyncio.CancelledError:
+                    pass
+            self._finish(job, CANCELLED)
+            cancelled += 1
+        if self._jobs:
+            self._ensure_runner()
+        return cancelled
+
+    def hold(self, reason: str):
+        """Keep new pump steps from starting (running steps finish)."""
+        self._holds.add(reason)
+        self._released.clear()
+
+    def release(self, reason: str):
+        self._holds.discard(reason)
+        if not self._holds:
+            self._released.set()
+
+    def on_ec_reading(self, ec: float):
+        """Feed EC readings so settle windows can end once EC is stable."""
+        if self._current is None:
+            return
+        self._ec_readings.append(ec)
+        del self._ec_readings[:-3]
+        self._wake.set()
+
+    def resume(self) -> int:
+        """Reload unfinished jobs from the datastore after a restart."""
+        stored = self.data_store.get(DOSING_JOBS_KEY) or []
+        now = self.clock.time()
+        resumed = 0
+        for data in stored:
+            try:
+                job = DosingJob.from_dict(data)
+            except (TypeError, ValueError) as e:
+                _LOGGER.warning(f"[{self.room}] Dropping invalid stored dosing job: {e}")
+                continue
+            if job.state not in (PENDING, RUNNING) or any(j.job_id == job.job_id for j in self._jobs):
+                continue
+            for step in job.steps:
+                if step.state != RUNNING:
+                    continue
+                # Pump was on when HA stopped: requeue what was not delivered
+                ran = max(0.0, min(now, step.stop_at or now) - (step.started_at or now))
+                left = step.volume_ml * (1.0 - ran / step.run_time) if step.run_time > 0 else 0.0
+                if left >= MIN_RESUME_ML:
+                    step.run_time *= left / step.volume_ml
+                    step.volume_ml = left
+                    step.state = PENDING
+                    step.started_at = step.stop_at = None
+                else:
+                    step.state = SETTLING
+                    step.settle_until = (step.stop_at or now) + step.settle_s
+                # Make sure the pump is really off
+                step.stop_first = True
+            job.state = PENDING
+            self._jobs.append(job)
+            self._done[job.job_id] = asyncio.get_running_loop().create_future()
+            resumed += 1
+
+        if resumed:
+            _LOGGER.warning(f"[{self.room}] Resuming {resumed} interrupted dosing job(s)")
+            self._persist()
+            self._ensure_runner()
+        return resumed
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "jobs": [
+                {
+                    "job_id": job.job_id,
+                    "kind": job.kind,
+                    "state": job.state,
+                    "steps": [(s.pump, s.state) for s in job.steps],
+                }
+                for job in self._jobs
+            ],
+            "held_by": sorted(self._holds),
+        }
+
+    # -----------------------------------------------------------------
+    # Runner
+    # -----------------------------------------------------------------
+
+    def _ensure_runner(self):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while self._jobs:
+            job = self._jobs[0]
+            self._current = job
+            try:
+                ok = await self._execute(job)
+            except asyncio.CancelledError:
+                self._current = None
+                raise
+            except Exception as e:
+                _LOGGER.error(f"[{self.room}] Dosing job {job.job_id} failed: {e}")
+                ok = False
+            self._current = None
+            self._finish(job, DONE if ok else FAILED)
+
+    async def _execute(self, job: DosingJob) -> bool:
+        job.state = RUNNING
+        self._persist()
+
+        for step in job.steps:
+            if step.stop_first:
+                await self._safe_stop(step.pump)
+                step.stop_first = False
+
+            if step.state == PENDING:
+                if not self._released.is_set():
+                    _LOGGER.debug(f"[{self.room}] Dosing waits for {sorted(self._holds)}")
+                    await self._released.wait()
+                now = self.clock.time()
+                if not await self._start_pump(step.pump, step.run_time, step.volume_ml):
+                    # Remaining steps still run (same as the former sequential dosing)
+                    _LOGGER.warning(f"[{self.room}] Failed to dose {step.volume_ml:.1f}ml with {step.pump}")
+                    step.state = FAILED
+                    self._persist()
+                    continue
+                step.started_at = now
+                step.stop_at = now + step.run_time
+                step.state = RUNNING
+                self._persist(save=True)
+
+            if step.state == RUNNING:
+                try:
+                    await self._sleep_until(step.stop_at)
+                finally:
+                    await self._safe_stop(step.pump)
+                step.state = SETTLING
+                step.settle_until = self.clock.time() + step.settle_s
+                self._persist()
+
+            if step.state == SETTLING:
+                await self._settle(step)
+                step.state = DONE
+                self._persist()
+
+        return all(step.state == DONE for step in job.steps)
+
+    async def _settle(self, step: DosingStep):
+        self._ec_readings.clear()
+        start = self.clock.time()
+        min_until = start + (step.settle_until - start) * MIN_SETTLE_FRACTION
+        while True:
+            woken = await self._sleep_until(step.settle_until, self._wake)
+            if not woken:
+                return
+            readings = self._ec_readings
+            if (
+                len(readings) >= 2
+                and abs(readings[-1] - readings[-2]) <= EC_STABLE_DELTA
+                and self.clock.time() >= min_until
+            ):
+                _LOGGER.debug(f"[{self.room}] EC stable after {step.pump} - settle window ended early")
+                return
+
+    async def _sleep_until(self, deadline: float, wake: Optional[asyncio.Event] = None) -> bool:
+        """Wait for a deadline; returns True if ``wake`` fired first."""
+        remaining = deadline - self.clock.time()
+        if remaining <= 0:
+            return False
+        if wake is None:
+            await self.clock.sleep(remaining)
+            return False
+
+        wake.clear()
+        sleeper = asyncio.ensure_future(self.clock.sleep(remaining))
+        waiter = asyncio.ensure_future(wake.wait())
+        try:
+            done, _ = await asyncio.wait({sleeper, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (sleeper, waiter):
+                if not task.done():
+                    task.cancel()
+        return waiter in done and self.clock.time() < deadline
+
+    async def _safe_stop(self, pump: str):
+        try:
+            await self._stop_pump(pump)
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Could not stop pump {pump}: {e}")
+
+    def _finish(self, job: DosingJob, state: str):
+        job.state = state
+        if job in self._jobs:
+            self._jobs.remove(job)
+        future = self._done.pop(job.job_id, None)
+        if future is not None and not future.done():
+            future.set_result(state == DONE)
+        self._persist(save=True)
+        _LOGGER.debug(f"[{self.room}] Dosing job {job.job_id} ({job.kind}) {state}")
+
+    def _persist(self, save: bool = False):
+        """Mirror jobs to the datastore; ``save`` also writes the state file."""
+        try:
+            self.data_store.set(DOSING_JOBS_KEY, [job.to_dict() for job in self._jobs])
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Could not persist dosing jobs: {e}")
+            return
+        if save and self.event_manager is not None:
+            asyncio.get_running_loop().create_task(
+                self.event_manager.emit("SaveState", {"source": "Dosing", "room": self.room})
+            )
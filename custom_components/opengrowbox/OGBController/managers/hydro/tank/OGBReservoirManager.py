@@ -78,6 +78,10 @@ class OGBReservoirManager:
         
         # Pump tracking
         self.reservoir_pump_entity: Optional[str] = None
+
+        # Level updates wake the fill loop; dosing pauses while filling
+        self._level_event = asyncio.Event()
+        self.dosing_scheduler = None  # set by OGBTankFeedManager
         
         # Register event handlers
         self.event_manager.on("ReservoirLevelUpdate", self._handle_level_update)
@@ -352,10 +356,9 @@ class OGBReservoirManager:
         if isinstance(data, dict):
             return data.get("entity_id", ""), data.get("state")
 
-        entity_id = getattr(data, "Name", "")
-        new_state_list = getattr(data, "newState", [])
-        state = new_state_list[0] if new_state_list else None
-        return entity_id, state
+        # OGBEventPublication
+        state = data.newState[0] if data.newState else None
+        return data.Name, state
 
     async def _handle_pump_state_update(self, state):
         """Handle reservoir pump state updates and block unsafe behavior."""
@@ -415,9 +418,8 @@ class OGBReservoirManager:
                 attributes = data.get('attributes', {})
             else:
                 # OGBEventPublication object format
-                entity_id = getattr(data, 'Name', 'unknown')
-                new_state_list = getattr(data, 'newState', [])
-                state = new_state_list[0] if new_state_list else None
+                entity_id = data.Name
+                state = data.newState[0] if data.newState else None
                 
                 # Get attributes from Home Assistant state
                 try:
@@ -512,6 +514,7 @@ class OGBReservoirManager:
             self.data_store.setDeep("Hydro.ReservoirLevel", self.current_level)
             self.data_store.setDeep("Hydro.ReservoirLevelRaw", self.current_level_raw)
             self.data_store.setDeep("Hydro.ReservoirLastUpdate", datetime.now().isoformat())
+            self._level_event.set()
             
             _LOGGER.debug(
                 f"[{self.room}] Reservoir level: {self.current_level:.1f}% "
@@ -799,6 +802,8 @@ class OGBReservoirManager:
         _LOGGER.debug(f"[{self.room}] Starting auto-fill process with pump: {self.reservoir_pump_entity}")
         
         self._is_filling = True
+        if self.dosing_scheduler is not None:
+            self.dosing_scheduler.hold("reservoir_fill")
         self._fill_cycles_completed = 0
         self._fill_start_level = self.current_level
         self._fill_start_time = datetime.now()
@@ -887,7 +892,7 @@ class OGBReservoirManager:
                 # Wait 5 minutes before next cycle (if not done)
                 if self._is_filling and self.current_level < target_level:
                     _LOGGER.debug(f"[{self.room}] Waiting 5 minutes before next fill cycle")
-                    await asyncio.sleep(300)  # 5 minutes
+                    await self._wait_while_filling(300)  # 5 minutes, ends early on stop
                     
                     # Verify sensor is still working after wait
                     if self.current_level is None:
@@ -925,7 +930,28 @@ class OGBReservoirManager:
             )
         finally:
             await self._stop_fill("Completed or error")
+            if self.dosing_scheduler is not None:
+                self.dosing_scheduler.release("reservoir_fill")
     
+    async def _wait_for_level(self, timeout: float) -> bool:
+        """Wait for the next level update; False on timeout."""
+        self._level_event.clear()
+        try:
+            await asyncio.wait_for(self._level_event.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _wait_while_filling(self, seconds: float):
+        """Settle wait between fill cycles that ends as soon as the fill is stopped."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + seconds
+        while self._is_filling:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            await self._wait_for_level(remaining)
+
     async def _run_fill_cycle(self, target_level: float) -> bool:
         """
         Run one fill cycle: pump until 5% added or max 5 minutes.
@@ -989,8 +1015,8 @@ class OGBReservoirManager:
                     # No sensor reading
                     _LOGGER.warning(f"[{self.room}] No sensor reading during fill cycle")
                 
-                # Wait 10 seconds before next check
-                await asyncio.sleep(10)
+                # Wake on the next level update (at the latest after 10 s)
+                await self._wait_for_level(min(10, max_pump_duration - elapsed))
             
             # Stop pump
             await self._deactivate_pump()
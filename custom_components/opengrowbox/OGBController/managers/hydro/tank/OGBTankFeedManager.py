@@ -11,6 +11,7 @@ _LOGGER = logging.getLogger(__name__)
 from ....data.OGBDataClasses.OGBPublications import OGBWaterAction, OGBWaterPublication, OGBHydroAction
 from ....managers.OGBNotifyManager import OGBNotificator
 from custom_components.opengrowbox.OGBController.managers.hydro.tank.OGBReservoirManager import OGBReservoirManager
+from .OGBDosingScheduler import DosingStep, OGBDosingScheduler
 from ....utils.ambient import is_ambient_room, is_not_ambient_room
 
 class ECUnit(Enum):
@@ -152,6 +153,29 @@ PLANT_TYPE_PROFILES: Dict[str, Dict[str, FeedConfig]] = {
 DEFAULT_PLANT_TYPE = "Cannabis"
 
 
+def _as_pump_type(pump: Union[PumpType, str]) -> Union[PumpType, str]:
+    """Persisted dosing steps store pump values; map them back to PumpType."""
+    if isinstance(pump, PumpType):
+        return pump
+    for pump_type in PumpType:
+        if pump_type.value == pump:
+            return pump_type
+    return pump
+
+
+# Settle window after each nutrient pump (sensor settling / mixing)
+NUTRIENT_SETTLE_SECONDS = 90
+
+# Nutrient -> pump, in dosing order
+NUTRIENT_PUMPS = {
+    "A": PumpType.NUTRIENT_A,
+    "B": PumpType.NUTRIENT_B,
+    "C": PumpType.NUTRIENT_C,
+    "X": PumpType.CUSTOM_X,
+    "Y": PumpType.CUSTOM_Y,
+}
+
+
 class OGBTankFeedManager:
     def __init__(self, hass, dataStore, eventManager, room: str):
         self.name = "OGB Tank Feed Manager"
@@ -315,6 +339,10 @@ class OGBTankFeedManager:
         self.event_manager.on("DoseFullRecipe", self._dose_full_recipe)
         self.event_manager.on("DosePHDown", self._dose_ph_down_proportional)
         self.event_manager.on("DosePHUp", self._dose_ph_up_proportional)
+        self.event_manager.on("CancelDosing", self._cancel_dosing)
+
+        # Deadline-driven dosing jobs (created lazily, resumed in init)
+        self.dosing_scheduler: Optional[OGBDosingScheduler] = None
 
         # Initialize specialized managers
         from .OGBFeedLogicManager import OGBFeedLogicManager
@@ -345,6 +373,11 @@ class OGBTankFeedManager:
             self.notificator
         )
         await self.reservoir_manager.init()
+
+        # Dosing jobs: resume interrupted ones, reservoir fill holds new pump steps
+        scheduler = self._get_dosing_scheduler()
+        self.reservoir_manager.dosing_scheduler = scheduler
+        scheduler.resume()
         
         # Load current plant stage
         self.current_plant_stage = self.data_store.get("plantStage")
@@ -800,6 +833,10 @@ class OGBTankFeedManager:
             _LOGGER.warning(f"[{self.room}] Unknown feed mode: {feedMode}")
             return False
 
+        # Disabling feed stops pending and running dosing jobs
+        if self.feed_mode == FeedMode.DISABLED and getattr(self, "dosing_scheduler", None):
+            await self.dosing_scheduler.cancel()
+
 
 
     async def _feed_mode_targets_change(self, data):
@@ -850,6 +887,10 @@ class OGBTankFeedManager:
             _LOGGER.debug(f"[{self.room}] Hydro values: pH={self.current_ph:.2f}, "
                         f"EC={self.current_ec:.2f} mS/cm, Temp={self.current_temp:.2f}°C")
 
+            # EC readings end dosing settle windows early once stable
+            if getattr(self, "dosing_scheduler", None) is not None:
+                self.dosing_scheduler.on_ec_reading(self.current_ec)
+
             # Delegate feed decision to logic manager
             await self.feed_logic_manager.handle_feed_update(sensor_data)
 
@@ -906,25 +947,13 @@ class OGBTankFeedManager:
     async def _dose_nutrients(self) -> bool:
         """Dose nutrients based on current stage and targets"""
         try:
-            # Dose in order: A, B, C with delays between
-            for nutrient in ["A", "B", "C"]:
-                if nutrient in self.nutrients and self.nutrients[nutrient] > 0:
-                    ml_per_liter = self.nutrients[nutrient]
-                    total_ml = self._calculate_nutrient_dose(ml_per_liter)
-                    
-                    # Get calibration factor and calculate run time correctly
-                    pump_enum = getattr(PumpType, f"NUTRIENT_{nutrient}")
-                    calibration_factor = self._get_effective_pump_rate(pump_enum)
-                    run_time = total_ml / calibration_factor if calibration_factor > 0 else 0.0
-                    
-                    if run_time > 0:
-                        if await self._activate_pump(pump_enum, run_time, total_ml):
-                            # Wait between nutrients (90 seconds for sensor settling)
-                            await asyncio.sleep(90)
-                    else:
-                        _LOGGER.debug(f"[{self.room}] Pump {pump_enum.name} disabled via flow rate 0 - skipping")
-                            
-            return True
+            # Dose in order: A, B, C with settle windows between
+            nutrient_doses = {
+                nutrient: self._calculate_nutrient_dose(self.nutrients[nutrient])
+                for nutrient in ["A", "B", "C"]
+                if nutrient in self.nutrients and self.nutrients[nutrient] > 0
+            }
+            return await self._run_nutrient_job("nutrients", nutrient_doses)
                     
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error dosing nutrients: {e}")
@@ -990,12 +1019,10 @@ class OGBTankFeedManager:
             )
 
             # Dose each nutrient based on calculated concentration-based doses
+            # The last step's settle window covers sensor settling before the EC reading
             success = await self._dose_nutrients_with_concentration(nutrient_doses)
             
             if success:
-                # Wait for sensors to settle (90 seconds after last nutrient)
-                await asyncio.sleep(90)
-                
                 # EC Tracking: Save EC after dosing
                 self.feed_ec_after = self.current_ec
                 self.feed_ec_added = self.feed_ec_after - self.feed_ec_before
@@ -1074,7 +1101,6 @@ class OGBTankFeedManager:
 
             success = await self._dose_nutrients_with_concentration(nutrient_doses)
             if success:
-                await asyncio.sleep(90)
                 self.feed_ec_after = self.current_ec
                 self.feed_ec_added = self.feed_ec_after - self.feed_ec_before
                 total_dose = sum(nutrient_doses.values())
@@ -1139,26 +1165,13 @@ class OGBTankFeedManager:
     async def _dose_nutrients_with_amount(self, dose_ml: float) -> bool:
         """Dose nutrients with a specific amount per nutrient type."""
         try:
-            # Dose in order: A, B, C with delays between
-            nutrients_to_dose = ['A', 'B', 'C']
-
-            for nutrient in nutrients_to_dose:
-                if nutrient in self.nutrients and self.nutrients[nutrient] > 0:
-                    # Get calibration factor and calculate run time correctly
-                    pump_enum = getattr(PumpType, f"NUTRIENT_{nutrient}")
-                    calibration_factor = self._get_effective_pump_rate(pump_enum)
-                    run_time = dose_ml / calibration_factor if calibration_factor > 0 else 0.0
-
-                    if run_time > 0:
-                        if await self._activate_pump(pump_enum, run_time, dose_ml):
-                            # Wait between nutrients to prevent mixing issues (90 seconds for sensor settling)
-                            await asyncio.sleep(90)
-                        else:
-                            _LOGGER.warning(f"[{self.room}] Failed to dose nutrient {nutrient}")
-                    else:
-                        _LOGGER.debug(f"[{self.room}] Pump {pump_enum.name} disabled via flow rate 0 - skipping")
-
-            return True
+            # Dose in order: A, B, C with settle windows between
+            nutrient_doses = {
+                nutrient: dose_ml
+                for nutrient in ["A", "B", "C"]
+                if nutrient in self.nutrients and self.nutrients[nutrient] > 0
+            }
+            return await self._run_nutrient_job("nutrients_amount", nutrient_doses)
 
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error dosing nutrients with amount: {e}")
@@ -1167,48 +1180,43 @@ class OGBTankFeedManager:
     async def _dose_nutrients_with_concentration(self, nutrient_doses: Dict[str, float]) -> bool:
         """Dose nutrients with concentration-based doses (ml per nutrient)."""
         try:
-            # Dose in order: A, B, C, X, Y with delays between
-            # Only dose nutrients that have a dose > 0
-            nutrients_to_dose = sorted(nutrient_doses.keys(), key=lambda x: {"A": 0, "B": 1, "C": 2, "X": 3, "Y": 4}.get(x, 99))
-
-            for nutrient in nutrients_to_dose:
-                dose_ml = nutrient_doses[nutrient]
-                if dose_ml <= 0:
-                    continue
-                
-                if nutrient in self.nutrients and self.nutrients[nutrient] > 0:
-                    # Get pump enum for this nutrient
-                    nutrient_to_pump = {
-                        "A": PumpType.NUTRIENT_A,
-                        "B": PumpType.NUTRIENT_B,
-                        "C": PumpType.NUTRIENT_C,
-                        "X": PumpType.CUSTOM_X,
-                        "Y": PumpType.CUSTOM_Y,
-                    }
-                    pump_enum = nutrient_to_pump.get(nutrient)
-                    if not pump_enum:
-                        _LOGGER.warning(f"[{self.room}] No pump mapping for nutrient {nutrient}")
-                        continue
-                    
-                    calibration_factor = self._get_effective_pump_rate(pump_enum)
-                    run_time = dose_ml / calibration_factor if calibration_factor > 0 else 0.0
-
-                    if run_time > 0:
-                        _LOGGER.debug(f"[{self.room}] Dosing {nutrient}: {dose_ml:.1f}ml for {run_time:.1f}s")
-                        if await self._activate_pump(pump_enum, run_time, dose_ml):
-                            # Wait between nutrients to prevent mixing issues (90 seconds for sensor settling)
-                            await asyncio.sleep(90)
-                        else:
-                            _LOGGER.warning(f"[{self.room}] Failed to dose nutrient {nutrient}")
-                    else:
-                        _LOGGER.debug(f"[{self.room}] Pump {pump_enum.name} disabled via flow rate 0 - skipping")
-
-            return True
+            # Only dose configured nutrients that have a dose > 0
+            doses = {
+                nutrient: dose_ml
+                for nutrient, dose_ml in nutrient_doses.items()
+                if dose_ml > 0 and nutrient in self.nutrients and self.nutrients[nutrient] > 0
+            }
+            return await self._run_nutrient_job("nutrients_concentration", doses)
 
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error dosing nutrients with concentration: {e}")
             return False
 
+    def _build_nutrient_steps(self, nutrient_doses: Dict[str, float]) -> list:
+        """Dosing steps in A, B, C, X, Y order; pumps with flow rate 0 are skipped."""
+        steps = []
+        for nutrient, pump_enum in NUTRIENT_PUMPS.items():
+            dose_ml = nutrient_doses.get(nutrient, 0.0)
+            if dose_ml <= 0:
+                continue
+            calibration_factor = self._get_effective_pump_rate(pump_enum)
+            run_time = dose_ml / calibration_factor if calibration_factor > 0 else 0.0
+            if run_time <= 0:
+                _LOGGER.debug(f"[{self.room}] Pump {pump_enum.name} disabled via flow rate 0 - skipping")
+                continue
+            _LOGGER.debug(f"[{self.room}] Dosing {nutrient}: {dose_ml:.1f}ml for {run_time:.1f}s")
+            steps.append(DosingStep(pump_enum.value, dose_ml, run_time, NUTRIENT_SETTLE_SECONDS))
+        for nutrient in nutrient_doses:
+            if nutrient not in NUTRIENT_PUMPS:
+                _LOGGER.warning(f"[{self.room}] No pump mapping for nutrient {nutrient}")
+        return steps
+
+    async def _run_nutrient_job(self, kind: str, nutrient_doses: Dict[str, float]) -> bool:
+        steps = self._build_nutrient_steps(nutrient_doses)
+        if not steps:
+            return True
+        return await self._get_dosing_scheduler().run(kind, steps, {"doses": nutrient_doses})
+
     async def _dose_ph_down_with_amount(self, dose_ml: float) -> bool:
         """Dose pH down with a specific amount."""
         try:
@@ -1328,8 +1336,44 @@ class OGBTankFeedManager:
             # Return original value as fallback
             return pump_type.value if isinstance(pump_type, PumpType) else pump_type
 
+    def _get_dosing_scheduler(self) -> OGBDosingScheduler:
+        scheduler = getattr(self, "dosing_scheduler", None)
+        if scheduler is None:
+            scheduler = OGBDosingScheduler(
+                self.room,
+                self.data_store,
+                self.event_manager,
+                start_pump=lambda pump, run_time, dose_ml: self._start_pump(
+                    _as_pump_type(pump), run_time, dose_ml
+                ),
+                stop_pump=lambda pump: self._stop_pump(_as_pump_type(pump)),
+            )
+            self.dosing_scheduler = scheduler
+        return scheduler
+
+    async def _cancel_dosing(self, data=None):
+        """Cancel dosing jobs (all, or data['job_id'])."""
+        job_id = data.get("job_id") if isinstance(data, dict) else None
+        cancelled = await self._get_dosing_scheduler().cancel(job_id)
+        if cancelled:
+            self._log_to_client(f"Dosing cancelled ({cancelled} job(s))", "WARNING")
+
+    async def async_shutdown(self):
+        """Stop dosing and an active reservoir fill (feature disabled or unload)."""
+        if self.dosing_scheduler is not None:
+            await self.dosing_scheduler.cancel()
+        reservoir = self.reservoir_manager
+        if reservoir is not None and getattr(reservoir, "_is_filling", False):
+            await reservoir._stop_fill("Tank feed disabled")
+        self.is_initialized = False
+
     async def _activate_pump(self, pump_type: Union[PumpType, str], run_time: float, dose_ml: float) -> bool:
-        """Activate a pump for specified time using Home Assistant switch entity"""
+        """Run a single pump for the specified time as a dosing job"""
+        pump = pump_type.value if isinstance(pump_type, PumpType) else str(pump_type)
+        return await self._get_dosing_scheduler().run("pump", [DosingStep(pump, dose_ml, run_time)])
+
+    async def _start_pump(self, pump_type: Union[PumpType, str], run_time: float, dose_ml: float) -> bool:
+        """Switch a dosing pump on via Home Assistant (the scheduler switches it off)"""
         try:
             # Find the actual entity ID using label-based discovery
             entity_id = await self._find_pump_entity(pump_type)
@@ -1357,19 +1401,6 @@ class OGBTankFeedManager:
                 Message=f"Dosing {dose_ml:.1f}ml"
             )
             await self.event_manager.emit("LogForClient", waterAction, haEvent=True, debug_type="INFO")
-            
-            # Wait for dose time
-            await asyncio.sleep(run_time)
-            
-            # Turn OFF pump via Home Assistant service call
-            await self.hass.services.async_call(
-                "switch",
-                "turn_off",
-                {"entity_id": entity_id},
-                blocking=False
-            )
-            
-            _LOGGER.debug(f"[{self.room}] Pump {pump_type} completed")
             return True
                 
         except Exception as e:
@@ -1384,6 +1415,22 @@ class OGBTankFeedManager:
             }, haEvent=True, debug_type="ERROR")
             return False
 
+    async def _stop_pump(self, pump_type: Union[PumpType, str]):
+        """Switch a dosing pump off via Home Assistant"""
+        entity_id = await self._find_pump_entity(pump_type)
+        if not entity_id:
+            _LOGGER.error(f"[{self.room}] Could not find entity for pump {pump_type}")
+            return
+
+        # Turn OFF pump via Home Assistant service call
+        await self.hass.services.async_call(
+            "switch",
+            "turn_off",
+            {"entity_id": entity_id},
+            blocking=False
+        )
+        _LOGGER.debug(f"[{self.room}] Pump {pump_type} completed")
+
     async def _activate_pump2(self, pump_type: PumpType, run_time: float, dose_ml: float) -> bool:
         """Activate a pump for specified time using PumpAction event (Alternative)"""
         try:
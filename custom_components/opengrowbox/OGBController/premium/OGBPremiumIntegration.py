@@ -262,7 +262,7 @@ class OGBPremiumIntegration:
 
         # Initialize analytics modules
         self.analytics = OGBPremAnalytics(api_proxy=None, cache=None)  # TODO: Add proper api_proxy and cache
-        self.compliance = OGBPremCompliance(api_proxy=None, cache=None)  # TODO: Add proper api_proxy and cache
+        self.compliance = OGBPremCompliance(api_proxy=None, cache=None, data_store=self.data_store)  # TODO: Add proper api_proxy and cache
         self.research = OGBPremResearch(api_proxy=None, cache=None)  # TODO: Add proper api_proxy and cache
 
         # Load saved state
@@ -301,6 +301,8 @@ class OGBPremiumIntegration:
 
         # Internal event manager events
         self._register_event_listener("DataRelease", self._send_growdata_to_prem_api)
+        # Every sensor/VPD update (also on the fixed VPD intervals, all below MAX_SAMPLE_GAP)
+        self._register_event_listener("VPDCreation", self._observe_compliance)
         self._register_event_listener("PremiumChange", self._handle_premium_change)
         self._register_event_listener("SaveRequest", self._save_request)
         self._register_event_listener("PremUICTRLChange", self._handle_ctrl_change)
@@ -3229,6 +3231,7 @@ class OGBPremiumIntegration:
                     room=self.room,
                     hass=self.hass,
                     event_manager=self.event_manager,
+                    data_store=self.data_store,
                 )
                 _LOGGER.debug(
                     f"🔧 {self.room} Feature manager initialized "
@@ -3783,6 +3786,24 @@ class OGBPremiumIntegration:
         except Exception as e:
             _LOGGER.error(f"Premium deselection error: {e}")
 
+    async def _observe_compliance(self, event):
+        """
+        Stream the current climate values into the local compliance engine.
+
+        Runs on VPDCreation; the averages in tentData may still be those of
+        the previous update, which only shifts a transition by one sample.
+        """
+        compliance = getattr(self, "compliance", None)
+        if compliance is None:
+            return
+        sample = {
+            "temperature": self.data_store.getDeep("tentData.temperature"),
+            "humidity": self.data_store.getDeep("tentData.humidity"),
+            "vpd": self.data_store.getDeep("vpd.current"),
+        }
+        if compliance.observe(sample):
+            await self.event_manager.emit("SaveState", {"source": "Compliance"})
+
     async def _handle_analytics_update(self, event):
         """Handle AnalyticsUpdate events from V1 WebSocket and route to analytics modules."""
         try:
@@ -3937,6 +3958,9 @@ class OGBPremiumIntegration:
             except Exception as e:
                 _LOGGER.debug(f"{self.room} manage controls task cancellation error: {e}")
 
+        if getattr(self, "compliance", None) is not None:
+            self.compliance.flush()
+
         if self.growPlanManager and hasattr(self.growPlanManager, "async_shutdown"):
             try:
                 await self.growPlanManager.async_shutdown()
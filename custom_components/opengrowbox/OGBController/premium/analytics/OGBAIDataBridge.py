@@ -4,54 +4,65 @@ OGB AI Data Bridge - Collects cropsteering data and sends to ogb-grow-api for AI
 This module bridges the cropsteering execution in HA backend with the AI learning
 system in the ogb-grow-api. It:
 - Listens to cropsteering events (phase transitions, irrigations, sensor readings)
-- Batches and sends data to the API via WebSocket
+- Batches events per type in columnar form (see OGBAIEventBatch) and sends
+  them to the API via WebSocket, flushing when a batch is full or old enough
+- Spills batches to a bounded local segment file while the API is
+  unreachable and sends them oldest-first once it is back
 - Receives optimized parameters from the AI system
 """
 
 import asyncio
+import base64
 import logging
+import time
 from collections import deque
-from dataclasses import asdict, dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...utils.ambient import is_ambient_room
+from .OGBAIEventBatch import BATCH_ENCODING, ColumnarBatch, SpillFile
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
-class CropSteeringEvent:
-    """Base class for cropsteering events to send to AI"""
-
-    event_type: str
-    timestamp: float
-    room: str
-    medium_type: str
-    data: Dict[str, Any]
-
-
 class OGBAIDataBridge:
     """Bridge between HA cropsteering and API AI learning system"""
 
+    # Wall clock for event timestamps and batch ages
+    clock = staticmethod(time.time)
+
     def __init__(
-        self, hass, eventManager, dataStore, room: str, websocket_manager=None
+        self, hass, eventManager, dataStore, room: str, websocket_manager=None, spill_path: Optional[str] = None
     ):
         self.hass = hass
         self.event_manager = eventManager
         self.data_store = dataStore
         self.room = room
         self.websocket_manager = websocket_manager
+        # Premium integration, wired in by the main controller; its WebSocket
+        # client is created after login, so it is looked up on every send
+        self.prem_manager = None
 
         # Skip for ambient room - no cropsteering/AI needed
         if is_ambient_room(self.room):
             _LOGGER.debug(f"{self.room}: AI Data Bridge disabled - ambient room")
             return
 
-        # Event buffering
-        self.event_buffer: deque = deque(maxlen=1000)
-        self.batch_size = 10
-        self.flush_interval = 60  # seconds
+        # Columnar batches per event type, flushed by size or age
+        self.batches: Dict[str, ColumnarBatch] = {}
+        self.pending_events = 0
+        self.max_batch_events = 200
+        self.max_batch_age = 60.0  # seconds
+        self.retry_interval = 60.0  # seconds, while spilled batches wait
+        self._flush_wakeup = asyncio.Event()
+
+        # Offline spill (bounded segment file below /config/ogb_data)
+        if spill_path is None:
+            config_path = getattr(getattr(hass, "config", None), "path", None)
+            if callable(config_path):
+                spill_path = config_path("ogb_data", f"ogb_{room.lower()}_ai_spill.seg")
+        self.spill = SpillFile(spill_path)
+        self.events_sent = 0
+        self.bytes_sent = 0
 
         # State tracking
         self.current_phase = "p0"
@@ -80,6 +91,7 @@ class OGBAIDataBridge:
             return
 
         self._is_enabled = True
+        await asyncio.to_thread(self.spill.load)
 
         # Subscribe to cropsteering events
         self.event_manager.on("CSPhaseChange", self._on_phase_change)
@@ -104,7 +116,7 @@ class OGBAIDataBridge:
             except asyncio.CancelledError:
                 pass
 
-        # Flush remaining events
+        # Flush remaining events (spilled to disk if the API is unreachable)
         await self._flush_buffer()
 
         _LOGGER.debug(f"{self.room} - AI Data Bridge stopped")
@@ -119,12 +131,9 @@ class OGBAIDataBridge:
         from_phase = data.get("from_phase", self.current_phase)
         to_phase = data.get("to_phase", "p0")
 
-        event = CropSteeringEvent(
-            event_type="phase_transition",
-            timestamp=datetime.now().timestamp() * 1000,
-            room=self.room,
-            medium_type=self._get_medium_type(),
-            data={
+        self._record(
+            "phase_transition",
+            {
                 "fromPhase": from_phase,
                 "toPhase": to_phase,
                 "trigger": data.get("trigger", "unknown"),
@@ -139,13 +148,11 @@ class OGBAIDataBridge:
                 "irrigationCount": self.daily_irrigation_count,
             },
         )
-
-        self.event_buffer.append(event)
         self.current_phase = to_phase
 
         # Reset cycle tracking on P0 start
         if to_phase == "p0":
-            self.cycle_start_time = datetime.now().timestamp() * 1000
+            self.cycle_start_time = self.clock() * 1000
             self.daily_irrigation_count = 0
 
         _LOGGER.debug(
@@ -157,17 +164,14 @@ class OGBAIDataBridge:
         if data.get("room") != self.room:
             return
 
-        now = datetime.now().timestamp() * 1000
+        now = self.clock() * 1000
         time_since_last = None
         if self.last_irrigation_time:
             time_since_last = now - self.last_irrigation_time
 
-        event = CropSteeringEvent(
-            event_type="irrigation",
-            timestamp=now,
-            room=self.room,
-            medium_type=self._get_medium_type(),
-            data={
+        self._record(
+            "irrigation",
+            {
                 "phase": self.current_phase,
                 "shotNumber": data.get("shot_number", self.daily_irrigation_count + 1),
                 "duration": data.get("duration", 0),
@@ -182,9 +186,8 @@ class OGBAIDataBridge:
                 "isEmergency": data.get("is_emergency", False),
                 "timeSinceLastIrrigation": time_since_last,
             },
+            timestamp=now,
         )
-
-        self.event_buffer.append(event)
         self.last_irrigation_time = now
         self.daily_irrigation_count += 1
 
@@ -204,7 +207,7 @@ class OGBAIDataBridge:
         # Add to sensor buffer
         self.sensor_buffer.append(
             {
-                "timestamp": datetime.now().timestamp() * 1000,
+                "timestamp": self.clock() * 1000,
                 "vwc": data.get("vwc"),
                 "ec": data.get("ec"),
                 "poreEC": data.get("pore_ec"),
@@ -218,15 +221,12 @@ class OGBAIDataBridge:
             time_since_irrigation = None
             if self.last_irrigation_time:
                 time_since_irrigation = (
-                    datetime.now().timestamp() * 1000 - self.last_irrigation_time
+                    self.clock() * 1000 - self.last_irrigation_time
                 )
 
-            event = CropSteeringEvent(
-                event_type="sensor_reading",
-                timestamp=datetime.now().timestamp() * 1000,
-                room=self.room,
-                medium_type=self._get_medium_type(),
-                data={
+            self._record(
+                "sensor_reading",
+                {
                     "phase": self.current_phase,
                     "vwc": data.get("vwc"),
                     "vwcRaw": data.get("vwc_raw"),
@@ -247,19 +247,14 @@ class OGBAIDataBridge:
                 },
             )
 
-            self.event_buffer.append(event)
-
     async def _on_dryback_complete(self, data: Dict[str, Any]):
         """Handle dryback cycle completion"""
         if data.get("room") != self.room:
             return
 
-        event = CropSteeringEvent(
-            event_type="dryback_cycle",
-            timestamp=datetime.now().timestamp() * 1000,
-            room=self.room,
-            medium_type=self._get_medium_type(),
-            data={
+        self._record(
+            "dryback_cycle",
+            {
                 "startTime": data.get("start_time"),
                 "endTime": data.get("end_time"),
                 "duration": data.get("duration"),
@@ -279,8 +274,6 @@ class OGBAIDataBridge:
             },
         )
 
-        self.event_buffer.append(event)
-
         _LOGGER.debug(f"{self.room} - AI logged dryback cycle complete")
 
     async def _on_performance_metric(self, data: Dict[str, Any]):
@@ -288,12 +281,9 @@ class OGBAIDataBridge:
         if data.get("room") != self.room:
             return
 
-        event = CropSteeringEvent(
-            event_type="performance",
-            timestamp=datetime.now().timestamp() * 1000,
-            room=self.room,
-            medium_type=self._get_medium_type(),
-            data={
+        self._record(
+            "performance",
+            {
                 "phase": self.current_phase,
                 "vwcAccuracy": data.get("vwc_accuracy"),
                 "vwcStability": data.get("vwc_stability"),
@@ -307,66 +297,128 @@ class OGBAIDataBridge:
             },
         )
 
-        self.event_buffer.append(event)
-
     # ==================== DATA TRANSMISSION ====================
 
+    def _record(self, event_type: str, data: Dict[str, Any], timestamp: Optional[float] = None):
+        """Append one event to the columnar batch of its type"""
+        batch = self.batches.get(event_type)
+        if batch is None:
+            if not self.batches:
+                # Nothing was pending: let the flush loop arm the age deadline
+                self._flush_wakeup.set()
+            batch = self.batches[event_type] = ColumnarBatch(event_type, self.room, self.clock())
+        batch.append(
+            self.clock() * 1000 if timestamp is None else timestamp,
+            self._get_medium_type(),
+            data,
+        )
+        self.pending_events += 1
+        if self.pending_events >= self.max_batch_events:
+            self._flush_wakeup.set()
+
+    def _next_flush_delay(self) -> Optional[float]:
+        """Seconds until the oldest batch is due, None when nothing is pending"""
+        if self.batches:
+            oldest = min(batch.created for batch in self.batches.values())
+            return max(0.0, oldest + self.max_batch_age - self.clock())
+        if self.spill.events:
+            return self.retry_interval
+        return None
+
     async def _periodic_flush(self):
-        """Periodically flush buffered events to API"""
+        """Flush batches when they are full (size) or old enough (age)"""
         while self._is_enabled:
             try:
-                await asyncio.sleep(self.flush_interval)
-                await self._flush_buffer()
+                delay = self._next_flush_delay()
+                if delay is None or delay > 0:
+                    try:
+                        await asyncio.wait_for(self._flush_wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        delay = 0
+                self._flush_wakeup.clear()
+                if delay == 0 or self.pending_events >= self.max_batch_events:
+                    await self._flush_buffer()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 _LOGGER.error(f"{self.room} - Error in periodic flush: {e}")
 
-    async def _flush_buffer(self):
-        """Flush buffered events to the API"""
-        if not self.event_buffer:
-            return
-
-        # Convert events to dictionaries
-        events_to_send = []
-        while self.event_buffer and len(events_to_send) < 100:
-            event = self.event_buffer.popleft()
-            events_to_send.append(asdict(event))
-
-        if not events_to_send:
-            return
-
-        try:
-            await self._send_to_api(
-                {
-                    "type": "cropsteering_events",
-                    "room": self.room,
-                    "events": events_to_send,
-                    "timestamp": datetime.now().timestamp() * 1000,
-                }
-            )
+    def _seal_batches(self) -> List[Tuple[int, bytes]]:
+        """Encode and clear all pending batches, oldest first"""
+        batches = sorted(self.batches.values(), key=lambda batch: batch.created)
+        self.batches = {}
+        self.pending_events = 0
+        return [(batch.count, batch.encode()) for batch in batches]
 
+    async def _flush_buffer(self):
+        """Send spilled batches oldest-first, then the pending ones; spill what fails"""
+        sealed = self._seal_batches()
+
+        if self.spill.events:
+            spilled = await asyncio.to_thread(self.spill.read)
+            sent = 0
+            for count, blob in spilled:
+                if not await self._send_batch(count, blob):
+                    break
+                sent += 1
+            if sent:
+                await asyncio.to_thread(self.spill.replace, spilled[sent:])
+                _LOGGER.debug(f"{self.room} - Sent {sent} spilled AI batches after reconnect")
+            if sent < len(spilled):
+                # Still offline: keep the order by queueing new batches behind the old ones
+                await self._spill(sealed)
+                return
+
+        for index, (count, blob) in enumerate(sealed):
+            if not await self._send_batch(count, blob):
+                await self._spill(sealed[index:])
+                return
+
+    async def _spill(self, sealed: List[Tuple[int, bytes]]):
+        for count, blob in sealed:
+            await asyncio.to_thread(self.spill.append, count, blob)
+        if sealed:
             _LOGGER.debug(
-                f"{self.room} - Flushed {len(events_to_send)} AI events to API"
+                f"{self.room} - AI API unreachable, spilled {sum(count for count, _ in sealed)} events "
+                f"({self.spill.events} waiting)"
             )
 
-        except Exception as e:
-            _LOGGER.error(f"{self.room} - Failed to send AI events to API: {e}")
-            # Re-add events to buffer (at front) for retry
-            for event_dict in reversed(events_to_send):
-                event = CropSteeringEvent(**event_dict)
-                self.event_buffer.appendleft(event)
-
-    async def _send_to_api(self, data: Dict[str, Any]):
-        """Send data to the ogb-grow-api via WebSocket"""
+    async def _send_batch(self, count: int, blob: bytes) -> bool:
+        sent = await self._send_to_api(
+            {
+                "type": "cropsteering_batch",
+                "room": self.room,
+                "encoding": BATCH_ENCODING,
+                "events": count,
+                "batch": base64.b64encode(blob).decode("ascii"),
+                "timestamp": self.clock() * 1000,
+            }
+        )
+        if sent:
+            self.events_sent += count
+            self.bytes_sent += len(blob)
+        return sent
+
+    def _transport(self):
         if self.websocket_manager:
-            try:
-                await self.websocket_manager.emit("ai_cropsteering_data", data)
-            except Exception as e:
-                _LOGGER.warning(f"{self.room} - WebSocket send failed: {e}")
-        else:
-            # Emit to eventManager for alternative handling
-            await self.event_manager.emit("AICropSteeringData", data)
+            return self.websocket_manager
+        return getattr(self.prem_manager, "ogb_ws", None)
+
+    async def _send_to_api(self, data: Dict[str, Any]) -> bool:
+        """Send data to the ogb-grow-api via WebSocket, False if it did not go out"""
+        client = self._transport()
+        if client is None:
+            # Not logged in (yet) - keep the batch for the spill file
+            return False
+        is_connected = getattr(client, "is_connected", None)
+        if callable(is_connected) and not is_connected():
+            return False
+        try:
+            send = getattr(client, "prem_event", None) or client.emit
+            return await send("ai_cropsteering_data", data) is not False
+        except Exception as e:
+            _LOGGER.warning(f"{self.room} - WebSocket send failed: {e}")
+            return False
 
     # ==================== AI RECOMMENDATIONS ====================
 
@@ -376,7 +428,7 @@ class OGBAIDataBridge:
         These can be applied to the cropsteering manager.
         """
         self.ai_recommendations = recommendations
-        self.last_optimization_time = datetime.now().timestamp() * 1000
+        self.last_optimization_time = self.clock() * 1000
 
         _LOGGER.debug(
             f"{self.room} - Received AI recommendations: {list(recommendations.keys())}"
@@ -428,22 +480,21 @@ class OGBAIDataBridge:
         Call this after irrigation settling to update the last irrigation event
         with post-irrigation sensor data.
         """
-        if not self.event_buffer:
+        batch = self.batches.get("irrigation")
+        if batch is None or not batch.count:
             return
 
-        # Find the most recent irrigation event and update it
-        for i in range(len(self.event_buffer) - 1, -1, -1):
-            event = self.event_buffer[i]
-            if event.event_type == "irrigation":
-                event.data["postVWC"] = post_vwc
-                event.data["postEC"] = post_ec
-                event.data["postPoreEC"] = post_pore_ec
-                event.data["settlingTime"] = (
-                    datetime.now().timestamp() * 1000 - event.timestamp
-                )
-                event.data["vwcIncrease"] = post_vwc - (event.data.get("preVWC") or 0)
-                event.data["ecChange"] = post_ec - (event.data.get("preEC") or 0)
-                break
+        # Update the most recent irrigation event that has not been sent yet
+        batch.update_last(
+            {
+                "postVWC": post_vwc,
+                "postEC": post_ec,
+                "postPoreEC": post_pore_ec,
+                "settlingTime": self.clock() * 1000 - batch.timestamps[-1],
+                "vwcIncrease": post_vwc - (batch.last("preVWC") or 0),
+                "ecChange": post_ec - (batch.last("preEC") or 0),
+            }
+        )
 
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the AI data bridge"""
@@ -451,7 +502,11 @@ class OGBAIDataBridge:
             "enabled": self._is_enabled,
             "room": self.room,
             "current_phase": self.current_phase,
-            "events_buffered": len(self.event_buffer),
+            "events_buffered": self.pending_events,
+            "events_spilled": self.spill.events,
+            "events_dropped": self.spill.dropped_events,
+            "events_sent": self.events_sent,
+            "bytes_sent": self.bytes_sent,
             "daily_irrigation_count": self.daily_irrigation_count,
             "last_irrigation_time": self.last_irrigation_time,
             "last_vwc": self.last_vwc,
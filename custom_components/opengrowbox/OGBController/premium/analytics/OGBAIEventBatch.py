@@ -0,0 +1,246 @@
+"""
+OpenGrowBox AI Event Batches
+
+Columnar, offline-tolerant transport for the AI data bridge:
+
+- events of one type are accumulated as columns (one list per field plus a
+  timestamp column) instead of one dict per event, so field names, room and
+  medium type are sent once per batch instead of once per event,
+- string values (medium type, phase, trigger, ...) are dictionary-encoded
+  into a per-batch string table, timestamps are sent as millisecond deltas,
+- a sealed batch is encoded as compact JSON and zlib-compressed, and goes
+  on the wire as base64 text (the premium client JSON-encodes its payloads),
+- while the API is unreachable, sealed batches are appended to a bounded
+  segment file (``SpillFile``) and sent oldest-first once it is back; when
+  the file is full the oldest segments are dropped and counted.
+"""
+
+import base64
+import json
+import logging
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson  # pragma: no cover - optional speedup
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_VERSION = 1
+BATCH_ENCODING = "base64+zlib+json"
+MEDIUM_COLUMN = "_medium"
+COMPRESS_LEVEL = 6
+DEFAULT_SPILL_BYTES = 4 * 1024 * 1024
+
+# Segment record header: payload length, number of events in the batch
+_RECORD = struct.Struct(">II")
+
+
+def _dumps(doc: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(doc, default=str)
+    return json.dumps(doc, separators=(",", ":"), default=str).encode()
+
+
+class ColumnarBatch:
+    """Events of one type for one room, stored column by column."""
+
+    __slots__ = ("event_type", "room", "timestamps", "columns", "count", "created")
+
+    def __init__(self, event_type: str, room: str, created: float):
+        self.event_type = event_type
+        self.room = room
+        self.timestamps: List[int] = []
+        self.columns: Dict[str, List[Any]] = {MEDIUM_COLUMN: []}
+        self.count = 0
+        # Clock time of the first event, drives the age-based flush
+        self.created = created
+
+    def append(self, timestamp_ms: float, medium_type: str, data: Dict[str, Any]):
+        row = self.count
+        self.timestamps.append(int(round(timestamp_ms)))
+        self.columns[MEDIUM_COLUMN].append(medium_type)
+        for key, value in data.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * row
+            column.append(value)
+        self.count = row + 1
+        for column in self.columns.values():
+            if len(column) < self.count:
+                column.append(None)
+
+    def last(self, key: str) -> Any:
+        column = self.columns.get(key)
+        return column[-1] if column else None
+
+    def update_last(self, values: Dict[str, Any]):
+        """Set fields on the most recent event (new fields are padded with None)."""
+        if not self.count:
+            return
+        for key, value in values.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.count
+            column[-1] = value
+
+    def to_doc(self) -> Dict[str, Any]:
+        strings: Dict[str, int] = {}
+        encoded: List[str] = []
+        columns: Dict[str, List[Any]] = {}
+        for key, column in self.columns.items():
+            if all(value is None or type(value) is str for value in column):
+                columns[key] = [None if value is None else strings.setdefault(value, len(strings)) for value in column]
+                encoded.append(key)
+            else:
+                columns[key] = column
+
+        timestamps = self.timestamps
+        deltas = [timestamps[i] - timestamps[i - 1] for i in range(1, len(timestamps))]
+        return {
+            "v": BATCH_VERSION,
+            "type": self.event_type,
+            "room": self.room,
+            "n": self.count,
+            "t0": timestamps[0] if timestamps else 0,
+            "dt": deltas,
+            "strings": list(strings),
+            "dict": encoded,
+            "cols": columns,
+        }
+
+    def encode(self) -> bytes:
+        return zlib.compress(_dumps(self.to_doc()), COMPRESS_LEVEL)
+
+
+def decode_batch(blob) -> List[Dict[str, Any]]:
+    """Expand an encoded batch (bytes or its base64 text) back into per-event dicts."""
+    if isinstance(blob, str):
+        blob = base64.b64decode(blob)
+    doc = json.loads(zlib.decompress(blob))
+    strings = doc["strings"]
+    columns = dict(doc["cols"])
+    for key in doc["dict"]:
+        columns[key] = [None if index is None else strings[index] for index in columns[key]]
+
+    timestamp = doc["t0"]
+    timestamps = [timestamp]
+    for delta in doc["dt"]:
+        timestamp += delta
+        timestamps.append(timestamp)
+
+    mediums = columns.pop(MEDIUM_COLUMN)
+    return [
+        {
+            "event_type": doc["type"],
+            "timestamp": float(timestamps[row]),
+            "room": doc["room"],
+            "medium_type": mediums[row],
+            "data": {key: column[row] for key, column in columns.items()},
+        }
+        for row in range(doc["n"])
+    ]
+
+
+class SpillFile:
+    """
+    Bounded append-only segment file for batches that could not be sent.
+
+    Each record is ``>II`` (payload length, event count) followed by the
+    encoded batch. Without a path the records are kept in memory with the
+    same bound. All methods do blocking I/O; run them in an executor.
+    """
+
+    def __init__(self, path: Optional[str], max_bytes: int = DEFAULT_SPILL_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.events = 0
+        self.dropped_batches = 0
+        self.dropped_events = 0
+        self._memory: Optional[List[Tuple[int, bytes]]] = None if path else []
+        self._loaded = path is None
+
+    def load(self):
+        """Pick up records left over from before a restart."""
+        if self._loaded:
+            return
+        self._loaded = True
+        records = self.read()
+        self.size = sum(_RECORD.size + len(blob) for _, blob in records)
+        self.events = sum(count for count, _ in records)
+
+    def read(self) -> List[Tuple[int, bytes]]:
+        """All records, oldest first."""
+        if self._memory is not None:
+            return list(self._memory)
+        try:
+            with open(self.path, "rb") as handle:
+                raw = handle.read()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        offset = 0
+        while offset + _RECORD.size <= len(raw):
+            length, count = _RECORD.unpack_from(raw, offset)
+            start = offset + _RECORD.size
+            if start + length > len(raw):
+                _LOGGER.warning(f"Truncated AI spill segment in {self.path}, discarding the tail")
+                break
+            records.append((count, raw[start:start + length]))
+            offset = start + length
+        return records
+
+    def append(self, count: int, blob: bytes):
+        self.load()
+        needed = _RECORD.size + len(blob)
+        if needed > self.max_bytes:
+            self._drop(1, count)
+            return
+        if self.size + needed > self.max_bytes:
+            records = self.read()
+            while records and self.size + needed > self.max_bytes:
+                old_count, old_blob = records.pop(0)
+                self.size -= _RECORD.size + len(old_blob)
+                self.events -= old_count
+                self._drop(1, old_count)
+            self._write(records)
+
+        if self._memory is not None:
+            self._memory.append((count, blob))
+        else:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "ab") as handle:
+                handle.write(_RECORD.pack(len(blob), count) + blob)
+        self.size += needed
+        self.events += count
+
+    def replace(self, records: List[Tuple[int, bytes]]):
+        """Keep only ``records`` (the ones still unsent)."""
+        self._write(records)
+        self.size = sum(_RECORD.size + len(blob) for _, blob in records)
+        self.events = sum(count for count, _ in records)
+
+    def _write(self, records: List[Tuple[int, bytes]]):
+        if self._memory is not None:
+            self._memory[:] = records
+            return
+        if not records:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            for count, blob in records:
+                handle.write(_RECORD.pack(len(blob), count) + blob)
+        os.replace(tmp_path, self.path)
+
+    def _drop(self, batches: int, events: int):
+        self.dropped_batches += batches
+        self.dropped_events += events
+        _LOGGER.warning(f"AI spill file full, dropped {events} oldest events")
@@ -0,0 +1,315 @@
+"""
+OpenGrowBox Premium Compliance Engine
+
+Streaming evaluation of compliance rules over the live sensor values:
+
+- rules come from a declarative table (``COMPLIANCE_RULES``) and are compiled
+  once into threshold checks grouped by sensor,
+- every sample is held until the next one; the time a rule spends in
+  violation, the number of excursions and the largest deviation are
+  accumulated per rule and day in constant memory (no history is kept),
+- closed days are stored as compact summaries
+  (``{"YYYY-MM-DD": {"o": observed_s, "r": {rule: [violation_s, excursions, max_dev]}}}``)
+  so a 7 or 30 day report is a sum over at most 30 small dicts.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# Regulatory limits (examples, same values as the former point checks)
+COMPLIANCE_RULES: Tuple[Dict[str, Any], ...] = (
+    {
+        "id": "temperature_max",
+        "sensor": "temperature",
+        "above": 30,
+        "severity": "warning",
+        "message": "Temperature {value}°C exceeds regulatory limit of {limit}°C",
+    },
+    {
+        "id": "temperature_min",
+        "sensor": "temperature",
+        "below": 15,
+        "severity": "critical",
+        "message": "Temperature {value}°C below regulatory minimum of {limit}°C",
+    },
+    {
+        "id": "humidity_max",
+        "sensor": "humidity",
+        "above": 80,
+        "severity": "warning",
+        "message": "Humidity {value}% exceeds regulatory limit of {limit}%",
+    },
+    {
+        "id": "vpd_max",
+        "sensor": "vpd",
+        "above": 1.6,
+        "severity": "critical",
+        "message": "VPD {value} kPa exceeds regulatory limit of {limit} kPa",
+    },
+)
+
+# A gap longer than this between two samples is not credited to any rule
+MAX_SAMPLE_GAP = 900.0
+RETENTION_DAYS = 90
+
+
+class ComplianceRule:
+    """One compiled threshold check."""
+
+    __slots__ = ("id", "sensor", "limit", "above", "severity", "message")
+
+    def __init__(self, rule_id: str, sensor: str, limit: float, above: bool, severity: str, message: str):
+        self.id = rule_id
+        self.sensor = sensor
+        self.limit = limit
+        self.above = above
+        self.severity = severity
+        self.message = message
+
+    @classmethod
+    def compile(cls, spec: Dict[str, Any]) -> "ComplianceRule":
+        above = "above" in spec
+        if above == ("below" in spec):
+            raise ValueError(f"Compliance rule {spec.get('id')} needs exactly one of 'above'/'below'")
+        return cls(
+            spec["id"],
+            spec["sensor"],
+            float(spec["above"] if above else spec["below"]),
+            above,
+            spec.get("severity", "warning"),
+            spec.get("message", "{sensor} {value} outside limit {limit}"),
+        )
+
+    def deviation(self, value: float) -> float:
+        """Amount beyond the limit (> 0 means violated)."""
+        return value - self.limit if self.above else self.limit - value
+
+    def violation(self, value) -> Dict[str, Any]:
+        limit = int(self.limit) if self.limit.is_integer() else self.limit
+        return {
+            "type": self.sensor,
+            "rule": self.id,
+            "severity": self.severity,
+            "value": value,
+            "limit": limit,
+            "message": self.message.format(sensor=self.sensor, value=value, limit=limit),
+        }
+
+
+class RuleAccumulator:
+    """Running totals of one rule for the current day."""
+
+    __slots__ = ("violation_seconds", "excursions", "max_deviation", "active", "last_value")
+
+    def __init__(self):
+        self.violation_seconds = 0.0
+        self.excursions = 0
+        self.max_deviation = 0.0
+        self.active = False
+        self.last_value: Optional[float] = None
+
+    def to_list(self) -> List[float]:
+        return [round(self.violation_seconds, 1), self.excursions, round(self.max_deviation, 3)]
+
+
+class ComplianceEngine:
+    """Constant-memory compliance accounting over a stream of sensor samples."""
+
+    # Wall clock: day boundaries and persisted summaries use local dates
+    clock = staticmethod(time.time)
+
+    def __init__(
+        self,
+        rules: Optional[Iterable[Dict[str, Any]]] = None,
+        daily: Optional[Dict[str, Any]] = None,
+        max_gap: float = MAX_SAMPLE_GAP,
+        retention_days: int = RETENTION_DAYS,
+    ):
+        self.rules = [ComplianceRule.compile(spec) for spec in (rules or COMPLIANCE_RULES)]
+        self.rules_by_sensor: Dict[str, Tuple[ComplianceRule, ...]] = {}
+        for rule in self.rules:
+            self.rules_by_sensor[rule.sensor] = self.rules_by_sensor.get(rule.sensor, ()) + (rule,)
+        self.max_gap = max_gap
+        self.retention_days = retention_days
+
+        self.daily: Dict[str, Any] = daily if isinstance(daily, dict) else {}
+        self.acc: Dict[str, RuleAccumulator] = {rule.id: RuleAccumulator() for rule in self.rules}
+        self.observed_seconds = 0.0
+        self.samples = 0
+        self._last_ts: Optional[float] = None
+        self._day: Optional[str] = None
+        self._day_end = 0.0
+
+    # -----------------------------------------------------------------
+    # Streaming
+    # -----------------------------------------------------------------
+
+    def observe(self, sample: Dict[str, Any], ts: Optional[float] = None) -> bool:
+        """Feed one snapshot of sensor values; returns True if a day was closed."""
+        ts = self.clock() if ts is None else ts
+        closed = False
+        if self._day is None:
+            self._start_day(ts)
+        elif self._last_ts is not None and ts > self._last_ts:
+            # Credit the held values up to this sample, split at midnight
+            while ts >= self._day_end:
+                self._credit(self._day_end)
+                self._close_day()
+                self._start_day(self._day_end)
+                closed = True
+            self._credit(ts)
+        self._last_ts = ts if self._last_ts is None else max(ts, self._last_ts)
+
+        for sensor, rules in self.rules_by_sensor.items():
+            value = sample.get(sensor)
+            if value is None:
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            for rule in rules:
+                acc = self.acc[rule.id]
+                deviation = rule.deviation(value)
+                acc.last_value = value
+                if deviation > 0:
+                    if not acc.active:
+                        acc.active = True
+                        acc.excursions += 1
+                    if deviation > acc.max_deviation:
+                        acc.max_deviation = deviation
+                else:
+                    acc.active = False
+        self.samples += 1
+        return closed
+
+    def _credit(self, until: float):
+        seconds = until - self._last_ts
+        self._last_ts = until
+        if seconds <= 0 or seconds > self.max_gap:
+            return
+        self.observed_seconds += seconds
+        for acc in self.acc.values():
+            if acc.active:
+                acc.violation_seconds += seconds
+
+    def _start_day(self, ts: float):
+        start = datetime.fromtimestamp(ts)
+        self._day = start.date().isoformat()
+        midnight = datetime.combine(start.date() + timedelta(days=1), datetime.min.time())
+        self._day_end = midnight.timestamp()
+        self._seed_from_summary(self.daily.get(self._day))
+
+    def _seed_from_summary(self, summary: Optional[Dict[str, Any]]):
+        """Continue a day that was flushed before a restart."""
+        active = {rule_id: acc.active for rule_id, acc in self.acc.items()}
+        self.acc = {rule.id: RuleAccumulator() for rule in self.rules}
+        for rule_id, acc in self.acc.items():
+            acc.active = active.get(rule_id, False)
+        self.observed_seconds = 0.0
+        if not isinstance(summary, dict):
+            return
+        self.observed_seconds = float(summary.get("o", 0.0))
+        for rule_id, values in (summary.get("r") or {}).items():
+            acc = self.acc.get(rule_id)
+            if acc is None or not isinstance(values, list) or len(values) != 3:
+                continue
+            acc.violation_seconds, acc.excursions, acc.max_deviation = float(values[0]), int(values[1]), float(values[2])
+
+    def adopt_daily(self, daily: Dict[str, Any]):
+        """
+        Switch to another ledger dict, e.g. the one restored from the state
+        file after this engine was created. Days only known here are kept;
+        a day running in both is combined.
+        """
+        if daily is self.daily or not isinstance(daily, dict):
+            return
+        restored_today = daily.get(self._day) if self._day is not None else None
+        for day, summary in self.daily.items():
+            if day != self._day:
+                daily.setdefault(day, summary)
+        self.daily = daily
+        if not isinstance(restored_today, dict):
+            return
+        self.observed_seconds += float(restored_today.get("o", 0.0))
+        for rule_id, values in (restored_today.get("r") or {}).items():
+            acc = self.acc.get(rule_id)
+            if acc is None or not isinstance(values, list) or len(values) != 3:
+                continue
+            acc.violation_seconds += float(values[0])
+            acc.excursions += int(values[1])
+            acc.max_deviation = max(acc.max_deviation, float(values[2]))
+
+    def _summary(self) -> Dict[str, Any]:
+        return {
+            "o": round(self.observed_seconds, 1),
+            "r": {
+                rule_id: acc.to_list()
+                for rule_id, acc in self.acc.items()
+                if acc.violation_seconds or acc.excursions
+            },
+        }
+
+    def _close_day(self):
+        self.daily[self._day] = self._summary()
+        cutoff = (datetime.fromtimestamp(self._day_end) - timedelta(days=self.retention_days)).date().isoformat()
+        for day in [day for day in self.daily if day < cutoff]:
+            del self.daily[day]
+
+    def flush(self) -> Dict[str, Any]:
+        """Store the running day in ``daily`` (e.g. before a restart) and return ``daily``."""
+        if self._day is not None:
+            self.daily[self._day] = self._summary()
+        return self.daily
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+
+    def active_violations(self) -> List[Dict[str, Any]]:
+        return [rule.violation(self.acc[rule.id].last_value) for rule in self.rules if self.acc[rule.id].active]
+
+    def report(self, days: int = 7, now: Optional[float] = None) -> Dict[str, Any]:
+        """Totals per rule over the last ``days`` days including today."""
+        now = self.clock() if now is None else now
+        today = datetime.fromtimestamp(now).date()
+        first_day = (today - timedelta(days=max(1, days) - 1)).isoformat()
+        today_key = today.isoformat()
+
+        totals = {rule.id: [0.0, 0, 0.0] for rule in self.rules}
+        observed = 0.0
+        covered = 0
+        summaries = [summary for day, summary in self.daily.items() if first_day <= day < today_key]
+        if self._day == today_key:
+            summaries.append(self._summary())
+        elif today_key in self.daily:
+            summaries.append(self.daily[today_key])
+
+        for summary in summaries:
+            covered += 1
+            observed += float(summary.get("o", 0.0))
+            for rule_id, values in (summary.get("r") or {}).items():
+                total = totals.get(rule_id)
+                if total is None:
+                    continue
+                total[0] += values[0]
+                total[1] += values[1]
+                total[2] = max(total[2], values[2])
+
+        rules = {}
+        for rule in self.rules:
+            seconds, excursions, max_deviation = totals[rule.id]
+            rules[rule.id] = {
+                "sensor": rule.sensor,
+                "severity": rule.severity,
+                "limit": rule.limit,
+                "violation_seconds": round(seconds, 1),
+                "excursions": excursions,
+                "max_deviation": round(max_deviation, 3),
+                "time_in_violation_percent": round(seconds / observed * 100, 2) if observed else 0.0,
+            }
+        return {"days_covered": covered, "observed_seconds": round(observed, 1), "rules": rules}
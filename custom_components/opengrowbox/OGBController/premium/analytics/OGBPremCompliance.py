@@ -4,12 +4,18 @@ OpenGrowBox Premium Compliance Module
 Handles regulatory compliance checking, violation tracking, and reporting.
 Provides methods for compliance status monitoring, alert generation,
 and compliance documentation.
+
+Live sensor values are streamed into an OGBComplianceEngine (``observe``),
+which keeps time-in-violation, excursions and max deviation per rule and
+day; reports over a range are served from its daily summaries.
 """
 
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+
+from .OGBComplianceEngine import ComplianceEngine
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,13 +32,23 @@ class OGBPremCompliance:
     - Compliance documentation
     """
 
-    def __init__(self, api_proxy=None, cache=None):
+    DAILY_KEY = "complianceDaily"
+
+    def __init__(
+        self,
+        api_proxy=None,
+        cache=None,
+        data_store=None,
+        rules: Optional[Iterable[Dict[str, Any]]] = None,
+    ):
         """
         Initialize compliance module.
 
         Args:
             api_proxy: API proxy for backend communication
             cache: Cache instance for data storage
+            data_store: Room data store holding the persisted daily summaries
+            rules: Optional rule table (defaults to COMPLIANCE_RULES)
         """
         self.api_proxy = api_proxy
         self.cache = cache
@@ -48,6 +64,69 @@ class OGBPremCompliance:
         self._compliance_data = {}
         self._violations = []
 
+        # Streaming engine; its daily summaries live in the data store
+        self.data_store = data_store
+        daily = data_store.get(self.DAILY_KEY) if data_store else None
+        if not isinstance(daily, dict):
+            daily = {}
+            if data_store:
+                data_store.set(self.DAILY_KEY, daily)
+        self.engine = ComplianceEngine(rules=rules, daily=daily)
+
+    def observe(self, sensor_data: Dict[str, Any], ts: Optional[float] = None) -> bool:
+        """
+        Stream a snapshot of live sensor values into the compliance engine.
+
+        Returns:
+            True if a day was closed (its summary should be saved)
+        """
+        try:
+            self._sync_daily()
+            return self.engine.observe(sensor_data, ts)
+        except Exception as e:
+            _LOGGER.error(f"Error observing compliance sample: {e}")
+            return False
+
+    def flush(self):
+        """Write the running day into the persisted daily summaries."""
+        self._sync_daily()
+        self.engine.flush()
+
+    def _sync_daily(self):
+        """
+        Follow the ledger held by the data store. Loading the state file
+        replaces it (``data_store.set``) after this module was created.
+        """
+        if self.data_store is None:
+            return
+        daily = self.data_store.get(self.DAILY_KEY)
+        if daily is self.engine.daily:
+            return
+        if isinstance(daily, dict):
+            self.engine.adopt_daily(daily)
+        else:
+            self.data_store.set(self.DAILY_KEY, self.engine.daily)
+
+    def _local_status(self) -> Dict[str, Any]:
+        violations = self.engine.active_violations()
+        return {
+            "overall_status": self._overall_status(violations) if self.engine.samples else "unknown",
+            "violations_count": len(violations),
+            "violations": violations,
+            "last_check": datetime.now().isoformat(),
+            "source": "local",
+        }
+
+    @staticmethod
+    def _overall_status(violations: List[Dict[str, Any]]) -> str:
+        if any(v["severity"] == "critical" for v in violations):
+            return "critical"
+        if any(v["severity"] == "warning" for v in violations):
+            return "warning"
+        if violations:
+            return "minor"
+        return "compliant"
+
     async def get_compliance_status(self) -> Dict[str, Any]:
         """
         Get current compliance status.
@@ -77,6 +156,9 @@ class OGBPremCompliance:
 
                     return data
 
+            if self.engine.samples:
+                return self._local_status()
+
             return {
                 "overall_status": "unknown",
                 "violations_count": 0,
@@ -125,68 +207,15 @@ class OGBPremCompliance:
 
         try:
             violations = []
+            for sensor, rules in self.engine.rules_by_sensor.items():
+                value = sensor_data.get(sensor)
+                if value is None:
+                    continue
+                for rule in rules:
+                    if rule.deviation(value) > 0:
+                        violations.append(rule.violation(value))
 
-            # Check temperature compliance (example regulation)
-            if "temperature" in sensor_data:
-                temp = sensor_data["temperature"]
-                if temp > 30:  # Example: max temp regulation
-                    violations.append(
-                        {
-                            "type": "temperature",
-                            "severity": "warning",
-                            "value": temp,
-                            "limit": 30,
-                            "message": f"Temperature {temp}°C exceeds regulatory limit of 30°C",
-                        }
-                    )
-                elif temp < 15:  # Example: min temp regulation
-                    violations.append(
-                        {
-                            "type": "temperature",
-                            "severity": "critical",
-                            "value": temp,
-                            "limit": 15,
-                            "message": f"Temperature {temp}°C below regulatory minimum of 15°C",
-                        }
-                    )
-
-            # Check humidity compliance
-            if "humidity" in sensor_data:
-                humidity = sensor_data["humidity"]
-                if humidity > 80:  # Example: max humidity regulation
-                    violations.append(
-                        {
-                            "type": "humidity",
-                            "severity": "warning",
-                            "value": humidity,
-                            "limit": 80,
-                            "message": f"Humidity {humidity}% exceeds regulatory limit of 80%",
-                        }
-                    )
-
-            # Check VPD compliance
-            if "vpd" in sensor_data:
-                vpd = sensor_data["vpd"]
-                if vpd > 1.6:  # Example: max VPD regulation
-                    violations.append(
-                        {
-                            "type": "vpd",
-                            "severity": "critical",
-                            "value": vpd,
-                            "limit": 1.6,
-                            "message": f"VPD {vpd} kPa exceeds regulatory limit of 1.6 kPa",
-                        }
-                    )
-
-            # Determine overall status
-            if any(v["severity"] == "critical" for v in violations):
-                overall_status = "critical"
-            elif any(v["severity"] == "warning" for v in violations):
-                overall_status = "warning"
-            elif violations:
-                overall_status = "minor"
-            else:
-                overall_status = "compliant"
+            overall_status = self._overall_status(violations)
 
             return {
                 "overall_status": overall_status,
@@ -246,6 +275,9 @@ class OGBPremCompliance:
         """
         Generate compliance report for the specified period.
 
+        Violation counts combine received alerts with the excursions the
+        local engine saw; per-rule totals come from its daily summaries.
+
         Args:
             days: Number of days to include in report
 
@@ -274,6 +306,16 @@ class OGBPremCompliance:
                 1 for v in recent_violations if v.get("severity") == "warning"
             )
 
+            # Excursions measured locally on the live sensor stream
+            self._sync_daily()
+            local = self.engine.report(days)
+            for rule in local["rules"].values():
+                total_violations += rule["excursions"]
+                if rule["severity"] == "critical":
+                    critical_count += rule["excursions"]
+                elif rule["severity"] == "warning":
+                    warning_count += rule["excursions"]
+
             # Group by type
             violations_by_type = {}
             for violation in recent_violations:
@@ -288,6 +330,9 @@ class OGBPremCompliance:
                 "critical_violations": critical_count,
                 "warning_violations": warning_count,
                 "violations_by_type": violations_by_type,
+                "rules": local["rules"],
+                "observed_seconds": local["observed_seconds"],
+                "days_covered": local["days_covered"],
                 "generated_at": datetime.now().isoformat(),
                 "compliance_score": self._calculate_compliance_score(
                     total_violations, critical_count, warning_count
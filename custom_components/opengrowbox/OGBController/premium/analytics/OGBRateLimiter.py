@@ -17,13 +17,17 @@ Features:
 """
 
 import logging
+import math
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
-from collections import deque
 from dataclasses import dataclass
 
 _LOGGER = logging.getLogger(__name__)
 
+# Float tolerance when turning the theoretical arrival time into a count
+_EPSILON = 1e-9
+
 
 @dataclass
 class RateLimit:
@@ -35,9 +39,32 @@ class RateLimit:
     soft_limit_percent: int = 80  # Warn at 80% usage
     hard_limit_percent: int = 100  # Block at 100% usage
 
+    @property
+    def emission_interval(self) -> float:
+        """Seconds of budget one request uses (the window spread over the limit)"""
+        return self.window_seconds / self.max_requests
+
 
 class OGBRateLimiter:
-    """Rate limiting for all subscription tiers"""
+    """
+    Rate limiting for all subscription tiers.
+
+    Uses the generic cell rate algorithm (GCRA): per operation only the
+    theoretical arrival time (TAT) is stored, a float timestamp that moves
+    ``window / limit`` seconds forward per allowed request and never lags
+    behind now. ``TAT - now`` divided by that interval is the number of
+    requests currently counted against the window, so a check is O(1) and
+    memory is constant regardless of the limit size. Budget frees up
+    continuously (token bucket) instead of one request at a time when it
+    leaves a sliding window.
+    """
+
+    STATE_VERSION = 1
+    # Datastore key the TATs are mirrored to; OGBDSManager saves it with the state file
+    STATE_KEY = "rateLimiterState"
+
+    # Wall clock, so the state can be persisted across restarts
+    clock = staticmethod(time.time)
 
     # Rate limit configurations by tier and operation type
     RATE_LIMITS = {
@@ -63,7 +90,14 @@ class OGBRateLimiter:
         },
     }
 
-    def __init__(self, user_id: str, plan_name: str, room: str):
+    def __init__(
+        self,
+        user_id: str,
+        plan_name: str,
+        room: str,
+        state: Optional[Dict[str, Any]] = None,
+        data_store: Optional[Any] = None,
+    ):
         """
         Initialize rate limiter.
 
@@ -71,14 +105,18 @@ class OGBRateLimiter:
             user_id: User ID
             plan_name: Subscription plan
             room: Room identifier
+            state: Optional state from export_state() to continue after a restart
+            data_store: Optional datastore; the state is restored from and
+                mirrored to ``STATE_KEY`` so budgets survive a restart
         """
         self.user_id = user_id
+        self.data_store = data_store
         self.plan_name = plan_name
         self.room = room
 
-        # Request tracking (using deque for efficient FIFO)
-        self.request_history: Dict[str, deque] = {}
-        
+        # Theoretical arrival time per operation (epoch seconds)
+        self._tat: Dict[str, float] = {}
+
         # Warning tracking (to avoid spam)
         self.warnings_sent: Dict[str, datetime] = {}
         self.warning_cooldown = timedelta(minutes=15)  # Min time between warnings
@@ -86,6 +124,11 @@ class OGBRateLimiter:
         # Get limits for this tier
         self.limits = self.RATE_LIMITS.get(plan_name, self.RATE_LIMITS["free"])
 
+        if state is None and data_store is not None:
+            state = data_store.get(self.STATE_KEY)
+        if state:
+            self.restore_state(state)
+
         _LOGGER.debug(
             f"⏱️ Rate limiter initialized for {room} "
             f"(user: {user_id[:8]}, plan: {plan_name})"
@@ -121,29 +164,27 @@ class OGBRateLimiter:
                 "remaining": 999999,
                 "limit": 999999,
                 "reset_at": None,
+                "retry_after": 0.0,
                 "warning": False,
                 "usage_percent": 0.0,
             }
 
-        # Initialize history for this operation if needed
-        if operation_type not in self.request_history:
-            self.request_history[operation_type] = deque()
-
-        # Clean old requests outside window
-        self._clean_old_requests(operation_type, limit_config.window_seconds)
+        now = self.clock()
+        interval = limit_config.emission_interval
+        tat = max(self._tat.get(operation_type, now), now)
 
-        # Get current count
-        current_count = len(self.request_history[operation_type])
+        # Requests currently counted against the window
+        current_count = math.ceil((tat - now) / interval - _EPSILON)
 
         # Calculate usage
         usage_percent = (current_count / limit_config.max_requests) * 100
         remaining = max(0, limit_config.max_requests - current_count)
 
-        # Check hard limit
+        # Check hard limit: one more request must fit below the threshold
         hard_limit_threshold = int(
             limit_config.max_requests * (limit_config.hard_limit_percent / 100)
         )
-        allowed = current_count < hard_limit_threshold
+        allowed = tat + interval - now <= hard_limit_threshold * interval + _EPSILON
 
         # Check soft limit (warning)
         soft_limit_threshold = int(
@@ -151,12 +192,18 @@ class OGBRateLimiter:
         )
         warning = current_count >= soft_limit_threshold
 
-        # Calculate reset time
-        reset_at = self._get_reset_time(limit_config.window_seconds)
-
         # Increment if allowed and requested
         if allowed and increment:
-            self.request_history[operation_type].append(datetime.now(timezone.utc))
+            tat += interval
+            self._tat[operation_type] = tat
+            self._mirror_state()
+
+        # The window is empty again at the TAT; a blocked request fits again
+        # once enough budget has leaked out to go below the hard threshold
+        reset_at = datetime.fromtimestamp(tat, timezone.utc)
+        retry_after = 0.0
+        if not allowed:
+            retry_after = max(0.0, tat + interval - hard_limit_threshold * interval - now)
 
         # Send warning if needed
         if warning and not allowed:
@@ -167,7 +214,7 @@ class OGBRateLimiter:
             _LOGGER.warning(
                 f"⚠️ {self.room} Rate limit exceeded for {operation_type}: "
                 f"{current_count}/{limit_config.max_requests} "
-                f"(resets at {reset_at.isoformat()})"
+                f"(retry in {retry_after:.0f}s, resets at {reset_at.isoformat()})"
             )
 
         return {
@@ -175,27 +222,12 @@ class OGBRateLimiter:
             "remaining": remaining,
             "limit": limit_config.max_requests,
             "reset_at": reset_at,
+            "retry_after": round(retry_after, 3),
             "warning": warning,
             "usage_percent": round(usage_percent, 2),
             "window_type": limit_config.limit_type,
         }
 
-    def _clean_old_requests(self, operation_type: str, window_seconds: int):
-        """Remove requests older than the window"""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window_seconds)
-
-        history = self.request_history[operation_type]
-
-        # Remove old requests from the left side
-        while history and history[0] < cutoff:
-            history.popleft()
-
-    def _get_reset_time(self, window_seconds: int) -> datetime:
-        """Calculate when the rate limit will reset"""
-        now = datetime.now(timezone.utc)
-        return now + timedelta(seconds=window_seconds)
-
     def _send_limit_warning(
         self, operation_type: str, usage_percent: float, reset_at: datetime
     ):
@@ -225,10 +257,43 @@ class OGBRateLimiter:
 
     def reset_limit(self, operation_type: str):
         """Manually reset a rate limit (admin use)"""
-        if operation_type in self.request_history:
-            self.request_history[operation_type].clear()
+        if self._tat.pop(operation_type, None) is not None:
+            self._mirror_state()
             _LOGGER.debug(f"✅ {self.room} Reset rate limit for {operation_type}")
 
+    def _mirror_state(self):
+        """Mirror the TATs to the datastore; the next regular save writes them."""
+        if self.data_store is None:
+            return
+        try:
+            self.data_store.set(self.STATE_KEY, self.export_state())
+        except Exception as e:
+            _LOGGER.debug(f"{self.room}: Could not mirror rate limiter state: {e}")
+
+    def export_state(self) -> Dict[str, Any]:
+        """JSON-serializable limiter state (one timestamp per operation)"""
+        now = self.clock()
+        return {
+            "version": self.STATE_VERSION,
+            "tat": {op: round(tat, 3) for op, tat in self._tat.items() if tat > now},
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """Continue from export_state(); invalid or expired entries are ignored"""
+        if not isinstance(state, dict) or state.get("version") != self.STATE_VERSION:
+            return
+        now = self.clock()
+        for operation_type, tat in (state.get("tat") or {}).items():
+            limit_config = self.limits.get(operation_type)
+            try:
+                tat = float(tat)
+            except (TypeError, ValueError):
+                continue
+            if limit_config is None or not math.isfinite(tat) or tat <= now:
+                continue
+            # Never more than a full window in the future (clock jumps, plan downgrades)
+            self._tat[operation_type] = min(tat, now + limit_config.window_seconds)
+
     def get_summary(self) -> Dict[str, Any]:
         """Get comprehensive rate limit summary"""
         limits_status = self.get_all_limits_status()
@@ -287,6 +287,7 @@ class OGBFeatureManager:
         room: Optional[str] = None,
         hass: Optional[Any] = None,
         event_manager: Optional[Any] = None,
+        data_store: Optional[Any] = None,
     ):
         """
         Initialize feature manager with API integration for dynamic feature flags.
@@ -311,6 +312,7 @@ class OGBFeatureManager:
             room: Room identifier for analytics tracking
             hass: Home Assistant instance for events
             event_manager: Event manager for upgrade prompts
+            data_store: Datastore the rate limiter state is persisted in
         """
         self.subscription_data = subscription_data or {}
         self.tenant_id = tenant_id
@@ -346,7 +348,9 @@ class OGBFeatureManager:
                 self.usage_metrics = OGBUsageMetrics(
                     user_id, self.plan_name, room, tenant_id
                 )
-                self.rate_limiter = OGBRateLimiter(user_id, self.plan_name, room)
+                self.rate_limiter = OGBRateLimiter(
+                    user_id, self.plan_name, room, data_store=data_store
+                )
                 
                 if hass and event_manager:
                     self.upgrade_prompts = OGBUpgradePrompts(
@@ -0,0 +1,305 @@
+"""
+Capability-indexed view of one control cycle's action map.
+
+OGBActionManager runs dedup, conflict resolution and publication over the
+same action list every cycle. ActionIndex walks the list once and keeps
+per-capability slots (best action for dedup, last action for pair
+conflicts, all actions for intra-capability conflicts) plus a bitmask of
+the capabilities present. Conflict pairs are compiled once into bitmasks so
+a cycle without conflicting capabilities skips the pair check entirely.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_RANK = {"emergency": 4, "high": 3, "medium": 2, "low": 1}
+
+# Fixed slot order for the known capabilities; others get a slot on first sight
+CAPABILITY_SLOTS = (
+    "canExhaust",
+    "canIntake",
+    "canVentilate",
+    "canWindow",
+    "canHumidify",
+    "canDehumidify",
+    "canHeat",
+    "canCool",
+    "canClimate",
+    "canCO2",
+    "canLight",
+)
+_SLOTS: Dict[str, int] = {cap: slot for slot, cap in enumerate(CAPABILITY_SLOTS)}
+
+# Capability -> device event suffix ("Increase Exhaust", ...)
+CAPABILITY_EVENTS = {
+    "canExhaust": "Exhaust",
+    "canIntake": "Intake",
+    "canVentilate": "Ventilation",
+    "canWindow": "Ventilation",
+    "canHumidify": "Humidifier",
+    "canDehumidify": "Dehumidifier",
+    "canHeat": "Heater",
+    "canCool": "Cooler",
+    "canClimate": "Climate",
+    "canCO2": "CO2",
+    "canLight": "Light",
+}
+
+_OPPOSITE_ACTIONS = {"Increase": "Reduce", "Reduce": "Increase"}
+
+
+def slot_of(capability: str) -> int:
+    slot = _SLOTS.get(capability)
+    if slot is None:
+        slot = _SLOTS[capability] = len(_SLOTS)
+    return slot
+
+
+class ConflictGraph:
+    """(cap_a, action_a) vs (cap_b, action_b) pairs compiled to slot bitmasks."""
+
+    __slots__ = ("source", "pairs", "mask")
+
+    def __init__(self, pairs: Sequence[Tuple[str, str, str, str]]):
+        self.source = pairs
+        compiled = []
+        mask = 0
+        for cap_a, act_a, cap_b, act_b in pairs:
+            slot_a, slot_b = slot_of(cap_a), slot_of(cap_b)
+            pair_mask = (1 << slot_a) | (1 << slot_b)
+            compiled.append((cap_a, act_a, cap_b, act_b, slot_a, slot_b, pair_mask))
+            mask |= pair_mask
+        self.pairs = tuple(compiled)
+        self.mask = mask
+
+
+class ActionIndex:
+    """Single pass over an action map, indexed by capability slot."""
+
+    __slots__ = ("actions", "present", "multi", "order", "best", "last", "grouped", "with_capability")
+
+    def __init__(self, actions: Sequence[Any]):
+        self.actions = actions
+        present = 0
+        multi = 0
+        order: List[int] = []
+        best: Dict[int, Tuple[int, Any]] = {}
+        last: Dict[int, Any] = {}
+        grouped: Dict[int, List[Any]] = {}
+        with_capability = 0
+        slots_get = _SLOTS.get
+
+        for action in actions:
+            cap = getattr(action, "capability", None)
+            if not cap:
+                continue
+            with_capability += 1
+            slot = slots_get(cap)
+            if slot is None:
+                slot = slot_of(cap)
+            bit = 1 << slot
+            rank = PRIORITY_RANK.get(getattr(action, "priority", "medium") or "medium", 0)
+            if present & bit:
+                multi |= bit
+                grouped[slot].append(action)
+                # Higher priority wins, equal priority keeps the later action
+                if rank >= best[slot][0]:
+                    best[slot] = (rank, action)
+            else:
+                present |= bit
+                order.append(slot)
+                grouped[slot] = [action]
+                best[slot] = (rank, action)
+            last[slot] = action
+
+        self.present = present
+        self.multi = multi
+        self.order = order
+        self.best = best
+        self.last = last
+        self.grouped = grouped
+        self.with_capability = with_capability
+
+    def deduplicated(self) -> List[Any]:
+        """One action per capability (highest priority, equal -> last), first-occurrence order."""
+        best = self.best
+        return [best[slot][1] for slot in self.order]
+
+    def without_conflicts(self, graph: ConflictGraph, room: str = "") -> List[Any]:
+        """Drop physically contradicting actions.
+
+        Pair conflicts block the whole losing capability (higher priority
+        wins, equal keeps cap_a). Opposite actions on the same capability
+        block only the losing (capability, action) pair; on equal priority a
+        "Bounds:" correction wins, otherwise the first one.
+        """
+        blocked_mask, blocked_pairs = self._blocked(graph, room)
+        if not blocked_mask and not blocked_pairs:
+            return list(self.actions)
+
+        kept = []
+        for action in self.actions:
+            cap = getattr(action, "capability", None)
+            if cap:
+                if blocked_mask >> _SLOTS[cap] & 1:
+                    continue
+                if (cap, getattr(action, "action", None)) in blocked_pairs:
+                    continue
+            kept.append(action)
+        return kept
+
+    def resolved(self, graph: ConflictGraph, room: str = "") -> List[Any]:
+        """without_conflicts() followed by deduplication, from this one index.
+
+        Actions without a capability are kept in place.
+        """
+        blocked_mask, blocked_pairs = self._blocked(graph, room)
+        if not blocked_mask and not blocked_pairs and not self.multi:
+            return list(self.actions)
+
+        winners: Dict[int, Any] = {}
+        for slot in self.order:
+            if blocked_mask >> slot & 1:
+                continue
+            if not blocked_pairs:
+                winners[slot] = self.best[slot][1]
+                continue
+            best_rank = -1
+            for action in self.grouped[slot]:
+                if (action.capability, getattr(action, "action", None)) in blocked_pairs:
+                    continue
+                rank = PRIORITY_RANK.get(getattr(action, "priority", "medium") or "medium", 0)
+                if rank >= best_rank:
+                    best_rank, winners[slot] = rank, action
+
+        kept = []
+        for action in self.actions:
+            cap = getattr(action, "capability", None)
+            if not cap:
+                kept.append(action)
+                continue
+            slot = _SLOTS[cap]
+            if slot not in winners or (cap, getattr(action, "action", None)) in blocked_pairs:
+                continue
+            # Emitted at the first kept occurrence of its capability
+            kept.append(winners.pop(slot))
+        return kept
+
+    def _blocked(self, graph: ConflictGraph, room: str) -> Tuple[int, set]:
+        blocked_mask = 0
+        if self.present & graph.mask:
+            last = self.last
+            present = self.present
+            for cap_a, act_a, cap_b, act_b, slot_a, slot_b, pair_mask in graph.pairs:
+                if present & pair_mask != pair_mask:
+                    continue
+                action_a = last[slot_a]
+                action_b = last[slot_b]
+                if getattr(action_a, "action", "") != act_a or getattr(action_b, "action", "") != act_b:
+                    continue
+
+                prio_a = PRIORITY_RANK.get(getattr(action_a, "priority", "medium"), 2)
+                prio_b = PRIORITY_RANK.get(getattr(action_b, "priority", "medium"), 2)
+                if prio_b > prio_a:
+                    blocked_mask |= 1 << slot_a
+                    _LOGGER.debug(
+                        f"{room}: Conflict – {cap_b}:{act_b} (prio={prio_b}) "
+                        f"overrides {cap_a}:{act_a} (prio={prio_a})"
+                    )
+                else:
+                    blocked_mask |= 1 << slot_b
+                    _LOGGER.debug(
+                        f"{room}: Conflict – {cap_a}:{act_a} (prio={prio_a}) "
+                        f"overrides {cap_b}:{act_b} (prio={prio_b})"
+                    )
+
+        blocked_pairs = self._intra_conflicts(room) if self.multi else set()
+        return blocked_mask, blocked_pairs
+
+    def _intra_conflicts(self, room: str) -> set:
+        blocked_pairs = set()
+        for slot in self.order:
+            if not self.multi >> slot & 1:
+                continue
+            actions = self.grouped[slot]
+            for i, action_a in enumerate(actions):
+                opposite = _OPPOSITE_ACTIONS.get(getattr(action_a, "action", ""))
+                if not opposite:
+                    continue
+                for action_b in actions[i + 1:]:
+                    if getattr(action_b, "action", "") != opposite:
+                        continue
+
+                    prio_a = PRIORITY_RANK.get(getattr(action_a, "priority", "medium"), 2)
+                    prio_b = PRIORITY_RANK.get(getattr(action_b, "priority", "medium"), 2)
+                    if prio_a > prio_b:
+                        winner, loser = action_a, action_b
+                    elif prio_b > prio_a:
+                        winner, loser = action_b, action_a
+                    else:
+                        # Equal priority: Bounds wins (safety first), else the first one
+                        is_b_bounds = "Bounds:" in getattr(action_b, "message", "")
+                        is_a_bounds = "Bounds:" in getattr(action_a, "message", "")
+                        if is_b_bounds and not is_a_bounds:
+                            winner, loser = action_b, action_a
+                        else:
+                            winner, loser = action_a, action_b
+
+                    loser_cap = getattr(loser, "capability", "")
+                    loser_act = getattr(loser, "action", "")
+                    blocked_pairs.add((loser_cap, loser_act))
+                    _LOGGER.warning(
+                        f"{room}: CRITICAL Intra-capability conflict – "
+                        f"{loser_cap}:{loser_act} removed in favor of {getattr(winner, 'action', '')} "
+                        f"(reason: {getattr(winner, 'message', '')})"
+                    )
+                    break
+        return blocked_pairs
+
+
+def build_action_records(
+    actions: Sequence[Any], controller_type: str, now: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Tuple[str, Any]]]:
+    """Build history entries, API control commands and device events in one pass.
+
+    Returns (history_actions, control_commands, device_events). History entries
+    keep ``capability`` for the HA format conversion; control commands are the
+    API payload (actionData.controlCommands).
+    """
+    now = time.time() if now is None else now
+    history: List[Dict[str, Any]] = []
+    commands: List[Dict[str, Any]] = []
+    events: List[Tuple[str, Any]] = []
+
+    for action in actions:
+        capability = getattr(action, "capability", "") or ""
+        action_type = getattr(action, "action", "Eval")
+        device = capability[3:].lower() if capability.startswith("can") else capability.lower()
+        priority = getattr(action, "priority", "medium") or "medium"
+        reason = getattr(action, "message", "")
+
+        command = {
+            "device": device,
+            "action": action_type,
+            "priority": priority,
+            "reason": reason,
+            "timestamp": now,
+            "controllerType": controller_type,
+        }
+        commands.append(command)
+        history.append({**command, "capability": capability})
+
+        suffix = CAPABILITY_EVENTS.get(capability)
+        if suffix and action_type:
+            value = getattr(action, "value", None)
+            events.append((
+                f"{action_type} {suffix}",
+                action_type if value is None else {"action": action_type, "value": value},
+            ))
+
+    return history, commands, events
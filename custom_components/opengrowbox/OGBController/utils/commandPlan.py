@@ -0,0 +1,391 @@
+"""Precompiled turn_on/turn_off command plans for OGB devices.
+
+Which HA services a device needs for on/off only depends on its
+identification (device type, platform flags, dimmable, entity ids). The
+plan is compiled once from those inputs and reused until they change.
+
+A plan is a list of stages. Service calls inside a stage are grouped per
+(domain, service, data) into one multi-entity call and the groups run
+concurrently; power/value steps run as their own stage so ordering such as
+"switch on first, then set the number" is kept.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+LIGHT_TYPES = frozenset({"Light", "LightFarRed", "LightUV", "LightBlue", "LightRed"})
+CLIMATE_HELPER_TYPES = frozenset({"Humidifier", "Dehumidifier", "Heater", "Cooler"})
+ACINFINITY_ON_VALUE_TYPES = frozenset({"Light", "Humidifier", "Dehumidifier", "Exhaust", "Intake", "Ventilation"})
+ACINFINITY_OFF_VALUE_TYPES = frozenset({"Light", "Humidifier", "Exhaust", "Ventilation"})
+
+
+@dataclass(frozen=True)
+class ServiceStep:
+    domain: str
+    service: str
+    entity_ids: Tuple[str, ...]
+    data: Tuple[Tuple[str, Any], ...] = ()
+    # (service data key, runtime parameter) added at execution time
+    param: Optional[Tuple[str, str]] = None
+
+
+@dataclass(frozen=True)
+class PowerStep:
+    power_on: bool
+
+
+@dataclass(frozen=True)
+class ValueStep:
+    # "zero" | "percentage" | "percentage/10" | "brightness/10" | "brightness/10:int"
+    source: str
+
+
+def _param_value(source: str, params: Dict[str, Any]):
+    if source == "zero":
+        return 0
+    if source == "percentage":
+        return params["percentage"]
+    if source == "percentage/10":
+        return params["percentage"] / 10
+    if source == "brightness_pct":
+        return params["brightness_pct"]
+    if source == "brightness_int":
+        return int(max(0, min(100, float(params["brightness_pct"]))))
+    if source == "brightness/10":
+        return float(params["brightness_pct"] / 10)
+    if source == "brightness/10:int":
+        return int(params["brightness_pct"] / 10)
+    if source == "hvac_mode":
+        return params.get("hvac_mode", "heat")
+    raise KeyError(source)
+
+
+@dataclass(frozen=True)
+class CommandPlan:
+    action: str
+    stages: Tuple[Tuple[Any, ...], ...]
+    running: Optional[bool]
+    label: str
+    reset_voltage: bool = False
+
+    @property
+    def service_calls(self) -> int:
+        """Number of HA service calls issued by service steps."""
+        return sum(1 for stage in self.stages for step in stage if isinstance(step, ServiceStep))
+
+    async def execute(self, device, params: Dict[str, Any]) -> None:
+        for stage in self.stages:
+            if len(stage) == 1:
+                await self._run_step(stage[0], device, params)
+            else:
+                await asyncio.gather(*(self._run_step(step, device, params) for step in stage))
+
+        if self.running is not None:
+            device.isRunning = self.running
+        if self.reset_voltage:
+            device.voltage = 0
+
+    @staticmethod
+    async def _run_step(step, device, params: Dict[str, Any]) -> None:
+        if isinstance(step, ServiceStep):
+            service_data = dict(step.data)
+            service_data["entity_id"] = step.entity_ids[0] if len(step.entity_ids) == 1 else list(step.entity_ids)
+            if step.param:
+                key, source = step.param
+                service_data[key] = _param_value(source, params)
+            await device.hass.services.async_call(
+                domain=step.domain,
+                service=step.service,
+                service_data=service_data,
+            )
+        elif isinstance(step, PowerStep):
+            await device._set_power_control(step.power_on)
+        elif isinstance(step, ValueStep):
+            await device.set_value(_param_value(step.source, params))
+
+
+class _PlanBuilder:
+    """Collects steps in legacy call order and groups service calls per stage."""
+
+    def __init__(self, action: str):
+        self.action = action
+        self.stages: List[Tuple[Any, ...]] = []
+        self._pending: Dict[tuple, List[str]] = {}
+        self._device_steps = set()
+        self.running: Optional[bool] = None
+        self.label = ""
+        self.reset_voltage = False
+
+    def service(self, domain: str, service: str, entity_id: str, param=None, **data) -> None:
+        key = (domain, service, tuple(sorted(data.items())), param)
+        entity_ids = self._pending.setdefault(key, [])
+        if entity_id not in entity_ids:
+            entity_ids.append(entity_id)
+
+    def device_step(self, step) -> None:
+        # Power/value steps address the whole device; repeating them per entity is redundant
+        if step in self._device_steps:
+            return
+        self._flush()
+        self._device_steps.add(step)
+        self.stages.append((step,))
+
+    def done(self, running: Optional[bool], label: str) -> bool:
+        self.running = running
+        self.label = label
+        return True
+
+    def _flush(self) -> None:
+        if self._pending:
+            self.stages.append(tuple(
+                ServiceStep(domain, service, tuple(entity_ids), data, param)
+                for (domain, service, data, param), entity_ids in self._pending.items()
+            ))
+            self._pending = {}
+
+    def build(self) -> CommandPlan:
+        self._flush()
+        return CommandPlan(self.action, tuple(self.stages), self.running, self.label, self.reset_voltage)
+
+
+def _entity_id(entity) -> str:
+    entity_id = entity.get("entity_id") if isinstance(entity, dict) else entity
+    if isinstance(entity_id, list):
+        entity_id = entity_id[0] if entity_id else "unknown"
+    if not isinstance(entity_id, str):
+        entity_id = str(entity_id)
+    return entity_id
+
+
+def plan_key(device) -> tuple:
+    """Inputs a compiled plan depends on; a changed key triggers recompilation."""
+    return (
+        device.deviceType,
+        device.isAcInfinDev,
+        device.isSpecialDevice,
+        device.isDimmable,
+        getattr(device, "voltageFromNumber", False),
+        getattr(device, "realHumidifierClass", False),
+        getattr(device, "humidifierEntityId", None),
+        tuple(_entity_id(entity) for entity in (device.switches or [])),
+        tuple(_entity_id(entity) for entity in (device.options or [])),
+    )
+
+
+def _acinfinity_selects(device) -> List[str]:
+    selects = [_entity_id(s) for s in (device.switches or []) if "select." in _entity_id(s)]
+    if not selects:
+        _LOGGER.warning(f"{device.deviceName}: No matching select switches, falling back to options")
+        selects = [_entity_id(o) for o in (device.options or []) if "select." in _entity_id(o)]
+    return selects
+
+
+def compile_command_plan(device, action: str) -> Optional[CommandPlan]:
+    """Compile the turn_on ("on") or turn_off ("off") plan for a device.
+
+    Returns None if the device has nothing to switch.
+    """
+    builder = _PlanBuilder(action)
+    on = action == "on"
+
+    if device.isAcInfinDev:
+        selects = _acinfinity_selects(device)
+        if selects:
+            for entity_id in selects:
+                builder.service("select", "select_option", entity_id, option="On" if on else "Off")
+            if on and device.deviceType in ACINFINITY_ON_VALUE_TYPES:
+                builder.device_step(ValueStep("brightness/10:int" if device.deviceType == "Light" else "percentage/10"))
+            elif not on and device.deviceType in ACINFINITY_OFF_VALUE_TYPES:
+                builder.device_step(ValueStep("zero"))
+            builder.done(on, f"AcInfinity via select {'ON' if on else 'OFF'}.")
+            return builder.build()
+        _LOGGER.warning(f"{device.deviceName}: AcInfinity without select entity - using standard fallback path")
+
+    if not device.switches:
+        return None
+
+    resolve = _resolve_on if on else _resolve_off
+    for entity in device.switches:
+        if resolve(device, builder, _entity_id(entity)):
+            break
+    return builder.build()
+
+
+def _resolve_on(device, b: _PlanBuilder, entity_id: str) -> bool:
+    """Add the turn_on steps for one switch entity. True stops the entity walk."""
+    device_type = device.deviceType
+    special = device.isSpecialDevice
+    dimmable = device.isDimmable
+
+    if device_type in LIGHT_TYPES:
+        if not dimmable:
+            b.service("switch", "turn_on", entity_id)
+            return b.done(True, f"{device_type} ON (non-dimmable).")
+        if getattr(device, "voltageFromNumber", False):
+            b.service("switch", "turn_on", entity_id)
+            b.device_step(ValueStep("brightness/10"))
+            return b.done(True, f"{device_type} ON (via Number).")
+        b.service("light", "turn_on", entity_id, param=("brightness_pct", "brightness_int"))
+        return b.done(True, f"{device_type} ON (dimmable).")
+
+    if device_type in ("Exhaust", "Intake"):
+        if special:
+            if dimmable:
+                b.service("light", "turn_on", entity_id, param=("brightness_pct", "brightness_pct"))
+            else:
+                b.service("switch", "turn_on", entity_id)
+            return b.done(True, f"{device_type} ON (special).")
+        if dimmable:
+            if device._has_power_and_number_control():
+                b.device_step(PowerStep(True))
+                b.device_step(ValueStep("percentage"))
+            else:
+                b.service("fan", "set_percentage", entity_id, param=("percentage", "percentage"))
+            return b.done(True, f"{device_type} ON (dimmable).")
+        if device_type == "Exhaust" and entity_id.startswith("cover."):
+            b.service("cover", "open_cover", entity_id)
+            return False
+        b.service("switch", "turn_on", entity_id)
+        return b.done(True, f"{device_type} ON (Switch).")
+
+    if device_type == "Ventilation":
+        if special:
+            b.service("light", "turn_on", entity_id, param=("brightness_pct", "brightness_pct"))
+        elif dimmable:
+            if device._has_power_and_number_control():
+                b.device_step(PowerStep(True))
+                b.device_step(ValueStep("percentage"))
+            else:
+                b.service("fan", "set_percentage", entity_id, param=("percentage", "percentage"))
+        else:
+            b.service("switch", "turn_on", entity_id)
+        b.done(True, f"Ventilation ON - {len(device.switches)} entities activated.")
+        return False
+
+    if device_type == "Climate":
+        b.service("climate", "set_hvac_mode", entity_id, param=("hvac_mode", "hvac_mode"))
+        return b.done(True, "HVAC-Mode ON.")
+
+    if device_type in CLIMATE_HELPER_TYPES:
+        if special:
+            if dimmable:
+                b.service("light", "turn_on", entity_id, param=("brightness_pct", "brightness_pct"))
+            else:
+                b.service("switch", "turn_on", entity_id)
+            return b.done(True, f"{device_type} ON (special).")
+        if entity_id.startswith("fan."):
+            if dimmable:
+                b.service("fan", "set_percentage", entity_id, param=("percentage", "percentage"))
+            else:
+                b.service("fan", "turn_on", entity_id)
+        elif device_type in ("Heater", "Cooler") and entity_id.startswith("climate."):
+            b.service("climate", "turn_on", entity_id)
+        elif device_type == "Humidifier" and getattr(device, "realHumidifierClass", False):
+            b.service("humidifier", "turn_on", entity_id)
+        elif (
+            device_type == "Dehumidifier"
+            and getattr(device, "realHumidifierClass", False)
+            and getattr(device, "humidifierEntityId", None)
+        ):
+            b.service("humidifier", "turn_on", device.humidifierEntityId)
+        else:
+            b.service("switch", "turn_on", entity_id)
+        # Turn on first, then set the numeric output value
+        if dimmable:
+            if device._has_power_and_number_control():
+                b.device_step(PowerStep(True))
+            b.device_step(ValueStep("percentage"))
+        return b.done(True, f"{device_type} ON.")
+
+    if device_type == "CO2":
+        if dimmable:
+            b.service("fan", "set_percentage", entity_id, param=("percentage", "percentage"))
+            return b.done(True, "CO2 ON (dimmable).")
+        b.service("switch", "turn_on", entity_id)
+        return b.done(True, "CO2 ON (Switch).")
+
+    b.service("switch", "turn_on", entity_id)
+    return b.done(True, "Default-Switch ON.")
+
+
+def _resolve_off(device, b: _PlanBuilder, entity_id: str) -> bool:
+    """Add the turn_off steps for one switch entity. True stops the entity walk."""
+    device_type = device.deviceType
+    special = device.isSpecialDevice
+    dimmable = device.isDimmable
+
+    if device_type == "Climate":
+        b.service("climate", "set_hvac_mode", entity_id, hvac_mode="off")
+        return b.done(False, "HVAC-Mode OFF.")
+
+    if device_type in CLIMATE_HELPER_TYPES:
+        if special:
+            b.service("light" if dimmable else "switch", "turn_off", entity_id)
+            return b.done(False, f"{device_type} OFF (special).")
+        if dimmable:
+            if device._has_power_and_number_control():
+                b.device_step(PowerStep(False))
+            b.device_step(ValueStep("zero"))
+        if entity_id.startswith("fan."):
+            b.service("fan", "turn_off", entity_id)
+        elif (
+            device_type in ("Humidifier", "Dehumidifier")
+            and getattr(device, "realHumidifierClass", False)
+            and getattr(device, "humidifierEntityId", None)
+        ):
+            b.service("humidifier", "turn_off", device.humidifierEntityId)
+        elif device_type == "Humidifier" and entity_id.startswith("cover."):
+            b.service("cover", "close_cover", entity_id)
+        elif device_type in ("Heater", "Cooler") and entity_id.startswith("climate."):
+            b.service("climate", "set_hvac_mode", entity_id, hvac_mode="off")
+        else:
+            b.service("switch", "turn_off", entity_id)
+        return b.done(False, f"{device_type} OFF.")
+
+    if device_type == "Light":
+        if dimmable:
+            b.service("light", "turn_off", entity_id)
+            b.reset_voltage = True
+            return b.done(False, "Light OFF (dimmable).")
+        b.service("switch", "turn_off", entity_id)
+        return b.done(False, "Light OFF (Default-Switch).")
+
+    if device_type in ("Exhaust", "Intake"):
+        if dimmable:
+            # Fan-percentage exhausts/intakes are never switched off, only power+number ones
+            if device._has_power_and_number_control():
+                b.device_step(PowerStep(False))
+                b.device_step(ValueStep("zero"))
+                return b.done(False, f"{device_type} OFF via power+number.")
+            return b.done(None, f"{device_type} OFF skipped (fan-percentage control).")
+        b.service("switch", "turn_off", entity_id)
+        return b.done(False, f"{device_type} OFF.")
+
+    if device_type == "Ventilation":
+        if special:
+            b.service("light", "turn_off", entity_id)
+        elif dimmable:
+            if device._has_power_and_number_control():
+                b.device_step(PowerStep(False))
+                b.device_step(ValueStep("zero"))
+            else:
+                b.service("fan", "turn_off", entity_id)
+        else:
+            b.service("switch", "turn_off", entity_id)
+        b.done(False, f"Ventilation OFF - {len(device.switches)} entities deactivated.")
+        return False
+
+    if device_type == "CO2":
+        if dimmable:
+            return b.done(None, "CO2 OFF skipped (dimmable).")
+        b.service("switch", "turn_off", entity_id)
+        return b.done(False, "CO2 OFF.")
+
+    b.service("switch", "turn_off", entity_id)
+    return b.done(False, "Default-Switch OFF.")
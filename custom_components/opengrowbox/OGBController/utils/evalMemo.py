@@ -0,0 +1,75 @@
+"""
+Memo for control-cycle evaluations.
+
+A cycle is described by a fingerprint of its quantized inputs. When the
+fingerprint matches the previous evaluation and that evaluation is younger
+than ``max_age``, the caller can skip the cycle. ``max_age`` bounds how long
+a result is reused, so time-based logic still gets a full pass now and then.
+Configuration changes call ``invalidate``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+UNAVAILABLE = "unavailable"
+
+
+def quantize(value, step: float):
+    """Snap a reading to its resolution; non-numeric values pass through."""
+    if value is None or value == UNAVAILABLE:
+        return value
+    try:
+        return round(float(value) / step)
+    except (TypeError, ValueError):
+        return value
+
+
+class EvaluationMemo:
+    """Last evaluated fingerprint plus hit/miss counters."""
+
+    def __init__(self, max_age: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self.clock = clock
+        self._fingerprint: Optional[Hashable] = None
+        self._evaluated_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.last_invalidation: Optional[str] = None
+
+    def is_unchanged(self, fingerprint: Hashable) -> bool:
+        """True if the last evaluation had the same inputs and is still fresh."""
+        if (
+            self._fingerprint is not None
+            and fingerprint == self._fingerprint
+            and self.clock() - self._evaluated_at < self.max_age
+        ):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def record(self, fingerprint: Hashable):
+        self._fingerprint = fingerprint
+        self._evaluated_at = self.clock()
+
+    def invalidate(self, reason: Optional[str] = None):
+        self._fingerprint = None
+        self.invalidations += 1
+        self.last_invalidation = reason
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "invalidations": self.invalidations,
+            "last_invalidation": self.last_invalidation,
+        }
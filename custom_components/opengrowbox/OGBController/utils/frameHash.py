@@ -0,0 +1,60 @@
+"""
+Perceptual hashing for camera frames.
+
+``frame_hash`` decodes a JPEG into a tiny grayscale thumbnail and compares
+neighbouring pixels (difference hash, 64 bit). Frames whose hashes differ
+in only a few bits look the same - a timelapse at night or under static
+light produces many of them. Decoding is blocking: run it in the executor.
+
+Pillow is optional (Home Assistant ships it). Without it, or for data it
+cannot decode, the hash is a digest of the bytes, so only identical frames
+are detected.
+"""
+
+import hashlib
+import io
+from typing import Optional
+
+try:  # pragma: no cover - depends on the environment
+    from PIL import Image as PILImage
+except ImportError:  # pragma: no cover
+    PILImage = None
+
+HASH_SIZE = 8
+
+
+def _digest(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def frame_hash(image_data: bytes, size: int = HASH_SIZE) -> Optional[int]:
+    """dHash of an encoded image (None for empty data)."""
+    if not image_data:
+        return None
+    if PILImage is None:
+        return _digest(image_data)
+    try:
+        with PILImage.open(io.BytesIO(image_data)) as img:
+            # JPEG draft mode decodes at 1/8 scale, far cheaper than a full decode
+            img.draft("L", (size * 8, size * 8))
+            pixels = list(img.convert("L").resize((size + 1, size)).getdata())
+    except Exception:
+        return _digest(image_data)
+
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def is_near_duplicate(a: Optional[int], b: Optional[int], max_distance: int) -> bool:
+    """True if both hashes exist and differ in at most ``max_distance`` bits."""
+    if a is None or b is None or max_distance < 0:
+        return False
+    return hamming(a, b) <= max_distance
@@ -0,0 +1,238 @@
+"""
+Lazy, feature-gated manager registry.
+
+Optional managers (tank feed, energy, device recognition, ...) are registered
+with a factory instead of being built in ``OGBMainController.__init__``. A
+manager is materialized
+
+- by ``start_enabled()``/``refresh()`` when it is ``autostart`` and its gate is open,
+- on a gate event (e.g. ``FeedModeChange``) that opens the gate,
+- on a wake event (explicit use such as ``DoseNutrients``), or
+- on first attribute access via ``get()``.
+
+The event that caused the materialization is forwarded to the listeners the
+new manager registered for it, so it is not lost. When a gate event closes
+the gate, the manager is shut down (``async_shutdown`` if present) and every
+event-manager listener bound to it or to its sub-managers is removed.
+Factories import their module on first call, so disabled features do not pay
+the import cost either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class LazyManager:
+    """Registration of one optional manager."""
+
+    name: str
+    factory: Callable[[], Any]
+    gate: Optional[Callable[[], bool]] = None
+    gate_events: Tuple[str, ...] = ()
+    wake_events: Tuple[str, ...] = ()
+    autostart: bool = True
+    instance: Any = None
+    created: int = 0
+    build_ms: float = 0.0
+    proxies: List[Tuple[str, Callable]] = field(default_factory=list)
+
+
+class OGBManagerRegistry:
+    """Creates optional managers on demand and tears them down when disabled."""
+
+    def __init__(self, event_manager, room: str, shared=()):
+        self.event_manager = event_manager
+        self.room = room
+        self._entries: Dict[str, LazyManager] = {}
+        self._subscribers: List[Callable[[str, Any], None]] = []
+        # Objects owned by the controller, never treated as part of a manager
+        self._shared_ids = {id(obj) for obj in shared if obj is not None}
+        self._pending: set = set()
+
+    # -----------------------------------------------------------------
+    # Registration
+    # -----------------------------------------------------------------
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        gate: Optional[Callable[[], bool]] = None,
+        gate_events=(),
+        wake_events=(),
+        autostart: bool = True,
+    ) -> LazyManager:
+        if name in self._entries:
+            raise ValueError(f"Manager '{name}' already registered")
+        entry = LazyManager(
+            name, factory, gate, tuple(gate_events), tuple(wake_events), autostart
+        )
+        self._entries[name] = entry
+
+        for event_name in entry.gate_events:
+            self._add_proxy(entry, event_name, wake=False)
+        for event_name in entry.wake_events:
+            self._add_proxy(entry, event_name, wake=True)
+        return entry
+
+    def subscribe(self, callback: Callable[[str, Any], None]):
+        """``callback(name, instance_or_None)`` after materialize/teardown."""
+        self._subscribers.append(callback)
+
+    def _add_proxy(self, entry: LazyManager, event_name: str, wake: bool):
+        # Synchronous so an emit with the manager already present costs one check;
+        # materializing happens in a task, outside the emit loop.
+        def proxy(data, _entry=entry, _event=event_name, _wake=wake):
+            if _wake and _entry.instance is not None:
+                return
+            if not _wake and _entry.instance is not None and self._gate_open(_entry):
+                return
+            asyncio.get_running_loop().create_task(self._on_event(_entry, _event, data, _wake))
+
+        self.event_manager.on(event_name, proxy)
+        entry.proxies.append((event_name, proxy))
+
+    # -----------------------------------------------------------------
+    # Access
+    # -----------------------------------------------------------------
+
+    def peek(self, name: str):
+        """Instance if materialized, without creating it."""
+        entry = self._entries.get(name)
+        return entry.instance if entry else None
+
+    def get(self, name: str):
+        """Instance, created on first use if its gate is open (or it has none)."""
+        entry = self._entries[name]
+        if entry.instance is None and self._gate_open(entry):
+            self._materialize(entry)
+        return entry.instance
+
+    def is_active(self, name: str) -> bool:
+        return self.peek(name) is not None
+
+    def active(self) -> Dict[str, Any]:
+        return {name: e.instance for name, e in self._entries.items() if e.instance is not None}
+
+    def start_enabled(self):
+        """Create the autostart managers whose gate is open."""
+        for entry in list(self._entries.values()):
+            if entry.instance is None and entry.autostart and self._gate_open(entry):
+                self._materialize(entry)
+
+    async def refresh(self):
+        """Re-evaluate all gates: start autostart managers, stop closed ones."""
+        self.start_enabled()
+        for entry in list(self._entries.values()):
+            if entry.instance is not None and entry.gate is not None and not self._gate_open(entry):
+                await self.teardown(entry.name)
+
+    async def async_shutdown(self):
+        for name in list(self._entries):
+            if self._entries[name].instance is not None:
+                await self.teardown(name)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "active": entry.instance is not None,
+                "created": entry.created,
+                "build_ms": round(entry.build_ms, 2),
+            }
+            for name, entry in self._entries.items()
+        }
+
+    # -----------------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------------
+
+    def _gate_open(self, entry: LazyManager) -> bool:
+        if entry.gate is None:
+            return True
+        try:
+            return bool(entry.gate())
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Gate check for {entry.name} failed: {e}")
+            return False
+
+    def _materialize(self, entry: LazyManager):
+        start = time.perf_counter()
+        entry.instance = entry.factory()
+        entry.build_ms = (time.perf_counter() - start) * 1000
+        entry.created += 1
+        _LOGGER.debug(f"[{self.room}] {entry.name} materialized in {entry.build_ms:.1f}ms")
+        self._notify(entry.name, entry.instance)
+
+    async def teardown(self, name: str):
+        entry = self._entries[name]
+        instance = entry.instance
+        if instance is None:
+            return
+        owners = self._owner_ids(instance)
+        entry.instance = None
+
+        shutdown = getattr(instance, "async_shutdown", None)
+        if shutdown is not None:
+            try:
+                await shutdown()
+            except Exception as e:
+                _LOGGER.error(f"[{self.room}] Error shutting down {name}: {e}")
+
+        removed = 0
+        for event_name, callbacks in list(self.event_manager.listeners.items()):
+            for callback in list(callbacks):
+                if id(getattr(callback, "__self__", None)) in owners:
+                    self.event_manager.remove(event_name, callback)
+                    removed += 1
+        _LOGGER.debug(f"[{self.room}] {name} torn down ({removed} listeners removed)")
+        self._notify(name, None)
+
+    async def _on_event(self, entry: LazyManager, event_name: str, data, wake: bool):
+        key = (entry.name, event_name)
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        try:
+            gate_open = self._gate_open(entry)
+            if entry.instance is None and (wake or gate_open):
+                self._materialize(entry)
+                # The manager missed the event that created it - deliver it now
+                owners = self._owner_ids(entry.instance)
+                for callback in list(self.event_manager.listeners.get(event_name, [])):
+                    if id(getattr(callback, "__self__", None)) in owners:
+                        await self.event_manager._call_listener(callback, data)
+            elif entry.instance is not None and not wake and not gate_open:
+                # Let the manager's own handler see the event before stopping it
+                await asyncio.sleep(0)
+                await self.teardown(entry.name)
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Error handling {event_name} for {entry.name}: {e}")
+        finally:
+            self._pending.discard(key)
+
+    def _owner_ids(self, instance) -> set:
+        """The manager plus the sub-managers it holds (one level deep)."""
+        owners = {id(instance)}
+        for value in vars(instance).values() if hasattr(instance, "__dict__") else ():
+            if (
+                id(value) not in self._shared_ids
+                and hasattr(value, "__dict__")
+                and not isinstance(value, (type, asyncio.Task, asyncio.Event, asyncio.Lock))
+            ):
+                owners.add(id(value))
+        return owners
+
+    def _notify(self, name: str, instance):
+        for callback in self._subscribers:
+            try:
+                callback(name, instance)
+            except Exception as e:
+                _LOGGER.error(f"[{self.room}] Manager subscriber failed for {name}: {e}")
@@ -0,0 +1,229 @@
+"""Opt-in control loop profiler.
+
+Times event emits, listener run time per event name and handler, explicit
+spans (e.g. the orchestrator loop) and event-loop lag. All samples go into
+fixed-size ring buffers so memory stays constant no matter how long the
+profiler runs.
+
+The profiler is disabled by default. The only cost on the hot path while
+disabled is a single ``profiler.enabled`` check in OGBEventManager.emit.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SIZE = 512
+LAG_SAMPLE_INTERVAL_SECONDS = 1.0
+# Publish a snapshot every N lag samples (30 s with the default interval)
+REPORT_EVERY_SAMPLES = 30
+
+
+def _nearest_rank(window, q: float) -> float:
+    """Nearest-rank percentile of an already sorted window."""
+    filled = len(window)
+    return window[max(0, min(filled - 1, math.ceil(q / 100.0 * filled) - 1))]
+
+
+class LatencyHistogram:
+    """Fixed-size ring buffer of durations with percentile summaries."""
+
+    __slots__ = ("_samples", "_size", "_index", "count", "total", "max")
+
+    def __init__(self, size: int = DEFAULT_WINDOW_SIZE):
+        self._samples = array("d", bytes(8 * size))
+        self._size = size
+        self._index = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self._samples[self._index] = seconds
+        self._index = (self._index + 1) % self._size
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile over the samples currently in the window."""
+        filled = min(self.count, self._size)
+        if filled == 0:
+            return 0.0
+        return _nearest_rank(sorted(self._samples[:filled]), q)
+
+    def summary(self) -> dict:
+        """Return count, mean, max and p50/p95/p99 in milliseconds."""
+        filled = min(self.count, self._size)
+        if filled == 0:
+            return {"count": 0}
+        window = sorted(self._samples[:filled])
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": round(_nearest_rank(window, 50) * 1000, 3),
+            "p95_ms": round(_nearest_rank(window, 95) * 1000, 3),
+            "p99_ms": round(_nearest_rank(window, 99) * 1000, 3),
+        }
+
+
+class OGBProfiler:
+    """Collects per-stage latency histograms for one room's event pipeline."""
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE):
+        self.enabled = False
+        self.window_size = window_size
+        self.enabled_since: Optional[float] = None
+
+        self.emits: Dict[str, LatencyHistogram] = {}
+        self.listeners: Dict[str, LatencyHistogram] = {}
+        self.handlers: Dict[str, LatencyHistogram] = {}
+        self.spans: Dict[str, LatencyHistogram] = {}
+        self.loop_lag = LatencyHistogram(window_size)
+
+        self.tasks_spawned: Dict[str, int] = {}
+        self.active_tasks = 0
+        self.peak_active_tasks = 0
+
+        self._lag_task: Optional[asyncio.Task] = None
+        self._reporter: Optional[Callable[[], Awaitable[None]]] = None
+
+    # -- Control ---------------------------------------------------------
+
+    def set_reporter(self, reporter: Optional[Callable[[], Awaitable[None]]]):
+        """Set a coroutine function called periodically while enabled."""
+        self._reporter = reporter
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.enabled_since = time.time()
+        try:
+            self._lag_task = asyncio.get_running_loop().create_task(self._sample_loop_lag())
+        except RuntimeError:
+            # No running loop (sync context) - lag sampling starts with the next enable
+            self._lag_task = None
+        _LOGGER.debug("Control loop profiler enabled")
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self._lag_task and not self._lag_task.done():
+            self._lag_task.cancel()
+        self._lag_task = None
+        _LOGGER.debug("Control loop profiler disabled")
+
+    def reset(self):
+        self.emits.clear()
+        self.listeners.clear()
+        self.handlers.clear()
+        self.spans.clear()
+        self.tasks_spawned.clear()
+        self.loop_lag = LatencyHistogram(self.window_size)
+        self.peak_active_tasks = self.active_tasks
+        if self.enabled:
+            self.enabled_since = time.time()
+
+    # -- Recording -------------------------------------------------------
+
+    def _histogram(self, table: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        hist = table.get(name)
+        if hist is None:
+            hist = table[name] = LatencyHistogram(self.window_size)
+        return hist
+
+    def record_emit(self, event_name: str, seconds: float):
+        self._histogram(self.emits, event_name).add(seconds)
+
+    def record_listener(self, event_name: str, callback, seconds: float):
+        self._histogram(self.listeners, event_name).add(seconds)
+        handler = getattr(callback, "__qualname__", None) or repr(callback)
+        self._histogram(self.handlers, handler).add(seconds)
+
+    def record_span(self, name: str, seconds: float):
+        self._histogram(self.spans, name).add(seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block of code as a named stage."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - start)
+
+    async def timed_listener(self, event_name: str, callback, coro):
+        """Await a listener coroutine and record its run time."""
+        self.tasks_spawned[event_name] = self.tasks_spawned.get(event_name, 0) + 1
+        self.active_tasks += 1
+        if self.active_tasks > self.peak_active_tasks:
+            self.peak_active_tasks = self.active_tasks
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.active_tasks -= 1
+            self.record_listener(event_name, callback, time.perf_counter() - start)
+
+    async def _sample_loop_lag(self):
+        """Measure how late the event loop wakes us up compared to the schedule."""
+        loop = asyncio.get_running_loop()
+        samples = 0
+        try:
+            while self.enabled:
+                expected = loop.time() + LAG_SAMPLE_INTERVAL_SECONDS
+                await asyncio.sleep(LAG_SAMPLE_INTERVAL_SECONDS)
+                self.loop_lag.add(max(0.0, loop.time() - expected))
+                samples += 1
+                if self._reporter and samples % REPORT_EVERY_SAMPLES == 0:
+                    try:
+                        await self._reporter()
+                    except Exception as e:
+                        _LOGGER.error(f"Profiler report failed: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    # -- Reporting -------------------------------------------------------
+
+    @staticmethod
+    def _summaries(table: Dict[str, LatencyHistogram], top: Optional[int]) -> dict:
+        summaries = {name: hist.summary() for name, hist in table.items()}
+        if top is not None:
+            ranked = sorted(summaries.items(), key=lambda kv: kv[1].get("p95_ms", 0), reverse=True)
+            summaries = dict(ranked[:top])
+        return summaries
+
+    def snapshot(self, top: Optional[int] = None) -> dict:
+        """Return all histograms as plain dicts (JSON serializable).
+
+        Args:
+            top: Only include the N slowest entries (by p95) per table.
+        """
+        return {
+            "enabled": self.enabled,
+            "enabled_since": self.enabled_since,
+            "window_size": self.window_size,
+            "loop_lag": self.loop_lag.summary(),
+            "tasks": {
+                "active": self.active_tasks,
+                "peak_active": self.peak_active_tasks,
+                "spawned": dict(self.tasks_spawned),
+            },
+            "spans": self._summaries(self.spans, top),
+            "emits": self._summaries(self.emits, top),
+            "listeners": self._summaries(self.listeners, top),
+            "handlers": self._summaries(self.handlers, top),
+        }
@@ -0,0 +1,208 @@
+"""
+Streaming release download and install for the self-update entity.
+
+Nothing holds the whole release archive in memory:
+
+- ``download_release`` writes the response chunk by chunk to a file and
+  feeds the same chunks into SHA-256; a published checksum that does not
+  match removes the file and fails the update,
+- ``install_release`` (blocking, run it in the executor) extracts member by
+  member into a staging directory next to the integration and swaps the
+  directories. Member names are checked before anything is written
+  (absolute paths, ``..``, symlinks). A member whose size and CRC-32 match
+  the installed file is linked/copied from the installed tree instead of
+  being decompressed and written again,
+- both report progress through an optional callback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import posixpath
+import shutil
+import stat
+import tempfile
+import zipfile
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Progress = Callable[[int, Optional[int]], None]
+
+
+class ReleaseInstallError(Exception):
+    """Download, verification or extraction of a release failed."""
+
+
+def parse_checksum(value: Optional[str]) -> Optional[str]:
+    """SHA-256 hex from ``sha256:<hex>`` (GitHub asset digest) or ``<hex>  <file>`` (sha256sum)."""
+    if not value:
+        return None
+    token = str(value).strip().split()[0] if str(value).strip() else ""
+    if token.lower().startswith("sha256:"):
+        token = token[7:]
+    token = token.lower()
+    if len(token) != 64 or any(c not in "0123456789abcdef" for c in token):
+        return None
+    return token
+
+
+def _default_executor(func, *args) -> Awaitable:
+    return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def download_release(
+    session,
+    url: str,
+    destination: str,
+    expected_sha256: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Progress] = None,
+    executor: Optional[Callable[..., Awaitable]] = None,
+    timeout: Any = None,
+) -> str:
+    """Stream ``url`` into ``destination``; returns the SHA-256 of the download."""
+    executor = executor or _default_executor
+    digest = hashlib.sha256()
+    handle = await executor(open, destination, "wb")
+    try:
+        async with session.get(url, timeout=timeout) as response:
+            if response.status != 200:
+                raise ReleaseInstallError(f"Download failed (HTTP {response.status}).")
+            total = response.content_length
+            done = 0
+            async for chunk in response.content.iter_chunked(chunk_size):
+                digest.update(chunk)
+                await executor(handle.write, chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        await executor(handle.close)
+
+        sha256 = digest.hexdigest()
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            raise ReleaseInstallError(f"Checksum mismatch: expected {expected_sha256}, got {sha256}.")
+        return sha256
+    except BaseException:
+        await executor(handle.close)
+        await executor(_unlink, destination)
+        raise
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def member_path(member: zipfile.ZipInfo, package: str) -> Optional[str]:
+    """Path of ``member`` inside ``package`` (None if outside it); raises on unsafe names."""
+    name = member.filename.replace("\\", "/")
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        raise ReleaseInstallError(f"Unsafe path in release archive: {member.filename}")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if ".." in parts:
+        raise ReleaseInstallError(f"Unsafe path in release archive: {member.filename}")
+    if stat.S_ISLNK(member.external_attr >> 16):
+        raise ReleaseInstallError(f"Symlink in release archive: {member.filename}")
+    if not parts or parts[0] != package:
+        return None
+    return posixpath.join(*parts[1:]) if len(parts) > 1 else ""
+
+
+def _unchanged(installed: str, member: zipfile.ZipInfo, chunk_size: int) -> bool:
+    try:
+        if os.path.getsize(installed) != member.file_size:
+            return False
+        crc = 0
+        with open(installed, "rb") as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b""):
+                crc = zlib.crc32(chunk, crc)
+        return crc == member.CRC
+    except OSError:
+        return False
+
+
+def _link_or_copy(source: str, target: str):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def install_release(
+    archive_path: str,
+    integration_dir: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Progress] = None,
+) -> Dict[str, int]:
+    """Extract the release into a staging dir and swap it with ``integration_dir`` (blocking)."""
+    integration_dir = os.path.abspath(integration_dir)
+    components_dir = os.path.dirname(integration_dir)
+    package = os.path.basename(integration_dir)
+    old_dir = f"{integration_dir}.old"
+    # Same filesystem as the integration: the swap is a rename, not a copy
+    staging_dir = tempfile.mkdtemp(prefix=f".{package}_update_", dir=components_dir)
+    stats = {"extracted": 0, "unchanged": 0, "ignored": 0, "bytes_written": 0}
+
+    try:
+        try:
+            archive = zipfile.ZipFile(archive_path)
+        except zipfile.BadZipFile as err:
+            raise ReleaseInstallError(f"Release archive is not a valid zip: {err}") from err
+        with archive:
+            members = archive.infolist()
+            paths = [member_path(member, package) for member in members]
+            extracted_dir = os.path.join(staging_dir, package)
+
+            for index, (member, rel_path) in enumerate(zip(members, paths), 1):
+                if rel_path is None:
+                    stats["ignored"] += 1
+                elif member.is_dir() or not rel_path:
+                    os.makedirs(os.path.join(extracted_dir, rel_path), exist_ok=True)
+                else:
+                    target = os.path.join(extracted_dir, rel_path)
+                    installed = os.path.join(integration_dir, rel_path)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    if _unchanged(installed, member, chunk_size):
+                        _link_or_copy(installed, target)
+                        stats["unchanged"] += 1
+                    else:
+                        # zipfile checks the CRC-32 when the member is read to the end
+                        with archive.open(member) as source, open(target, "wb") as handle:
+                            shutil.copyfileobj(source, handle, chunk_size)
+                        stats["extracted"] += 1
+                        stats["bytes_written"] += member.file_size
+                if progress:
+                    progress(index, len(members))
+
+        if not os.path.isdir(extracted_dir):
+            raise ReleaseInstallError(f"Release archive does not contain an '{package}' folder.")
+
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        os.rename(integration_dir, old_dir)
+        try:
+            os.rename(extracted_dir, integration_dir)
+        except Exception:
+            # Roll back so Home Assistant keeps running the previous version.
+            os.rename(old_dir, integration_dir)
+            raise
+        shutil.rmtree(old_dir, ignore_errors=True)
+    except zipfile.BadZipFile as err:
+        raise ReleaseInstallError(f"Release archive is corrupt: {err}") from err
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    _LOGGER.debug(
+        f"Release installed: {stats['extracted']} files written, {stats['unchanged']} unchanged, "
+        f"{stats['ignored']} ignored"
+    )
+    return stats
@@ -0,0 +1,65 @@
+"""
+Fixed-bucket sliding-window counter.
+
+The window is split into ``buckets`` slots of ``window / buckets`` seconds
+kept in a ring. A running total is maintained while the ring advances, so
+``add`` and ``count`` are O(1) amortised and memory is fixed regardless of
+how many events arrive. Counts are approximate to one bucket width, which
+is what rate limiting needs.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Callable
+
+
+class SlidingWindowCounter:
+    """Count events in the last ``window`` seconds using a bucket ring."""
+
+    __slots__ = ("window", "width", "_counts", "_head", "_total", "_clock")
+
+    def __init__(
+        self,
+        window: float,
+        buckets: int = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if window <= 0 or buckets <= 0:
+            raise ValueError("window and buckets must be positive")
+        self.window = float(window)
+        self.width = self.window / buckets
+        self._counts = array("l", [0]) * buckets
+        self._head = None  # absolute bucket number of the newest slot
+        self._total = 0
+        self._clock = clock
+
+    def _advance(self, now: float) -> int:
+        bucket = int(now // self.width)
+        head = self._head
+        if head is None:
+            self._head = bucket
+        elif bucket > head:
+            size = len(self._counts)
+            steps = bucket - head
+            if steps >= size:
+                for i in range(size):
+                    self._counts[i] = 0
+                self._total = 0
+            else:
+                for b in range(head + 1, bucket + 1):
+                    i = b % size
+                    self._total -= self._counts[i]
+                    self._counts[i] = 0
+            self._head = bucket
+        return self._head % len(self._counts)
+
+    def add(self, amount: int = 1, now: float | None = None) -> None:
+        slot = self._advance(self._clock() if now is None else now)
+        self._counts[slot] += amount
+        self._total += amount
+
+    def count(self, now: float | None = None) -> int:
+        self._advance(self._clock() if now is None else now)
+        return self._total
@@ -0,0 +1,142 @@
+"""
+Dependency graph for room startup.
+
+Startup work is split into named async stages with explicit dependencies.
+Each stage starts as soon as all of its dependencies have finished, so
+independent stages run concurrently, and the graph records how long every
+stage waited and ran. A failing stage is logged and marked as failed; stages
+depending on it still run (same as the former sequential startup, where each
+step caught its own errors) unless the dependency was declared ``required``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stage states
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class StartupStage:
+    """One startup step and what it waits for."""
+
+    name: str
+    func: Callable[[], Awaitable]
+    after: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()  # dependencies that must succeed
+    state: Optional[str] = None
+    result: object = None
+    error: Optional[BaseException] = None
+    queued_s: float = 0.0  # time spent waiting for dependencies
+    run_s: float = 0.0
+
+
+@dataclass
+class StartupGraph:
+    """Run startup stages in dependency order, concurrently where possible."""
+
+    name: str = "startup"
+    clock: Callable[[], float] = time.perf_counter
+    stages: Dict[str, StartupStage] = field(default_factory=dict)
+    total_s: float = 0.0
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        after: Iterable[str] = (),
+        required: Iterable[str] = (),
+    ) -> "StartupGraph":
+        if name in self.stages:
+            raise ValueError(f"Duplicate startup stage '{name}'")
+        required = tuple(required)
+        after = tuple(dict.fromkeys((*after, *required)))
+        self.stages[name] = StartupStage(name, func, after, required)
+        return self
+
+    def _check(self):
+        for stage in self.stages.values():
+            for dep in stage.after:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn's algorithm - anything left over is part of a cycle
+        pending = {name: len(stage.after) for name, stage in self.stages.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        seen = 0
+        while ready:
+            current = ready.pop()
+            seen += 1
+            for stage in self.stages.values():
+                if current in stage.after:
+                    pending[stage.name] -= 1
+                    if pending[stage.name] == 0:
+                        ready.append(stage.name)
+        if seen != len(self.stages):
+            cycle = sorted(name for name, count in pending.items() if count)
+            raise ValueError(f"Startup stages form a cycle: {cycle}")
+
+    async def run(self) -> Dict[str, StartupStage]:
+        """Run all stages; returns the stages with state and timings."""
+        self._check()
+        start = self.clock()
+        finished = {name: asyncio.Event() for name in self.stages}
+
+        async def run_stage(stage: StartupStage):
+            try:
+                for dep in stage.after:
+                    await finished[dep].wait()
+                stage.queued_s = self.clock() - start
+
+                failed = [dep for dep in stage.required if self.stages[dep].state != DONE]
+                if failed:
+                    stage.state = SKIPPED
+                    _LOGGER.warning(f"{self.name}: skipping '{stage.name}', required stage(s) {failed} failed")
+                    return
+
+                began = self.clock()
+                try:
+                    stage.result = await stage.func()
+                    stage.state = DONE
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    stage.state = FAILED
+                    stage.error = e
+                    _LOGGER.error(f"{self.name}: stage '{stage.name}' failed: {e}", exc_info=True)
+                finally:
+                    stage.run_s = self.clock() - began
+            finally:
+                finished[stage.name].set()
+
+        await asyncio.gather(*(run_stage(stage) for stage in self.stages.values()))
+        self.total_s = self.clock() - start
+        return self.stages
+
+    def timings(self) -> Dict[str, Dict[str, object]]:
+        """Per-stage timing summary (seconds), e.g. for the datastore or logs."""
+        return {
+            name: {
+                "state": stage.state,
+                "start": round(stage.queued_s, 3),
+                "duration": round(stage.run_s, 3),
+            }
+            for name, stage in self.stages.items()
+        }
+
+    def summary(self) -> str:
+        parts: List[str] = [
+            f"{name}={stage.run_s * 1000:.0f}ms@{stage.queued_s * 1000:.0f}ms"
+            + ("" if stage.state == DONE else f" ({stage.state})")
+            for name, stage in self.stages.items()
+        ]
+        return f"{self.name} finished in {self.total_s:.2f}s: " + ", ".join(parts)
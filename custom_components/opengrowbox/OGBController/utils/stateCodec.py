@@ -0,0 +1,361 @@
+"""
+Schema-compiled encoder/decoder for the persisted ``OGBConf`` state.
+
+``StateCodec`` is built once from the dataclass field definitions instead of
+dispatching on every value at save/load time:
+
+- excluded fields are dropped when the codec is compiled; every other field
+  gets an encoder and a decoder chosen from its annotation (``str``,
+  ``Dict[str, float]``, ``Dict[str, LightStage]``, ``List[Any]`` ...),
+- values that are already JSON-native (dicts, lists, str, numbers, bool,
+  None) are returned as they are: the walk only copies a container if
+  something below it has to change (excluded key, tuple, object). A plain
+  subtree therefore costs one pass and no allocations. The result shares
+  those subtrees with the live state, so treat it as read-only,
+- fields declared with ``metadata=NATIVE_JSON`` (ledgers and histories that
+  only OGB code writes, as plain JSON) are not walked at all; only their
+  top-level keys are filtered,
+- ``dumps``/``loads`` use ``orjson`` when it is installed (Home Assistant
+  ships it), otherwise the C encoder of ``json`` (compact output),
+- the file carries ``SCHEMA_KEY``; ``migrate`` runs the hooks registered
+  with ``register_migration`` from the file's version up to
+  ``SCHEMA_VERSION`` (files without the key are version 0).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import typing
+from datetime import date, datetime, time
+from enum import Enum
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:  # pragma: no cover - depends on the environment
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+SCHEMA_KEY = "_schemaVersion"
+
+# Nesting deeper than this is treated as a reference cycle
+MAX_DEPTH = 64
+
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+# Field metadata: the value is plain JSON below its top-level keys
+NATIVE_JSON = MappingProxyType({"stateCodec": "native"})
+_MISSING = object()
+
+Migration = Callable[[Dict[str, Any], str], Dict[str, Any]]
+MIGRATIONS: Dict[int, Migration] = {}
+
+
+def register_migration(from_version: int) -> Callable[[Migration], Migration]:
+    """Register ``func(data, room) -> data`` to upgrade a file of ``from_version``."""
+
+    def decorator(func: Migration) -> Migration:
+        MIGRATIONS[from_version] = func
+        return func
+
+    return decorator
+
+
+def migrate(data: Dict[str, Any], room: str = "") -> Dict[str, Any]:
+    """Pop the schema version from ``data`` and upgrade it to ``SCHEMA_VERSION``."""
+    version = data.pop(SCHEMA_KEY, 0)
+    if not isinstance(version, int) or version < 0:
+        _LOGGER.warning(f"[{room}] Invalid state schema version {version!r}, treating file as version 0")
+        version = 0
+    if version > SCHEMA_VERSION:
+        _LOGGER.warning(
+            f"[{room}] State file has schema version {version}, newer than {SCHEMA_VERSION}; loading what is known"
+        )
+    while version < SCHEMA_VERSION:
+        hook = MIGRATIONS.get(version)
+        if hook is not None:
+            _LOGGER.debug(f"[{room}] Migrating state from schema version {version}")
+            data = hook(data, room)
+        version += 1
+    return data
+
+
+def dumps(data: Any) -> bytes:
+    """UTF-8 JSON; indented with ``orjson``, compact with the ``json`` C encoder."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class StateCodec:
+    """Per-field encoders/decoders compiled from a state dataclass."""
+
+    def __init__(
+        self,
+        conf_cls: type,
+        exclude_keys: Iterable[str] = (),
+        transforms: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    ):
+        self.exclude_keys = frozenset(exclude_keys)
+        self.transforms = dict(transforms or {})
+        hints = typing.get_type_hints(conf_cls)
+        self.fields = [
+            field
+            for field in dataclasses.fields(conf_cls)
+            if not self.is_excluded(field.name)
+        ]
+        self.encoders = {field.name: self._compile_encoder(field, hints.get(field.name, Any)) for field in self.fields}
+        self.decoders = {field.name: self._compile_decoder(hints.get(field.name, Any)) for field in self.fields}
+
+    def is_excluded(self, key: str) -> bool:
+        return key in self.exclude_keys or key.startswith("_")
+
+    # -----------------------------------------------------------------
+    # Encoding
+    # -----------------------------------------------------------------
+
+    def encode(self, state: Any) -> Dict[str, Any]:
+        """JSON-serializable dict of all non-excluded fields of ``state``."""
+        result = {}
+        for field in self.fields:
+            name = field.name
+            try:
+                value = getattr(state, name)
+                if isinstance(value, dataclasses.Field):
+                    _LOGGER.warning(f"⚠️ Field '{name}' contains a dataclass.Field object, using default instead")
+                    value = _field_default(field)
+                transform = self.transforms.get(name)
+                if transform is not None:
+                    value = transform(value)
+                result[name] = self.encoders[name](value)
+            except Exception as e:
+                _LOGGER.warning(f"⚠️ Failed to serialize field '{name}': {e}")
+                result[name] = str(getattr(state, name, "N/A"))
+        return result
+
+    def _compile_encoder(self, field: dataclasses.Field, hint: Any) -> Callable[[Any], Any]:
+        if field.metadata.get("stateCodec") == "native":
+            def encode_native(value):
+                if value.__class__ is dict:
+                    if any(key.__class__ is str and self.is_excluded(key) for key in value):
+                        return {key: item for key, item in value.items() if not (key.__class__ is str and self.is_excluded(key))}
+                    return value
+                return value if value.__class__ is list else self.encode_value(value)
+            return encode_native
+
+        if hint in _SCALARS:
+            def encode_scalar(value):
+                return value if value.__class__ in _SCALARS else self.encode_value(value)
+            return encode_scalar
+
+        origin, args = typing.get_origin(hint), typing.get_args(hint)
+        if origin is dict and len(args) == 2 and dataclasses.is_dataclass(args[1]):
+            def encode_dataclass_map(value):
+                if value.__class__ is not dict:
+                    return self.encode_value(value)
+                return {
+                    str(key): self.encode_value(item)
+                    for key, item in value.items()
+                    if not (key.__class__ is str and self.is_excluded(key))
+                }
+            return encode_dataclass_map
+        return self.encode_value
+
+    def encode_value(self, value: Any, depth: int = 0, active: Optional[set] = None) -> Any:
+        """Encode any value; JSON-native subtrees are returned unchanged (no copy)."""
+        cls = value.__class__
+        if cls in _SCALARS:
+            return value
+        if depth > MAX_DEPTH:
+            return f"<circular reference to {cls.__name__}>"
+
+        if cls is dict:
+            exclude = self.exclude_keys
+            out = None
+            unchanged = 0
+            for key, item in value.items():
+                str_key = key.__class__ is str
+                if str_key and (key in exclude or key[:1] == "_"):
+                    if out is None:
+                        out = dict(islice(value.items(), unchanged))
+                    continue
+                encoded = item if item.__class__ in _SCALARS else self.encode_value(item, depth + 1, active)
+                if out is None:
+                    if str_key and encoded is item:
+                        unchanged += 1
+                        continue
+                    out = dict(islice(value.items(), unchanged))
+                out[key if str_key else str(key)] = encoded
+            return value if out is None else out
+
+        if cls is list:
+            out = None
+            for index, item in enumerate(value):
+                if item.__class__ in _SCALARS:
+                    if out is not None:
+                        out.append(item)
+                    continue
+                encoded = self.encode_value(item, depth + 1, active)
+                if out is None:
+                    if encoded is item:
+                        continue
+                    out = value[:index]
+                out.append(encoded)
+            return value if out is None else out
+
+        if isinstance(value, Enum):
+            return self.encode_value(value.value, depth + 1, active)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            # Tuples must become lists: str(tuple) corrupts on reload
+            return [self.encode_value(item, depth + 1, active) for item in value]
+        if isinstance(value, dict):
+            return self.encode_value(dict(value), depth, active)
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, (str, int, float)):
+            return value
+        return self._encode_object(value, depth, active)
+
+    def _encode_object(self, value: Any, depth: int, active: Optional[set]) -> Any:
+        active = set() if active is None else active
+        obj_id = id(value)
+        if obj_id in active:
+            return f"<circular reference to {type(value).__name__}>"
+        active.add(obj_id)
+        try:
+            if dataclasses.is_dataclass(value) and not isinstance(value, type):
+                return {
+                    field.name: self.encode_value(getattr(value, field.name), depth + 1, active)
+                    for field in dataclasses.fields(value)
+                    if not self.is_excluded(field.name)
+                }
+            if hasattr(value, "to_dict"):
+                try:
+                    return self.encode_value(value.to_dict(), depth + 1, active)
+                except Exception as e:
+                    _LOGGER.warning(f"to_dict() failed for {type(value).__name__}: {e}")
+                    return str(value)
+            if hasattr(value, "__dict__"):
+                return {
+                    key: self.encode_value(item, depth + 1, active)
+                    for key, item in vars(value).items()
+                    if not self.is_excluded(key)
+                }
+            return str(value)
+        except Exception:
+            return str(value)
+        finally:
+            active.discard(obj_id)
+
+    # -----------------------------------------------------------------
+    # Decoding
+    # -----------------------------------------------------------------
+
+    def decode(self, data: Dict[str, Any], room: str = "") -> Dict[str, Any]:
+        """Migrate ``data`` and check/coerce known fields; invalid values are dropped."""
+        data = migrate(data, room)
+        for key in list(data):
+            decoder = self.decoders.get(key)
+            if decoder is None:
+                continue
+            value = decoder(data[key])
+            if value is _MISSING:
+                _LOGGER.warning(f"[{room}] Invalid value for '{key}' in state file, keeping default")
+                del data[key]
+            else:
+                data[key] = value
+        return data
+
+    def _compile_decoder(self, hint: Any) -> Callable[[Any], Any]:
+        if hint is Any:
+            return _identity
+
+        origin, args = typing.get_origin(hint), typing.get_args(hint)
+        if origin is typing.Union:
+            inner = [arg for arg in args if arg is not type(None)]
+            decode_inner = self._compile_decoder(inner[0]) if len(inner) == 1 else _identity
+            return lambda value: None if value is None else decode_inner(value)
+
+        if hint is str:
+            return lambda value: value if isinstance(value, str) else _MISSING
+        if hint is bool:
+            return lambda value: value if isinstance(value, bool) else _MISSING
+        if hint in (int, float):
+            return lambda value, cast=hint: _coerce_number(value, cast)
+
+        if origin is dict or hint is dict:
+            value_hint = args[1] if len(args) == 2 else Any
+            if value_hint in (int, float):
+                return lambda value, cast=value_hint: _decode_number_map(value, cast)
+            if dataclasses.is_dataclass(value_hint):
+                return lambda value, cls=value_hint: _decode_dataclass_map(value, cls)
+            return lambda value: value if isinstance(value, dict) else _MISSING
+        if origin is list or hint is list:
+            return lambda value: value if isinstance(value, list) else _MISSING
+        if origin is tuple or hint is tuple:
+            return lambda value: tuple(value) if isinstance(value, list) else _MISSING
+        return _identity
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _field_default(field: dataclasses.Field) -> Any:
+    if field.default_factory is not dataclasses.MISSING:
+        return field.default_factory()
+    if field.default is not dataclasses.MISSING:
+        return field.default
+    return None
+
+
+def _coerce_number(value: Any, cast: type) -> Any:
+    if isinstance(value, bool):
+        return _MISSING
+    if isinstance(value, cast):
+        return value
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return _MISSING
+
+
+def _decode_number_map(value: Any, cast: type) -> Any:
+    if not isinstance(value, dict):
+        return _MISSING
+    result = {}
+    for key, item in value.items():
+        number = _coerce_number(item, cast)
+        if number is _MISSING:
+            _LOGGER.warning(f"Dropping invalid value for '{key}': {item!r}")
+            continue
+        result[key] = number
+    return result
+
+
+def _decode_dataclass_map(value: Any, cls: type) -> Any:
+    if not isinstance(value, dict):
+        return _MISSING
+    names = {field.name for field in dataclasses.fields(cls)}
+    result = {}
+    for key, item in value.items():
+        if isinstance(item, dict) and names.issuperset(item):
+            try:
+                result[key] = cls(**item)
+                continue
+            except TypeError:
+                pass
+        result[key] = item
+    return result
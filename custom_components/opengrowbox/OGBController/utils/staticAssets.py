@@ -0,0 +1,249 @@
+"""
+Content-hashed, precompressed frontend assets.
+
+``build_assets`` runs once per start in the executor and turns every file of
+the panel bundle into ``<name>.<hash>.<ext>`` plus ``.gz`` (and ``.br`` when
+the ``brotli`` package is available) next to it:
+
+- a ``manifest.json`` maps the source path to the hashed file, its hash and
+  the encodings that exist, so the panel URL can reference the hashed name
+  and the files can be cached forever (``immutable``),
+- a source whose size and mtime still match the manifest is not read again;
+  an unchanged bundle costs one ``stat`` per file on startup,
+- the same manifest records the hashes of assets copied to ``/config/www``
+  (``copy_asset``), which replaces the byte-by-byte compare.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+from aiohttp import hdrs, web
+
+try:  # pragma: no cover - depends on the environment
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def _stat_key(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def fingerprint(path: str, known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Hash of ``path``, reused from ``known`` while size and mtime are unchanged."""
+    key = _stat_key(path)
+    if known and known.get("hash") and all(known.get(k) == v for k, v in key.items()):
+        return {**key, "hash": known["hash"]}
+    return {**key, "hash": file_hash(path)}
+
+
+def hashed_name(rel_path: str, digest: str) -> str:
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest}{ext}"
+
+
+def load_manifest(build_dir: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(build_dir, MANIFEST_NAME), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        manifest = None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "assets": {}, "copies": {}}
+    manifest.setdefault("assets", {})
+    manifest.setdefault("copies", {})
+    return manifest
+
+
+def save_manifest(build_dir: str, manifest: Dict[str, Any]):
+    os.makedirs(build_dir, exist_ok=True)
+    path = os.path.join(build_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _compress(source: str, target: str, encoding: str):
+    with open(source, "rb") as handle:
+        data = handle.read()
+    if encoding == "br":
+        data = brotli.compress(data, quality=11)
+    else:
+        data = gzip.compress(data, compresslevel=9, mtime=0)
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, target)
+
+
+def available_encodings() -> List[str]:
+    return [encoding for encoding in ENCODINGS if encoding != "br" or brotli is not None]
+
+
+def build_assets(source_dir: str, build_dir: str) -> Dict[str, Any]:
+    """Bring ``build_dir`` in line with ``source_dir``; returns the manifest."""
+    manifest = load_manifest(build_dir)
+    previous = manifest["assets"]
+    assets: Dict[str, Any] = {}
+    encodings = available_encodings()
+
+    for root, _dirs, files in os.walk(source_dir):
+        for filename in sorted(files):
+            source = os.path.join(root, filename)
+            rel_path = os.path.relpath(source, source_dir).replace(os.sep, "/")
+            known = previous.get(rel_path)
+            entry = fingerprint(source, known)
+            entry["file"] = hashed_name(rel_path, entry["hash"])
+            target = os.path.join(build_dir, entry["file"])
+
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(source, f"{target}.tmp")
+                os.replace(f"{target}.tmp", target)
+            done = []
+            for encoding in encodings:
+                variant = target + ENCODINGS[encoding]
+                if not os.path.exists(variant):
+                    _compress(target, variant, encoding)
+                done.append(encoding)
+            entry["encodings"] = done
+            assets[rel_path] = entry
+
+            if known != entry:
+                _LOGGER.debug(f"Built frontend asset {rel_path} -> {entry['file']} ({', '.join(done)})")
+
+    manifest["assets"] = assets
+    _remove_stale(build_dir, assets)
+    save_manifest(build_dir, manifest)
+    return manifest
+
+
+def _remove_stale(build_dir: str, assets: Dict[str, Any]):
+    keep = {os.path.normpath(os.path.join(build_dir, MANIFEST_NAME))}
+    for entry in assets.values():
+        target = os.path.normpath(os.path.join(build_dir, entry["file"]))
+        keep.add(target)
+        keep.update(target + suffix for suffix in ENCODINGS.values())
+    for root, _dirs, files in os.walk(build_dir):
+        for filename in files:
+            path = os.path.normpath(os.path.join(root, filename))
+            if path not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def served_files(manifest: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Hashed file name -> available encodings; the only paths a view may serve."""
+    return {entry["file"]: list(entry.get("encodings", [])) for entry in manifest.get("assets", {}).values()}
+
+
+def choose_encoding(accept_encoding: Optional[str], available: List[str]) -> Optional[str]:
+    """Best of ``available`` the client accepts (``q=0`` excludes), None for identity."""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+async def serve_asset(
+    build_dir: str,
+    files: Dict[str, List[str]],
+    filename: str,
+    accept_encoding: Optional[str],
+) -> web.StreamResponse:
+    """Response for a hashed asset, precompressed if the client accepts it."""
+    encodings = files.get(filename)
+    if encodings is None:
+        raise web.HTTPNotFound()
+    path = os.path.join(build_dir, filename)
+    headers = {
+        hdrs.CACHE_CONTROL: CACHE_CONTROL,
+        hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        hdrs.CONTENT_TYPE: mimetypes.guess_type(filename)[0] or "application/octet-stream",
+    }
+    encoding = choose_encoding(accept_encoding, encodings)
+    if encoding:
+        path += ENCODINGS[encoding]
+        headers[hdrs.CONTENT_ENCODING] = encoding
+    return web.FileResponse(path, headers=headers)
+
+
+def copy_asset(source: str, destination: str, name: str, manifest: Dict[str, Any]) -> bool:
+    """Copy ``source`` to ``destination`` unless the recorded hashes say it is current."""
+    try:
+        if not os.path.exists(source):
+            return False
+        copies = manifest.setdefault("copies", {})
+        recorded = copies.get(destination) or {}
+        source_print = fingerprint(source, recorded.get("source"))
+
+        if os.path.exists(destination):
+            dest_print = recorded.get("destination") or {}
+            if dest_print.get("hash") == source_print["hash"] and all(
+                dest_print.get(k) == v for k, v in _stat_key(destination).items()
+            ):
+                copies[destination] = {"source": source_print, "destination": dest_print}
+                _LOGGER.debug("%s already exists at %s", name, destination)
+                return True
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(source, destination)
+        copies[destination] = {
+            "source": source_print,
+            "destination": {**_stat_key(destination), "hash": source_print["hash"]},
+        }
+        _LOGGER.debug("Copied %s to %s", name, destination)
+        return True
+    except Exception as err:
+        _LOGGER.warning("Could not copy %s to www: %s", name, err)
+        return False
@@ -0,0 +1,266 @@
+"""
+Shared outdoor weather cache.
+
+One service per ``hass`` (kept in ``hass.data``) fetches Open-Meteo data per
+location and shares it between all rooms:
+
+- concurrent requests for the same location wait on a single in-flight fetch,
+- a result is fresh for ``ttl`` seconds; after that the cached value is
+  returned right away while one background refresh runs
+  (stale-while-revalidate), up to ``max_stale`` seconds,
+- 429/502/connection backoff is tracked per location instead of per room,
+- rooms ``subscribe`` to a location and get every new result; a new
+  subscriber immediately receives the cached value, so rooms start warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_KEY = "opengrowbox_weather"
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+Location = Tuple[Optional[float], Optional[float]]
+
+
+def location_key(lat, lon) -> Location:
+    """Round to ~1km so rooms on the same install share one entry."""
+    if lat is None or lon is None:
+        return (None, None)
+    return (round(float(lat), 2), round(float(lon), 2))
+
+
+def get_weather_service(hass) -> "OGBWeatherService":
+    """The hass-wide weather service, created on first use."""
+    service = hass.data.get(DATA_KEY)
+    if service is None:
+        service = OGBWeatherService(hass)
+        hass.data[DATA_KEY] = service
+    return service
+
+
+@dataclass
+class WeatherEntry:
+    """Cached weather and fetch state of one location."""
+
+    key: Location
+    data: Optional[Dict[str, Any]] = None
+    fetched_at: float = 0.0
+    version: int = 0
+    retry_at: float = 0.0
+    backoff_429: float = 60
+    backoff_error: float = 120
+    inflight: Optional[asyncio.Task] = None
+    subscribers: List[Callable] = field(default_factory=list)
+
+
+class OGBWeatherService:
+    """Coalescing, TTL-based Open-Meteo client shared by all rooms."""
+
+    def __init__(
+        self,
+        hass,
+        ttl: float = 600,
+        max_stale: float = 3600,
+        base_url: str = OPEN_METEO_URL,
+        max_retries: int = 3,
+        timeout: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep=asyncio.sleep,
+    ):
+        self.hass = hass
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.clock = clock
+        self.sleep = sleep
+        self._entries: Dict[Location, WeatherEntry] = {}
+        self.stats = {"requests": 0, "fetches": 0, "hits": 0, "stale": 0, "coalesced": 0, "failures": 0}
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+
+    def peek(self, lat, lon) -> Optional[Dict[str, Any]]:
+        """Cached data if still usable, without fetching."""
+        entry = self._entries.get(location_key(lat, lon))
+        return self._usable(entry) if entry else None
+
+    async def get(self, lat, lon) -> Optional[Dict[str, Any]]:
+        """Weather for a location; fetches at most once per TTL for all rooms."""
+        entry = self._entry(lat, lon)
+        self.stats["requests"] += 1
+        now = self.clock()
+        age = now - entry.fetched_at
+
+        if entry.data is not None and age < self.ttl:
+            self.stats["hits"] += 1
+            return entry.data
+
+        if now < entry.retry_at:
+            _LOGGER.debug(f"🌤️ Weather {entry.key} in backoff for {int(entry.retry_at - now)}s")
+            return self._usable(entry)
+
+        if entry.data is not None and age < self.max_stale:
+            # Serve stale data now, refresh in the background
+            self.stats["stale"] += 1
+            self._refresh(entry)
+            return entry.data
+
+        return await asyncio.shield(self._refresh(entry))
+
+    def subscribe(self, lat, lon, callback: Callable[[Dict[str, Any]], Any]) -> Callable[[], None]:
+        """Call ``callback(data)`` on every new result; returns an unsubscribe function."""
+        entry = self._entry(lat, lon)
+        entry.subscribers.append(callback)
+
+        cached = self._usable(entry)
+        if cached is not None:
+            try:
+                asyncio.get_running_loop().create_task(self._deliver(callback, cached))
+            except RuntimeError:
+                pass
+
+        def unsubscribe():
+            if callback in entry.subscribers:
+                entry.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "locations": len(self._entries)}
+
+    # -----------------------------------------------------------------
+    # Internals
+    # -----------------------------------------------------------------
+
+    def _entry(self, lat, lon) -> WeatherEntry:
+        key = location_key(lat, lon)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = WeatherEntry(key)
+            self._entries[key] = entry
+        return entry
+
+    def _usable(self, entry: WeatherEntry) -> Optional[Dict[str, Any]]:
+        if entry.data is None or self.clock() - entry.fetched_at >= self.max_stale:
+            return None
+        return entry.data
+
+    def _refresh(self, entry: WeatherEntry) -> asyncio.Task:
+        if entry.inflight is not None and not entry.inflight.done():
+            self.stats["coalesced"] += 1
+            return entry.inflight
+        entry.inflight = asyncio.get_running_loop().create_task(self._fetch(entry))
+        return entry.inflight
+
+    async def _fetch(self, entry: WeatherEntry) -> Optional[Dict[str, Any]]:
+        self.stats["fetches"] += 1
+        try:
+            data = await self._request(entry)
+        except Exception as e:
+            _LOGGER.error(f"🌤️ Fetch Error Open-Meteo {entry.key}: {e}")
+            data = None
+            self._backoff(entry)
+
+        if data is None:
+            self.stats["failures"] += 1
+            return self._usable(entry)
+
+        current = data.get("current", {})
+        weather = {
+            "temperature": round(current.get("temperature_2m", 20.0), 1),
+            "humidity": current.get("relative_humidity_2m", 60),
+        }
+        entry.data = weather
+        entry.fetched_at = self.clock()
+        entry.version += 1
+        entry.retry_at = 0.0
+        entry.backoff_429 = 60
+        entry.backoff_error = 120
+        _LOGGER.debug(
+            f"🌤️ Open-Meteo {entry.key}: {weather['temperature']}°C, {weather['humidity']}% "
+            f"-> {len(entry.subscribers)} subscriber(s)"
+        )
+
+        for callback in list(entry.subscribers):
+            await self._deliver(callback, weather)
+        return weather
+
+    async def _deliver(self, callback, data):
+        try:
+            result = callback(data)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            _LOGGER.error(f"🌤️ Weather subscriber {callback} failed: {e}")
+
+    def _backoff(self, entry: WeatherEntry, rate_limited: bool = False):
+        now = self.clock()
+        if rate_limited:
+            entry.retry_at = now + entry.backoff_429
+            entry.backoff_429 = min(entry.backoff_429 * 2, 480)
+        else:
+            entry.retry_at = now + entry.backoff_error
+            entry.backoff_error = min(entry.backoff_error * 2, 900)
+
+    async def _request(self, entry: WeatherEntry) -> Optional[Dict[str, Any]]:
+        """Open-Meteo JSON, or None after a non-retryable error / exhausted retries."""
+        import aiohttp
+
+        lat, lon = entry.key
+        params = {
+            "latitude": str(lat),
+            "longitude": str(lon),
+            "current": "temperature_2m,relative_humidity_2m",
+            "timezone": "auto",
+        }
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    async with session.get(self.base_url, params=params) as response:
+                        if response.status == 200:
+                            return await response.json()
+
+                        if response.status == 429:
+                            _LOGGER.error(
+                                f"🌤️ Open-Meteo Rate Limited (429). Backing off for {entry.backoff_429}s"
+                            )
+                            self._backoff(entry, rate_limited=True)
+                            return None
+
+                        if response.status == 502 and attempt < self.max_retries:
+                            wait_time = 2 ** attempt  # 2s, 4s
+                            _LOGGER.warning(
+                                f"🌤️ Open-Meteo Server Error (502). "
+                                f"Retry {attempt}/{self.max_retries} in {wait_time}s"
+                            )
+                            await self.sleep(wait_time)
+                            continue
+
+                        _LOGGER.error(
+                            f"🌤️ Open-Meteo API Error: {response.status}. Next attempt in {entry.backoff_error}s"
+                        )
+                        self._backoff(entry)
+                        return None
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    _LOGGER.warning(f"🌤️ Open-Meteo connection error (attempt {attempt}): {e}")
+                    if attempt < self.max_retries:
+                        await self.sleep(2 ** attempt)
+                        continue
+                    self._backoff(entry)
+                    return None
+
+        return None
@@ -5,8 +5,11 @@ from datetime import timedelta
 from typing import Any
 import voluptuous as vol
 
+from homeassistant.core import callback
 from homeassistant.helpers.area_registry import \
     async_get as async_get_area_registry
+from homeassistant.helpers.entity_registry import \
+    async_get as async_get_entity_registry
 from homeassistant.helpers.service import SupportsResponse
 from homeassistant.helpers.update_coordinator import (DataUpdateCoordinator,
                                                       UpdateFailed)
@@ -15,11 +18,16 @@ from .const import DOMAIN
 from .OGBController.OGB import OpenGrowBox
 from .OGBController.RegistryListener import OGBRegistryEvenListener
 from .OGBController.utils.ambient import is_ambient_room
+from .OGBController.utils.startupGraph import StartupGraph
 from .select import OpenGrowBoxRoomSelector
 from .text import OpenGrowBoxAccessToken
 
 _LOGGER = logging.getLogger(__name__)
 
+# Upper bounds for the startup readiness gates (they normally open much earlier)
+ENTITY_READY_TIMEOUT = 10.0  # own platform entities registered
+STATE_READY_TIMEOUT = 5.0  # room device entities reporting a valid state
+
 
 class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Manage data for multiple hubs and global entities."""
@@ -31,9 +39,14 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.room_name = config_entry.data["room_name"]
 
         self.OGB = OpenGrowBox(hass, config_entry.data["room_name"], config_entry.entry_id)
-        self.is_ready = False
+        self._ready = asyncio.Event()
         self._started = False
 
+        # Startup readiness: platforms report their entities via platform_added()
+        self._added_platforms: set[str] = set()
+        self._platforms_changed = asyncio.Event()
+        self.startup_timings: dict[str, dict[str, Any]] = {}
+
         # Track background tasks for proper cleanup
         self._background_tasks: set[asyncio.Task] = set()
 
@@ -61,6 +74,65 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # Track the room selector update task
         self._create_background_task(self.update_room_selector())
 
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    @is_ready.setter
+    def is_ready(self, value: bool) -> None:
+        if value:
+            self._ready.set()
+        else:
+            self._ready.clear()
+
+    def platform_added(self, platform: str, entities) -> None:
+        """Called by each entity platform after async_add_entities."""
+        self.entities[platform] = list(entities)
+        self._added_platforms.add(platform)
+        self._platforms_changed.set()
+
+    def _missing_entities(self, entity_registry) -> list[str]:
+        """Platforms not yet set up and entities not yet in the entity registry."""
+        missing = [platform for platform in self.entities if platform not in self._added_platforms]
+        for platform, entities in self.entities.items():
+            for entity in entities:
+                unique_id = getattr(entity, "unique_id", None)
+                if unique_id and entity_registry.async_get_entity_id(platform, DOMAIN, unique_id) is None:
+                    missing.append(unique_id)
+        return missing
+
+    async def _async_wait_for_entities(self, timeout: float = ENTITY_READY_TIMEOUT) -> bool:
+        """Wait until all OGB platforms are added and their entities are registered."""
+        entity_registry = async_get_entity_registry(self.hass)
+        changed = self._platforms_changed
+
+        @callback
+        def _registry_updated(event):
+            changed.set()
+
+        remove = self.hass.bus.async_listen("entity_registry_updated", _registry_updated)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                changed.clear()
+                missing = self._missing_entities(entity_registry)
+                if not missing:
+                    return True
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    _LOGGER.warning(
+                        f"⚠️ {self.room_name}: {len(missing)} OGB platforms/entities not registered after {timeout}s "
+                        f"- continuing startup ({missing[:5]})"
+                    )
+                    return False
+                try:
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            remove()
+
     def _create_background_task(self, coro) -> asyncio.Task:
         """Create and track a background task for proper cleanup."""
         task = asyncio.create_task(coro)
@@ -179,15 +251,21 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         _LOGGER.debug(f"🚀 ============ STARTING OGB INTEGRATION FOR {self.room_name} ============")
         """
         Start the OpenGrowBox-Init.
+
+        Startup is a small dependency graph: stages start as soon as the stages
+        they depend on are done and wait on readiness events (own entities in
+        the entity registry, room entities reporting a state) instead of fixed
+        sleeps. Independent stages run concurrently; per-stage timings end up
+        in ``startup_timings``.
         """
         if self._started:
             return
         self._started = True
         self.is_ready = False
-        await asyncio.sleep(3)
-        try:
-            room = self.room_name.lower()
-            
+        room = self.room_name.lower()
+        discovered: dict[str, list] = {"ogb": [], "devices": []}
+
+        async def load_state():
             # CRITICAL: Load saved datastore state FIRST before managerInit
             # This ensures plant names, dates, mediums are restored BEFORE
             # entity values trigger MediumChange events that would create new empty mediums
@@ -195,16 +273,19 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             try:
                 await self.OGB.data_storeManager.async_init()
                 _LOGGER.debug(f"✅ {self.room_name}: Restored saved state from disk (async)")
-                if not is_ambient_room(self.room_name):
-                    if hasattr(self.OGB, 'wizard_manager') and self.OGB.wizard_manager:
-                        await self.OGB.wizard_manager.restore_active_plant_stage_config()
-                        _LOGGER.debug(f"✅ {self.room_name}: Restored active plant stage source")
-                else:
-                    _LOGGER.debug(f"ℹ️ {self.room_name}: Ambient room - skipping plant stage config restore")
             except Exception as e:
                 _LOGGER.warning(f"⚠️ {self.room_name}: Could not load saved state: {e}")
-            
-            # NOW initialize MediumManager with restored data BEFORE managerInit
+
+        async def restore_plant_stages():
+            if is_ambient_room(self.room_name):
+                _LOGGER.debug(f"ℹ️ {self.room_name}: Ambient room - skipping plant stage config restore")
+                return
+            if hasattr(self.OGB, 'wizard_manager') and self.OGB.wizard_manager:
+                await self.OGB.wizard_manager.restore_active_plant_stage_config()
+                _LOGGER.debug(f"✅ {self.room_name}: Restored active plant stage source")
+
+        async def init_mediums():
+            # Initialize MediumManager with restored data BEFORE managerInit
             # This way when MediumChange comes, it can properly sync instead of creating new
             # CRITICAL: Must call init() which loads from growMediums via _load_mediums_from_store()
             # NOT initialize_mediums_from_config() which loads from wrong path!
@@ -212,29 +293,32 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 await self.OGB.mediumManager.init()
                 media_count = len(self.OGB.mediumManager.media) if self.OGB.mediumManager.media else 0
                 _LOGGER.debug(f"🌱 {self.room_name}: MediumManager initialized with {media_count} restored mediums")
-            
-            # CRITICAL: Wait for entities to be registered in HA's entity registry
-            # This fixes the issue where newly created rooms don't find OGB entities
-            # because async_forward_entry_setups returns before entities are fully registered
-            await asyncio.sleep(2)
-            _LOGGER.debug(f"⏱️ {self.room_name}: Waited 2s for entities to be registered in registry")
-            
+
+        async def wait_for_states():
+            # Device entities of other integrations may still be loading during
+            # HA startup - wait for their first valid state (bounded)
+            entity_ids = self.OGB.registryListener.get_relevant_entity_ids(room)
+            invalid = await self.OGB.registryListener.async_wait_for_states(entity_ids, STATE_READY_TIMEOUT)
+            if invalid:
+                _LOGGER.debug(f"⏱️ {self.room_name}: {len(invalid)} of {len(entity_ids)} entities still without state")
+
+        async def discover():
+            # Values were awaited above - read them once, no retry loop
             groupedRoomEntities = (
-                await self.OGB.registryListener.get_filtered_entities_with_value(room, max_retries=10, retry_interval=0.5)
+                await self.OGB.registryListener.get_filtered_entities_with_value(room, max_retries=1, retry_interval=0)
             )
-
-            ogbGroup = [
+            discovered["ogb"] = [
                 group for group in groupedRoomEntities if "ogb" in group["name"].lower()
             ]
-            realDevices = [
+            discovered["devices"] = [
                 group
                 for group in groupedRoomEntities
                 if "ogb" not in group["name"].lower()
             ]
 
-            if ogbGroup:
+            if discovered["ogb"]:
                 _LOGGER.debug(
-                    f"✅ {self.room_name}: Found {len(ogbGroup)} OGB configuration groups"
+                    f"✅ {self.room_name}: Found {len(discovered['ogb'])} OGB configuration groups"
                 )
             else:
                 _LOGGER.warning(
@@ -242,69 +326,87 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     f"Initialization will proceed with default setup."
                 )
 
-            if not realDevices:
+            if not discovered["devices"]:
                 _LOGGER.warning(f"No devices found in room {self.room_name}")
 
-            if ogbGroup:
-                _LOGGER.debug(
-                    f"✅ {self.room_name}: Found {len(ogbGroup)} OGB configuration groups"
-                )
-                for group in ogbGroup:
-                    entity_count = len(group.get('entities', []))
-                    _LOGGER.debug(f"  📦 {group['name']}: {entity_count} entities")
-                ogbTasks = [self.OGB.managerInit(group) for group in ogbGroup]
-                ogbResults = await asyncio.gather(*ogbTasks, return_exceptions=True)
-                for group, result in zip(ogbGroup, ogbResults):
-                    if isinstance(result, Exception):
-                        _LOGGER.error(
-                            f"❌ {self.room_name}: OGB config group '{group.get('name', 'unknown')}' failed during init: {result}",
-                            exc_info=(type(result), result, result.__traceback__),
-                        )
-                _LOGGER.debug(f"✅ {self.room_name}: OGB configuration complete")
-            else:
+        async def init_managers():
+            ogbGroup = discovered["ogb"]
+            if not ogbGroup:
                 # New room or room without OGB entities - continue with device setup
                 _LOGGER.debug(f"ℹ️ {self.room_name}: Skipping OGB initialization (no OGB groups found)")
-
-            if realDevices:
-                self.OGB.dataStore.setDeep("workData.Devices", realDevices)
-                _LOGGER.debug(
-                    f"✅ {self.room_name}: Found {len(realDevices)} device groups"
-                )
-                for group in realDevices[:5]:  # Log first 5
-                    entity_count = len(group.get('entities', []))
-                    _LOGGER.debug(f"  🔌 {group['name']}: {entity_count} entities")
-                if len(realDevices) > 5:
-                    _LOGGER.debug(f"  ... and {len(realDevices) - 5} more device groups")
-                deviceTasks = [
-                    self.OGB.deviceManager.setupDevice(deviceGroup)
-                    for deviceGroup in realDevices
-                ]
-                deviceResults = await asyncio.gather(*deviceTasks, return_exceptions=True)
-                for deviceGroup, result in zip(realDevices, deviceResults):
-                    if isinstance(result, Exception):
-                        _LOGGER.error(
-                            f"❌ {self.room_name}: Device '{deviceGroup.get('name', 'unknown')}' failed during init: {result}",
-                            exc_info=(type(result), result, result.__traceback__),
-                        )
-                _LOGGER.debug(f"✅ {self.room_name}: Device initialization complete")
-
-                # CRITICAL: Start periodic device refresh AFTER initial setup is complete
-                # This prevents race condition where DeviceUpdater runs before
-                # devices are fully initialized, causing duplicate creation
-                if hasattr(self.OGB, 'deviceManager') and self.OGB.deviceManager:
-                    self.OGB.deviceManager.start_periodic_refresh()
-                    _LOGGER.debug(f"✅ {self.room_name}: Periodic device refresh started")
-            else:
+                return
+            for group in ogbGroup:
+                entity_count = len(group.get('entities', []))
+                _LOGGER.debug(f"  📦 {group['name']}: {entity_count} entities")
+            ogbTasks = [self.OGB.managerInit(group) for group in ogbGroup]
+            ogbResults = await asyncio.gather(*ogbTasks, return_exceptions=True)
+            for group, result in zip(ogbGroup, ogbResults):
+                if isinstance(result, Exception):
+                    _LOGGER.error(
+                        f"❌ {self.room_name}: OGB config group '{group.get('name', 'unknown')}' failed during init: {result}",
+                        exc_info=(type(result), result, result.__traceback__),
+                    )
+            _LOGGER.debug(f"✅ {self.room_name}: OGB configuration complete")
+
+        async def init_devices():
+            realDevices = discovered["devices"]
+            if not realDevices:
                 _LOGGER.warning(f"⚠️ {self.room_name}: No devices found.")
-
-            _LOGGER.debug(f"🎉 {self.room_name}: OpenGrowBox initialization completed!")
-
+                return
+            self.OGB.dataStore.setDeep("workData.Devices", realDevices)
+            _LOGGER.debug(
+                f"✅ {self.room_name}: Found {len(realDevices)} device groups"
+            )
+            for group in realDevices[:5]:  # Log first 5
+                entity_count = len(group.get('entities', []))
+                _LOGGER.debug(f"  🔌 {group['name']}: {entity_count} entities")
+            if len(realDevices) > 5:
+                _LOGGER.debug(f"  ... and {len(realDevices) - 5} more device groups")
+            deviceTasks = [
+                self.OGB.deviceManager.setupDevice(deviceGroup)
+                for deviceGroup in realDevices
+            ]
+            deviceResults = await asyncio.gather(*deviceTasks, return_exceptions=True)
+            for deviceGroup, result in zip(realDevices, deviceResults):
+                if isinstance(result, Exception):
+                    _LOGGER.error(
+                        f"❌ {self.room_name}: Device '{deviceGroup.get('name', 'unknown')}' failed during init: {result}",
+                        exc_info=(type(result), result, result.__traceback__),
+                    )
+            _LOGGER.debug(f"✅ {self.room_name}: Device initialization complete")
+
+            # CRITICAL: Start periodic device refresh AFTER initial setup is complete
+            # This prevents race condition where DeviceUpdater runs before
+            # devices are fully initialized, causing duplicate creation
+            if hasattr(self.OGB, 'deviceManager') and self.OGB.deviceManager:
+                self.OGB.deviceManager.start_periodic_refresh()
+                _LOGGER.debug(f"✅ {self.room_name}: Periodic device refresh started")
+
+        async def signal_orchestrator():
             # CRITICAL: Signal orchestrator that initialization is complete
             # This allows the orchestrator's control loop to start safely
             if hasattr(self.OGB, 'orchestrator') and self.OGB.orchestrator:
                 self.OGB.orchestrator.mark_initialization_complete()
                 _LOGGER.debug(f"✅ {self.room_name}: Orchestrator signaled initialization complete")
 
+        # Device setup stays after managerInit: devices read the OGB settings it restores
+        graph = (
+            StartupGraph(f"{self.room_name} startup")
+            .add("entities", self._async_wait_for_entities)
+            .add("state", load_state)
+            .add("plant_stages", restore_plant_stages, after=["state"])
+            .add("mediums", init_mediums, after=["state"])
+            .add("entity_states", wait_for_states, after=["entities"])
+            .add("discovery", discover, after=["entity_states"])
+            .add("managers", init_managers, after=["plant_stages", "mediums"], required=["discovery"])
+            .add("devices", init_devices, after=["managers"], required=["discovery"])
+            .add("orchestrator", signal_orchestrator, after=["devices"])
+        )
+        try:
+            await graph.run()
+            self.startup_timings = graph.timings()
+            _LOGGER.debug(f"⏱️ {graph.summary()}")
+            _LOGGER.debug(f"🎉 {self.room_name}: OpenGrowBox initialization completed!")
         except Exception as e:
             _LOGGER.error(
                 f"Error during OpenGrowBox initialization in room '{self.room_name}': {e}",
@@ -329,12 +431,7 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def wait_until_ready_and_start_monitoring(self):
         _LOGGER.debug("Waiting for OpenGrowBox to be ready...")
-        attempt = 0
-        while not self.is_ready:
-            attempt += 1
-            if attempt % 10 == 0:  # Alle 10 Versuche loggen
-                _LOGGER.debug("Still waiting for OpenGrowBox to be ready...")
-            await asyncio.sleep(0.1)
+        await self._ready.wait()
         _LOGGER.debug("OpenGrowBox is ready. Starting monitoring...")
 
         await self.OGB.first_start()
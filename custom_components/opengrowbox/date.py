@@ -140,6 +140,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     hass.data[DOMAIN]["dates"].extend(dates)
 
     async_add_entities(dates)
+    coordinator.platform_added("date", dates)
 
     if not hass.services.has_service(DOMAIN, "update_date"):
 
@@ -0,0 +1,41 @@
+"""Diagnostics support for OpenGrowBox."""
+
+import logging
+from typing import Any
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry) -> dict[str, Any]:
+    """Return control loop diagnostics for a room config entry.
+
+    Contains orchestrator statistics, the VPD evaluation cache hit rate and
+    the profiler histograms. Enable the profiler via the console ('profiler
+    on') before downloading to get per-stage latencies; without it only the
+    loop statistics are filled.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(config_entry.entry_id)
+    if coordinator is None:
+        return {"error": "Room not loaded"}
+
+    ogb = coordinator.OGB
+    diagnostics: dict[str, Any] = {"room": coordinator.room_name}
+
+    try:
+        diagnostics["orchestrator"] = ogb.orchestrator.get_statistics()
+    except Exception as e:
+        _LOGGER.error(f"Diagnostics: orchestrator statistics failed: {e}")
+
+    try:
+        diagnostics["vpd_evaluation"] = ogb.vpd_manager.eval_memo.get_stats()
+    except Exception as e:
+        _LOGGER.error(f"Diagnostics: VPD evaluation cache stats failed: {e}")
+
+    try:
+        diagnostics["profiler"] = ogb.eventManager.get_profile()
+    except Exception as e:
+        _LOGGER.error(f"Diagnostics: profiler snapshot failed: {e}")
+
+    return diagnostics
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
-import filecmp
 import logging
 import os
-import shutil
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from aiohttp import hdrs, web
 from homeassistant.components.frontend import (
     add_extra_js_url,
     async_register_built_in_panel,
 )
+from homeassistant.components.http import HomeAssistantView
 
 from .const import DOMAIN, FRONTEND_EXTRA_MODULE_URL, URL_BASE
+from .OGBController.utils.staticAssets import (
+    build_assets,
+    copy_asset,
+    load_manifest,
+    save_manifest,
+    serve_asset,
+    served_files,
+)
 from .OGBController.utils.workarounds import async_register_static_path
 
 if TYPE_CHECKING:
@@ -24,44 +32,73 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 _LOVELACE_RESOURCE_URL = FRONTEND_EXTRA_MODULE_URL
 _LOVELACE_RESOURCE_TYPE = "module"
+_PANEL_BUNDLE = "static/js/main.js"
+_ASSETS_URL = f"{URL_BASE}/assets"
+_ASSETS_VIEW_KEY = f"{DOMAIN}_frontend_assets_view"
+
+
+class OGBFrontendAssetView(HomeAssistantView):
+    """Serve content-hashed panel files with immutable caching and precompression."""
+
+    requires_auth = False
+    url = _ASSETS_URL + "/{filename:.+}"
+    name = "opengrowbox:frontend_assets"
+
+    def __init__(self, build_dir: str, manifest: Dict[str, Any]) -> None:
+        self.build_dir = build_dir
+        self.files = served_files(manifest)
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        return await serve_asset(
+            self.build_dir,
+            self.files,
+            filename,
+            request.headers.get(hdrs.ACCEPT_ENCODING),
+        )
 
 
 async def async_register_frontend(hass: HomeAssistant) -> None:
-    static_path = os.path.join(
-        hass.config.path("custom_components"), "opengrowbox", "frontend", "static"
+    frontend_path = os.path.join(
+        hass.config.path("custom_components"), "opengrowbox", "frontend"
     )
+    static_path = os.path.join(frontend_path, "static")
+    build_path = os.path.join(frontend_path, "build")
 
     static_path_exists = await hass.async_add_executor_job(os.path.exists, static_path)
     if not static_path_exists:
         _LOGGER.error("Static path not found: %s", static_path)
         return
 
+    # Unhashed URLs stay available for panels opened before an update
     await async_register_static_path(
         hass, f"{URL_BASE}/static", static_path, cache_headers=False
     )
 
-    icon_js_src = os.path.join(
-        hass.config.path("custom_components"), "opengrowbox", "frontend", "ogb_icons.js"
-    )
     www_opengrowbox_path = os.path.join(hass.config.path("www"), "opengrowbox")
     icon_js_dest = os.path.join(www_opengrowbox_path, "ogb_icons.js")
+    png_dest = os.path.join(www_opengrowbox_path, "ogb_tree.png")
 
-    icon_js_ready = await _async_copy_frontend_asset(
-        hass,
-        icon_js_src,
-        icon_js_dest,
-        "ogb_icons.js",
+    manifest, copied = await hass.async_add_executor_job(
+        _prepare_frontend_assets,
+        static_path,
+        build_path,
+        [
+            (os.path.join(frontend_path, "ogb_icons.js"), icon_js_dest, "ogb_icons.js"),
+            (os.path.join(frontend_path, "ogb_tree.png"), png_dest, "ogb_tree.png"),
+        ],
     )
-    if icon_js_ready:
+
+    if copied.get("ogb_icons.js"):
         _register_global_frontend_module(hass, _LOVELACE_RESOURCE_URL)
         await _async_register_lovelace_resource(hass, _LOVELACE_RESOURCE_URL)
 
-    png_src = os.path.join(
-        hass.config.path("custom_components"), "opengrowbox", "frontend", "ogb_tree.png"
-    )
-    png_dest = os.path.join(www_opengrowbox_path, "ogb_tree.png")
-
-    await _async_copy_frontend_asset(hass, png_src, png_dest, "ogb_tree.png")
+    js_url = f"{URL_BASE}/static/{_PANEL_BUNDLE}"
+    bundle = (manifest or {}).get("assets", {}).get(_PANEL_BUNDLE)
+    if bundle:
+        if _ASSETS_VIEW_KEY not in hass.data:
+            hass.data[_ASSETS_VIEW_KEY] = OGBFrontendAssetView(build_path, manifest)
+            hass.http.register_view(hass.data[_ASSETS_VIEW_KEY])
+        js_url = f"{_ASSETS_URL}/{bundle['file']}"
 
     sidebar_icon = "custom:ogb_tree"
 
@@ -79,7 +116,7 @@ async def async_register_frontend(hass: HomeAssistant) -> None:
                     "mode": "shadow-dom",
                     "embed_iframe": False,
                     "trust_external": False,
-                    "js_url": f"{URL_BASE}/static/static/js/main.js",
+                    "js_url": js_url,
                 }
             },
             require_admin=False,
@@ -89,42 +126,28 @@ async def async_register_frontend(hass: HomeAssistant) -> None:
         _LOGGER.debug("Custom panel already registered.")
 
 
-async def _async_copy_frontend_asset(
-    hass: HomeAssistant,
-    source: str,
-    destination: str,
-    name: str,
-) -> bool:
-    """Copy a frontend asset from an executor to avoid blocking the event loop."""
-    return await hass.async_add_executor_job(
-        _copy_frontend_asset,
-        source,
-        destination,
-        name,
-    )
-
-
-def _copy_frontend_asset(source: str, destination: str, name: str) -> bool:
-    """Copy a frontend asset into /config/www when missing or outdated."""
+def _prepare_frontend_assets(
+    static_path: str,
+    build_path: str,
+    copies: List[Tuple[str, str, str]],
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, bool]]:
+    """Build hashed/precompressed assets and copy www assets (runs in the executor)."""
     try:
-        if not os.path.exists(source):
-            return False
-
-        os.makedirs(os.path.dirname(destination), exist_ok=True)
-        if os.path.exists(destination) and filecmp.cmp(
-            source,
-            destination,
-            shallow=False,
-        ):
-            _LOGGER.debug("%s already exists at %s", name, destination)
-            return True
-
-        shutil.copy2(source, destination)
-        _LOGGER.debug("Copied %s to %s", name, destination)
-        return True
+        manifest = build_assets(static_path, build_path)
     except Exception as err:
-        _LOGGER.warning("Could not copy %s to www: %s", name, err)
-        return False
+        _LOGGER.warning("Could not build hashed frontend assets, serving unhashed files: %s", err)
+        manifest = None
+
+    copy_manifest = manifest if manifest is not None else load_manifest(build_path)
+    copied = {
+        name: copy_asset(source, destination, name, copy_manifest)
+        for source, destination, name in copies
+    }
+    try:
+        save_manifest(build_path, copy_manifest)
+    except OSError as err:
+        _LOGGER.debug("Could not save frontend asset manifest: %s", err)
+    return manifest, copied
 
 
 def _register_global_frontend_module(
@@ -1535,3 +1535,4 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     hass.data[DOMAIN]["numbers"].extend(numbers)
     async_add_entities(numbers)
+    coordinator.platform_added("number", numbers)
@@ -556,6 +556,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     hass.data[DOMAIN]["selects"].extend(selects)
 
     async_add_entities(selects)
+    coordinator.platform_added("select", selects)
 
     if not hass.services.has_service(DOMAIN, "add_select_options"):
 
@@ -1,7 +1,7 @@
 import logging
 
 import voluptuous as vol
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -161,6 +161,52 @@ class CustomSensor(RestoreEntity):
             )
 
 
+class ProfilerSensor(CustomSensor):
+    """Diagnostic sensor exposing the control loop profiler.
+
+    State is the p95 event-loop lag in ms; attributes carry the slowest
+    stages. Only updated while the profiler is enabled (console: profiler on).
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, name, room_name, coordinator):
+        super().__init__(
+            name,
+            room_name,
+            coordinator,
+            initial_value=None,
+            device_class=None,
+            should_restore=False,
+            unit_of_measurement="ms",
+        )
+        self._profile = {}
+
+    @property
+    def state_class(self):
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        attributes = {"room_name": self.room_name}
+        if self._profile:
+            attributes.update(
+                {
+                    "enabled": self._profile.get("enabled"),
+                    "loop_lag": self._profile.get("loop_lag"),
+                    "tasks": self._profile.get("tasks"),
+                    "spans": self._profile.get("spans"),
+                    "listeners": self._profile.get("listeners"),
+                }
+            )
+        return attributes
+
+    def update_profile(self, profile: dict):
+        """Store the latest profiler snapshot and publish the lag percentile."""
+        self._profile = profile or {}
+        self.update_state(self._profile.get("loop_lag", {}).get("p95_ms"))
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up sensor entities."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
@@ -187,6 +233,13 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             # Don't prevent setup, but log the limitation
             # In a full implementation, you might want to fire an event or show UI notification
 
+    # Diagnostic sensor fed by ProfilerUpdate while the profiler is enabled
+    profiler_sensor = ProfilerSensor(
+        f"OGB_ControlLoopProfile_{coordinator.room_name}",
+        coordinator.room_name,
+        coordinator,
+    )
+
     # Create all sensors in a single array
     sensors = [
         # VPD Sensors
@@ -430,6 +483,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             should_restore=True,
             unit_of_measurement="ml/L",
         ),
+        profiler_sensor,
     ]
 
     # Register the sensors globally in hass.data
@@ -440,6 +494,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     # Add entities to Home Assistant
     async_add_entities(sensors)
+    coordinator.platform_added("sensor", sensors)
 
     # update_sensor service is registered centrally in __init__.py so it is
     # available before the sensor platform loads. The sensor list is populated
@@ -658,8 +713,16 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         except Exception as e:
             _LOGGER.error(f"❌ Error handling EnergyUpdate event: {e}")
 
+    async def handle_profiler_update(profile):
+        """Handle periodic ProfilerUpdate snapshots from OGBEventManager."""
+        try:
+            profiler_sensor.update_profile(profile)
+        except Exception as e:
+            _LOGGER.error(f"❌ Error handling ProfilerUpdate event: {e}")
+
     # Register event listener with coordinator's event manager
     try:
+        coordinator.OGB.eventManager.on("ProfilerUpdate", handle_profiler_update)
         coordinator.OGB.eventManager.on("EnergyUpdate", handle_energy_update)
         _LOGGER.debug(f"✅ Registered EnergyUpdate event listener for room: {coordinator.room_name}")
     except Exception as e:
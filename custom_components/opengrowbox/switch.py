@@ -179,6 +179,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     # Add entities to Home Assistant
     async_add_entities(switches)
+    coordinator.platform_added("switch", switches)
 
     # Register a global service for toggling switch states if not already registered
     if not hass.services.has_service(DOMAIN, "toggle_switch"):
@@ -163,6 +163,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
 
     hass.data[DOMAIN]["texts"].extend(texts)
     async_add_entities(texts)
+    coordinator.platform_added("text", texts)
 
     if not hass.services.has_service(DOMAIN, "update_text"):
 
@@ -135,6 +135,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     hass.data[DOMAIN]["times"].extend(times)
     async_add_entities(times)
+    coordinator.platform_added("time", times)
 
     if not hass.services.has_service(DOMAIN, "update_time"):
 
@@ -11,11 +11,10 @@ from __future__ import annotations
 
 import logging
 import os
-import shutil
 import tempfile
-import zipfile
 from datetime import timedelta
 
+import aiohttp
 from homeassistant.components.update import UpdateEntity, UpdateEntityFeature
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
@@ -31,6 +30,13 @@ from .const import (
     VERSION,
 )
 from .naming import global_device_info
+from .OGBController.utils.releaseInstaller import (
+    DEFAULT_CHUNK_SIZE,
+    ReleaseInstallError,
+    download_release,
+    install_release,
+    parse_checksum,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +44,10 @@ SCAN_INTERVAL = timedelta(hours=6)
 
 _NOTIFICATION_ID = "opengrowbox_update_installed"
 
+# Share of the progress bar used by the download; the rest is extraction
+_DOWNLOAD_SHARE = 80
+_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
 
 class OGBUpdateEntity(UpdateEntity):
     """Update entity that checks and installs OpenGrowBox GitHub releases."""
@@ -45,7 +55,9 @@ class OGBUpdateEntity(UpdateEntity):
     _attr_has_entity_name = False
     _attr_name = "OpenGrowBox Update"
     _attr_supported_features = (
-        UpdateEntityFeature.INSTALL | UpdateEntityFeature.RELEASE_NOTES
+        UpdateEntityFeature.INSTALL
+        | UpdateEntityFeature.RELEASE_NOTES
+        | UpdateEntityFeature.PROGRESS
     )
 
     def __init__(self, hass: HomeAssistant, config_entry) -> None:
@@ -56,6 +68,8 @@ class OGBUpdateEntity(UpdateEntity):
         self._attr_installed_version = VERSION
         self._attr_latest_version = VERSION
         self._release_notes: str | None = None
+        self._attr_in_progress = False
+        self._attr_update_percentage = None
 
     @property
     def device_info(self):
@@ -105,27 +119,64 @@ class OGBUpdateEntity(UpdateEntity):
         return self._release_notes
 
     async def async_install(self, version: str | None, backup: bool, **kwargs) -> None:
-        """Download the release asset and install it over the running integration."""
+        """Stream the release asset to disk, verify it and install it over the running integration."""
         target_version = version or self._attr_latest_version
         session = async_get_clientsession(self.hass)
 
-        asset_url = await self._resolve_asset_url(session, target_version)
+        asset_url, checksum = await self._resolve_asset(session, target_version)
         if not asset_url:
             raise HomeAssistantError(
                 f"Release asset '{RELEASE_ASSET_NAME}' for version {target_version} "
                 "was not found."
             )
+        if not checksum:
+            _LOGGER.warning(
+                "No checksum published for %s %s; installing without verification",
+                RELEASE_ASSET_NAME,
+                target_version,
+            )
 
-        async with session.get(asset_url, timeout=60) as response:
-            if response.status != 200:
-                raise HomeAssistantError(
-                    f"Download of {RELEASE_ASSET_NAME} failed "
-                    f"(HTTP {response.status})."
-                )
-            payload = await response.read()
-
-        await self.hass.async_add_executor_job(self._install_payload, payload)
+        integration_dir = os.path.dirname(os.path.abspath(__file__))
+        # Next to the integration instead of /tmp, which is RAM-backed on many Pis
+        fd, archive_path = await self.hass.async_add_executor_job(
+            lambda: tempfile.mkstemp(
+                prefix=".opengrowbox_", suffix=".zip", dir=os.path.dirname(integration_dir)
+            )
+        )
+        await self.hass.async_add_executor_job(os.close, fd)
 
+        self._set_progress(0)
+        try:
+            await download_release(
+                session,
+                asset_url,
+                archive_path,
+                expected_sha256=checksum,
+                progress=self._download_progress,
+                executor=self.hass.async_add_executor_job,
+                timeout=_DOWNLOAD_TIMEOUT,
+            )
+            stats = await self.hass.async_add_executor_job(
+                install_release,
+                archive_path,
+                integration_dir,
+                DEFAULT_CHUNK_SIZE,
+                self._install_progress,
+            )
+        except ReleaseInstallError as err:
+            raise HomeAssistantError(
+                f"Installing {RELEASE_ASSET_NAME} {target_version} failed: {err}"
+            ) from err
+        finally:
+            await self.hass.async_add_executor_job(_remove_file, archive_path)
+            self._set_progress(None)
+
+        _LOGGER.info(
+            "OpenGrowBox %s installed (%s files written, %s unchanged)",
+            target_version,
+            stats["extracted"],
+            stats["unchanged"],
+        )
         self._attr_installed_version = target_version
         self.async_write_ha_state()
 
@@ -143,63 +194,73 @@ class OGBUpdateEntity(UpdateEntity):
             blocking=False,
         )
 
-    async def _resolve_asset_url(self, session, version: str) -> str | None:
-        """Look up the download URL of the release asset for the given version."""
+    def _set_progress(self, percentage: int | None) -> None:
+        """Publish install progress; only whole-percent changes write state."""
+        in_progress = percentage is not None
+        if (
+            in_progress == self._attr_in_progress
+            and percentage == self._attr_update_percentage
+        ):
+            return
+        self._attr_in_progress = in_progress
+        self._attr_update_percentage = percentage
+        if self.hass is not None and self.entity_id:
+            self.async_write_ha_state()
+
+    def _download_progress(self, done: int, total: int | None) -> None:
+        if total:
+            self._set_progress(min(_DOWNLOAD_SHARE, done * _DOWNLOAD_SHARE // total))
+
+    def _install_progress(self, done: int, total: int | None) -> None:
+        """Called from the executor thread during extraction."""
+        if total:
+            percentage = _DOWNLOAD_SHARE + done * (100 - _DOWNLOAD_SHARE) // total
+            self.hass.loop.call_soon_threadsafe(self._set_progress, min(99, percentage))
+
+    async def _resolve_asset(self, session, version: str) -> tuple[str | None, str | None]:
+        """Look up the download URL and published SHA-256 of the release asset."""
         url = GITHUB_RELEASES_TAG_API.format(version=version)
         try:
             async with session.get(url, timeout=15) as response:
                 if response.status != 200:
-                    return None
+                    return None, None
                 data = await response.json()
         except Exception as err:  # noqa: BLE001
             _LOGGER.error(
                 "Release lookup for version %s failed: %s", version, err
             )
-            return None
-
-        for asset in data.get("assets", []):
-            if asset.get("name") == RELEASE_ASSET_NAME:
-                return asset.get("browser_download_url")
-        return None
-
-    def _install_payload(self, payload: bytes) -> None:
-        """Extract the release zip and atomically swap it into custom_components (blocking)."""
-        integration_dir = os.path.dirname(os.path.abspath(__file__))
-        components_dir = os.path.dirname(integration_dir)
-        staging_dir = tempfile.mkdtemp(prefix="opengrowbox_update_")
-        old_dir = os.path.join(components_dir, "opengrowbox.old")
-        tmp_zip_path = None
+            return None, None
 
-        try:
-            if os.path.exists(old_dir):
-                shutil.rmtree(old_dir)
-
-            with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp_zip:
-                tmp_zip.write(payload)
-                tmp_zip_path = tmp_zip.name
-
-            with zipfile.ZipFile(tmp_zip_path) as archive:
-                archive.extractall(staging_dir)
+        assets = {asset.get("name"): asset for asset in data.get("assets", [])}
+        asset = assets.get(RELEASE_ASSET_NAME)
+        if not asset:
+            return None, None
 
-            extracted_dir = os.path.join(staging_dir, "opengrowbox")
-            if not os.path.isdir(extracted_dir):
+        # GitHub publishes "sha256:<hex>" per asset; older releases ship a .sha256 file
+        checksum = parse_checksum(asset.get("digest"))
+        checksum_asset = assets.get(f"{RELEASE_ASSET_NAME}.sha256")
+        if not checksum and checksum_asset:
+            try:
+                async with session.get(
+                    checksum_asset.get("browser_download_url"), timeout=15
+                ) as response:
+                    if response.status == 200:
+                        checksum = parse_checksum(await response.text())
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Checksum download for %s failed: %s", version, err)
+            if not checksum:
+                # A published but unreadable checksum must not silently downgrade to no check
                 raise HomeAssistantError(
-                    "Release archive does not contain an 'opengrowbox' folder."
+                    f"Checksum for {RELEASE_ASSET_NAME} {version} could not be read."
                 )
+        return asset.get("browser_download_url"), checksum
 
-            os.rename(integration_dir, old_dir)
-            try:
-                shutil.move(extracted_dir, integration_dir)
-            except Exception:
-                # Roll back so Home Assistant keeps running the previous version.
-                os.rename(old_dir, integration_dir)
-                raise
 
-            shutil.rmtree(old_dir, ignore_errors=True)
-        finally:
-            shutil.rmtree(staging_dir, ignore_errors=True)
-            if tmp_zip_path and os.path.exists(tmp_zip_path):
-                os.unlink(tmp_zip_path)
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities) -> None:
@@ -0,0 +1,153 @@
+import pytest
+
+from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBPublications import (
+    OGBActionPublication,
+)
+from custom_components.opengrowbox.OGBController.managers import OGBActionManager as action_manager_module
+from custom_components.opengrowbox.OGBController.managers.OGBActionManager import (
+    OGBActionManager,
+)
+from custom_components.opengrowbox.OGBController.utils.actionIndex import (
+    ActionIndex,
+    ConflictGraph,
+    build_action_records,
+)
+
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+
+
+def _action(cap, action, priority="medium", message="test", value=None):
+    return OGBActionPublication(
+        Name="room", message=message, capability=cap, action=action, priority=priority, value=value
+    )
+
+
+def test_index_tracks_present_and_duplicate_capabilities():
+    actions = [
+        _action("canHeat", "Increase", "low"),
+        _action("canExhaust", "Reduce"),
+        _action("canHeat", "Increase", "high"),
+        _action("canHeat", "Increase", "high", message="later"),
+    ]
+    index = ActionIndex(actions)
+
+    assert index.with_capability == 4
+    assert bin(index.present).count("1") == 2
+    assert bin(index.multi).count("1") == 1
+    dedup = index.deduplicated()
+    # First-occurrence order, highest priority, equal priority keeps the later one
+    assert [a.capability for a in dedup] == ["canHeat", "canExhaust"]
+    assert dedup[0].message == "later"
+
+
+def test_conflict_graph_skips_rooms_without_conflicting_capabilities():
+    graph = ConflictGraph([("canHeat", "Increase", "canCool", "Increase")])
+    actions = [_action("canExhaust", "Increase"), _action("canLight", "Increase")]
+    index = ActionIndex(actions)
+
+    assert index.present & graph.mask == 0
+    assert index.without_conflicts(graph) == actions
+
+
+def test_pair_and_intra_capability_conflicts():
+    graph = ConflictGraph([("canHeat", "Increase", "canCool", "Increase")])
+    actions = [
+        _action("canHeat", "Increase", "medium"),
+        _action("canCool", "Increase", "high"),
+        _action("canExhaust", "Increase", "medium"),
+        _action("canExhaust", "Reduce", "medium", message="Bounds: too cold"),
+    ]
+    kept = ActionIndex(actions).without_conflicts(graph, "room")
+
+    assert [(a.capability, a.action) for a in kept] == [
+        ("canCool", "Increase"),
+        ("canExhaust", "Reduce"),
+    ]
+
+
+def test_resolved_matches_conflict_removal_then_dedup():
+    graph = ConflictGraph([("canHeat", "Increase", "canCool", "Increase")])
+    actions = [
+        _action("canExhaust", "Increase", "high"),
+        _action("canHeat", "Increase", "medium"),
+        _action("canCool", "Increase", "high"),
+        _action("canExhaust", "Reduce", "medium"),
+        _action("canExhaust", "Increase", "high", message="later"),
+        _action(None, "Eval"),
+    ]
+    index = ActionIndex(actions)
+    resolved = index.resolved(graph, "room")
+
+    assert resolved == ActionIndex(index.without_conflicts(graph)).deduplicated() + [actions[-1]]
+    assert [(a.capability, a.action, a.message) for a in resolved[:2]] == [
+        ("canExhaust", "Increase", "later"),
+        ("canCool", "Increase", "test"),
+    ]
+
+
+def test_records_share_one_pass_for_history_payload_and_events():
+    actions = [
+        _action("canWindow", "Increase", "high", message="open"),
+        _action("canHeat", "Reduce", None, value=40),
+        _action("canPump", "Increase"),
+    ]
+    history, commands, events = build_action_records(actions, "VPD-P", now=100.0)
+
+    assert commands[0] == {
+        "device": "window",
+        "action": "Increase",
+        "priority": "high",
+        "reason": "open",
+        "timestamp": 100.0,
+        "controllerType": "VPD-P",
+    }
+    assert history[1]["capability"] == "canHeat"
+    assert history[1]["priority"] == "medium"
+    assert "capability" not in commands[1]
+    # canWindow goes through the Ventilation event, unknown capabilities emit nothing
+    assert events == [
+        ("Increase Ventilation", "Increase"),
+        ("Reduce Heater", {"action": "Reduce", "value": 40}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publication_handler_writes_history_and_action_data():
+    data_store = FakeDataStore({"tentMode": "VPD Perfection", "previousActions": []})
+    event_manager = FakeEventManager()
+    manager = OGBActionManager(None, data_store, event_manager, "room")
+
+    await manager.publicationActionHandler([_action("canExhaust", "Increase")])
+
+    previous = data_store.get("previousActions")
+    action_data = data_store.get("actionData")
+    assert previous[-1]["actions"][0]["device"] == "exhaust"
+    assert action_data["commandCount"] == 1
+    assert action_data["controlCommands"][0]["action"] == "Increase"
+    assert [e["event_name"] for e in event_manager.emitted][-1] == "Increase Exhaust"
+
+
+@pytest.mark.asyncio
+async def test_publication_resolves_conflicts_and_duplicates_from_one_index(monkeypatch):
+    data_store = FakeDataStore({"tentMode": "VPD Perfection", "previousActions": []})
+    event_manager = FakeEventManager()
+    manager = OGBActionManager(None, data_store, event_manager, "room")
+    built = []
+
+    class CountingIndex(ActionIndex):
+        def __init__(self, actions):
+            built.append(len(actions))
+            super().__init__(actions)
+
+    monkeypatch.setattr(action_manager_module, "ActionIndex", CountingIndex)
+
+    await manager.publicationActionHandler([
+        _action("canHeat", "Increase", "low"),
+        _action("canCool", "Increase", "high"),
+        _action("canExhaust", "Increase"),
+        _action("canExhaust", "Increase", "high"),
+    ])
+
+    assert built == [4]
+    commands = data_store.get("actionData")["controlCommands"]
+    assert [(c["device"], c["priority"]) for c in commands] == [("cool", "high"), ("exhaust", "high")]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from benchmarks.harness import SimWorld, install_ha_stubs, load_trace, quiet_logging
+from benchmarks.run import compare
+from benchmarks.scenarios import SCENARIOS, BenchConfig
+
+install_ha_stubs()
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    quiet_logging()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_replay_reaches_actuators():
+    world = await SimWorld(rooms=1, devices=4, sensors=2, seed=1).start()
+    try:
+        result = await world.replay(world.synthesize_trace(3))
+    finally:
+        await world.stop()
+
+    assert result["samples"] == 6
+    assert result["service_calls"] > 0
+    assert result["latencies"]
+
+
+@pytest.mark.asyncio
+async def test_all_scenarios_run_at_minimal_size():
+    config = BenchConfig(rooms=1, devices=2, sensors=2, samples_per_sensor=2, iterations=200)
+    for name, scenario in SCENARIOS.items():
+        result = await scenario(config)
+        assert isinstance(result, dict) and result, name
+        json.dumps(result)
+
+
+def test_load_json_trace_and_compare(tmp_path):
+    trace_file = tmp_path / "trace.json"
+    trace_file.write_text(json.dumps([
+        {"offset": 5, "room": "R", "entity_id": "sensor.b", "value": 60},
+        {"offset": 1, "room": "R", "entity_id": "sensor.a", "value": "22.5"},
+    ]))
+    samples = load_trace(str(trace_file))
+    assert [s.entity_id for s in samples] == ["sensor.a", "sensor.b"]
+    assert samples[0].value == 22.5
+
+    old = tmp_path / "old.json"
+    new = tmp_path / "new.json"
+    old.write_text(json.dumps({"results": {"event_bus": {"events_per_s": 100.0}}}))
+    new.write_text(json.dumps({"results": {"event_bus": {"events_per_s": 150.0}}}))
+    assert "+50.0%" in compare(str(old), str(new))
@@ -0,0 +1,113 @@
+import pytest
+
+from custom_components.opengrowbox.OGBController.data.OGBParams.OGBPlantIndex import (
+    MAX_TEMP,
+    TARGET_FIELDS,
+    VPD_MAX,
+    VPD_MIN,
+    build_plant_index,
+    validate_plant_maps,
+)
+from custom_components.opengrowbox.OGBController.data.OGBParams.OGBPlants import (
+    DEFAULT_PLANT_SPECIES,
+    PLANT_INDEX,
+    PLANT_SPECIES_VPD_MAPS,
+    get_full_plant_stages,
+    get_stage_config,
+    get_vpd_range,
+)
+
+
+def _stage(vpd, min_temp, max_temp):
+    return {
+        "vpdRange": list(vpd),
+        "minTemp": min_temp,
+        "maxTemp": max_temp,
+        "minHumidity": 50,
+        "maxHumidity": 60,
+        "minEC": 1.0,
+        "maxEc": 2.0,
+        "minPh": 5.8,
+        "maxPh": 6.2,
+        "minLight": 40,
+        "maxLight": 60,
+        "minCo2": 400,
+        "maxCo2": 800,
+        "nightMinTemp": min_temp - 2,
+        "nightMaxTemp": max_temp - 2,
+        "nightMinHumidity": 55,
+        "nightMaxHumidity": 65,
+        "nightVpdRange": [vpd[0] - 0.1, vpd[1] - 0.1],
+    }
+
+
+def test_shipped_catalog_is_consistent_and_matches_dict_lookups():
+    assert PLANT_INDEX.issues == ()
+    for species, stages in PLANT_SPECIES_VPD_MAPS.items():
+        for stage in (*PLANT_INDEX.stage_names, "Unknown"):
+            expected = stages.get(stage) or next(iter(stages.values()))
+            assert get_stage_config(species, stage) == expected
+            targets = PLANT_INDEX.targets(species, stage)
+            assert [targets[VPD_MIN], targets[VPD_MAX]] == expected["vpdRange"]
+            assert targets[MAX_TEMP] == expected["maxTemp"]
+    assert get_vpd_range("NoSuchPlant", "MidFlower") == PLANT_SPECIES_VPD_MAPS[DEFAULT_PLANT_SPECIES]["MidFlower"]["vpdRange"]
+
+
+def test_lookups_by_id_return_the_same_stored_tuple():
+    species_id = PLANT_INDEX.species_id("Tomato")
+    stage_id = PLANT_INDEX.stage_id("MidFlower")
+    targets = PLANT_INDEX.targets_by_id(species_id, stage_id)
+
+    assert len(targets) == len(TARGET_FIELDS)
+    assert targets is PLANT_INDEX.targets("Tomato", "MidFlower")
+    assert PLANT_INDEX.has_stage("Tomato", "MidFlower")
+    assert not PLANT_INDEX.has_stage("Lettuce", "MidFlower")
+
+
+def test_full_stages_are_copies_of_the_catalog():
+    stages = get_full_plant_stages("Cannabis")
+    stages["MidVeg"]["vpdRange"][0] = 9.9
+    stages["MidVeg"]["maxTemp"] = 99
+
+    assert PLANT_SPECIES_VPD_MAPS["Cannabis"]["MidVeg"]["vpdRange"][0] != 9.9
+    assert get_full_plant_stages("Cannabis")["MidVeg"] == PLANT_SPECIES_VPD_MAPS["Cannabis"]["MidVeg"]
+
+
+def test_transition_days_are_interpolated_between_stages():
+    maps = {"Herb": {"EarlyVeg": _stage((0.8, 1.0), 20, 24), "MidVeg": _stage((1.0, 1.2), 22, 28)}}
+    index = build_plant_index(maps, ["Herb"], "Herb", transition_days=4)
+
+    assert index.transition("Herb", "MidVeg", 0) == index.targets("Herb", "EarlyVeg")
+    assert index.transition("Herb", "MidVeg", 2)[VPD_MIN] == pytest.approx(0.9)
+    assert index.transition("Herb", "MidVeg", 2)[MAX_TEMP] == pytest.approx(26)
+    assert index.transition("Herb", "MidVeg", 4) == index.targets("Herb", "MidVeg")
+    assert index.transition("Herb", "MidVeg", 30) == index.targets("Herb", "MidVeg")
+    # First stage has nothing to blend from
+    assert index.transition("Herb", "EarlyVeg", 2) == index.targets("Herb", "EarlyVeg")
+
+
+def test_validation_reports_inconsistent_entries():
+    broken = _stage((1.2, 0.8), 26, 20)
+    del broken["maxEc"]
+    maps = {
+        "Herb": {"MidVeg": _stage((1.0, 1.2), 22, 28), "EarlyVeg": _stage((0.8, 1.0), 20, 24)},
+        "Weed": {"Bloom": broken},
+    }
+
+    issues = validate_plant_maps(maps, ["Herb", "Ghost"], "Cannabis")
+
+    assert "Default species 'Cannabis' has no VPD map" in issues
+    assert "Species option 'Ghost' has no VPD map" in issues
+    assert "Species 'Weed' is not in the species options" in issues
+    assert "Herb: stages are not in growth order" in issues
+    assert "Weed: unknown stage 'Bloom'" in issues
+    assert "Weed/Bloom: missing 'maxEc'" in issues
+
+    # min > max is checked once all fields of an entry are present
+    issues = validate_plant_maps({"Herb": {"MidVeg": _stage((1.2, 0.8), 26, 20)}})
+    assert set(issues) == {
+        "Herb/MidVeg: vpdMin > vpdMax",
+        "Herb/MidVeg: minTemp > maxTemp",
+        "Herb/MidVeg: nightMinTemp > nightMaxTemp",
+        "Herb/MidVeg: nightVpdMin > nightVpdMax",
+    }
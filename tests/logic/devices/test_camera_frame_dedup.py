@@ -0,0 +1,104 @@
+import asyncio
+import base64
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.OGBDevices.Camera import Camera
+from custom_components.opengrowbox.OGBController.utils.frameHash import frame_hash, hamming, is_near_duplicate
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+
+
+def test_frame_hash_detects_identical_frames_without_decoding():
+    assert frame_hash(b"") is None
+    assert frame_hash(b"jpeg-a") == frame_hash(b"jpeg-a")
+    assert is_near_duplicate(frame_hash(b"jpeg-a"), frame_hash(b"jpeg-a"), 4)
+    assert not is_near_duplicate(frame_hash(b"jpeg-a"), None, 4)
+    assert not is_near_duplicate(frame_hash(b"jpeg-a"), frame_hash(b"jpeg-a"), -1)
+    assert hamming(0b1011, 0b0001) == 2
+
+
+def test_dhash_ignores_small_changes_but_not_new_content():
+    Image = pytest.importorskip("PIL.Image")
+    import io
+
+    def jpeg(draw):
+        img = Image.new("L", (320, 240))
+        img.putdata([draw(x, y) for y in range(240) for x in range(320)])
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=80)
+        return buffer.getvalue()
+
+    night = frame_hash(jpeg(lambda x, y: (x // 4 + y // 8) % 256))
+    night_noise = frame_hash(jpeg(lambda x, y: min(255, (x // 4 + y // 8) % 256 + (x * y) % 3)))
+    plant = frame_hash(jpeg(lambda x, y: 255 - (x // 4 + y // 8) % 256))
+
+    assert is_near_duplicate(night, night_noise, 4)
+    assert not is_near_duplicate(night, plant, 4)
+
+
+def _camera(tmp_path, plants_view=None):
+    camera = Camera.__new__(Camera)
+    camera.deviceName = "growcam"
+    camera.inRoom = "dev_room"
+    camera.camera_storage_path = str(tmp_path)
+    camera.dataStore = FakeDataStore({"plantsView": plants_view or {}})
+    camera.event_manager = FakeEventManager()
+
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    camera.hass = SimpleNamespace(async_add_executor_job=run_in_executor)
+    camera.last_image = None
+    camera.tl_image_count = 0
+    camera.tl_skipped_count = 0
+    camera._last_frame_hash = None
+    camera._counter_persist_task = None
+    camera._counter_persist_delay = 0
+    return camera
+
+
+async def _capture(camera, data, second):
+    camera.last_image = data
+    return await camera._save_timelapse_frame(data, datetime(2026, 3, 1, 2, 0, second))
+
+
+@pytest.mark.asyncio
+async def test_timelapse_skips_near_duplicates_and_debounces_counter_saves(tmp_path):
+    camera = _camera(tmp_path)
+
+    assert await _capture(camera, b"\xff\xd8night", 0)
+    assert not await _capture(camera, b"\xff\xd8night", 1)
+    assert await _capture(camera, b"\xff\xd8lights-on", 2)
+
+    # Raw bytes reach the disk unchanged, duplicates are not written
+    files = sorted(p.name for p in (tmp_path / "timelapse").iterdir())
+    assert files == ["growcam_20260301_020000.jpg", "growcam_20260301_020002.jpg"]
+    assert (tmp_path / "timelapse" / files[1]).read_bytes() == b"\xff\xd8lights-on"
+
+    # Three frames, a single deferred SaveState with both counters
+    assert camera.event_manager.emitted == []
+    await camera._counter_persist_task
+    saves = [e for e in camera.event_manager.emitted if e["event_name"] == "SaveState"]
+    assert len(saves) == 1
+    plants_view = camera.dataStore.get("plantsView")
+    assert (plants_view["tl_image_count"], plants_view["tl_skipped_count"]) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_skipping_can_be_disabled(tmp_path):
+    camera = _camera(tmp_path, {"skip_duplicate_frames": False})
+
+    assert await _capture(camera, b"\xff\xd8night", 0)
+    assert await _capture(camera, b"\xff\xd8night", 1)
+    assert camera.tl_image_count == 2
+    camera._cancel_counter_persist()
+    await asyncio.sleep(0)
+    assert camera.event_manager.emitted == []
+
+
+def test_base64_is_only_applied_for_text_consumers():
+    assert Camera._image_base64(b"\xff\xd8jpeg") == base64.b64encode(b"\xff\xd8jpeg").decode()
+    assert Camera._image_base64("already-text") == "already-text"
+    assert Camera._image_base64(None) is None
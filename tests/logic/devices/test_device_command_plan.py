@@ -0,0 +1,179 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.OGBDevices.Device import Device
+from custom_components.opengrowbox.OGBController.utils.commandPlan import (
+    PowerStep,
+    ServiceStep,
+    ValueStep,
+    compile_command_plan,
+)
+
+
+class FakeStates:
+    def __init__(self, states=None):
+        self._states = states or {}
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+
+class FakeServices:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def async_call(self, domain, service, service_data=None, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            self.calls.append((domain, service, dict(service_data or {})))
+        finally:
+            self.in_flight -= 1
+
+
+def _device(device_type, switches, options=(), dimmable=False, special=False, acinfinity=False, states=None):
+    device = Device.__new__(Device)
+    device.deviceName = f"test_{device_type.lower()}"
+    device.deviceType = device_type
+    device.isDimmable = dimmable
+    device.isSpecialDevice = special
+    device.isAcInfinDev = acinfinity
+    device.voltageFromNumber = False
+    device.switches = [{"entity_id": e} for e in switches]
+    device.options = [{"entity_id": e} for e in options]
+    device.sensors = []
+    device.isRunning = False
+    device.voltage = None
+    device.dutyCycle = 50
+    device.reliability_manager = None
+    device.hass = SimpleNamespace(services=FakeServices(), states=FakeStates(states))
+    return device
+
+
+@pytest.mark.asyncio
+async def test_ventilation_switches_are_one_multi_entity_call():
+    switches = [f"switch.vent_{i}" for i in range(20)]
+    device = _device("Ventilation", switches)
+
+    await device.turn_on()
+
+    calls = device.hass.services.calls
+    assert calls == [("switch", "turn_on", {"entity_id": switches})]
+    assert device.isRunning is True
+
+    await device.turn_off()
+    assert calls[-1] == ("switch", "turn_off", {"entity_id": switches})
+    assert device.isRunning is False
+
+
+@pytest.mark.asyncio
+async def test_service_groups_of_one_stage_run_concurrently():
+    # Exhaust flap (cover) plus fan switch: two domains, one stage
+    device = _device("Exhaust", ["cover.flap", "switch.fan"])
+    device.hass.services = FakeServices(delay=0.01)
+
+    await device.turn_on()
+
+    assert sorted(device.hass.services.calls) == [
+        ("cover", "open_cover", {"entity_id": "cover.flap"}),
+        ("switch", "turn_on", {"entity_id": "switch.fan"}),
+    ]
+    assert device.hass.services.max_in_flight == 2
+    assert device.isRunning is True
+
+
+def test_humidifier_plan_orders_switch_before_power_and_value():
+    device = _device(
+        "Humidifier",
+        ["switch.humi"],
+        options=["select.humi_mode", "number.humi_intensity"],
+        dimmable=True,
+    )
+
+    on_plan = compile_command_plan(device, "on")
+    assert on_plan.stages == (
+        (ServiceStep("switch", "turn_on", ("switch.humi",)),),
+        (PowerStep(True),),
+        (ValueStep("percentage"),),
+    )
+
+    off_plan = compile_command_plan(device, "off")
+    assert off_plan.stages == (
+        (PowerStep(False),),
+        (ValueStep("zero"),),
+        (ServiceStep("switch", "turn_off", ("switch.humi",)),),
+    )
+
+
+@pytest.mark.asyncio
+async def test_dimmable_light_uses_first_entity_and_clamped_brightness():
+    device = _device("Light", ["light.main", "light.spare"], dimmable=True)
+
+    await device.turn_on(brightness_pct=140)
+    assert device.hass.services.calls == [
+        ("light", "turn_on", {"entity_id": "light.main", "brightness_pct": 100})
+    ]
+
+    device.voltage = 80
+    await device.turn_off()
+    assert device.hass.services.calls[-1] == ("light", "turn_off", {"entity_id": "light.main"})
+    assert device.voltage == 0
+
+
+@pytest.mark.asyncio
+async def test_acinfinity_selects_and_value():
+    device = _device(
+        "Exhaust",
+        ["select.fan_mode", "select.fan_mode_2"],
+        options=["number.fan_duty"],
+        dimmable=True,
+        acinfinity=True,
+    )
+
+    await device.turn_on(percentage=60)
+
+    assert device.hass.services.calls == [
+        ("select", "select_option", {"entity_id": ["select.fan_mode", "select.fan_mode_2"], "option": "On"}),
+        ("number", "set_value", {"entity_id": "number.fan_duty", "value": 6.0}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_plan_recompiles_when_identification_changes():
+    device = _device("Heater", ["switch.heater"])
+    await device.turn_off()
+    assert device.hass.services.calls[-1][0:2] == ("switch", "turn_off")
+
+    device.switches = [{"entity_id": "climate.heater"}]
+    await device.turn_off()
+    assert device.hass.services.calls[-1] == (
+        "climate",
+        "set_hvac_mode",
+        {"entity_id": "climate.heater", "hvac_mode": "off"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_power_before_action_is_recorded_after_dispatch():
+    states = {"sensor.test_heater_power": SimpleNamespace(state="120.5", attributes={})}
+    device = _device("Heater", ["switch.heater"], states=states)
+    scheduled = []
+    device.reliability_manager = SimpleNamespace(
+        _device_reliability={},
+        schedule_runaway_check=scheduled.append,
+    )
+
+    await device.turn_off()
+
+    assert device.hass.services.calls == [("switch", "turn_off", {"entity_id": "switch.heater"})]
+    rel = device.reliability_manager._device_reliability["test_heater"]
+    assert rel.last_power_before_action == 120.5
+    assert scheduled == ["test_heater"]
+    assert device._power_sensor_id == "sensor.test_heater_power"
@@ -0,0 +1,146 @@
+"""Local aiohttp stand-in for Shelly/Tasmota/ESPHome HTTP endpoints.
+
+Every emulated device listens on its own loopback address (127.0.0.x) and a
+shared port, so a NetworkScanner pointed at 127.0.0.0/24 sees a realistic mix
+of open and closed hosts. Run this module directly to time a /24 scan:
+
+    python -m tests.logic.discovery.fake_device_server
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+import time
+import types
+from pathlib import Path
+
+from aiohttp import web
+
+_RECOGNITION_PACKAGES = (
+    "custom_components.opengrowbox.OGBController",
+    "custom_components.opengrowbox.OGBController.managers",
+    "custom_components.opengrowbox.OGBController.managers.core",
+    "custom_components.opengrowbox.OGBController.managers.core.OGBDeviceRecognition",
+)
+
+
+def bootstrap_recognition_package():
+    """Register bare package modules so the discovery modules import without
+    executing the heavy core/__init__.py chain (OGBMainController needs HA)."""
+    root = Path(__file__).resolve().parents[3] / "custom_components" / "opengrowbox"
+    for name in _RECOGNITION_PACKAGES:
+        if name in sys.modules:
+            continue
+        relative = name.split(".")[2:]
+        package = types.ModuleType(name)
+        package.__path__ = [str(root.joinpath(*relative))]
+        sys.modules[name] = package
+
+FAKE_DEVICES = {
+    "127.0.0.2": "shelly_gen2",
+    "127.0.0.3": "shelly_gen1",
+    "127.0.0.4": "tasmota",
+    "127.0.0.5": "esphome",
+    "127.0.0.6": "plain_http",  # open port, no smart device
+}
+
+
+def _app_for(kind: str) -> web.Application:
+    async def root(_request):
+        if kind == "esphome":
+            return web.Response(text="<html><title>ESPHome Web Server</title></html>", content_type="text/html")
+        return web.Response(text="<html><title>Router</title></html>", content_type="text/html")
+
+    async def rpc(request):
+        if kind != "shelly_gen2":
+            return web.Response(status=404)
+        body = await request.json()
+        if body.get("method") == "Shelly.GetDeviceInfo":
+            return web.json_response(
+                {"id": 1, "result": {"id": "shellyplusplugs-abc", "mac": "AABBCCDDEEFF", "app": "PlusPlugS", "num_outputs": 1}}
+            )
+        return web.json_response({"id": 1, "result": {}})
+
+    async def shelly(_request):
+        if kind != "shelly_gen1":
+            return web.Response(status=404)
+        return web.json_response({"type": "SHPLG-S", "mac": "112233445566", "num_outputs": 1})
+
+    async def tasmota(_request):
+        if kind != "tasmota":
+            return web.Response(status=404)
+        return web.json_response(
+            {"Status": {"DeviceName": "Tasmota"}, "StatusNET": {"Hostname": "tasmota-1", "Mac": "AA:BB:CC:00:11:22"}}
+        )
+
+    async def wled(_request):
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get("/", root)
+    app.router.add_post("/rpc", rpc)
+    app.router.add_get("/shelly", shelly)
+    app.router.add_get("/cm", tasmota)
+    app.router.add_get("/json/info", wled)
+    return app
+
+
+def free_port(host: str = "127.0.0.2") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class FakeDeviceNetwork:
+    """Starts one aiohttp site per emulated device address."""
+
+    def __init__(self, devices: dict[str, str] | None = None, port: int | None = None):
+        self.devices = devices or FAKE_DEVICES
+        self.port = port or free_port(next(iter(self.devices)))
+        self._runners: list[web.AppRunner] = []
+
+    async def __aenter__(self):
+        for ip, kind in self.devices.items():
+            runner = web.AppRunner(_app_for(kind), access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, ip, self.port).start()
+            self._runners.append(runner)
+        return self
+
+    async def __aexit__(self, *_exc):
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+
+async def _benchmark(ip_range: str = "127.0.0.0/24", rounds: int = 2):
+    bootstrap_recognition_package()
+    from custom_components.opengrowbox.OGBController.managers.core.OGBDeviceRecognition.discovery.network_scanner import (
+        NetworkScanner,
+    )
+
+    found = []
+
+    async def _callback(data):
+        found.append(data)
+
+    async with FakeDeviceNetwork() as network:
+        scanner = NetworkScanner(_callback, [ip_range], "Bench", port=network.port)
+        for i in range(rounds):
+            found.clear()
+            started = time.perf_counter()
+            await scanner.scan()
+            elapsed = time.perf_counter() - started
+            print(
+                f"round {i + 1}: {elapsed * 1000:.1f} ms, found={len(found)}, "
+                f"stats={scanner.last_scan_stats}"
+            )
+        await scanner.stop()
+
+
+if __name__ == "__main__":
+    import tests.logic.conftest  # noqa: F401  (namespace bootstrap)
+
+    asyncio.run(_benchmark())
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.logic.discovery.fake_device_server import bootstrap_recognition_package
+
+bootstrap_recognition_package()
+
+from custom_components.opengrowbox.OGBController.managers.core.OGBDeviceRecognition.direct_api import (  # noqa: E402
+    DirectAPIController,
+)
+from custom_components.opengrowbox.OGBController.managers.core.OGBDeviceRecognition.discovery.network_scanner import (  # noqa: E402
+    NetworkScanner,
+)
+from custom_components.opengrowbox.OGBController.managers.core.OGBDeviceRecognition.http_pool import (  # noqa: E402
+    SharedHttpSession,
+)
+from tests.logic.discovery.fake_device_server import FakeDeviceNetwork  # noqa: E402
+
+
+async def _scan(ip_range, http=None):
+    found = []
+
+    async def _callback(data):
+        found.append(data)
+
+    network = FakeDeviceNetwork()
+    async with network:
+        scanner = NetworkScanner(_callback, [ip_range], "TestTent", http=http, port=network.port)
+        await scanner.scan()
+        first = list(found)
+        found.clear()
+        await scanner.scan()
+        second = list(found)
+        stats = scanner.last_scan_stats
+        await scanner.stop()
+    return first, second, stats
+
+
+@pytest.mark.asyncio
+async def test_scan_fingerprints_emulated_devices():
+    first, _, _ = await _scan("127.0.0.0/29")
+
+    by_ip = {d["ip"]: d["endpoint"] for d in first}
+    assert by_ip == {
+        "127.0.0.2": "shelly_gen2",
+        "127.0.0.3": "shelly_gen1",
+        "127.0.0.4": "tasmota",
+        "127.0.0.5": "esphome",
+    }
+    assert {d["type"] for d in first} == {"shelly", "tasmota", "esphome"}
+
+
+@pytest.mark.asyncio
+async def test_negative_hosts_are_cached_between_scans():
+    first, second, stats = await _scan("127.0.0.0/29")
+
+    # The closed host (.1) and the plain HTTP host (.6) are skipped on the second pass
+    assert stats["skipped_cached"] == 2
+    assert stats["probed"] == 4
+    assert len(second) == len(first) == 4
+
+
+@pytest.mark.asyncio
+async def test_shared_session_is_reused_and_not_closed_by_consumers():
+    http = SharedHttpSession()
+    await _scan("127.0.0.0/29", http=http)
+    session = await http.get()
+
+    controller = DirectAPIController("TestTent", http=http)
+    api = await controller.get_device_api({"ip": "127.0.0.4", "manufacturer": "tasmota"})
+    assert await api._get_session() is session
+
+    await controller.close_all()
+    assert not http.closed
+    await http.close()
+    assert http.closed
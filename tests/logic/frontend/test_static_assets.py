@@ -0,0 +1,116 @@
+import gzip
+import os
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from custom_components.opengrowbox.OGBController.utils import staticAssets
+from custom_components.opengrowbox.OGBController.utils.staticAssets import (
+    CACHE_CONTROL,
+    build_assets,
+    choose_encoding,
+    copy_asset,
+    serve_asset,
+    served_files,
+)
+
+BUNDLE = b"console.log('ogb');" * 2000
+
+
+def _source(tmp_path, content=BUNDLE):
+    source = tmp_path / "static"
+    (source / "static" / "js").mkdir(parents=True, exist_ok=True)
+    (source / "static" / "js" / "main.js").write_bytes(content)
+    return str(source)
+
+
+def test_build_hashes_compresses_and_skips_unchanged_sources(tmp_path, monkeypatch):
+    source = _source(tmp_path)
+    build = str(tmp_path / "build")
+
+    entry = build_assets(source, build)["assets"]["static/js/main.js"]
+    assert entry["file"] == f"static/js/main.{entry['hash']}.js"
+    target = os.path.join(build, entry["file"])
+    assert gzip.decompress(open(target + ".gz", "rb").read()) == BUNDLE
+    assert "gzip" in entry["encodings"]
+
+    # Unchanged size and mtime: the source is not read again
+    def fail(_path):
+        raise AssertionError("source re-hashed")
+
+    monkeypatch.setattr(staticAssets, "file_hash", fail)
+    assert build_assets(source, build)["assets"]["static/js/main.js"] == entry
+    monkeypatch.undo()
+
+    # A new bundle gets a new name; the old files are removed
+    _source(tmp_path, BUNDLE + b"//v2")
+    new_entry = build_assets(source, build)["assets"]["static/js/main.js"]
+    assert new_entry["file"] != entry["file"]
+    assert not os.path.exists(target) and not os.path.exists(target + ".gz")
+    assert os.path.exists(os.path.join(build, new_entry["file"] + ".gz"))
+
+
+def test_accept_encoding_negotiation():
+    both = ["br", "gzip"]
+    assert choose_encoding("gzip, deflate, br", both) == "br"
+    assert choose_encoding("gzip, deflate, br", ["gzip"]) == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0.8", both) == "gzip"
+    assert choose_encoding("*;q=0.5", ["gzip"]) == "gzip"
+    assert choose_encoding("identity", both) is None
+    assert choose_encoding(None, both) is None
+
+
+def test_copy_uses_recorded_hashes_instead_of_byte_compare(tmp_path, monkeypatch):
+    source = tmp_path / "ogb_icons.js"
+    source.write_text("icons-v1")
+    destination = str(tmp_path / "www" / "opengrowbox" / "ogb_icons.js")
+    manifest = {"copies": {}}
+
+    assert copy_asset(str(source), destination, "ogb_icons.js", manifest)
+    assert open(destination).read() == "icons-v1"
+
+    calls = []
+    monkeypatch.setattr(staticAssets.shutil, "copy2", lambda *args: calls.append(args))
+    assert copy_asset(str(source), destination, "ogb_icons.js", manifest)
+    assert calls == []
+
+    # A user-edited copy no longer matches the record and is replaced
+    with open(destination, "w") as handle:
+        handle.write("edited by hand")
+    assert copy_asset(str(source), destination, "ogb_icons.js", manifest)
+    assert len(calls) == 1
+
+    assert not copy_asset(str(tmp_path / "missing.js"), destination, "missing.js", manifest)
+
+
+@pytest.mark.asyncio
+async def test_view_serves_precompressed_immutable_assets(tmp_path):
+    build = str(tmp_path / "build")
+    manifest = build_assets(_source(tmp_path), build)
+    files = served_files(manifest)
+    hashed = manifest["assets"]["static/js/main.js"]["file"]
+
+    async def handler(request):
+        return await serve_asset(build, files, request.match_info["filename"], request.headers.get("Accept-Encoding"))
+
+    app = web.Application()
+    app.router.add_get("/ogb/assets/{filename:.+}", handler)
+    async with TestClient(TestServer(app)) as client:
+        response = await client.get(f"/ogb/assets/{hashed}", headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+        assert response.status == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Cache-Control"] == CACHE_CONTROL
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert "javascript" in response.headers["Content-Type"]
+        body = await response.read()
+        assert len(body) < len(BUNDLE) / 10
+        assert gzip.decompress(body) == BUNDLE
+
+        response = await client.get(f"/ogb/assets/{hashed}", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert await response.read() == BUNDLE
+
+        # Only manifest entries are served
+        for path in ("static/js/main.js", "manifest.json", "../static/static/js/main.js"):
+            assert (await client.get(f"/ogb/assets/{path}")).status == 404
@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 from types import SimpleNamespace
-from unittest.mock import patch
 
 import pytest
 
@@ -11,6 +10,9 @@ from custom_components.opengrowbox.OGBController.managers.hydro.crop_steering.OG
     CSMode,
     OGBCSManager,
 )
+from custom_components.opengrowbox.OGBController.managers.hydro.crop_steering.OGBCSPhaseEngine import (
+    CSPhaseEngine,
+)
 
 from tests.logic.helpers import FakeDataStore, FakeEventManager
 
@@ -381,16 +383,16 @@ async def test_forced_transition_no_op_when_phase_matches_light():
 
 @pytest.mark.asyncio
 async def test_manual_phase_change_event_signals_running_cycle():
-    """Manual phase change should set the asyncio event to restart the cycle."""
-    import asyncio
-
+    """Manual phase change should re-enter the phase on an immediate evaluation."""
     manager = _cs_manager()
-    manager._manual_phase_changed_event = asyncio.Event()
-    manager._main_task = SimpleNamespace(done=lambda: False)
+    manager._phase_engine = CSPhaseEngine(manager.room, call_later=lambda delay, callback: SimpleNamespace(cancel=lambda: None))
+    manager._phase_engine.start(_noop_coroutine)
+    manager._manual_phase = "p1"
 
     await manager._on_manual_phase_changed({"phase": "p2"})
 
-    assert manager._manual_phase_changed_event.is_set() is True
+    assert manager._manual_phase is None
+    assert "phase" in manager._phase_engine.get_stats()["pending"]
 
 
 @pytest.mark.asyncio
@@ -739,22 +741,11 @@ def _manual_cycle_manager(initial=None, near_light_off=False, mode="Manual"):
 
 
 async def _run_manual_cycle_once(manager, phase):
-    """Run a single _manual_cycle iteration.
-
-    _manual_cycle loops forever (sleeping 10s per iteration); the sleep is
-    patched so the run exits after the first full iteration for testing.
-    """
+    """Run a single _manual_cycle evaluation with the dripper shutdown stubbed."""
     manager._turn_off_all_drippers = lambda: _noop_coroutine()
     manager._emergency_stop = lambda: _noop_coroutine()
 
-    class _StopCycle(Exception):
-        pass
-
-    async def _sleep(seconds):
-        raise _StopCycle()
-
-    with patch("asyncio.sleep", _sleep):
-        await manager._manual_cycle(phase)
+    await manager._manual_cycle(phase)
 
 
 @pytest.mark.asyncio
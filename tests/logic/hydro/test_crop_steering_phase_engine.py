@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.harness import VirtualClock, install_ha_stubs, quiet_logging, simulate_crop_steering_day
+from custom_components.opengrowbox.OGBController.managers.hydro.crop_steering.OGBCSPhaseEngine import (
+    CSPhaseEngine,
+)
+
+install_ha_stubs()
+
+START = datetime(2026, 3, 1, 5, 0)
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    quiet_logging()
+
+
+def _engine(clock):
+    engine = CSPhaseEngine("sim_room", clock=clock.now, call_later=clock.call_later, settle_seconds=2.0)
+    calls = []
+
+    async def evaluate(reasons):
+        calls.append((clock.now(), reasons))
+
+    return engine, evaluate, calls
+
+
+@pytest.mark.asyncio
+async def test_engine_coalesces_inputs_and_runs_deadlines():
+    clock = VirtualClock(START)
+    engine, evaluate, calls = _engine(clock)
+    engine.start(evaluate)
+    await clock.run_until(START)
+    assert calls == [(START, frozenset({"start"}))]
+
+    # One probe update (VWC + EC + temp) within the settle window -> one evaluation
+    engine.notify("sensor")
+    engine.notify("sensor")
+    engine.notify("config")
+    await clock.run_until(START + timedelta(seconds=1))
+    assert len(calls) == 1
+    await clock.run_until(START + timedelta(seconds=2))
+    assert calls[1:] == [(START + timedelta(seconds=2), frozenset({"sensor", "config"}))]
+
+    # Earliest request per reason wins; nothing runs in between
+    engine.wake_in(600, "p2_check")
+    engine.wake_in(300, "p2_check")
+    await clock.run_until(START + timedelta(seconds=290))
+    assert len(calls) == 2
+    await clock.run_until(START + timedelta(seconds=302))
+    assert calls[-1] == (START + timedelta(seconds=302), frozenset({"p2_check"}))
+
+    # Without inputs only the watchdog wakes the engine
+    await clock.run_until(START + timedelta(hours=1, seconds=302))
+    assert [reasons for _, reasons in calls[3:]] == [frozenset({"idle"})] * 4
+    assert engine.get_stats()["pending"] == ["idle"]
+
+    await engine.stop()
+    assert not engine.running
+    engine.notify("sensor")
+    await clock.run_until(START + timedelta(hours=2))
+    assert len(calls) == 7
+
+
+@pytest.mark.asyncio
+async def test_steering_day_replays_on_virtual_clock():
+    result = await simulate_crop_steering_day(hours=24, sample_minutes=5, start=START)
+    stats = result["stats"]
+    transitions = [(at.hour, old, new) for at, old, new in result["transitions"]]
+
+    # Lights on at 06:00 ends the night (P3 -> P0), lights off at 18:00 starts it again
+    assert transitions[0] == (6, "p3", "p0")
+    assert ("p0", "p1") in [(old, new) for _, old, new in transitions]
+    assert transitions[-1] == (18, "p0", "p3")
+    assert stats["phase"] == "p3"
+    assert result["substrate"].shots > 0
+    assert result["events"].emitted["PumpAction"] == 2 * result["substrate"].shots
+
+    # Evaluations follow inputs and deadlines: about one per sensor sample
+    # instead of one per minute (plus 10 s polls while waiting in P1)
+    assert stats["evaluations"] <= result["samples"] + 30
+    assert stats["wakeups"]["light_on"] == 1
+    assert stats["wakeups"]["light_off"] == 1
+
+
+@pytest.mark.asyncio
+async def test_quiet_night_only_wakes_for_the_watchdog():
+    start = datetime(2026, 3, 1, 20, 0)
+    result = await simulate_crop_steering_day(hours=8, sample_minutes=8 * 60, start=start)
+    stats = result["stats"]
+
+    assert stats["phase"] == "p3"
+    assert result["transitions"] == []
+    # Start, the single sensor sample at the end and one watchdog per 15 min
+    assert stats["evaluations"] <= 2 + 8 * 4 + 1
+    assert set(stats["wakeups"]) <= {"start", "idle", "sensor", "p3_emergency"}
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.harness import install_ha_stubs, quiet_logging, simulate_crop_steering_day
+from custom_components.opengrowbox.OGBController.managers.hydro.crop_steering.OGBCSShotController import (
+    CSShotController,
+    CSShotModel,
+)
+
+install_ha_stubs()
+
+START = datetime(2026, 3, 1, 10, 0)
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    quiet_logging()
+
+
+class ScriptedSensors:
+    """Virtual time whose sleep is interrupted by scripted medium readings."""
+
+    def __init__(self, readings=()):
+        self.now = START
+        self.readings = sorted(readings)  # (seconds, entity_id, value)
+        self.shot = None
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        until = self.now + timedelta(seconds=seconds)
+        while self.readings and START + timedelta(seconds=self.readings[0][0]) <= until:
+            offset, entity_id, value = self.readings.pop(0)
+            self.now = START + timedelta(seconds=offset)
+            if self.shot.on_reading({"sensor_type": "moisture", "entity_id": entity_id, "state": value}):
+                return
+        self.now = until
+
+
+def _mediums():
+    return [
+        SimpleNamespace(current_moisture=50.0, registered_sensors={"moisture": ["sensor.slab_1_vwc"]}),
+        SimpleNamespace(current_moisture=52.0, registered_sensors={"moisture": ["sensor.slab_2_vwc"]}),
+    ]
+
+
+def _shot(sensors, model=None, drippers=2, **bounds):
+    shot = CSShotController(model or CSShotModel(), drippers, clock=sensors.clock, sleep=sensors.sleep, **bounds)
+    sensors.shot = shot
+    shot.bind(_mediums(), 51.0)
+    return shot
+
+
+def test_model_learns_rate_per_dripper_and_round_trips():
+    model = CSShotModel(alpha=0.5)
+    assert not model.learn_shot(drippers=2, seconds=3, vwc_rise=1.0)
+    assert not model.learn_shot(drippers=2, seconds=60, vwc_rise=-0.5)
+    assert model.learn_shot(drippers=2, seconds=60, vwc_rise=12.0)
+    assert not model.trusted
+    assert model.learn_shot(drippers=1, seconds=50, vwc_rise=4.0)
+
+    assert model.trusted
+    assert model.rate_per_dripper == pytest.approx((0.1 + 0.08) / 2)
+    assert model.rate(drippers=3) == pytest.approx(0.27)
+    assert CSShotModel.from_dict(model.to_dict()).to_dict() == model.to_dict()
+    assert CSShotModel.from_dict({"rate_per_dripper": "broken"}).rate_per_dripper is None
+
+
+@pytest.mark.asyncio
+async def test_shot_stops_on_first_bound_reading():
+    sensors = ScriptedSensors(
+        [
+            (20, "sensor.other_room_vwc", 90.0),
+            (30, "sensor.slab_1_vwc", 56.0),
+            (45, "sensor.slab_2_vwc", 60.0),
+            (50, "sensor.slab_1_vwc", 59.0),
+        ]
+    )
+    shot = _shot(sensors, target_vwc=59.0, max_vwc=65.0)
+
+    elapsed, reason = await shot.run(120)
+
+    # Average of both slabs (59.0 + 60.0) / 2 crosses the target at 50 s
+    assert elapsed == 50
+    assert reason == "target 59.0% reached"
+    assert shot.readings == 3
+    assert shot.wakeups == 3
+    assert sensors.sleeps[0] == 120
+
+
+def test_readings_use_the_calibrated_value():
+    shot = _shot(ScriptedSensors())
+    # Sensor payload: raw state plus last_reading with a +3% calibration offset
+    assert shot.on_reading(
+        {"sensor_type": "moisture", "entity_id": "sensor.slab_1_vwc", "state": "54.0", "last_reading": 57.0}
+    )
+    assert shot.vwc == pytest.approx((57.0 + 52.0) / 2)
+    # Payloads without last_reading still work
+    assert shot.on_reading({"sensor_type": "moisture", "entity_id": "sensor.slab_2_vwc", "state": "55.0"})
+    assert shot.vwc == pytest.approx((57.0 + 55.0) / 2)
+
+
+@pytest.mark.asyncio
+async def test_shot_falls_back_to_duration_without_readings():
+    sensors = ScriptedSensors()
+    shot = _shot(sensors, max_vwc=70.0)
+
+    assert await shot.run(90) == (90, None)
+    assert not shot.stopped_early
+    assert shot.wakeups == 1
+
+
+@pytest.mark.asyncio
+async def test_learned_rate_cuts_the_shot_before_the_sensor_lags_past_the_cap():
+    model = CSShotModel.from_dict({"rate_per_dripper": 0.05, "lag_seconds": 10, "samples": 5})
+    sensors = ScriptedSensors([(200, "sensor.slab_1_vwc", 62.0)])
+    shot = _shot(sensors, model=model, drippers=2, max_vwc=60.0)
+
+    elapsed, reason = await shot.run(120)
+
+    # 51% + 0.1%/s * t reaches 60% at 90 s; minus 10 s of water still on its way
+    assert elapsed == pytest.approx(80)
+    assert reason == "predicted safety cap 60.0% reached"
+    assert shot.settling
+
+    # Once every slab reported after the stop, the rise above the estimate is the lag
+    sensors.now = START + timedelta(seconds=110)
+    assert shot.on_reading({"sensor_type": "moisture", "entity_id": "sensor.slab_1_vwc", "state": 58.0})
+    assert not shot.lag_learned
+    assert shot.on_reading({"sensor_type": "moisture", "entity_id": "sensor.slab_2_vwc", "state": 66.0})
+    assert shot.lag_learned
+    # Estimate at the stop was 59%, the slabs settled at 62%: 3% / 0.1%/s = 30 s
+    assert model.lag_seconds == pytest.approx(10 + 0.3 * (30 - 10))
+    assert model.lag_samples == 1
+
+
+@pytest.mark.asyncio
+async def test_steering_day_learns_and_persists_the_shot_model():
+    result = await simulate_crop_steering_day(hours=12, sample_minutes=5)
+    manager = result["manager"]
+
+    learned = manager.data_store.getDeep("CropSteering.Learned.shot_model")
+    assert learned["samples"] >= CSShotModel.MIN_SAMPLES
+    # The simulated substrate rises 0.12 % VWC per dripper second
+    assert learned["rate_per_dripper"] == pytest.approx(0.12, rel=0.1)
@@ -0,0 +1,230 @@
+import asyncio
+import time
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.managers.hydro.tank.OGBDosingScheduler import (
+    DOSING_JOBS_KEY,
+    DosingStep,
+    OGBDosingScheduler,
+)
+from custom_components.opengrowbox.OGBController.managers.hydro.tank.OGBTankFeedManager import (
+    NUTRIENT_SETTLE_SECONDS,
+    PumpType,
+)
+
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+from tests.logic.hydro.test_tank_feed_manager_logic import _manager_stub
+
+
+class VirtualClock:
+    """Deadline clock for tests: auto mode jumps to every deadline, manual mode waits for advance()."""
+
+    def __init__(self, auto=True):
+        self.now = 1_700_000_000.0
+        self.auto = auto
+        self._sleepers = []
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        if self.auto:
+            self.now += max(0.0, seconds)
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._sleepers.append((self.now + seconds, future))
+        await future
+
+    async def advance(self, seconds):
+        self.now += seconds
+        for deadline, future in list(self._sleepers):
+            if deadline <= self.now:
+                self._sleepers.remove((deadline, future))
+                if not future.done():
+                    future.set_result(None)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+
+class PumpLog:
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    async def start(self, pump, run_time, dose_ml):
+        self.events.append(("on", pump, dose_ml, self.clock.time()))
+        return True
+
+    async def stop(self, pump):
+        self.events.append(("off", pump, None, self.clock.time()))
+
+
+def _scheduler(clock, store=None):
+    pumps = PumpLog(clock)
+    scheduler = OGBDosingScheduler(
+        "dev_room", store or FakeDataStore(), FakeEventManager(), pumps.start, pumps.stop, clock=clock
+    )
+    return scheduler, pumps
+
+
+@pytest.mark.asyncio
+async def test_full_feed_cycle_runs_on_virtual_clock():
+    clock = VirtualClock()
+    manager = _manager_stub(FakeDataStore(), FakeEventManager())
+    manager.nutrients = {"A": 1.0, "B": 1.0, "C": 1.0, "X": 1.0, "Y": 1.0}
+    pumps = PumpLog(clock)
+    manager._start_pump = pumps.start
+    manager._stop_pump = pumps.stop
+    manager.dosing_scheduler = OGBDosingScheduler(
+        "dev_room",
+        manager.data_store,
+        manager.event_manager,
+        start_pump=lambda pump, run_time, dose_ml: manager._start_pump(pump, run_time, dose_ml),
+        stop_pump=lambda pump: manager._stop_pump(pump),
+        clock=clock,
+    )
+
+    started = time.monotonic()
+    start_clock = clock.time()
+    ok = await manager._dose_nutrients_with_concentration(
+        {"A": 10.0, "B": 8.0, "C": 6.0, "X": 4.0, "Y": 2.0}
+    )
+
+    assert ok is True
+    assert time.monotonic() - started < 1.0
+    assert [(e[0], e[1]) for e in pumps.events] == [
+        (state, pump)
+        for pump in ("switch.feedpump_a", "switch.feedpump_b", "switch.feedpump_c",
+                     "switch.feedpump_x", "switch.feedpump_y")
+        for state in ("on", "off")
+    ]
+    # Pump run times plus one settle window per nutrient, nothing else
+    run_time = sum(off[3] - on[3] for on, off in zip(pumps.events[::2], pumps.events[1::2]))
+    assert run_time > 0
+    assert clock.time() - start_clock == pytest.approx(run_time + 5 * NUTRIENT_SETTLE_SECONDS)
+    assert manager.data_store.get(DOSING_JOBS_KEY) == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_switches_running_pump_off():
+    clock = VirtualClock(auto=False)
+    scheduler, pumps = _scheduler(clock)
+
+    job = scheduler.submit("nutrients", [DosingStep("A", 10, 20, 90), DosingStep("B", 10, 20, 90)])
+    await clock.advance(0)
+    await clock.advance(5)
+    assert pumps.events == [("on", "A", 10, clock.now - 5)]
+
+    assert await scheduler.cancel() == 1
+    assert pumps.events[-1][:2] == ("off", "A")
+    assert await scheduler.wait(job) is False
+    assert job.state == "cancelled"
+    assert scheduler.data_store.get(DOSING_JOBS_KEY) == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_feed_is_not_recorded_or_calibrated():
+    clock = VirtualClock(auto=False)
+    manager = _manager_stub(FakeDataStore(), FakeEventManager())
+    manager.nutrients = {"A": 1.0, "B": 1.0}
+    manager.nutrient_concentrations = {"A": 1.0, "B": 1.0}
+    manager.reservoir_volume_liters = 10.0
+    pumps = PumpLog(clock)
+    manager.dosing_scheduler = OGBDosingScheduler(
+        "dev_room", manager.data_store, manager.event_manager, pumps.start, pumps.stop, clock=clock
+    )
+    calibrations = []
+
+    async def calibrate(total_dose, nutrients):
+        calibrations.append(total_dose)
+
+    manager._auto_calibrate_pumps = calibrate
+
+    feed = asyncio.create_task(manager._dose_nutrients_proportional({"scale_factor": 1.0}))
+    await clock.advance(0)
+    assert pumps.events[0][:2] == ("on", "switch.feedpump_a")
+
+    assert await manager.dosing_scheduler.cancel() == 1
+    await asyncio.wait_for(feed, 1)
+
+    assert manager.feed_history == []
+    assert calibrations == []
+
+
+@pytest.mark.asyncio
+async def test_reservoir_fill_hold_and_ec_settle():
+    clock = VirtualClock(auto=False)
+    scheduler, pumps = _scheduler(clock)
+
+    scheduler.hold("reservoir_fill")
+    job = scheduler.submit("nutrients", [DosingStep("A", 5, 10, 90), DosingStep("B", 5, 10, 90)])
+    await clock.advance(60)
+    assert pumps.events == []
+
+    scheduler.release("reservoir_fill")
+    await clock.advance(0)
+    await clock.advance(10)
+    assert [e[:2] for e in pumps.events] == [("on", "A"), ("off", "A")]
+
+    # Stable EC after a third of the settle window ends it early
+    await clock.advance(40)
+    scheduler.on_ec_reading(1.40)
+    await clock.advance(0)
+    scheduler.on_ec_reading(1.41)
+    await clock.advance(0)
+    assert pumps.events[-1][:2] == ("on", "B")
+
+    await clock.advance(10)
+    await clock.advance(90)
+    assert await scheduler.wait(job) is True
+
+
+@pytest.mark.asyncio
+async def test_resume_requeues_undelivered_volume_after_restart():
+    clock = VirtualClock()
+    now = clock.time()
+    store = FakeDataStore({
+        DOSING_JOBS_KEY: [{
+            "kind": "nutrients",
+            "job_id": "abc",
+            "state": "running",
+            "steps": [
+                {"pump": "A", "volume_ml": 10.0, "run_time": 20.0, "settle_s": 90.0, "state": "done"},
+                {"pump": "B", "volume_ml": 10.0, "run_time": 20.0, "settle_s": 90.0, "state": "running",
+                 "started_at": now - 5, "stop_at": now + 15},
+                {"pump": "C", "volume_ml": 4.0, "run_time": 8.0, "settle_s": 90.0},
+            ],
+        }]
+    })
+    scheduler, pumps = _scheduler(clock, store)
+
+    assert scheduler.resume() == 1
+    await asyncio.wait_for(scheduler._runner, 1)
+
+    # B is switched off first, then gets the 3/4 that were not delivered
+    assert [(e[0], e[1], e[2]) for e in pumps.events] == [
+        ("off", "B", None),
+        ("on", "B", pytest.approx(7.5)),
+        ("off", "B", None),
+        ("on", "C", 4.0),
+        ("off", "C", None),
+    ]
+    assert store.get(DOSING_JOBS_KEY) == []
+
+
+@pytest.mark.asyncio
+async def test_single_pump_activation_is_a_one_step_job():
+    clock = VirtualClock()
+    manager = _manager_stub(FakeDataStore(), FakeEventManager())
+    pumps = PumpLog(clock)
+    manager._start_pump = pumps.start
+    manager._stop_pump = pumps.stop
+    manager.dosing_scheduler = OGBDosingScheduler(
+        "dev_room", manager.data_store, manager.event_manager,
+        start_pump=manager._start_pump, stop_pump=manager._stop_pump, clock=clock,
+    )
+
+    assert await manager._activate_pump(PumpType.PH_DOWN, 2.0, 1.0) is True
+    assert [e[:2] for e in pumps.events] == [("on", "switch.feedpump_pp"), ("off", "switch.feedpump_pp")]
@@ -94,11 +94,11 @@ async def test_dose_nutrients_skips_disabled_pump_flowrate_zero():
 
     calls = {"count": 0}
 
-    async def _activate(*_args, **_kwargs):
+    async def _start(*_args, **_kwargs):
         calls["count"] += 1
         return True
 
-    manager._activate_pump = _activate
+    manager._start_pump = _start
 
     result = await manager._dose_nutrients()
 
@@ -656,11 +656,15 @@ async def test_concentration_based_dosing_includes_x_and_y():
     # Track pumps that were dosed
     dosed_pumps = []
     
-    async def mock_activate_pump(pump_type, run_time, dose_ml):
+    async def mock_start_pump(pump_type, run_time, dose_ml):
         dosed_pumps.append({"pump": pump_type, "dose_ml": dose_ml})
         return True
+
+    async def mock_stop_pump(pump_type):
+        pass
     
-    manager._activate_pump = mock_activate_pump
+    manager._start_pump = mock_start_pump
+    manager._stop_pump = mock_stop_pump
     
     # Mock asyncio.sleep to avoid long delays in tests
     import asyncio
@@ -717,11 +721,15 @@ async def test_concentration_based_dosing_skips_zero_concentration():
     # Track pumps that were dosed
     dosed_pumps = []
     
-    async def mock_activate_pump(pump_type, run_time, dose_ml):
+    async def mock_start_pump(pump_type, run_time, dose_ml):
         dosed_pumps.append({"pump": pump_type, "dose_ml": dose_ml})
         return True
+
+    async def mock_stop_pump(pump_type):
+        pass
     
-    manager._activate_pump = mock_activate_pump
+    manager._start_pump = mock_start_pump
+    manager._stop_pump = mock_stop_pump
     
     # Mock asyncio.sleep to avoid long delays in tests
     import asyncio
@@ -924,11 +932,15 @@ async def test_dose_nutrients_proportional_scales_with_scale_factor():
 
     dosed_pumps = []
 
-    async def mock_activate_pump(pump_type, run_time, dose_ml):
+    async def mock_start_pump(pump_type, run_time, dose_ml):
         dosed_pumps.append({"pump": pump_type, "dose_ml": dose_ml})
         return True
 
-    manager._activate_pump = mock_activate_pump
+    async def mock_stop_pump(pump_type):
+        pass
+
+    manager._start_pump = mock_start_pump
+    manager._stop_pump = mock_stop_pump
 
     original_sleep = asyncio.sleep
     async def mock_sleep(seconds):
@@ -969,11 +981,15 @@ async def test_dose_full_recipe_doses_full_concentration_based_amount():
 
     dosed_pumps = []
 
-    async def mock_activate_pump(pump_type, run_time, dose_ml):
+    async def mock_start_pump(pump_type, run_time, dose_ml):
         dosed_pumps.append({"pump": pump_type, "dose_ml": dose_ml})
         return True
 
-    manager._activate_pump = mock_activate_pump
+    async def mock_stop_pump(pump_type):
+        pass
+
+    manager._start_pump = mock_start_pump
+    manager._stop_pump = mock_stop_pump
 
     original_sleep = asyncio.sleep
     async def mock_sleep(seconds):
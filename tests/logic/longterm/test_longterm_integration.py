@@ -117,6 +117,8 @@ async def test_extended_reservoir_management_30_days():
     manager.high_threshold = 85.0
     manager.current_level = 80.0
     manager.level_unit = "%"
+    manager.dosing_scheduler = None
+    manager._level_event = asyncio.Event()
     
     # Simulate 30 days
     daily_consumption = 2.5  # % per day
@@ -217,6 +219,8 @@ async def test_reservoir_autofill_handles_multiple_refills_over_time():
     manager._fill_block_reason = None
     manager._last_feed_mode = None
     manager._expected_pump_state = None
+    manager.dosing_scheduler = None
+    manager._level_event = asyncio.Event()
 
     notifications = []
     refill_runs = []
@@ -238,11 +242,15 @@ async def test_reservoir_autofill_handles_multiple_refills_over_time():
     async def _find_reservoir_pump(log_missing: bool = True):
         manager.reservoir_pump_entity = "switch.test_reservoir_fill"
 
+    async def _wait_while_filling(_seconds):
+        return None
+
     manager._notify_user = _notify_user
     manager._run_fill_cycle = _run_fill_cycle
     manager._activate_pump = _activate_pump
     manager._deactivate_pump = _deactivate_pump
     manager._find_reservoir_pump = _find_reservoir_pump
+    manager._wait_while_filling = _wait_while_filling
     manager._log_to_client = lambda *args, **kwargs: None
 
     original_sleep = asyncio.sleep
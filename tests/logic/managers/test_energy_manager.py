@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.managers import OGBEnergyManager as energy_module
+from custom_components.opengrowbox.OGBController.managers.OGBEnergyManager import (
+    EnergyCounter,
+    OGBEnergyManager,
+    month_totals,
+    week_totals,
+)
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+
+
+def _ts(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def _make_manager():
+    data_store = FakeDataStore({"Energy": {"price_per_kwh": 0.5, "daily": {}}, "devices": []})
+    event_manager = FakeEventManager()
+    # Constructor starts the flush loop; tests drive integration directly
+    with patch.object(OGBEnergyManager, "_start_background_tasks"):
+        manager = OGBEnergyManager(None, data_store, event_manager, "TestTent")
+    return manager, data_store, event_manager
+
+
+def _save_count(event_manager):
+    return sum(1 for e in event_manager.emitted if e["event_name"] == "SaveState")
+
+
+def test_trapezoidal_integration_between_samples():
+    manager, _, _ = _make_manager()
+    start = _ts(2026, 5, 4, 12, 0)
+    counter = EnergyCounter(100.0, start, False)
+    manager._device_tracking["light"] = counter
+
+    # Ramp 100W -> 300W over one hour = 200Wh
+    added = manager._integrate("light", counter, start + 3600, 300.0)
+
+    assert added == pytest.approx(0.2)
+    assert counter.power_watts == 300.0
+    assert counter.session_kwh == pytest.approx(0.2)
+    assert manager._pending["2026-05-04"]["light"][1] == pytest.approx(3600)
+
+
+def test_interval_across_midnight_is_split_per_day():
+    manager, _, _ = _make_manager()
+    start = _ts(2026, 5, 4, 23, 0)
+    counter = EnergyCounter(1000.0, start, True)
+
+    manager._integrate("heater", counter, start + 2 * 3600)
+
+    assert manager._pending["2026-05-04"]["heater"][0] == pytest.approx(1.0)
+    assert manager._pending["2026-05-05"]["heater"][0] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_power_updates_append_to_daily_ledger_and_debounce_save():
+    manager, data_store, event_manager = _make_manager()
+    now = [_ts(2026, 5, 4, 10, 0)]
+
+    with patch.object(energy_module.time, "time", side_effect=lambda: now[0]):
+        await manager._start_tracking_with_estimate("exhaust")
+        await manager._on_power_sensor_update({"device_name": "exhaust", "power_watts": 50.0})
+        now[0] += 1800
+        await manager._on_power_sensor_update({"device_name": "exhaust", "power_watts": 50.0})
+        now[0] += 1800
+        await manager._on_device_state_change({"device_name": "exhaust", "is_running": False})
+
+        today = datetime.fromtimestamp(now[0], tz=timezone.utc).strftime("%Y-%m-%d")
+        bucket = data_store.getDeep(f"Energy.daily.{today}")
+        assert bucket["kwh"] == pytest.approx(0.05)
+        assert bucket["cost"] == pytest.approx(0.025)
+        assert bucket["runtime"]["exhaust"] == pytest.approx(1.0)
+        assert "exhaust" not in manager._device_tracking
+        assert _save_count(event_manager) == 1
+
+        # Second session shortly after: ledger appended, SaveState debounced
+        await manager._start_tracking_with_estimate("exhaust")
+        now[0] += 600
+        await manager._on_device_state_change({"device_name": "exhaust", "is_running": False})
+
+    bucket = data_store.getDeep(f"Energy.daily.{today}")
+    assert bucket["runtime"]["exhaust"] == pytest.approx(1.0 + 600 / 3600, abs=1e-3)
+    assert _save_count(event_manager) == 1
+
+
+def test_weekly_and_monthly_are_derived_from_daily_buckets():
+    energy = {
+        "price_per_kwh": 0.5,
+        "daily": {
+            "2026-04-30": {"kwh": 3.0, "runtime": {}},
+            "2026-05-01": {"kwh": 1.0, "runtime": {"light": 12.0}},
+            "2026-05-04": {"kwh": 2.0, "runtime": {"light": 12.0}},
+            "2026-05-11": {"kwh": 4.0, "runtime": {}},
+        },
+    }
+    now = datetime(2026, 5, 6, tzinfo=timezone.utc)
+
+    assert week_totals(energy, now)["kwh"] == pytest.approx(2.0)
+    month = month_totals(energy, now)
+    assert month["kwh"] == pytest.approx(7.0)
+    assert month["cost"] == pytest.approx(3.5)
+    assert month["runtime_hours"] == pytest.approx(24.0)
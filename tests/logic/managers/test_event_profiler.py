@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.managers.OGBConsoleManager import (
+    OGBConsoleManager,
+)
+from custom_components.opengrowbox.OGBController.managers.OGBEventManager import (
+    OGBEventManager,
+)
+from custom_components.opengrowbox.OGBController.utils.profiler import LatencyHistogram
+
+from tests.logic.helpers import FakeDataStore
+
+
+class FakeBus:
+    def __init__(self):
+        self.last_fired = None
+
+    def async_listen(self, event_type, handler):
+        pass
+
+    def async_fire(self, event_type, data):
+        self.last_fired = {"event_type": event_type, "data": data}
+
+
+class FakeHass:
+    def __init__(self):
+        self.bus = FakeBus()
+
+
+def test_histogram_keeps_fixed_window_and_percentiles():
+    hist = LatencyHistogram(size=100)
+    # First 100 samples are slow, then the window is overwritten by 1..100 ms
+    for _ in range(100):
+        hist.add(5.0)
+    for ms in range(1, 101):
+        hist.add(ms / 1000)
+
+    summary = hist.summary()
+    assert summary["count"] == 200
+    assert summary["p50_ms"] == pytest.approx(50.0)
+    assert summary["p95_ms"] == pytest.approx(95.0)
+    assert summary["p99_ms"] == pytest.approx(99.0)
+    # max tracks the whole lifetime, not only the window
+    assert summary["max_ms"] == pytest.approx(5000.0)
+
+
+@pytest.mark.asyncio
+async def test_emit_records_nothing_while_profiler_disabled():
+    manager = OGBEventManager(FakeHass(), FakeDataStore())
+    calls = []
+
+    async def handler(data):
+        calls.append(data)
+
+    manager.on("VPDCreation", handler)
+    await manager.emit("VPDCreation", {"vpd": 1.1})
+    await asyncio.sleep(0)
+
+    assert calls == [{"vpd": 1.1}]
+    profile = manager.get_profile()
+    assert profile["enabled"] is False
+    assert profile["listeners"] == {}
+    assert profile["emits"] == {}
+
+
+@pytest.mark.asyncio
+async def test_emit_times_async_and_sync_listeners_when_enabled():
+    manager = OGBEventManager(FakeHass(), FakeDataStore())
+
+    async def handle_new_vpd(data):
+        await asyncio.sleep(0.01)
+
+    def sync_listener(data):
+        pass
+
+    manager.on("VPDCreation", handle_new_vpd)
+    manager.on("VPDCreation", sync_listener)
+    manager.enable_profiling(True)
+    try:
+        for _ in range(3):
+            await manager.emit("VPDCreation", {"vpd": 1.2})
+        await asyncio.gather(*list(manager._background_tasks))
+    finally:
+        manager.enable_profiling(False)
+
+    profile = manager.get_profile()
+    assert profile["emits"]["VPDCreation"]["count"] == 3
+    # Three async + three sync listener runs under the event name
+    assert profile["listeners"]["VPDCreation"]["count"] == 6
+    handler_stats = next(v for k, v in profile["handlers"].items() if k.endswith("handle_new_vpd"))
+    assert handler_stats["p50_ms"] >= 9.0
+    assert profile["tasks"]["spawned"]["VPDCreation"] == 3
+    assert profile["tasks"]["peak_active"] >= 1
+    assert profile["tasks"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_console_profiler_command_toggles_and_reports():
+    hass = FakeHass()
+    manager = OGBEventManager(hass, FakeDataStore())
+    console = OGBConsoleManager(hass, FakeDataStore(), manager, "test_room")
+    console.is_initialized = True
+
+    await console.cmd_profiler(["on"])
+    assert manager.profiler.enabled is True
+
+    with manager.profiler.span("orchestrator.loop"):
+        pass
+    await console.cmd_profiler(["status", "5"])
+    message = hass.bus.last_fired["data"]["message"]
+    assert "Control Loop Profiler (ON)" in message
+    assert "orchestrator.loop" in message
+
+    await console.cmd_profiler(["off"])
+    assert manager.profiler.enabled is False
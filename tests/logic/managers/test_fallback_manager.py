@@ -186,3 +186,110 @@ async def test_light_schedule_debounce_emits_once():
 
     toggle_events = [call for call in controller.event_manager.emit.await_args_list if call.args[0] == "toggleLight"]
     assert len(toggle_events) == 1
+
+
+def _register_sensor(manager, entity_id):
+    return manager._on_sensor_initialized(
+        {"entity_id": entity_id, "sensor_type": "temperature", "room": "TestTent"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_deadline_heap_only_marks_expired_entities_stale():
+    manager = _make_manager()
+    manager._notify_entity_stale = AsyncMock()
+    manager._notify_entity_recovered = AsyncMock()
+    clock = [1000.0]
+
+    with patch(
+        "custom_components.opengrowbox.OGBController.managers.OGBFallBackManager.time.monotonic",
+        side_effect=lambda: clock[0],
+    ):
+        await _register_sensor(manager, "sensor.a")
+        await _register_sensor(manager, "sensor.b")
+        threshold = manager.STALE_THRESHOLD_MINUTES * 60
+
+        assert manager._next_wakeup_delay(clock[0]) == pytest.approx(threshold)
+
+        # sensor.b reports halfway through; only sensor.a should expire
+        clock[0] += threshold / 2
+        await manager._on_sensor_update({"entity_id": "sensor.b", "value": 21.0})
+        assert len(manager._deadline_heap) == 2  # refresh does not push duplicates
+
+        clock[0] += threshold / 2 + 1
+        await manager._process_due_deadlines(clock[0])
+
+        assert manager._stale_entities == {"sensor.a"}
+        manager._notify_entity_stale.assert_awaited_once()
+        # sensor.b entry was re-armed with its real deadline
+        assert manager._next_wakeup_delay(clock[0]) == pytest.approx(threshold / 2 - 1)
+
+        # Recovery is immediate on the next update
+        await manager._on_sensor_update({"entity_id": "sensor.a", "value": 20.0})
+        assert manager._stale_entities == set()
+        manager._notify_entity_recovered.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_removed_entity_deadline_is_discarded():
+    manager = _make_manager()
+    manager._notify_entity_stale = AsyncMock()
+
+    await _register_sensor(manager, "sensor.gone")
+    await manager._on_entity_removed({"entity_id": "sensor.gone"})
+    await manager._process_due_deadlines(float("inf"))
+
+    manager._notify_entity_stale.assert_not_awaited()
+    assert manager._deadline_heap == []
+
+
+@pytest.mark.asyncio
+async def test_runaway_detected_from_power_update():
+    manager = _make_manager()
+    manager._notify_runaway = AsyncMock()
+    device = FakeDevice("Pump", "Pump", state="off", power=40.0)
+    await manager._on_device_initialized(
+        {
+            "entity_id": "switch.pump",
+            "device_name": "Pump",
+            "device_type": "Pump",
+            "room": "TestTent",
+            "device_ref": device,
+        }
+    )
+
+    await manager._on_power_sensor_update({"device_name": "Pump", "power_watts": 40.0})
+
+    device.turn_off.assert_awaited_once()
+    assert "Pump" in manager._runaway_due
+
+    # Further samples within the retry spacing do not re-trigger turn_off
+    await manager._on_power_sensor_update({"device_name": "Pump", "power_watts": 39.0})
+    device.turn_off.assert_awaited_once()
+
+    # Power dropping clears the pending follow-up check
+    await manager._on_power_sensor_update({"device_name": "Pump", "power_watts": 0.5})
+    assert "Pump" not in manager._runaway_due
+
+
+@pytest.mark.asyncio
+async def test_scheduled_runaway_check_reads_power_when_sensor_is_silent():
+    manager = _make_manager()
+    manager._notify_runaway = AsyncMock()
+    device = FakeDevice("Heater", "Heater", state="off", power=800.0)
+    await manager._on_device_initialized(
+        {
+            "entity_id": "switch.heater",
+            "device_name": "Heater",
+            "device_type": "Heater",
+            "room": "TestTent",
+            "device_ref": device,
+        }
+    )
+
+    manager.schedule_runaway_check("Heater", delay=0)
+    due = manager._runaway_due["Heater"]
+    await manager._process_due_deadlines(due)
+
+    device.turn_off.assert_awaited_once()
+    manager._notify_runaway.assert_awaited_once()
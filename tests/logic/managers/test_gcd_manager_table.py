@@ -0,0 +1,83 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBPublications import (
+    OGBActionPublication,
+)
+from custom_components.opengrowbox.OGBController.managers.OGBgcdManager import (
+    OGBgcdManager,
+)
+
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+
+
+def _manager(data=None):
+    data_store = FakeDataStore({"controlOptions": {}, **(data or {})})
+    return OGBgcdManager(None, data_store, FakeEventManager(), "room"), data_store
+
+
+def _action(cap, action):
+    return OGBActionPublication(
+        Name="room", message="test", capability=cap, action=action, priority="medium"
+    )
+
+
+def test_filter_allowed_registers_and_blocks_repeated_capability():
+    manager, _ = _manager()
+    actions = [
+        _action("canHeat", "Increase"),
+        _action("canExhaust", "Increase"),
+        _action("canHeat", "Increase"),
+    ]
+
+    allowed, blocked = manager.filter_allowed(actions)
+
+    assert [a.capability for a in allowed] == ["canHeat", "canExhaust"]
+    assert blocked == [actions[2]]
+
+    # Next cycle: everything is in cooldown now
+    allowed, blocked = manager.filter_allowed(actions[:2], register=False)
+    assert allowed == []
+    assert len(blocked) == 2
+
+
+@pytest.mark.asyncio
+async def test_history_view_writes_through_to_the_table():
+    manager, _ = _manager()
+    await manager.register("canHeat", "Increase")
+
+    entry = manager.action_history["canHeat"]
+    assert isinstance(entry["cooldown_until"], datetime)
+    assert entry["action_type"] == "Increase"
+    assert await manager.is_allowed("canHeat", "Increase") is False
+
+    entry["cooldown_until"] = datetime.now() - timedelta(seconds=1)
+    entry["repeat_cooldown"] = datetime.now() - timedelta(seconds=1)
+    assert await manager.is_allowed("canHeat", "Increase") is True
+
+    manager.action_history.clear()
+    assert "canHeat" not in manager.action_history
+    assert len(manager.action_history) == 0
+
+
+@pytest.mark.asyncio
+async def test_active_cooldowns_round_trip_through_wall_clock():
+    manager, data_store = _manager()
+    await manager.register("canHeat", "Increase")
+    manager.filter_allowed([_action("canExhaust", "Reduce")])
+
+    state = data_store.get("cooldownState")
+    assert set(state) == {"canHeat", "canExhaust"}
+    assert state["canHeat"]["until"] > time.time()
+
+    # Expired entries are dropped on load, active ones survive a restart
+    state["canExhaust"]["until"] = state["canExhaust"]["repeat"] = time.time() - 5
+    restored, _ = _manager({"cooldownState": state})
+
+    assert "canHeat" in restored.action_history
+    assert "canExhaust" not in restored.action_history
+    assert await restored.is_allowed("canHeat", "Increase") is False
+    remaining = restored.get_status()["canHeat"]["cooldown_remaining_seconds"]
+    assert abs(remaining - manager.get_status()["canHeat"]["cooldown_remaining_seconds"]) < 1.0
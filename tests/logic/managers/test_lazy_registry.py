@@ -0,0 +1,193 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.harness import install_ha_stubs
+from custom_components.opengrowbox.OGBController.managers.OGBEventManager import (
+    OGBEventManager,
+)
+from custom_components.opengrowbox.OGBController.utils.lazyRegistry import (
+    OGBManagerRegistry,
+)
+from tests.logic.helpers import FakeDataStore
+
+
+class FakeBus:
+    def async_listen(self, event_type, handler):
+        pass
+
+    def async_fire(self, event_type, data):
+        pass
+
+
+class FakeHass:
+    def __init__(self):
+        self.bus = FakeBus()
+
+
+class FakeSubManager:
+    def __init__(self, event_manager):
+        self.seen = []
+        event_manager.on("DoseNutrients", self.on_dose)
+
+    async def on_dose(self, data):
+        self.seen.append(data)
+
+
+class FakeFeedManager:
+    def __init__(self, event_manager, shared):
+        self.shared = shared
+        self.seen = []
+        self.shutdown_called = False
+        self.sub = FakeSubManager(event_manager)
+        event_manager.on("FeedModeChange", self.on_mode)
+        event_manager.on("DoseNutrients", self.on_dose)
+
+    async def on_mode(self, data):
+        self.seen.append(("mode", data))
+
+    async def on_dose(self, data):
+        self.seen.append(("dose", data))
+
+    async def async_shutdown(self):
+        self.shutdown_called = True
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def make_registry(state):
+    events = OGBEventManager(FakeHass(), None)
+    shared = object()
+    registry = OGBManagerRegistry(events, "room", shared=(shared,))
+    created = []
+
+    def factory():
+        created.append(FakeFeedManager(events, shared))
+        return created[-1]
+
+    registry.register(
+        "feed_manager",
+        factory,
+        gate=lambda: state["enabled"],
+        gate_events=("FeedModeChange",),
+        wake_events=("DoseNutrients",),
+    )
+    return events, registry, created
+
+
+@pytest.mark.asyncio
+async def test_closed_gate_creates_nothing_until_gate_event_opens_it():
+    state = {"enabled": False}
+    events, registry, created = make_registry(state)
+
+    registry.start_enabled()
+    assert registry.peek("feed_manager") is None
+    assert registry.get("feed_manager") is None
+    assert created == []
+
+    state["enabled"] = True
+    await events.emit("FeedModeChange", "Automatic")
+    await settle()
+
+    manager = registry.peek("feed_manager")
+    assert manager is not None
+    # The triggering event reaches the freshly created manager exactly once
+    assert manager.seen == [("mode", "Automatic")]
+    assert registry.get_stats()["feed_manager"]["created"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wake_event_materializes_and_forwards_to_sub_managers():
+    state = {"enabled": False}
+    events, registry, _ = make_registry(state)
+
+    await events.emit("DoseNutrients", {"A": 1})
+    await settle()
+
+    manager = registry.peek("feed_manager")
+    assert manager.seen == [("dose", {"A": 1})]
+    assert manager.sub.seen == [{"A": 1}]
+
+    await events.emit("DoseNutrients", {"A": 2})
+    await settle()
+    assert manager.seen[-1] == ("dose", {"A": 2})
+    assert registry.get_stats()["feed_manager"]["created"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gate_close_tears_down_manager_and_its_listeners():
+    state = {"enabled": True}
+    events, registry, _ = make_registry(state)
+    changes = []
+    registry.subscribe(lambda name, inst: changes.append((name, inst is not None)))
+
+    registry.start_enabled()
+    manager = registry.peek("feed_manager")
+    assert manager is not None
+
+    state["enabled"] = False
+    await events.emit("FeedModeChange", "Disabled")
+    await settle()
+
+    assert registry.peek("feed_manager") is None
+    assert manager.shutdown_called
+    assert manager.seen == [("mode", "Disabled")]
+    owned = {id(manager), id(manager.sub)}
+    for callbacks in events.listeners.values():
+        assert not any(id(getattr(cb, "__self__", None)) in owned for cb in callbacks)
+    # Registry proxies stay so the manager can come back
+    assert events.listeners["FeedModeChange"]
+    assert changes == [("feed_manager", True), ("feed_manager", False)]
+
+
+@pytest.mark.asyncio
+async def test_tank_gate_keeps_reservoir_management_with_feed_mode_disabled():
+    install_ha_stubs()  # OGBMainController imports homeassistant.core
+    from custom_components.opengrowbox.OGBController.managers.core.OGBMainController import (
+        OGBMainController,
+    )
+
+    store = FakeDataStore(
+        {
+            "Hydro": {"FeedModeActive": True, "ReservoirLevelRaw": None},
+            "capabilities": {"canPump": {"state": False}, "canReservoirFill": {"state": True}},
+        }
+    )
+    events = OGBEventManager(FakeHass(), None)
+    controller = SimpleNamespace(room="Tent", data_store=store, TANK_PUMP_CAPABILITIES=OGBMainController.TANK_PUMP_CAPABILITIES)
+    controller.managers = OGBManagerRegistry(events, "Tent")
+    gate = lambda: OGBMainController._tank_feed_enabled(controller)
+    controller.managers.register(
+        "feed_manager",
+        lambda: FakeFeedManager(events, None),
+        gate=gate,
+        gate_events=("FeedModeChange", "ReservoirLevelUpdate"),
+    )
+    controller.managers.start_enabled()
+    manager = controller.managers.peek("feed_manager")
+
+    # A reservoir pump keeps the tank stack running when feeding is switched off
+    store.setDeep("Hydro.FeedModeActive", False)
+    await events.emit("FeedModeChange", "Disabled")
+    await settle()
+    assert controller.managers.peek("feed_manager") is manager
+
+    # ...and so does a fill in progress, even without pump capabilities
+    store.setDeep("capabilities.canReservoirFill.state", False)
+    manager.reservoir_manager = SimpleNamespace(_is_filling=True)
+    await controller.managers.refresh()
+    assert controller.managers.peek("feed_manager") is manager
+
+    manager.reservoir_manager._is_filling = False
+    await controller.managers.refresh()
+    assert controller.managers.peek("feed_manager") is None
+
+    # A reservoir level reading alone brings it back
+    store.setDeep("Hydro.ReservoirLevelRaw", 42.0)
+    await events.emit("ReservoirLevelUpdate", {"entity_id": "sensor.tank_level", "state": "42.0"})
+    await settle()
+    assert controller.managers.peek("feed_manager") is not None
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.managers.OGBNotifyManager import (
+    AGGREGATION_WINDOW_SECONDS,
+    MAX_TRACKED_FINGERPRINTS,
+    OGBNotificator,
+)
+from custom_components.opengrowbox.OGBController.utils.slidingWindow import (
+    SlidingWindowCounter,
+)
+
+
+class FakeServices:
+    def __init__(self):
+        self.calls = []
+
+    async def async_call(self, domain, service, data, blocking=False):
+        self.calls.append((domain, service, data))
+
+    def async_services(self):
+        return {}
+
+
+def _notificator():
+    # No hass.data -> no DST monitor
+    hass = SimpleNamespace(services=FakeServices())
+    notificator = OGBNotificator(hass, "room")
+    clock = [1000.0]
+    notificator._clock = lambda: clock[0]
+    return notificator, hass.services.calls, clock
+
+
+def test_sliding_window_counter_expires_buckets():
+    counter = SlidingWindowCounter(60, 6)
+    counter.add(now=0)
+    counter.add(2, now=25)
+    assert counter.count(now=55) == 3
+    assert counter.count(now=65) == 2  # first bucket left the window
+    assert counter.count(now=500) == 0
+
+
+@pytest.mark.asyncio
+async def test_identical_issue_is_suppressed_and_counted_distinct_issues_pass():
+    notificator, calls, clock = _notificator()
+
+    await notificator.warning("Pump A stuck at 12.5", title="Pump")
+    clock[0] += 40
+    await notificator.warning("Pump A stuck at 13.1", title="Pump")  # same issue, numbers masked
+    await notificator.warning("Filter clogged", title="Filter")
+    assert [c[2]["title"] for c in calls] == ["Pump", "Filter"]
+
+    clock[0] += 5 * 60
+    await notificator.warning("Pump A stuck at 14.0", title="Pump")
+    assert calls[-1][2]["message"].endswith("(repeated 1x since last notification)")
+    assert notificator.get_notification_stats()["warning"]["suppressed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sensor_failure_storm_is_merged_into_one_notification():
+    notificator, calls, clock = _notificator()
+
+    for i in range(40):
+        await notificator.alert_sensor_failure("temperature", f"sensor_{i}")
+        clock[0] += 0.1
+
+    # First alert immediately, the rest waits for the aggregation window
+    assert len(calls) == 1
+    await notificator.flush_burst(("critical", "OGB room: Sensor Failure"))
+
+    assert len(calls) == 2
+    merged = calls[-1][2]
+    assert merged["title"] == "OGB room: Sensor Failure (39x)"
+    assert "(+29 more)" in merged["message"]
+    assert notificator.get_notification_stats()["critical"]["last_hour"] == 2
+
+    # Window over: a new sensor failure goes out on its own again
+    clock[0] += AGGREGATION_WINDOW_SECONDS
+    await notificator.alert_sensor_failure("humidity", "late_sensor")
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_hourly_limit_and_bounded_state():
+    notificator, calls, clock = _notificator()
+
+    for i in range(MAX_TRACKED_FINGERPRINTS + 50):
+        await notificator.info(f"event {chr(65 + i % 26)}{i // 26}", title=f"T{i}")
+        clock[0] += 1
+
+    assert len(calls) == notificator.rate_limits["info"]["max_per_hour"]
+    assert len(notificator._alerts) <= MAX_TRACKED_FINGERPRINTS
+
+    clock[0] += 3600
+    await notificator.info("after an hour", title="Later")
+    assert calls[-1][2]["title"] == "Later"
@@ -0,0 +1,79 @@
+import dataclasses
+import logging
+import sys
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.data.OGBDataClasses import OGBPublications
+from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBPublications import (
+    EVENT_PAYLOADS,
+    OGBEventPublication,
+    OGBHydroAction,
+    OGBPlantDatesPublication,
+    OGBVPDPublication,
+    validate_payload,
+)
+from custom_components.opengrowbox.OGBController.managers.OGBEventManager import (
+    OGBEventManager,
+)
+
+PUBLICATIONS = [
+    cls for cls in vars(OGBPublications).values()
+    if isinstance(cls, type) and dataclasses.is_dataclass(cls) and cls.__module__ == OGBPublications.__name__
+]
+
+
+class FakeHass:
+    bus = None
+
+
+def test_all_publications_are_slotted_and_keep_their_dict_form():
+    assert len(PUBLICATIONS) == 26
+    for cls in PUBLICATIONS:
+        assert "__slots__" in vars(cls), cls.__name__
+
+    pub = OGBVPDPublication(Name="RoomUpdate", VPD=1.2)
+    assert not hasattr(pub, "__dict__")
+    assert pub.to_dict()["VPD"] == 1.2
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        pub.VPD = 1.3
+
+    dates = OGBPlantDatesPublication("Room", "m1", "p", "b", "photo", "veg", "veg")
+    assert dataclasses.asdict(dates) == dates.to_dict()
+    # Slotted instances are smaller than the former __dict__ layout
+    plain = dataclasses.make_dataclass("Plain", [(f.name, f.type) for f in dataclasses.fields(OGBHydroAction)])
+    unslotted = plain("R", "pump", "true", "on")
+    action = OGBHydroAction(Name="R", Device="pump", Cycle="true", Action="on")
+    assert sys.getsizeof(action) < sys.getsizeof(unslotted) + sys.getsizeof(unslotted.__dict__)
+
+
+def test_validate_payload_against_registry(caplog):
+    assert validate_payload("PumpAction", OGBHydroAction(Name="R", Device="pump", Cycle="true", Action="on"))
+    assert validate_payload("PumpAction", {"action": "off"})
+    assert validate_payload("NotRegistered", object())
+    assert set(EVENT_PAYLOADS["selectActionMode"]) >= {str}
+
+    with caplog.at_level(logging.WARNING, logger=OGBPublications.__name__):
+        assert not validate_payload("SensorUpdate", OGBVPDPublication(Name="x"))
+    assert "expected OGBEventPublication | dict" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_emit_validates_only_in_debug_mode(caplog):
+    manager = OGBEventManager(FakeHass(), None)
+    received = []
+    manager.on("SensorUpdate", received.append)
+    logger = "custom_components.opengrowbox.OGBController.managers.OGBEventManager"
+
+    caplog.set_level(logging.WARNING, logger=OGBPublications.__name__)
+
+    with caplog.at_level(logging.INFO, logger=logger):
+        await manager.emit("SensorUpdate", "sensor.temp")
+    assert "expected" not in caplog.text
+
+    with caplog.at_level(logging.DEBUG, logger=logger):
+        await manager.emit("SensorUpdate", "sensor.temp")
+        await manager.emit("SensorUpdate", OGBEventPublication(Name="sensor.temp", newState=[21.0]))
+    assert caplog.text.count("Event 'SensorUpdate' emitted with str") == 1
+    # Validation only warns; listeners still receive the payload
+    assert len(received) == 3
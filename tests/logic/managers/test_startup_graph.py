@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.utils.startupGraph import (
+    DONE,
+    FAILED,
+    SKIPPED,
+    StartupGraph,
+)
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently_after_their_dependencies():
+    order = []
+    gate = asyncio.Event()
+
+    async def stage(name, wait=None):
+        order.append(f"{name}:start")
+        if wait is not None:
+            await wait.wait()
+        order.append(f"{name}:end")
+
+    async def entities():
+        # Only finishes once the state load is already running
+        await stage("entities")
+        gate.set()
+
+    graph = (
+        StartupGraph("room")
+        .add("entities", entities)
+        .add("state", lambda: stage("state", gate))
+        .add("mediums", lambda: stage("mediums"), after=["state"])
+        .add("devices", lambda: stage("devices"), after=["entities", "mediums"])
+    )
+    stages = await graph.run()
+
+    assert order.index("state:start") < order.index("state:end")
+    assert order.index("entities:end") < order.index("state:end")
+    assert order[-2:] == ["devices:start", "devices:end"]
+    assert all(stage.state == DONE for stage in stages.values())
+    assert set(graph.timings()) == {"entities", "state", "mediums", "devices"}
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_skips_only_stages_that_require_it():
+    ran = []
+
+    async def discovery():
+        raise RuntimeError("registry unavailable")
+
+    async def record(name):
+        ran.append(name)
+
+    graph = (
+        StartupGraph("room")
+        .add("discovery", discovery)
+        .add("mediums", lambda: record("mediums"), after=["discovery"])
+        .add("devices", lambda: record("devices"), required=["discovery"])
+    )
+    stages = await graph.run()
+
+    assert ran == ["mediums"]
+    assert stages["discovery"].state == FAILED
+    assert stages["devices"].state == SKIPPED
+    assert "devices=" in graph.summary()
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_and_cycles_are_rejected():
+    async def noop():
+        return None
+
+    with pytest.raises(ValueError):
+        await StartupGraph().add("a", noop, after=["missing"]).run()
+
+    with pytest.raises(ValueError):
+        await StartupGraph().add("a", noop, after=["b"]).add("b", noop, after=["a"]).run()
+
+    with pytest.raises(ValueError):
+        StartupGraph().add("a", noop).add("a", noop)
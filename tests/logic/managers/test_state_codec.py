@@ -0,0 +1,166 @@
+import json
+import logging
+from datetime import datetime
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import (
+    LightStage,
+    OGBConf,
+)
+from custom_components.opengrowbox.OGBController.managers.OGBDSManager import OGBDSManager
+from custom_components.opengrowbox.OGBController.utils import stateCodec
+from custom_components.opengrowbox.OGBController.utils.stateCodec import (
+    SCHEMA_KEY,
+    SCHEMA_VERSION,
+    migrate,
+)
+from tests.logic.helpers import FakeEventManager
+
+
+class Phase(Enum):
+    VEG = "veg"
+
+
+class Medium:
+    def __init__(self, name):
+        self.name = name
+        self.event_manager = object()
+
+    def to_dict(self):
+        return {"name": self.name, "properties": {"ph_range": (5.8, 6.5)}, "sensor_history": [1, 2, 3]}
+
+
+def _store():
+    store = DataStore(OGBConf(hass=None, room="Tent"))
+    store.set("growMediums", [Medium("m1"), {"name": "m2", "properties": {"ec_range": (1.0, 2.0)}}])
+    store.setDeep("Energy.daily.2026-03-01", {"kwh": 1.5, "cost": 0.52, "runtime": {"switch.fan": 3.5}})
+    store.setDeep("Energy.devices", {"switch.fan": {"watts": 30}})
+    store.set("drying", {"phase": Phase.VEG, "started": datetime(2026, 3, 1, 8, 30), "tags": {"a"}, "_tmp": 1})
+    store.set("previousActions", [{"capability": "canFan", "time": datetime(2026, 3, 1)}])
+    return store
+
+
+def test_encode_matches_the_generic_walk_for_plain_data_and_shares_it():
+    store = _store()
+    state = store.getFullState()
+
+    # Excluded keys are dropped at every level, tuples become lists, objects go through to_dict
+    assert "Energy" in state and "devices" not in state["Energy"]
+    assert state["growMediums"] == [
+        {"name": "m1", "properties": {"ph_range": [5.8, 6.5]}},
+        {"name": "m2", "properties": {"ec_range": [1.0, 2.0]}},
+    ]
+    assert state["drying"] == {"phase": "veg", "started": "2026-03-01T08:30:00", "tags": ["a"]}
+    assert state["previousActions"][0]["time"] == "2026-03-01T00:00:00"
+    assert "hass" not in state and "workData" not in state and "DeviceProfiles" not in state
+
+    # Plain subtrees are not copied
+    assert state["Energy"]["daily"] is store.state.Energy["daily"]
+    assert state["vpd"] is store.state.vpd
+    for key in ("vpd", "tentData", "Hydro", "plantStages", "capabilities"):
+        assert state[key] == store._make_serializable(getattr(store.state, key))
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_round_trip_through_bytes(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(stateCodec, "orjson", None)
+    store = _store()
+    raw = stateCodec.dumps({**store.getFullState(), SCHEMA_KEY: SCHEMA_VERSION})
+    assert isinstance(raw, bytes)
+
+    fresh = DataStore(OGBConf(hass=None, room="Tent"))
+    decoded = fresh.codec.decode(stateCodec.loads(raw), "Tent")
+
+    assert SCHEMA_KEY not in decoded
+    assert decoded["Energy"]["daily"] == {"2026-03-01": {"kwh": 1.5, "cost": 0.52, "runtime": {"switch.fan": 3.5}}}
+    assert decoded["growMediums"][0]["properties"]["ph_range"] == [5.8, 6.5]
+    assert decoded["lightPlantStages"]["Germination"] == store.state.lightPlantStages["Germination"]
+    assert isinstance(decoded["lightPlantStages"]["Germination"], LightStage)
+    # Re-encoding the restored state gives the same document (ints may come back as floats)
+    restored = SimpleNamespace(**{**vars(fresh.state), **decoded})
+    assert stateCodec.loads(stateCodec.dumps(fresh.codec.encode(restored))) == stateCodec.loads(
+        stateCodec.dumps(store.getFullState())
+    )
+
+
+def test_decoders_coerce_known_field_types_and_drop_invalid_values(caplog):
+    caplog.set_level(logging.WARNING, logger=stateCodec.__name__)
+    codec = DataStore(OGBConf(hass=None, room="Tent")).codec
+    decoded = codec.decode(
+        {
+            SCHEMA_KEY: SCHEMA_VERSION,
+            "deviceCooldowns": {"canHeat": "15", "canCool": 12.5, "canFan": "invalid", "canExhaust": None},
+            "tentMode": ["not", "a", "mode"],
+            "growMediums": {"wrong": "type"},
+            "unknownKey": 1,
+        },
+        "Tent",
+    )
+    assert decoded == {"deviceCooldowns": {"canHeat": 15.0, "canCool": 12.5}, "unknownKey": 1}
+    assert "Invalid value for 'tentMode'" in caplog.text
+
+
+def test_migrations_run_from_the_file_version(monkeypatch):
+    calls = []
+    monkeypatch.setattr(stateCodec, "SCHEMA_VERSION", 3)
+    monkeypatch.setitem(stateCodec.MIGRATIONS, 1, lambda data, room: calls.append(1) or {**data, "v2": True})
+    monkeypatch.setitem(stateCodec.MIGRATIONS, 2, lambda data, room: calls.append(2) or data)
+
+    assert migrate({SCHEMA_KEY: 1, "tentMode": "Drying"}) == {"tentMode": "Drying", "v2": True}
+    assert calls == [1, 2]
+    assert migrate({SCHEMA_KEY: 3}) == {}
+    assert calls == [1, 2]
+
+
+class FakeConfig:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, *parts):
+        return str(self.root.joinpath(*parts))
+
+
+class FakeHass:
+    def __init__(self, root):
+        self.config = FakeConfig(root)
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+@pytest.mark.asyncio
+async def test_ds_manager_writes_versioned_file_and_migrates_legacy_files(tmp_path):
+    store = _store()
+    store.set("tentMode", "VPD Perfection")
+    store.set("deviceCooldowns", {"canHeat": 12.0})
+    manager = OGBDSManager(FakeHass(tmp_path), store, FakeEventManager(), "Tent", None)
+    manager._state_loaded = True
+    store.set("plantsView", {"isTimeLapseActive": True})
+
+    await manager.saveState({"source": "test"})
+    saved = json.loads(open(manager.storage_path, "rb").read())
+    assert saved[SCHEMA_KEY] == SCHEMA_VERSION
+    assert saved["Energy"]["daily"]["2026-03-01"]["kwh"] == 1.5
+    # Defaults are added to the saved copy, not to the shared live dict
+    assert saved["plantsView"]["OutPutFormat"] == "mp4"
+    assert store.get("plantsView") == {"isTimeLapseActive": True}
+
+    restored = DataStore(OGBConf(hass=None, room="Tent"))
+    loader = OGBDSManager(FakeHass(tmp_path), restored, FakeEventManager(), "Tent", None)
+    await loader.async_init()
+    assert restored.get("tentMode") == "VPD Perfection"
+    assert restored.get("deviceCooldowns") == {"canHeat": 12.0}
+    assert restored.get("Energy")["daily"] == store.get("Energy")["daily"]
+
+    # A file from before the codec (no version) still gets the legacy cleanup
+    legacy = {"growMediums": [{"name": "m1", "properties": {"ph_range": "('(', " + "'x', " * 40 + ")"}}]}
+    with open(manager.storage_path, "w", encoding="utf-8") as handle:
+        json.dump(legacy, handle)
+    legacy_store = DataStore(OGBConf(hass=None, room="Tent"))
+    await OGBDSManager(FakeHass(tmp_path), legacy_store, FakeEventManager(), "Tent", None).async_init()
+    assert legacy_store.get("growMediums")[0]["properties"]["ph_range"] == [5.5, 7.0]
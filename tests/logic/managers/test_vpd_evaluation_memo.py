@@ -0,0 +1,78 @@
+import pytest
+
+from benchmarks.harness import SimWorld, TraceSample, install_ha_stubs, quiet_logging
+from custom_components.opengrowbox.OGBController.utils.evalMemo import EvaluationMemo, quantize
+
+install_ha_stubs()
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    quiet_logging()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memo_hits_only_for_same_fresh_fingerprint():
+    clock = FakeClock()
+    memo = EvaluationMemo(max_age=300, clock=clock)
+    fingerprint = (quantize(23.04, 0.1), quantize("unavailable", 0.1))
+
+    assert not memo.is_unchanged(fingerprint)
+    memo.record(fingerprint)
+    assert memo.is_unchanged((quantize(22.96, 0.1), "unavailable"))
+
+    clock.now = 301
+    assert not memo.is_unchanged(fingerprint)
+    memo.record(fingerprint)
+
+    memo.invalidate("ogb_plantstage_room")
+    assert not memo.is_unchanged(fingerprint)
+    assert memo.get_stats() == {
+        "hits": 1,
+        "misses": 3,
+        "hit_rate": 0.25,
+        "invalidations": 1,
+        "last_invalidation": "ogb_plantstage_room",
+    }
+
+
+@pytest.mark.asyncio
+async def test_repeated_readings_skip_evaluation_until_config_changes():
+    world = await SimWorld(rooms=1, devices=4, sensors=2, seed=1).start()
+    try:
+        room = next(iter(world.rooms.values()))
+        memo = room.vpd_manager.eval_memo
+        temp_id, hum_id = room.sensor_entities()[:2]
+
+        def samples(temp, hum):
+            return [
+                TraceSample(0.0, room.name, temp_id, temp),
+                TraceSample(0.0, room.name, hum_id, hum),
+            ]
+
+        await world.replay(samples(26.0, 48.0))
+        actions_after_first = len(room.data_store.get("previousActions") or [])
+        misses = memo.misses
+
+        # Same readings within sensor resolution: no re-evaluation, no new actions
+        await world.replay(samples(26.01, 48.02) * 5)
+        # One miss picks up the action taken by the first cycle, the rest are hits
+        assert memo.misses - misses == 1
+        assert memo.hits == 9
+        assert len(room.data_store.get("previousActions") or []) == actions_after_first
+
+        hits = memo.hits
+        await room.event_manager.emit("ConfigurationApplied", "ogb_vpd_perfection")
+        await world.replay(samples(26.0, 48.0))
+        assert memo.misses > misses
+        assert memo.last_invalidation == "ogb_vpd_perfection"
+        assert room.vpd_manager.get_vpd_status()["evaluation_cache"]["hits"] >= hits
+    finally:
+        await world.stop()
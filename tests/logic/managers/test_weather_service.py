@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from custom_components.opengrowbox.OGBController.utils.weatherService import (
+    OGBWeatherService,
+    get_weather_service,
+)
+
+
+class FakeHass:
+    def __init__(self):
+        self.data = {}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class OpenMeteoStub:
+    """Local Open-Meteo stand-in with scriptable status codes and delay."""
+
+    def __init__(self):
+        self.calls = 0
+        self.statuses = []
+        self.delay = 0.0
+        self.temperature = 21.04
+        self.runner = None
+        self.url = None
+
+    async def handler(self, request):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return web.Response(status=status)
+        return web.json_response(
+            {"current": {"temperature_2m": self.temperature, "relative_humidity_2m": 55}}
+        )
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/v1/forecast", self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1/forecast"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+def make_service(stub, clock):
+    async def no_sleep(_seconds):
+        return None
+
+    return OGBWeatherService(FakeHass(), ttl=600, max_stale=3600, base_url=stub.url, clock=clock, sleep=no_sleep)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rooms_share_one_fetch_and_subscribers_get_it():
+    async with OpenMeteoStub() as stub:
+        clock = FakeClock()
+        service = make_service(stub, clock)
+        stub.delay = 0.05
+        received = []
+        service.subscribe(52.5201, 13.4049, received.append)
+
+        results = await asyncio.gather(*(service.get(52.52, 13.405) for _ in range(8)))
+
+        assert stub.calls == 1
+        assert all(result == {"temperature": 21.0, "humidity": 55} for result in results)
+        assert received == [results[0]]
+        assert service.stats["coalesced"] == 7
+
+        # Within TTL: served from cache
+        clock.now += 300
+        assert await service.get(52.52, 13.405) == results[0]
+        assert stub.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing_in_background():
+    async with OpenMeteoStub() as stub:
+        clock = FakeClock()
+        service = make_service(stub, clock)
+        await service.get(52.52, 13.4)
+
+        stub.temperature = 25.0
+        clock.now += 900
+        assert (await service.get(52.52, 13.4))["temperature"] == 21.0
+        await asyncio.sleep(0.05)
+
+        assert stub.calls == 2
+        assert service.peek(52.52, 13.4)["temperature"] == 25.0
+
+        # New subscribers start warm with the cached value
+        warm = []
+        service.subscribe(52.52, 13.4, warm.append)
+        await asyncio.sleep(0)
+        assert warm == [{"temperature": 25.0, "humidity": 55}]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backs_off_per_location():
+    async with OpenMeteoStub() as stub:
+        clock = FakeClock()
+        service = make_service(stub, clock)
+        stub.statuses = [429]
+
+        assert await service.get(52.52, 13.4) is None
+        assert await service.get(52.52, 13.4) is None
+        assert stub.calls == 1
+
+        clock.now += 61
+        assert await service.get(52.52, 13.4) == {"temperature": 21.0, "humidity": 55}
+        assert stub.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried_before_backing_off():
+    async with OpenMeteoStub() as stub:
+        clock = FakeClock()
+        service = make_service(stub, clock)
+        stub.statuses = [502, 200]
+
+        assert (await service.get(52.52, 13.4))["humidity"] == 55
+        assert stub.calls == 2
+
+        stub.statuses = [502, 502, 502]
+        clock.now += 3601
+        assert await service.get(52.52, 13.4) is None
+        assert stub.calls == 5
+        assert service.get_stats()["failures"] == 1
+
+
+def test_service_is_shared_per_hass():
+    hass = FakeHass()
+    assert get_weather_service(hass) is get_weather_service(hass)
+    assert get_weather_service(FakeHass()) is not get_weather_service(hass)
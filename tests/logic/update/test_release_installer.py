@@ -0,0 +1,137 @@
+import hashlib
+import os
+import zipfile
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from custom_components.opengrowbox.OGBController.utils import releaseInstaller
+from custom_components.opengrowbox.OGBController.utils.releaseInstaller import (
+    ReleaseInstallError,
+    download_release,
+    install_release,
+    parse_checksum,
+)
+
+BIG = os.urandom(256 * 1024)
+
+
+def _archive(path, files, extra=None):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(f"opengrowbox/{name}", data)
+        for name, data in (extra or {}).items():
+            archive.writestr(name, data)
+    return str(path)
+
+
+def _installed(tmp_path, files):
+    integration = tmp_path / "custom_components" / "opengrowbox"
+    for name, data in files.items():
+        (integration / name).parent.mkdir(parents=True, exist_ok=True)
+        (integration / name).write_bytes(data)
+    return str(integration)
+
+
+def test_parse_checksum_formats():
+    digest = "a" * 64
+    assert parse_checksum(f"sha256:{digest}") == digest
+    assert parse_checksum(f"{digest.upper()}  opengrowbox.zip\n") == digest
+    assert parse_checksum("sha256:abc") is None
+    assert parse_checksum(None) is None
+
+
+@pytest.mark.asyncio
+async def test_download_streams_to_disk_and_verifies_checksum(tmp_path):
+    archive = _archive(tmp_path / "release.zip", {"manifest.json": b"{}", "frontend/main.js": BIG})
+    payload = open(archive, "rb").read()
+    checksum = hashlib.sha256(payload).hexdigest()
+
+    async def release(request):
+        return web.FileResponse(archive)
+
+    app = web.Application()
+    app.router.add_get("/opengrowbox.zip", release)
+    async with TestServer(app) as server, ClientSession() as session:
+        url = str(server.make_url("/opengrowbox.zip"))
+        progress = []
+        target = str(tmp_path / "download.zip")
+
+        assert await download_release(
+            session, url, target, checksum, chunk_size=16 * 1024, progress=lambda done, total: progress.append((done, total))
+        ) == checksum
+        assert open(target, "rb").read() == payload
+        assert progress[-1] == (len(payload), len(payload))
+        assert len(progress) > 2
+
+        with pytest.raises(ReleaseInstallError, match="Checksum mismatch"):
+            await download_release(session, url, target, "0" * 64)
+        assert not os.path.exists(target)
+
+        with pytest.raises(ReleaseInstallError, match="HTTP 404"):
+            await download_release(session, url + ".missing", target)
+        assert not os.path.exists(target)
+
+
+def test_install_swaps_directory_and_reuses_unchanged_files(tmp_path):
+    integration = _installed(tmp_path, {"manifest.json": b'{"version": "1.0"}', "frontend/main.js": BIG, "old.py": b"x"})
+    archive = _archive(
+        tmp_path / "release.zip",
+        {"manifest.json": b'{"version": "1.1"}', "frontend/main.js": BIG, "new.py": b"y"},
+        extra={"README.md": b"outside the package"},
+    )
+    progress = []
+
+    stats = install_release(archive, integration, progress=lambda done, total: progress.append((done, total)))
+
+    assert stats == {"extracted": 2, "unchanged": 1, "ignored": 1, "bytes_written": len(b'{"version": "1.1"}') + 1}
+    assert sorted(os.listdir(integration)) == ["frontend", "manifest.json", "new.py"]
+    assert open(os.path.join(integration, "frontend", "main.js"), "rb").read() == BIG
+    assert progress[-1] == (4, 4)
+    # Only the integration is left behind: no staging or .old directories
+    assert os.listdir(os.path.dirname(integration)) == ["opengrowbox"]
+
+
+@pytest.mark.parametrize("name", ["../evil.py", "/etc/evil", "opengrowbox/../../evil.py", "C:/evil.py"])
+def test_install_rejects_path_traversal_before_writing(tmp_path, name):
+    integration = _installed(tmp_path, {"manifest.json": b"{}"})
+    archive = _archive(tmp_path / "release.zip", {"manifest.json": b"{}"}, extra={name: b"boom"})
+
+    with pytest.raises(ReleaseInstallError, match="Unsafe path"):
+        install_release(archive, integration)
+    assert os.listdir(integration) == ["manifest.json"]
+    assert os.listdir(os.path.dirname(integration)) == ["opengrowbox"]
+
+
+def test_install_rejects_symlinks_and_corrupt_archives(tmp_path):
+    integration = _installed(tmp_path, {"manifest.json": b"{}"})
+    archive = str(tmp_path / "links.zip")
+    with zipfile.ZipFile(archive, "w") as handle:
+        link = zipfile.ZipInfo("opengrowbox/secrets.yaml")
+        link.external_attr = (0o120777 << 16)
+        handle.writestr(link, "../../secrets.yaml")
+    with pytest.raises(ReleaseInstallError, match="Symlink"):
+        install_release(archive, integration)
+
+    broken = tmp_path / "broken.zip"
+    broken.write_bytes(b"not a zip")
+    with pytest.raises(ReleaseInstallError, match="not a valid zip"):
+        install_release(str(broken), integration)
+    assert open(os.path.join(integration, "manifest.json"), "rb").read() == b"{}"
+
+
+def test_install_keeps_the_previous_version_when_the_swap_fails(tmp_path, monkeypatch):
+    integration = _installed(tmp_path, {"manifest.json": b"old"})
+    archive = _archive(tmp_path / "release.zip", {"manifest.json": b"new"})
+    real_rename = os.rename
+
+    def rename(src, dst):
+        if dst == integration and not src.endswith(".old"):
+            raise OSError("disk full")
+        real_rename(src, dst)
+
+    monkeypatch.setattr(releaseInstaller.os, "rename", rename)
+    with pytest.raises(OSError):
+        install_release(archive, integration)
+    assert open(os.path.join(integration, "manifest.json"), "rb").read() == b"old"
@@ -0,0 +1,226 @@
+"""Tests for the columnar, offline-tolerant batching in OGBAIDataBridge."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.premium.analytics.OGBAIDataBridge import (
+    OGBAIDataBridge,
+)
+from custom_components.opengrowbox.OGBController.premium.analytics.OGBAIEventBatch import (
+    ColumnarBatch,
+    SpillFile,
+    decode_batch,
+)
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+
+
+class ManualClock:
+    def __init__(self, now=1_760_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class LocalEndpoint:
+    """Stand-in for the API: accepts batches while online, refuses them otherwise."""
+
+    def __init__(self):
+        self.online = True
+        self.payloads = []
+
+    def is_connected(self):
+        return self.online
+
+    async def emit(self, event, data):
+        if not self.online:
+            raise ConnectionError("offline")
+        self.payloads.append(data)
+
+    def events(self):
+        return [event for payload in self.payloads for event in decode_batch(payload["batch"])]
+
+
+def _bridge(tmp_path, endpoint, clock=None):
+    store = FakeDataStore({"CropSteering": {"MediumType": "Rockwool"}})
+    bridge = OGBAIDataBridge(None, FakeEventManager(), store, "Tent", endpoint, spill_path=str(tmp_path / "spill.seg"))
+    if clock is not None:
+        bridge.clock = clock
+    return bridge
+
+
+def _sensor(i):
+    return {
+        "room": "Tent",
+        "vwc": 55.0 + (i % 40) / 10,
+        "vwc_raw": 1200 + i % 50,
+        "ec": 2.1 + (i % 7) / 100,
+        "pore_ec": 3.4,
+        "temperature": 23.5,
+        "soil_temp": 21.0,
+        "vwc_min": 50,
+        "vwc_max": 65,
+        "ec_target": 2.2,
+        "air_temp": 25.1,
+        "humidity": 61,
+        "vpd": 1.15,
+        "light_intensity": 800,
+        "light_status": "on",
+    }
+
+
+def _legacy_size(events):
+    # The former wire format: one dict per event, 100 per message
+    return sum(
+        len(json.dumps({"type": "cropsteering_events", "room": "Tent", "events": events[i:i + 100], "timestamp": 0}))
+        for i in range(0, len(events), 100)
+    )
+
+
+def test_batch_round_trips_events_with_dictionary_encoded_strings():
+    batch = ColumnarBatch("sensor_reading", "Tent", 0.0)
+    events = []
+    for i in range(300):
+        data = {"phase": ["p1", "p2", "p3"][i % 3], "vwc": 55.0 + i / 10, "lightStatus": "on", "note": None}
+        batch.append(1_760_000_000_000 + i * 30_000, "rockwool", data)
+        events.append(
+            {"event_type": "sensor_reading", "timestamp": 1_760_000_000_000.0 + i * 30_000, "room": "Tent",
+             "medium_type": "rockwool", "data": data}
+        )
+
+    doc = batch.to_doc()
+    assert doc["strings"] == ["rockwool", "p1", "p2", "p3", "on"]
+    assert set(doc["dict"]) == {"_medium", "phase", "lightStatus", "note"}
+    assert set(doc["dt"]) == {30_000}
+
+    blob = batch.encode()
+    assert decode_batch(blob) == events
+    assert len(blob) * 10 < _legacy_size(events)
+
+
+@pytest.mark.asyncio
+async def test_six_hour_outage_loses_nothing_and_sends_oldest_first(tmp_path):
+    clock = ManualClock()
+    endpoint = LocalEndpoint()
+    bridge = _bridge(tmp_path, endpoint, clock)
+    spill_path = tmp_path / "spill.seg"
+
+    generated = []
+    record = bridge._record
+    bridge._record = lambda event_type, data, **kwargs: generated.append(event_type) or record(event_type, data, **kwargs)
+
+    outage = range(3600, 7 * 3600)
+    for second in range(0, 8 * 3600, 10):
+        clock.now += 10
+        endpoint.online = second not in outage
+        await bridge._on_sensor_update(_sensor(second))
+        if second % 900 == 0:
+            await bridge._on_irrigation({"room": "Tent", "duration": 30, "volume": 120})
+            bridge.log_irrigation_complete(60.0, 2.3)
+        if bridge._next_flush_delay() == 0:
+            await bridge._flush_buffer()
+        if second == 6 * 3600:
+            assert os.path.getsize(spill_path) > 0
+            assert bridge.get_status()["events_spilled"] > 1000
+    await bridge._flush_buffer()
+
+    received = endpoint.events()
+    # The former deque(maxlen=1000) could not have held this outage
+    assert len(generated) > 2000
+    assert len(received) == len(generated)
+    assert bridge.get_status()["events_dropped"] == 0
+    assert not spill_path.exists()
+
+    sensor_ts = [event["timestamp"] for event in received if event["event_type"] == "sensor_reading"]
+    assert sensor_ts == sorted(sensor_ts)
+    irrigation = [event for event in received if event["event_type"] == "irrigation"]
+    assert irrigation[-1]["data"]["postVWC"] == 60.0
+    assert irrigation[-1]["medium_type"] == "rockwool"
+
+    # Bytes on the wire vs. the former per-event JSON
+    assert bridge.bytes_sent * 5 < _legacy_size(received)
+
+
+def test_spill_file_is_bounded_and_survives_a_restart(tmp_path):
+    path = str(tmp_path / "spill.seg")
+    spill = SpillFile(path, max_bytes=200)
+    for i in range(5):
+        spill.append(10, bytes([i]) * 60)
+    assert spill.dropped_batches == 3 and spill.dropped_events == 30
+    assert [blob[0] for _, blob in spill.read()] == [3, 4]
+
+    restarted = SpillFile(path, max_bytes=200)
+    restarted.load()
+    assert restarted.events == 20
+
+    # A torn last record (crash mid-write) is discarded, not fatal
+    with open(path, "ab") as handle:
+        handle.write(b"\x00\x00\x01\x00\x00\x00\x00\x05abc")
+    assert len(SpillFile(path).read()) == 2
+
+    restarted.replace([])
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_flush_loop_uses_size_and_age_triggers(tmp_path):
+    endpoint = LocalEndpoint()
+    bridge = _bridge(tmp_path, endpoint)
+    bridge.max_batch_events = 5
+    bridge.max_batch_age = 0.1
+    await bridge.start()
+    try:
+        # Size: a full buffer goes out right away
+        for _ in range(5):
+            await bridge._on_performance_metric({"room": "Tent", "vwc_accuracy": 0.9})
+        for _ in range(20):
+            await asyncio.sleep(0)
+        assert [payload["events"] for payload in endpoint.payloads] == [5]
+
+        # Age: a single event waits for max_batch_age, not longer
+        await bridge._on_dryback_complete({"room": "Tent", "duration": 3600})
+        await asyncio.sleep(0.02)
+        assert len(endpoint.payloads) == 1
+        await asyncio.sleep(0.2)
+        assert [payload["events"] for payload in endpoint.payloads] == [5, 1]
+    finally:
+        await bridge.stop()
+
+
+class PremiumClient:
+    """Shape of the premium WebSocket client: JSON-encodes what it sends."""
+
+    def __init__(self):
+        self.messages = []
+
+    def is_connected(self):
+        return True
+
+    async def prem_event(self, message_type, data):
+        self.messages.append((message_type, json.loads(json.dumps(data))))
+        return True
+
+
+@pytest.mark.asyncio
+async def test_batches_spill_until_the_premium_client_exists(tmp_path):
+    bridge = _bridge(tmp_path, None)
+    bridge.prem_manager = type("Premium", (), {"ogb_ws": None})()
+
+    for i in range(3):
+        await bridge._on_performance_metric({"room": "Tent", "overshoot_count": i})
+    await bridge._flush_buffer()
+    assert bridge.get_status()["events_spilled"] == 3
+    assert bridge.events_sent == 0
+
+    client = bridge.prem_manager.ogb_ws = PremiumClient()
+    await bridge._on_performance_metric({"room": "Tent", "overshoot_count": 3})
+    await bridge._flush_buffer()
+
+    assert [message_type for message_type, _ in client.messages] == ["ai_cropsteering_data"] * 2
+    received = [event for _, payload in client.messages for event in decode_batch(payload["batch"])]
+    assert [event["data"]["overshootCount"] for event in received] == [0, 1, 2, 3]
+    assert bridge.events_sent == 4
+    assert not (tmp_path / "spill.seg").exists()
@@ -0,0 +1,185 @@
+"""Tests for the streaming compliance engine behind OGBPremCompliance."""
+
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.OGBDatastore import DataStore
+from custom_components.opengrowbox.OGBController.data.OGBDataClasses.OGBData import OGBConf
+from custom_components.opengrowbox.OGBController.managers.OGBDSManager import OGBDSManager
+from custom_components.opengrowbox.OGBController.premium.OGBPremiumIntegration import (
+    OGBPremiumIntegration,
+)
+from custom_components.opengrowbox.OGBController.premium.analytics.OGBComplianceEngine import (
+    ComplianceEngine,
+)
+from custom_components.opengrowbox.OGBController.premium.analytics.OGBPremCompliance import (
+    OGBPremCompliance,
+)
+from tests.logic.helpers import FakeDataStore, FakeEventManager
+
+
+def _ts(day, hour, minute=0):
+    return datetime(2026, 3, day, hour, minute).timestamp()
+
+
+def test_engine_accumulates_time_excursions_and_deviation():
+    engine = ComplianceEngine()
+    engine.observe({"temperature": 25, "humidity": 60, "vpd": 1.0}, _ts(2, 10))
+    engine.observe({"temperature": 31}, _ts(2, 10, 10))  # excursion starts
+    engine.observe({"temperature": 32.5}, _ts(2, 10, 20))  # same excursion, deeper
+    engine.observe({"temperature": 29}, _ts(2, 10, 30))  # back in range
+    engine.observe({"temperature": 31}, _ts(2, 11))  # second excursion
+    engine.observe({"temperature": 14.0}, _ts(2, 11, 5))  # straight into the minimum rule
+
+    acc = engine.acc["temperature_max"]
+    assert acc.violation_seconds == 20 * 60 + 5 * 60
+    assert acc.excursions == 2
+    assert acc.max_deviation == pytest.approx(2.5)
+    assert engine.acc["temperature_min"].excursions == 1
+    assert engine.acc["humidity_max"].excursions == 0
+    assert [v["rule"] for v in engine.active_violations()] == ["temperature_min"]
+    assert engine.active_violations()[0]["message"] == "Temperature 14.0°C below regulatory minimum of 15°C"
+
+
+def test_days_are_split_at_midnight_and_gaps_are_not_credited():
+    engine = ComplianceEngine(max_gap=3600)
+    engine.observe({"vpd": 1.8}, _ts(2, 23, 30))
+    assert engine.observe({"vpd": 1.8}, _ts(3, 0, 30))  # closes 2 March
+    engine.observe({"vpd": 1.8}, _ts(3, 6, 30))  # 6 h gap: sensor stream was down
+
+    assert engine.daily["2026-03-02"] == {"o": 1800.0, "r": {"vpd_max": [1800.0, 1, 0.2]}}
+    today = engine.report(days=1, now=_ts(3, 7))
+    assert today["rules"]["vpd_max"]["violation_seconds"] == 1800
+    # An excursion running over midnight is counted on the day it started
+    assert today["rules"]["vpd_max"]["excursions"] == 0
+
+
+def test_thirty_day_report_comes_from_daily_summaries_quickly():
+    daily = {
+        f"2026-02-{day:02d}": {"o": 86400.0, "r": {"humidity_max": [3600.0, 2, 4.0]}}
+        for day in range(1, 29)
+    }
+    engine = ComplianceEngine(daily=daily)
+    engine.observe({"humidity": 70}, _ts(1, 8))
+
+    started = time.perf_counter()
+    report = engine.report(days=30, now=_ts(1, 9))
+    assert time.perf_counter() - started < 0.005
+
+    humidity = report["rules"]["humidity_max"]
+    # 1 March plus 29 days back reaches 31 January: all 28 February summaries
+    assert report["days_covered"] == 29
+    assert humidity["excursions"] == 56
+    assert humidity["time_in_violation_percent"] == pytest.approx(28 * 3600 / (28 * 86400 + 3600) * 100, abs=0.01)
+    assert engine.report(days=7, now=_ts(1, 9))["rules"]["humidity_max"]["excursions"] == 12
+
+
+def test_restart_continues_the_running_day():
+    store = FakeDataStore({"complianceDaily": None})
+    compliance = OGBPremCompliance(data_store=store)
+    compliance.observe({"temperature": 31}, _ts(4, 9))
+    compliance.observe({"temperature": 31}, _ts(4, 9, 10))
+    compliance.flush()
+    assert store.get("complianceDaily")["2026-03-04"]["r"]["temperature_max"] == [600.0, 1, 1.0]
+
+    restarted = OGBPremCompliance(data_store=store)
+    restarted.observe({"temperature": 31}, _ts(4, 10))
+    restarted.observe({"temperature": 31}, _ts(4, 10, 5))
+    rule = restarted.engine.report(days=1, now=_ts(4, 11))["rules"]["temperature_max"]
+    assert rule["violation_seconds"] == 900
+    assert rule["excursions"] == 2
+
+
+class FakeConfig:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, *parts):
+        return str(self.root.joinpath(*parts))
+
+
+class FakeHass:
+    def __init__(self, root):
+        self.config = FakeConfig(root)
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+@pytest.mark.asyncio
+async def test_daily_ledger_survives_save_and_load_through_ds_manager(tmp_path):
+    store = DataStore(OGBConf(hass=None, room="Tent"))
+    compliance = OGBPremCompliance(data_store=store)
+    compliance.observe({"humidity": 85}, _ts(4, 23, 50))
+    compliance.observe({"humidity": 85}, _ts(5, 0, 5))  # closes 4 March, 5 min into 5 March
+    compliance.flush()
+    manager = OGBDSManager(FakeHass(tmp_path), store, FakeEventManager(), "Tent", None)
+    manager._state_loaded = True
+    await manager.saveState({"source": "Compliance"})
+
+    # Startup order: the module exists before the state file is loaded
+    restored = DataStore(OGBConf(hass=None, room="Tent"))
+    restarted = OGBPremCompliance(data_store=restored)
+    await OGBDSManager(FakeHass(tmp_path), restored, FakeEventManager(), "Tent", None).async_init()
+    assert restored.get("complianceDaily")["2026-03-04"]["r"]["humidity_max"] == [600.0, 1, 5.0]
+
+    restarted.observe({"humidity": 85}, _ts(5, 1))
+    restarted.observe({"humidity": 85}, _ts(5, 1, 5))
+    # 5 March continues from the 5 minutes flushed before the restart
+    today = restarted.engine.report(days=1, now=_ts(5, 2))["rules"]["humidity_max"]
+    assert today["violation_seconds"] == 300 + 300
+    two_days = restarted.engine.report(days=2, now=_ts(5, 2))["rules"]["humidity_max"]
+    assert two_days["violation_seconds"] == 600 + 300 + 300
+    assert restarted.engine.daily is restored.get("complianceDaily")
+
+
+@pytest.mark.asyncio
+async def test_point_check_and_report_keep_their_shape():
+    compliance = OGBPremCompliance()
+    result = await compliance.check_compliance({"temperature": 31, "humidity": 85, "vpd": 1.0})
+    assert result["overall_status"] == "warning"
+    assert [v["message"] for v in result["violations"]] == [
+        "Temperature 31°C exceeds regulatory limit of 30°C",
+        "Humidity 85% exceeds regulatory limit of 80%",
+    ]
+
+    now = time.time()
+    compliance.observe({"vpd": 1.7}, now - 60)
+    compliance.observe({"vpd": 1.2}, now)
+    await compliance.handle_compliance_alert({"alert_type": "audit", "severity": "warning"})
+    report = await compliance.get_compliance_report(days=7)
+    assert report["total_violations"] == 2
+    assert report["critical_violations"] == 1
+    assert report["warning_violations"] == 1
+    assert report["rules"]["vpd_max"]["violation_seconds"] == pytest.approx(60)
+    assert (await compliance.get_compliance_status())["overall_status"] == "compliant"
+
+
+@pytest.mark.asyncio
+async def test_integration_observes_every_vpd_update_without_actions():
+    store = FakeDataStore({"tentData": {"temperature": 31, "humidity": 60}, "vpd": {"current": 1.1}})
+    events = FakeEventManager()
+    integration = OGBPremiumIntegration.__new__(OGBPremiumIntegration)
+    integration.hass = SimpleNamespace(bus=SimpleNamespace(async_listen=lambda *args: None))
+    integration.event_manager = events
+    integration.data_store = store
+    integration.compliance = OGBPremCompliance(data_store=store)
+    integration._ha_unsubscribers = []
+    integration._event_bindings = []
+    integration._setup_event_listeners()
+
+    assert integration._observe_compliance in events.listeners["VPDCreation"]
+    assert integration._observe_compliance not in events.listeners.get("DataRelease", [])
+
+    # A steady excursion with no actions in between is still credited
+    clock = iter([_ts(6, 10), _ts(6, 10, 5), _ts(6, 10, 10)])
+    integration.compliance.engine.clock = lambda: next(clock)
+    for _ in range(3):
+        for listener in events.listeners["VPDCreation"]:
+            await listener(None)
+    rule = integration.compliance.engine.report(days=1, now=_ts(6, 11))["rules"]["temperature_max"]
+    assert rule["violation_seconds"] == 600
+    assert rule["excursions"] == 1
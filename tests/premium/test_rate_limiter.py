@@ -0,0 +1,126 @@
+"""Tests for the GCRA-based OGBRateLimiter."""
+
+import sys
+
+import pytest
+
+from custom_components.opengrowbox.OGBController.managers.OGBDSManager import PRESERVED_STATE_KEYS
+from custom_components.opengrowbox.OGBController.premium.analytics.OGBRateLimiter import (
+    OGBRateLimiter,
+)
+from tests.logic.helpers import FakeDataStore
+
+
+class ManualClock:
+    def __init__(self, now=1_760_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = ManualClock()
+    monkeypatch.setattr(OGBRateLimiter, "clock", clock)
+    return clock
+
+
+def _limiter(plan="free", state=None, data_store=None):
+    return OGBRateLimiter("user-1234567890", plan, "test_room", state=state, data_store=data_store)
+
+
+def test_burst_up_to_the_limit_then_blocks_with_accurate_retry(clock):
+    limiter = _limiter()  # free: 20 device commands per hour, warn at 80 %
+
+    results = [limiter.check_limit("device_commands") for _ in range(20)]
+    assert all(r["allowed"] for r in results)
+    assert [r["warning"] for r in results].index(True) == 16
+    assert results[-1]["remaining"] == 1
+
+    blocked = limiter.check_limit("device_commands")
+    assert not blocked["allowed"]
+    assert blocked["remaining"] == 0
+    assert blocked["usage_percent"] == 100.0
+    # One request worth of budget (3600 s / 20) frees up after 180 s
+    assert blocked["retry_after"] == pytest.approx(180)
+    assert blocked["reset_at"].timestamp() == pytest.approx(clock.now + 3600)
+
+    clock.now += 179
+    assert not limiter.check_limit("device_commands")["allowed"]
+    clock.now += 1
+    assert limiter.check_limit("device_commands")["allowed"]
+    assert not limiter.check_limit("device_commands")["allowed"]
+
+
+def test_budget_leaks_back_continuously_and_status_checks_do_not_count(clock):
+    limiter = _limiter()
+    for _ in range(10):
+        limiter.check_limit("device_commands")
+
+    clock.now += 900  # a quarter of the window returns 5 requests
+    status = limiter.check_limit("device_commands", increment=False)
+    assert status["remaining"] == 15
+    assert limiter.check_limit("device_commands", increment=False)["remaining"] == 15
+
+    clock.now += 3600
+    assert limiter.get_all_limits_status()["device_commands"]["usage_percent"] == 0.0
+
+
+def test_state_is_constant_size_for_large_limits(clock):
+    limiter = _limiter("enterprise")
+    for _ in range(20000):
+        clock.now += 0.01
+        limiter.check_limit("sensor_reads")
+
+    assert len(limiter._tat) == 1
+    assert sys.getsizeof(limiter._tat["sensor_reads"]) == sys.getsizeof(0.0)
+    # 20000 reads in 200 s, while 200 s / 0.06 s per read leaked back out
+    assert limiter.check_limit("sensor_reads", increment=False)["remaining"] == 60000 - (20000 - 3333)
+
+
+def test_state_survives_a_restart(clock):
+    limiter = _limiter()
+    for _ in range(20):
+        limiter.check_limit("device_commands")
+    limiter.check_limit("api_calls")
+    state = limiter.export_state()
+
+    clock.now += 60
+    restored = _limiter(state=state)
+    assert not restored.check_limit("device_commands")["allowed"]
+    assert restored.check_limit("api_calls", increment=False)["remaining"] == 99
+
+    # Expired, unknown and malformed entries are dropped; the TAT is capped at one window
+    clock.now += 10 * 86400
+    fresh = _limiter()
+    fresh.restore_state(state)
+    assert fresh._tat == {}
+    bogus = _limiter()
+    bogus.restore_state({"version": 1, "tat": {"device_commands": clock.now + 1e9, "nope": 1, "api_calls": "x"}})
+    assert bogus._tat == {"device_commands": clock.now + 3600}
+    bogus.reset_limit("device_commands")
+    assert bogus.check_limit("device_commands")["remaining"] == 20
+
+
+def test_state_is_mirrored_to_the_datastore_and_restored_from_it(clock):
+    assert OGBRateLimiter.STATE_KEY in PRESERVED_STATE_KEYS
+    store = FakeDataStore()
+    limiter = _limiter(data_store=store)
+    for _ in range(20):
+        limiter.check_limit("device_commands")
+    assert store.get(OGBRateLimiter.STATE_KEY) == limiter.export_state()
+
+    # A new limiter on the (reloaded) datastore continues with the spent budget
+    clock.now += 60
+    restarted = _limiter(data_store=FakeDataStore({OGBRateLimiter.STATE_KEY: store.get(OGBRateLimiter.STATE_KEY)}))
+    assert not restarted.check_limit("device_commands")["allowed"]
+
+    restarted.reset_limit("device_commands")
+    assert restarted.data_store.get(OGBRateLimiter.STATE_KEY)["tat"] == {}
+
+
+def test_unknown_operation_is_allowed(clock):
+    limiter = _limiter()
+    result = limiter.check_limit("teleport")
+    assert result["allowed"] and result["reset_at"] is None